@@ -64,19 +64,8 @@ async def get_project_sessions(
             if not project_path.exists():
                 raise HTTPException(status_code=404, detail="Project directory not found")
 
-            session_files = list(project_path.glob("*.jsonl"))
-            sessions = []
-
-            for session_file in session_files:
-                try:
-                    session_data = sessions_reader._parse_session_file(session_file)
-                    sessions.append(session_data)
-                except Exception as e:
-                    logger.error(f"Failed to parse session {session_file.name}: {e}")
-                    continue
-
-            # Sort by last timestamp (BEFORE pagination)
-            sessions = sorted(sessions, key=lambda x: x['last_timestamp'] or "", reverse=True)
+            # Sorted by last timestamp (BEFORE pagination); only changed transcripts are parsed
+            sessions = sessions_reader.get_directory_sessions(project_path)
 
             # Apply pagination
             total = len(sessions)
@@ -142,8 +131,8 @@ async def get_session_details(
         if not session_file.exists():
             raise HTTPException(status_code=404, detail="Session not found")
 
-        # Parse session file
-        session = sessions_reader._parse_session_file(session_file)
+        # Session metadata (parsed as far as the transcript changed)
+        session = sessions_reader.get_session_metadata(session_file)
 
         if include_messages:
             # Parse full message history
@@ -46,6 +46,7 @@ async def get_project_storage_mode(project_path: str, db: AsyncSession) -> tuple
 async def index_commit_files(
     project_dir: str = Query(..., description="Project directory path (URL-encoded)"),
     request: dict = None,
+    wait: bool = Query(False, description="Wait for MongoDB indexing jobs to finish"),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -55,14 +56,17 @@ async def index_commit_files(
     after merging to main/master branches.
 
     Automatically uses MongoDB Atlas if project has storage_mode='mongodb',
-    otherwise falls back to local ChromaDB.
+    otherwise falls back to local ChromaDB. MongoDB indexing is queued as a
+    background job (merged with other queued jobs of the project), so hooks
+    return immediately.
 
     Args:
         project_dir: Project directory path (URL-encoded)
         request: JSON body with file_paths array
+        wait: Wait for a queued MongoDB job instead of returning its ID
 
     Returns:
-        Indexing status and file count
+        Indexing status and file count (or the queued job)
     """
     try:
         # URL-decode the project directory (handles spaces and special characters)
@@ -124,6 +128,21 @@ async def index_commit_files(
             }
 
         # Index based on storage mode
+        if storage_mode == "mongodb" and project_id and not wait:
+            job = _queue_files_mongodb(str(project_id), filtered_paths, project_path_str)
+            if job is not None:
+                return {
+                    "success": True,
+                    "message": f"Queued {len(filtered_paths)} files for indexing",
+                    "files_queued": len(filtered_paths),
+                    "total_files": len(absolute_file_paths),
+                    "skipped_files": len(absolute_file_paths) - len(filtered_paths),
+                    "project_path": project_path_str,
+                    "storage_mode": storage_mode,
+                    "job_id": job.job_id,
+                    "job_status": job.status
+                }
+
         if storage_mode == "mongodb" and project_id:
             # Use MongoDB Atlas + Voyage AI
             result = await _index_files_mongodb(project_id, filtered_paths, project_path_str)
@@ -150,12 +169,47 @@ async def index_commit_files(
         raise HTTPException(status_code=500, detail=f"Failed to index files: {str(e)}")
 
 
+def _to_relative_paths(file_paths: list, repo_path: str) -> list:
+    """Convert absolute paths to paths relative to the repository"""
+    relative_paths = []
+    for path in file_paths:
+        if os.path.isabs(path):
+            relative_paths.append(os.path.relpath(path, repo_path))
+        else:
+            relative_paths.append(path)
+    return relative_paths
+
+
+def _queue_files_mongodb(project_id: str, file_paths: list, repo_path: str):
+    """
+    Queue a codebase indexing job for the files.
+
+    Returns:
+        The queued job, or None if MongoDB indexing is unavailable
+        (the caller then indexes synchronously with ChromaDB fallback)
+    """
+    from ..database_mongodb import mongodb_manager
+    from ..services.indexing_jobs import indexing_jobs
+    from ..routers import codebase_rag  # noqa: F401 - registers the "codebase" runner
+
+    if not mongodb_manager.client:
+        return None
+    if not (os.getenv("VOYAGE_AI_API_KEY") or os.getenv("VOYAGE_API_KEY")):
+        return None
+
+    job, merged = indexing_jobs.submit(
+        project_id, "codebase", "index_files", repo_path,
+        file_paths=_to_relative_paths(file_paths, repo_path)
+    )
+    return job
+
+
 async def _index_files_mongodb(project_id: str, file_paths: list, repo_path: str) -> dict:
     """Index files using MongoDB Atlas + Voyage AI"""
     from ..database_mongodb import mongodb_manager
     from ..repositories.codebase_repository import MongoDBCodebaseRepository
     from ..services.codebase_indexer import CodebaseIndexer
-    from ..services.embedding_service import VoyageEmbeddingService
+    from ..services.rag_engine import rag_engine
 
     # Check MongoDB connection
     if not mongodb_manager.client:
@@ -171,20 +225,12 @@ async def _index_files_mongodb(project_id: str, file_paths: list, repo_path: str
     try:
         db = mongodb_manager.get_database()
         repository = MongoDBCodebaseRepository(db)
-        embedding_service = VoyageEmbeddingService(voyage_api_key)
+        embedding_service = rag_engine.get_voyage_service(voyage_api_key)
         indexer = CodebaseIndexer(repository, embedding_service)
 
-        # Convert absolute paths to relative
-        relative_paths = []
-        for path in file_paths:
-            if os.path.isabs(path):
-                relative_paths.append(os.path.relpath(path, repo_path))
-            else:
-                relative_paths.append(path)
-
         stats = await indexer.index_files(
             project_id=project_id,
-            file_paths=relative_paths,
+            file_paths=_to_relative_paths(file_paths, repo_path),
             repo_path=repo_path
         )
 
@@ -200,11 +246,9 @@ async def _index_files_mongodb(project_id: str, file_paths: list, repo_path: str
 
 async def _index_files_chromadb(file_paths: list, repo_path: str) -> dict:
     """Index files using local ChromaDB (fallback)"""
-    from claudetask.mcp_server.rag.rag_service import RAGService, RAGConfig
+    from ..services.rag_engine import rag_engine
 
-    rag_config = RAGConfig()
-    rag_service = RAGService(rag_config)
-    await rag_service.initialize()
+    rag_service = await rag_engine.get_service()
 
     await rag_service.index_files(
         file_paths=file_paths,
@@ -366,23 +366,39 @@ class MongoDBManager:
         Collections:
         - mcp_logs: MCP call logs per project
         - hook_logs: Hook execution logs per project
+        - log_counters: Log entries per project, name and status
         """
         if not self.client:
             raise RuntimeError("MongoDB not connected")
 
         db = self.get_database()
 
-        # MCP logs indexes
+        # MCP logs indexes (keyset pagination on timestamp, _id; text search)
         await db.mcp_logs.create_index("project_id")
-        await db.mcp_logs.create_index([("project_id", 1), ("timestamp", -1)])
+        await db.mcp_logs.create_index([("project_id", 1), ("timestamp", -1), ("_id", -1)])
         await db.mcp_logs.create_index("tool_name")
         await db.mcp_logs.create_index("status")
+        await db.mcp_logs.create_index(
+            [("arguments", "text"), ("result", "text"), ("error", "text")],
+            name="mcp_logs_text",
+            default_language="none",
+            language_override="text_language"
+        )
 
         # Hook logs indexes
         await db.hook_logs.create_index("project_id")
-        await db.hook_logs.create_index([("project_id", 1), ("timestamp", -1)])
+        await db.hook_logs.create_index([("project_id", 1), ("timestamp", -1), ("_id", -1)])
         await db.hook_logs.create_index("hook_name")
         await db.hook_logs.create_index("status")
+        await db.hook_logs.create_index(
+            [("message", "text"), ("error", "text")],
+            name="hook_logs_text",
+            default_language="none",
+            language_override="text_language"
+        )
+
+        # Per-project log counters (maintained on ingest)
+        await db.log_counters.create_index([("project_id", 1), ("log_type", 1), ("generation", 1)])
 
         logger.info("Log indexes created successfully")
 
@@ -42,7 +42,10 @@ from .services.git_workflow_service import GitWorkflowService
 from .services.claude_session_service import ClaudeSessionService, SessionStatus
 from .services.real_claude_service import real_claude_service
 from .services.websocket_manager import task_websocket_manager
-from .routers import skills, mcp_configs, subagents, editor, instructions, hooks, file_browser, mcp_logs, cloud_storage, codebase_rag, memory, documentation_rag
+from .services.rag_engine import rag_engine
+from .services.indexing_jobs import indexing_jobs
+from .services.uds_listener import uds_listener
+from .routers import skills, mcp_configs, subagents, editor, instructions, hooks, file_browser, mcp_logs, cloud_storage, codebase_rag, memory, documentation_rag, embeddings, indexing_jobs as indexing_jobs_router
 from .api import claude_sessions, rag
 from .repositories.factory import RepositoryFactory
 
@@ -87,6 +90,8 @@ app.include_router(cloud_storage.router)
 app.include_router(codebase_rag.router)
 app.include_router(documentation_rag.router)
 app.include_router(memory.router)
+app.include_router(embeddings.router)
+app.include_router(indexing_jobs_router.router)
 
 
 @app.on_event("startup")
@@ -108,10 +113,26 @@ async def startup_event():
     except Exception as e:
         logger.warning(f"MongoDB initialization skipped: {e}")
 
+    # Re-queue indexing jobs interrupted by the last shutdown
+    try:
+        await indexing_jobs.resume_interrupted()
+    except Exception as e:
+        logger.warning(f"Failed to resume indexing jobs: {e}")
+
+    # Load the shared RAG model in the background so startup is not blocked
+    await rag_engine.warm_up()
+
+    # Serve co-located MCP bridges on CLAUDETASK_BACKEND_UDS, if set
+    await uds_listener.start(app)
+
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown"""
+    await uds_listener.shutdown()
+    await indexing_jobs.shutdown()
+    await rag_engine.shutdown()
+
     # Disconnect MongoDB if connected
     try:
         from .database_mongodb import mongodb_manager
@@ -127,6 +148,12 @@ async def health_check():
     return {"status": "healthy", "service": "claudetask-backend"}
 
 
+@app.get("/health/rag")
+async def rag_health_check():
+    """Readiness probe for the shared RAG engine (embedding model + ChromaDB)"""
+    return rag_engine.status()
+
+
 # Project endpoints
 @app.post("/api/projects/initialize", response_model=InitializeProjectResponse)
 async def initialize_project(
@@ -2145,21 +2172,8 @@ async def save_conversation_message(
 
         # Index in RAG asynchronously
         try:
-            # Import with absolute path from project root
-            import sys
-            from pathlib import Path
-            mcp_path = Path(__file__).parent.parent.parent / "mcp_server"
-            if str(mcp_path) not in sys.path:
-                sys.path.insert(0, str(mcp_path))
-
-            from rag.rag_service import RAGService, RAGConfig
-
-            # Initialize RAG service with centralized config path
-            rag_config = RAGConfig(
-                chromadb_path=str(config.chromadb_dir)
-            )
-            rag_service = RAGService(rag_config)
-            await rag_service.initialize()
+            # Shared process-wide RAG service (model loaded once)
+            rag_service = await rag_engine.get_service()
 
             # Index the message with full metadata
             message_metadata = {
@@ -2517,20 +2531,8 @@ async def rebuild_memory_index(
         if not messages:
             return {"status": "no_messages", "message": "No messages found to index"}
 
-        # Initialize RAG service
-        import sys
-        from pathlib import Path
-        mcp_path = Path(__file__).parent.parent.parent / "mcp_server"
-        if str(mcp_path) not in sys.path:
-            sys.path.insert(0, str(mcp_path))
-
-        from rag.rag_service import RAGService, RAGConfig
-
-        rag_config = RAGConfig(
-            chromadb_path=str(config.chromadb_dir)
-        )
-        rag_service = RAGService(rag_config)
-        await rag_service.initialize()
+        # Get shared RAG service
+        rag_service = await rag_engine.get_service()
 
         # Rebuild the index
         await rag_service.rebuild_memory_index(project_id, messages)
@@ -2606,21 +2608,8 @@ async def search_project_memories(
 
         # Try RAG service first
         try:
-            # Import with absolute path from project root
-            import sys
-            from pathlib import Path
-            mcp_path = Path(__file__).parent.parent.parent / "mcp_server"
-            if str(mcp_path) not in sys.path:
-                sys.path.insert(0, str(mcp_path))
-
-            from rag.rag_service import RAGService, RAGConfig
-
-            # Initialize RAG service with centralized config path
-            rag_config = RAGConfig(
-                chromadb_path=str(config.chromadb_dir)
-            )
-            rag_service = RAGService(rag_config)
-            await rag_service.initialize()
+            # Shared process-wide RAG service (model loaded once)
+            rag_service = await rag_engine.get_service()
 
             # Perform semantic search
             results = await rag_service.search_memories(
@@ -2853,4 +2842,5 @@ else:
 
 if __name__ == "__main__":
     import uvicorn
+    # The startup hook also listens on CLAUDETASK_BACKEND_UDS when it is set
     uvicorn.run(app, host="0.0.0.0", port=3333)
\ No newline at end of file
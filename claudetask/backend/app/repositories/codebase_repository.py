@@ -1,15 +1,59 @@
-"""Codebase repository implementations for code chunk storage and vector search"""
+"""Codebase repository implementations for code chunk storage, vector and lexical search"""
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from datetime import datetime
+from pathlib import Path
+import sys
 import logging
 import hashlib
+import json
 
 from .base import BaseRepository
 
+# Lexical index and symbol ranking live in mcp_server/retrieval, shared with the MCP bridge
+mcp_server_path = Path(__file__).parent.parent.parent.parent / "mcp_server"
+if str(mcp_server_path) not in sys.path:
+    sys.path.insert(0, str(mcp_server_path))
+
+from retrieval import (
+    LexicalIndexCache, SYMBOL_MATCH_MODES, split_symbol_query, prefix_upper_bound,
+    fuzzy_like_pattern, fuzzy_regex, rank_symbols
+)
+
 logger = logging.getLogger(__name__)
 
+# BM25 indexes of code chunks, keyed by (storage mode, project_id). Loaded on
+# the first lexical query and kept in sync by the repositories' writes.
+lexical_indexes = LexicalIndexCache()
+
+LEXICAL_FILTER_FIELDS = ("language", "chunk_type")
+
+
+def lexical_document(chunk: Dict[str, Any], chunk_id: str) -> Tuple[str, str, List[str], Dict[str, Any]]:
+    """(id, content, symbols, metadata) entry of a chunk for the lexical index"""
+    return (
+        chunk_id,
+        chunk.get("content") or "",
+        chunk.get("symbols") or [],
+        {field: chunk.get(field) for field in LEXICAL_FILTER_FIELDS}
+    )
+
+
+def lexical_filters(filters: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Search filters supported by the lexical index"""
+    return {field: filters[field] for field in LEXICAL_FILTER_FIELDS if filters and filters.get(field)}
+
+
+# Fuzzy symbol queries rank at most this many pre-filtered candidates
+SYMBOL_CANDIDATE_LIMIT = 10_000
+
+
+def check_symbol_match(match: str):
+    """Raise ValueError for an unknown symbol match mode"""
+    if match not in SYMBOL_MATCH_MODES:
+        raise ValueError(f"Unknown match mode '{match}' (expected one of {', '.join(SYMBOL_MATCH_MODES)})")
+
 
 class MongoDBCodebaseRepository(BaseRepository):
     """
@@ -20,6 +64,10 @@ class MongoDBCodebaseRepository(BaseRepository):
 
     Collection: codebase_chunks
     Index: codebase_vector_idx (must be created in Atlas)
+    Lexical index: in-process BM25 over content and symbols (lexical_indexes)
+    State collection: codebase_index_state (last indexed commit per project)
+    Symbol collection: codebase_symbols (one document per definition:
+        project_id, name, name_lower, kind, file_path, start_line, end_line, container, language)
 
     Document structure:
     {
@@ -41,6 +89,8 @@ class MongoDBCodebaseRepository(BaseRepository):
     """
 
     COLLECTION_NAME = "codebase_chunks"
+    STATE_COLLECTION_NAME = "codebase_index_state"
+    SYMBOL_COLLECTION_NAME = "codebase_symbols"
     VECTOR_INDEX_NAME = "codebase_vector_idx"
 
     def __init__(self, db: AsyncIOMotorDatabase):
@@ -52,6 +102,8 @@ class MongoDBCodebaseRepository(BaseRepository):
         """
         self._db = db
         self._collection = db[self.COLLECTION_NAME]
+        self._state_collection = db[self.STATE_COLLECTION_NAME]
+        self._symbol_collection = db[self.SYMBOL_COLLECTION_NAME]
 
     async def get_by_id(self, id: str) -> Optional[Dict[str, Any]]:
         """Retrieve code chunk by ID from MongoDB."""
@@ -166,25 +218,20 @@ class MongoDBCodebaseRepository(BaseRepository):
         Returns:
             ID of saved chunk (ObjectId as string)
         """
-        # Create deterministic chunk ID based on file path and line numbers
-        chunk_key = f"{project_id}:{file_path}:{start_line}:{end_line}"
-        chunk_id = hashlib.sha256(chunk_key.encode()).hexdigest()[:24]
-
-        doc = {
-            "chunk_id": chunk_id,
-            "project_id": project_id,
-            "file_path": file_path,
-            "content": content,
-            "embedding": embedding,
-            "start_line": start_line,
-            "end_line": end_line,
-            "language": language,
-            "chunk_type": chunk_type,
-            "symbols": symbols,
-            "summary": summary,
-            "file_hash": file_hash,
-            "indexed_at": datetime.utcnow()
-        }
+        doc = self._build_chunk_doc(
+            project_id=project_id,
+            file_path=file_path,
+            content=content,
+            embedding=embedding,
+            start_line=start_line,
+            end_line=end_line,
+            language=language,
+            chunk_type=chunk_type,
+            symbols=symbols,
+            summary=summary,
+            file_hash=file_hash
+        )
+        chunk_id = doc["chunk_id"]
 
         # Upsert: update if exists, insert if not
         result = await self._collection.update_one(
@@ -192,14 +239,81 @@ class MongoDBCodebaseRepository(BaseRepository):
             {"$set": doc},
             upsert=True
         )
+        lexical_indexes.apply(("mongodb", project_id), added=[lexical_document(doc, chunk_id)])
 
         return chunk_id
 
+    async def save_chunks_bulk(
+        self,
+        chunks: List[Dict[str, Any]],
+        batch_size: int = 500
+    ) -> int:
+        """
+        Save many code chunks with unordered bulk upserts.
+
+        Each chunk dict takes the same fields as save_chunk() arguments.
+        Chunks are written as UpdateOne upserts in unordered bulk_write
+        batches, so N chunks cost ceil(N / batch_size) round trips instead of N.
+
+        Args:
+            chunks: Chunk dicts (project_id, file_path, content, embedding,
+                start_line, end_line, language, chunk_type, symbols, summary, file_hash,
+                optional stable chunk_id)
+            batch_size: Operations per bulk_write call
+
+        Returns:
+            Number of chunks written (upserted + matched)
+        """
+        from pymongo import UpdateOne
+
+        written = 0
+
+        for i in range(0, len(chunks), batch_size):
+            docs = {}
+            for chunk in chunks[i:i + batch_size]:
+                doc = self._build_chunk_doc(
+                    project_id=chunk["project_id"],
+                    file_path=chunk["file_path"],
+                    content=chunk["content"],
+                    embedding=chunk["embedding"],
+                    start_line=chunk["start_line"],
+                    end_line=chunk["end_line"],
+                    language=chunk["language"],
+                    chunk_type=chunk["chunk_type"],
+                    symbols=chunk["symbols"],
+                    summary=chunk["summary"],
+                    file_hash=chunk["file_hash"],
+                    chunk_id=chunk.get("chunk_id")
+                )
+                # Same chunk twice in one batch would race in an unordered bulk - keep the last
+                docs[doc["chunk_id"]] = doc
+
+            operations = [
+                UpdateOne(
+                    {"chunk_id": doc["chunk_id"], "project_id": doc["project_id"]},
+                    {"$set": doc},
+                    upsert=True
+                )
+                for doc in docs.values()
+            ]
+
+            result = await self._collection.bulk_write(operations, ordered=False)
+            written += result.upserted_count + result.matched_count
+
+            for doc in docs.values():
+                lexical_indexes.apply(
+                    ("mongodb", doc["project_id"]), added=[lexical_document(doc, doc["chunk_id"])]
+                )
+
+        logger.debug(f"Bulk saved {written} code chunks")
+        return written
+
     async def delete_by_file(self, project_id: str, file_path: str) -> int:
         """
         Delete all chunks for a specific file.
 
-        Used when re-indexing a file or when file is deleted.
+        Used when re-indexing a file or when file is deleted. The file's
+        symbols are deleted as well.
 
         Args:
             project_id: Project ID
@@ -208,17 +322,109 @@ class MongoDBCodebaseRepository(BaseRepository):
         Returns:
             Number of deleted chunks
         """
+        key = ("mongodb", project_id)
+        if lexical_indexes.is_loaded(key):
+            removed = list(await self.get_file_chunk_positions(project_id, file_path))
+        else:
+            removed = []
+
         result = await self._collection.delete_many({
             "project_id": project_id,
             "file_path": file_path
         })
+        await self._symbol_collection.delete_many({"project_id": project_id, "file_path": file_path})
+        lexical_indexes.apply(key, removed=removed)
 
         logger.info(f"Deleted {result.deleted_count} chunks for {file_path}")
         return result.deleted_count
 
+    async def get_file_chunk_positions(self, project_id: str, file_path: str) -> Dict[str, Dict[str, int]]:
+        """
+        Get stored chunk IDs and line ranges for a file.
+
+        Used by chunk-level reindexing to decide which chunks are unchanged.
+
+        Args:
+            project_id: Project ID
+            file_path: Relative file path
+
+        Returns:
+            Dict mapping chunk_id to {"start_line", "end_line"}
+        """
+        cursor = self._collection.find(
+            {"project_id": project_id, "file_path": file_path},
+            {"_id": 0, "chunk_id": 1, "start_line": 1, "end_line": 1}
+        )
+        docs = await cursor.to_list(length=None)
+
+        return {
+            doc["chunk_id"]: {"start_line": doc.get("start_line"), "end_line": doc.get("end_line")}
+            for doc in docs
+        }
+
+    async def delete_chunks(self, project_id: str, chunk_ids: List[str]) -> int:
+        """
+        Delete specific chunks by chunk_id.
+
+        Args:
+            project_id: Project ID
+            chunk_ids: Chunk IDs to delete
+
+        Returns:
+            Number of deleted chunks
+        """
+        if not chunk_ids:
+            return 0
+
+        result = await self._collection.delete_many({
+            "project_id": project_id,
+            "chunk_id": {"$in": chunk_ids}
+        })
+        lexical_indexes.apply(("mongodb", project_id), removed=chunk_ids)
+        return result.deleted_count
+
+    async def update_chunk_positions(
+        self,
+        project_id: str,
+        updates: List[Dict[str, Any]],
+        batch_size: int = 500
+    ) -> int:
+        """
+        Refresh line numbers and file hash of unchanged chunks without re-embedding.
+
+        Args:
+            project_id: Project ID
+            updates: Dicts with chunk_id, start_line, end_line, file_hash
+            batch_size: Operations per bulk_write call
+
+        Returns:
+            Number of chunks matched
+        """
+        from pymongo import UpdateOne
+
+        matched = 0
+
+        for i in range(0, len(updates), batch_size):
+            operations = [
+                UpdateOne(
+                    {"chunk_id": update["chunk_id"], "project_id": project_id},
+                    {"$set": {
+                        "start_line": update["start_line"],
+                        "end_line": update["end_line"],
+                        "file_hash": update["file_hash"]
+                    }}
+                )
+                for update in updates[i:i + batch_size]
+            ]
+
+            result = await self._collection.bulk_write(operations, ordered=False)
+            matched += result.matched_count
+
+        return matched
+
     async def delete_by_project(self, project_id: str) -> int:
         """
-        Delete all chunks for a project.
+        Delete all chunks (and symbols) for a project.
 
         Used when re-indexing entire codebase.
 
@@ -229,6 +435,9 @@ class MongoDBCodebaseRepository(BaseRepository):
             Number of deleted chunks
         """
         result = await self._collection.delete_many({"project_id": project_id})
+        await self._state_collection.delete_one({"project_id": project_id})
+        await self._symbol_collection.delete_many({"project_id": project_id})
+        lexical_indexes.drop(("mongodb", project_id))
         logger.info(f"Deleted {result.deleted_count} chunks for project {project_id}")
         return result.deleted_count
 
@@ -236,7 +445,9 @@ class MongoDBCodebaseRepository(BaseRepository):
         """
         Get all file hashes for a project.
 
-        Used for incremental indexing to detect changed files.
+        Used for incremental indexing to detect changed files. Takes the
+        lowest hash per file, so chunks still carrying the indexer's pending
+        marker make the file look changed.
 
         Args:
             project_id: Project ID
@@ -248,7 +459,7 @@ class MongoDBCodebaseRepository(BaseRepository):
             {"$match": {"project_id": project_id}},
             {"$group": {
                 "_id": "$file_path",
-                "file_hash": {"$first": "$file_hash"}
+                "file_hash": {"$min": "$file_hash"}
             }}
         ]
 
@@ -257,6 +468,55 @@ class MongoDBCodebaseRepository(BaseRepository):
 
         return {doc["_id"]: doc["file_hash"] for doc in docs}
 
+    async def get_index_state(self, project_id: str) -> Dict[str, Any]:
+        """
+        Get change-detection state recorded by the last incremental reindex.
+
+        Args:
+            project_id: Project ID
+
+        Returns:
+            Dict with last_commit, dirty_files and file_stats (empty if never indexed)
+        """
+        doc = await self._state_collection.find_one({"project_id": project_id}, {"_id": 0})
+        if not doc:
+            return {}
+
+        # Stored as [path, mtime, size] entries - file paths contain dots, which
+        # are not safe as document keys
+        doc["file_stats"] = {
+            entry[0]: [entry[1], entry[2]] for entry in doc.get("file_stats", [])
+        }
+        return doc
+
+    async def save_index_state(
+        self,
+        project_id: str,
+        last_commit: Optional[str],
+        dirty_files: List[str],
+        file_stats: Dict[str, List[float]]
+    ) -> None:
+        """
+        Record change-detection state after an incremental reindex.
+
+        Args:
+            project_id: Project ID
+            last_commit: HEAD commit that was indexed (None outside git)
+            dirty_files: Files that differed from HEAD when indexed
+            file_stats: relative_path -> [mtime, size] for the stat pre-check
+        """
+        await self._state_collection.update_one(
+            {"project_id": project_id},
+            {"$set": {
+                "project_id": project_id,
+                "last_commit": last_commit,
+                "dirty_files": dirty_files,
+                "file_stats": [[path, stat[0], stat[1]] for path, stat in file_stats.items()],
+                "updated_at": datetime.utcnow()
+            }},
+            upsert=True
+        )
+
     async def vector_search(
         self,
         project_id: str,
@@ -357,6 +617,202 @@ class MongoDBCodebaseRepository(BaseRepository):
             # Return empty list on error (index might not exist yet)
             return []
 
+    async def _lexical_index(self, project_id: str):
+        """BM25 index of a project's chunks (loaded from the collection on first use)"""
+        async def load():
+            cursor = self._collection.find(
+                {"project_id": project_id},
+                {"_id": 0, "chunk_id": 1, "content": 1, "symbols": 1, "language": 1, "chunk_type": 1}
+            )
+            return [lexical_document(doc, doc["chunk_id"]) async for doc in cursor]
+
+        return await lexical_indexes.get(("mongodb", project_id), load)
+
+    async def _get_chunks(self, project_id: str, scores: Dict[str, float]) -> List[Dict[str, Any]]:
+        """Fetch chunks by chunk_id, in the order of scores, with the given scores"""
+        if not scores:
+            return []
+        cursor = self._collection.find(
+            {"project_id": project_id, "chunk_id": {"$in": list(scores)}},
+            {"embedding": 0}
+        )
+        docs = {doc["chunk_id"]: doc async for doc in cursor}
+        return [
+            self._doc_to_chunk({**docs[chunk_id], "score": score})
+            for chunk_id, score in scores.items() if chunk_id in docs
+        ]
+
+    async def lexical_search(
+        self,
+        project_id: str,
+        query: str,
+        limit: int = 20,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        BM25 search over chunk content and symbols (no embedding needed).
+
+        Args:
+            project_id: Project ID to search within
+            query: Free text or identifiers
+            limit: Maximum number of results
+            filters: Optional metadata filters (language, chunk_type)
+
+        Returns:
+            List of matching chunks with BM25 scores
+        """
+        index = await self._lexical_index(project_id)
+        hits = index.search(query, k=limit, filters=lexical_filters(filters))
+        return await self._get_chunks(project_id, dict(hits))
+
+    async def find_symbol(
+        self,
+        project_id: str,
+        symbol: str,
+        limit: int = 20,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Chunks defining a symbol (exact name, case-insensitive; exact case first).
+
+        Args:
+            project_id: Project ID to search within
+            symbol: Function or class name
+            limit: Maximum number of results
+            filters: Optional metadata filters (language, chunk_type)
+
+        Returns:
+            List of matching chunks with score 1.0
+        """
+        index = await self._lexical_index(project_id)
+        chunk_ids = index.lookup_symbol(symbol, filters=lexical_filters(filters))[:limit]
+        return await self._get_chunks(project_id, {chunk_id: 1.0 for chunk_id in chunk_ids})
+
+    # ==================
+    # Symbol table
+    # ==================
+
+    async def replace_file_symbols(
+        self,
+        project_id: str,
+        file_path: str,
+        language: str,
+        symbols: List[Dict[str, Any]]
+    ) -> int:
+        """
+        Replace the symbol definitions of a file.
+
+        Args:
+            project_id: Project ID
+            file_path: Relative file path
+            language: Programming language
+            symbols: Dicts with name, kind, start_line, end_line and optional container
+
+        Returns:
+            Number of symbols stored
+        """
+        await self._symbol_collection.delete_many({"project_id": project_id, "file_path": file_path})
+        if not symbols:
+            return 0
+
+        await self._symbol_collection.insert_many([
+            {
+                "project_id": project_id,
+                "name": symbol["name"],
+                "name_lower": symbol["name"].lower(),
+                "kind": symbol["kind"],
+                "file_path": file_path,
+                "start_line": symbol["start_line"],
+                "end_line": symbol["end_line"],
+                "container": symbol.get("container"),
+                "language": language
+            }
+            for symbol in symbols
+        ], ordered=False)
+        return len(symbols)
+
+    async def seed_symbols_from_chunks(self, project_id: str) -> int:
+        """
+        Fill the symbol table from stored chunk symbols (projects indexed
+        before the symbol table existed). Line ranges are those of the chunks.
+
+        Returns:
+            Number of symbols stored
+        """
+        cursor = self._collection.find(
+            {"project_id": project_id, "symbols.0": {"$exists": True}},
+            {"_id": 0, "file_path": 1, "language": 1, "chunk_type": 1, "start_line": 1, "end_line": 1, "symbols": 1}
+        )
+        by_file: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        async for doc in cursor:
+            symbols = by_file.setdefault((doc["file_path"], doc.get("language")), [])
+            symbols.extend(
+                {"name": name, "kind": doc.get("chunk_type"), "start_line": doc["start_line"], "end_line": doc["end_line"]}
+                for name in doc["symbols"] if name
+            )
+
+        seeded = 0
+        for (file_path, language), symbols in by_file.items():
+            seeded += await self.replace_file_symbols(project_id, file_path, language, symbols)
+        logger.info(f"Seeded {seeded} symbols from chunks for project {project_id}")
+        return seeded
+
+    async def count_symbols(self, project_id: str) -> int:
+        """Number of symbol definitions of a project"""
+        return await self._symbol_collection.count_documents({"project_id": project_id})
+
+    async def search_symbols(
+        self,
+        project_id: str,
+        query: str,
+        match: str = "fuzzy",
+        kind: Optional[str] = None,
+        language: Optional[str] = None,
+        limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """
+        Find symbol definitions by name.
+
+        Args:
+            project_id: Project ID
+            query: Symbol name, prefix or abbreviation ("Class.method" looks up "method",
+                   ranking methods of Class first)
+            match: "exact" (case-insensitive), "prefix" or "fuzzy" (characters in order)
+            kind: Optional kind filter (function, class)
+            language: Optional language filter
+            limit: Maximum number of results
+
+        Returns:
+            Definitions (name, kind, file_path, start_line, end_line, container, language, score),
+            best first
+
+        Raises:
+            ValueError: If match is unknown
+        """
+        check_symbol_match(match)
+        name, container = split_symbol_query(query)
+        if not name:
+            return []
+
+        lower = name.lower()
+        if match == "exact":
+            name_filter: Any = lower
+        elif match == "prefix":
+            name_filter = {"$gte": lower, "$lt": prefix_upper_bound(lower)}
+        else:
+            name_filter = {"$regex": fuzzy_regex(lower)}
+
+        query_filter: Dict[str, Any] = {"project_id": project_id, "name_lower": name_filter}
+        if kind:
+            query_filter["kind"] = kind
+        if language:
+            query_filter["language"] = language
+
+        cursor = self._symbol_collection.find(
+            query_filter, {"_id": 0, "project_id": 0, "name_lower": 0}
+        ).limit(SYMBOL_CANDIDATE_LIMIT)
+        return rank_symbols(name, await cursor.to_list(length=None), match, limit, container)
+
     async def get_indexed_files(self, project_id: str) -> List[str]:
         """
         Get list of all indexed files for a project.
@@ -410,10 +866,13 @@ class MongoDBCodebaseRepository(BaseRepository):
         cursor = self._collection.aggregate(pipeline)
         result = await cursor.to_list(length=1)
 
+        total_symbols = await self.count_symbols(project_id)
+
         if not result:
             return {
                 "total_chunks": 0,
                 "total_files": 0,
+                "total_symbols": total_symbols,
                 "by_language": {},
                 "by_chunk_type": {}
             }
@@ -423,6 +882,7 @@ class MongoDBCodebaseRepository(BaseRepository):
         return {
             "total_chunks": data["total"][0]["count"] if data["total"] else 0,
             "total_files": data["files"][0]["count"] if data["files"] else 0,
+            "total_symbols": total_symbols,
             "by_language": {item["_id"]: item["count"] for item in data["by_language"]},
             "by_chunk_type": {item["_id"]: item["count"] for item in data["by_chunk_type"]}
         }
@@ -445,6 +905,12 @@ class MongoDBCodebaseRepository(BaseRepository):
             ("chunk_id", 1)
         ], unique=True)
 
+        await self._state_collection.create_index("project_id", unique=True)
+
+        # Symbol lookups (exact/prefix on name_lower) and per-file replacement
+        await self._symbol_collection.create_index([("project_id", 1), ("name_lower", 1)])
+        await self._symbol_collection.create_index([("project_id", 1), ("file_path", 1)])
+
         # Index for language/type filtering
         await self._collection.create_index([
             ("project_id", 1),
@@ -454,6 +920,43 @@ class MongoDBCodebaseRepository(BaseRepository):
 
         logger.info("Codebase indexes created")
 
+    def _build_chunk_doc(
+        self,
+        project_id: str,
+        file_path: str,
+        content: str,
+        embedding: List[float],
+        start_line: int,
+        end_line: int,
+        language: str,
+        chunk_type: str,
+        symbols: List[str],
+        summary: str,
+        file_hash: str,
+        chunk_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Build the stored chunk document with its deterministic chunk_id."""
+        if chunk_id is None:
+            # Fall back to an ID based on file path and line numbers
+            chunk_key = f"{project_id}:{file_path}:{start_line}:{end_line}"
+            chunk_id = hashlib.sha256(chunk_key.encode()).hexdigest()[:24]
+
+        return {
+            "chunk_id": chunk_id,
+            "project_id": project_id,
+            "file_path": file_path,
+            "content": content,
+            "embedding": embedding,
+            "start_line": start_line,
+            "end_line": end_line,
+            "language": language,
+            "chunk_type": chunk_type,
+            "symbols": symbols,
+            "summary": summary,
+            "file_hash": file_hash,
+            "indexed_at": datetime.utcnow()
+        }
+
     def _chunk_to_doc(self, chunk: Any) -> Dict[str, Any]:
         """Convert chunk to MongoDB document."""
         if isinstance(chunk, dict):
@@ -492,3 +995,543 @@ class MongoDBCodebaseRepository(BaseRepository):
             "indexed_at": doc.get("indexed_at"),
             "score": doc.get("score")  # Similarity score from vector search
         }
+
+
+class SQLiteCodebaseRepository(BaseRepository):
+    """
+    Local implementation of codebase repository for projects without MongoDB Atlas.
+
+    Chunks are stored in the local vector store (SQLite) with all-MiniLM-L6-v2
+    embeddings (384d) and searched in-process (NumPy exact scan, HNSW for
+    large projects). Same interface and result format as MongoDBCodebaseRepository.
+
+    Table: code_chunks
+    State table: code_index_state
+    Symbol table: code_symbols
+    """
+
+    TABLE_NAME = "code_chunks"
+    STATE_TABLE_NAME = "code_index_state"
+    SYMBOL_TABLE_NAME = "code_symbols"
+
+    def __init__(self, store):
+        """
+        Initialize local codebase repository.
+
+        Args:
+            store: LocalVectorStore instance
+        """
+        self._store = store
+
+    async def get_by_id(self, id: str) -> Optional[Dict[str, Any]]:
+        """Retrieve code chunk by chunk_id."""
+        row = await self._store.run(lambda conn: conn.execute(
+            f"SELECT * FROM {self.TABLE_NAME} WHERE chunk_id = ?", (id,)
+        ).fetchone())
+        return self._row_to_chunk(row) if row else None
+
+    async def create(self, entity: Any) -> str:
+        """Create new code chunk."""
+        chunk = self._entity_to_chunk(entity)
+        await self.save_chunks_bulk([chunk])
+        return self._chunk_id(chunk)
+
+    async def update(self, entity: Any) -> None:
+        """Update code chunk."""
+        await self.save_chunks_bulk([self._entity_to_chunk(entity)])
+
+    async def delete(self, id: str) -> None:
+        """Delete code chunk by chunk_id."""
+        row = await self.get_by_id(id)
+        if row:
+            await self.delete_chunks(row["project_id"], [id])
+
+    async def list(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """List code chunks."""
+        where, params = self._where(filters)
+        rows = await self._store.run(lambda conn: conn.execute(
+            f"SELECT * FROM {self.TABLE_NAME} WHERE {where} ORDER BY file_path, start_line LIMIT ? OFFSET ?",
+            (*params, limit, skip)
+        ).fetchall())
+        return [self._row_to_chunk(row) for row in rows]
+
+    async def count(self, filters: Optional[Dict[str, Any]] = None) -> int:
+        """Count code chunks."""
+        where, params = self._where(filters)
+        return await self._store.run(lambda conn: conn.execute(
+            f"SELECT COUNT(*) FROM {self.TABLE_NAME} WHERE {where}", params
+        ).fetchone()[0])
+
+    async def save_chunks_bulk(
+        self,
+        chunks: List[Dict[str, Any]],
+        batch_size: int = 500
+    ) -> int:
+        """
+        Save many code chunks (upsert by chunk_id) in one transaction.
+
+        Args:
+            chunks: Chunk dicts as for MongoDBCodebaseRepository.save_chunks_bulk()
+            batch_size: Unused (kept for interface compatibility)
+
+        Returns:
+            Number of chunks written
+        """
+        if not chunks:
+            return 0
+
+        now = datetime.utcnow().isoformat()
+        rows = {}
+        for chunk in chunks:
+            chunk_id = self._chunk_id(chunk)
+            # Same chunk twice in one call - keep the last, as the MongoDB bulk does
+            rows[chunk_id] = (
+                chunk["project_id"], chunk_id, chunk["file_path"], chunk["content"],
+                chunk["start_line"], chunk["end_line"], chunk["language"], chunk["chunk_type"],
+                json.dumps(chunk.get("symbols") or []), chunk.get("summary") or "",
+                chunk["file_hash"], now, self._store.pack(chunk["embedding"])
+            )
+
+        await self._store.run(lambda conn: conn.executemany(
+            f"INSERT OR REPLACE INTO {self.TABLE_NAME} "
+            "(project_id, chunk_id, file_path, content, start_line, end_line, language, "
+            "chunk_type, symbols, summary, file_hash, indexed_at, embedding) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            list(rows.values())
+        ))
+
+        by_project: Dict[str, Dict[str, List[float]]] = {}
+        for chunk in chunks:
+            by_project.setdefault(chunk["project_id"], {})[self._chunk_id(chunk)] = chunk["embedding"]
+        for project_id, vectors in by_project.items():
+            await self._store.index_add(self.TABLE_NAME, project_id, list(vectors), list(vectors.values()))
+        for chunk in chunks:
+            lexical_indexes.apply(
+                ("local", chunk["project_id"]), added=[lexical_document(chunk, self._chunk_id(chunk))]
+            )
+
+        logger.debug(f"Bulk saved {len(rows)} code chunks (local)")
+        return len(rows)
+
+    async def delete_by_file(self, project_id: str, file_path: str) -> int:
+        """Delete all chunks and symbols for a specific file."""
+        chunk_ids = list(await self.get_file_chunk_positions(project_id, file_path))
+        deleted = await self.delete_chunks(project_id, chunk_ids)
+        await self.replace_file_symbols(project_id, file_path, None, [])
+        logger.info(f"Deleted {deleted} chunks for {file_path}")
+        return deleted
+
+    async def get_file_chunk_positions(self, project_id: str, file_path: str) -> Dict[str, Dict[str, int]]:
+        """Get stored chunk IDs and line ranges for a file."""
+        rows = await self._store.run(lambda conn: conn.execute(
+            f"SELECT chunk_id, start_line, end_line FROM {self.TABLE_NAME} "
+            "WHERE project_id = ? AND file_path = ?",
+            (project_id, file_path)
+        ).fetchall())
+        return {
+            row["chunk_id"]: {"start_line": row["start_line"], "end_line": row["end_line"]}
+            for row in rows
+        }
+
+    async def delete_chunks(self, project_id: str, chunk_ids: List[str]) -> int:
+        """Delete specific chunks by chunk_id."""
+        if not chunk_ids:
+            return 0
+
+        deleted = await self._store.run(lambda conn: conn.executemany(
+            f"DELETE FROM {self.TABLE_NAME} WHERE project_id = ? AND chunk_id = ?",
+            [(project_id, chunk_id) for chunk_id in chunk_ids]
+        ).rowcount)
+        await self._store.index_remove(self.TABLE_NAME, project_id, chunk_ids)
+        lexical_indexes.apply(("local", project_id), removed=chunk_ids)
+        return deleted
+
+    async def update_chunk_positions(
+        self,
+        project_id: str,
+        updates: List[Dict[str, Any]],
+        batch_size: int = 500
+    ) -> int:
+        """Refresh line numbers and file hash of unchanged chunks without re-embedding."""
+        if not updates:
+            return 0
+
+        return await self._store.run(lambda conn: conn.executemany(
+            f"UPDATE {self.TABLE_NAME} SET start_line = ?, end_line = ?, file_hash = ? "
+            "WHERE project_id = ? AND chunk_id = ?",
+            [
+                (update["start_line"], update["end_line"], update["file_hash"], project_id, update["chunk_id"])
+                for update in updates
+            ]
+        ).rowcount)
+
+    async def delete_by_project(self, project_id: str) -> int:
+        """Delete all chunks, symbols and the index state of a project."""
+        def delete(conn):
+            deleted = conn.execute(
+                f"DELETE FROM {self.TABLE_NAME} WHERE project_id = ?", (project_id,)
+            ).rowcount
+            conn.execute(f"DELETE FROM {self.STATE_TABLE_NAME} WHERE project_id = ?", (project_id,))
+            conn.execute(f"DELETE FROM {self.SYMBOL_TABLE_NAME} WHERE project_id = ?", (project_id,))
+            return deleted
+
+        deleted = await self._store.run(delete)
+        await self._store.index_drop(self.TABLE_NAME, project_id)
+        lexical_indexes.drop(("local", project_id))
+        logger.info(f"Deleted {deleted} chunks for project {project_id}")
+        return deleted
+
+    async def get_file_hashes(self, project_id: str) -> Dict[str, str]:
+        """Get all file hashes for a project."""
+        rows = await self._store.run(lambda conn: conn.execute(
+            f"SELECT file_path, MIN(file_hash) AS file_hash FROM {self.TABLE_NAME} "
+            "WHERE project_id = ? GROUP BY file_path",
+            (project_id,)
+        ).fetchall())
+        return {row["file_path"]: row["file_hash"] for row in rows}
+
+    async def get_index_state(self, project_id: str) -> Dict[str, Any]:
+        """Get change-detection state recorded by the last incremental reindex."""
+        row = await self._store.run(lambda conn: conn.execute(
+            f"SELECT * FROM {self.STATE_TABLE_NAME} WHERE project_id = ?", (project_id,)
+        ).fetchone())
+        if not row:
+            return {}
+
+        return {
+            "project_id": project_id,
+            "last_commit": row["last_commit"],
+            "dirty_files": json.loads(row["dirty_files"] or "[]"),
+            "file_stats": json.loads(row["file_stats"] or "{}"),
+            "updated_at": row["updated_at"]
+        }
+
+    async def save_index_state(
+        self,
+        project_id: str,
+        last_commit: Optional[str],
+        dirty_files: List[str],
+        file_stats: Dict[str, List[float]]
+    ) -> None:
+        """Record change-detection state after an incremental reindex."""
+        await self._store.run(lambda conn: conn.execute(
+            f"INSERT OR REPLACE INTO {self.STATE_TABLE_NAME} "
+            "(project_id, last_commit, dirty_files, file_stats, updated_at) VALUES (?, ?, ?, ?, ?)",
+            (project_id, last_commit, json.dumps(dirty_files), json.dumps(file_stats), datetime.utcnow().isoformat())
+        ))
+
+    async def vector_search(
+        self,
+        project_id: str,
+        query_embedding: List[float],
+        limit: int = 20,
+        min_similarity: float = 0.0,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Semantic search over the project's chunks with the local vector index.
+
+        Args:
+            project_id: Project ID to search within
+            query_embedding: Query vector (384d from all-MiniLM-L6-v2)
+            limit: Maximum number of results
+            min_similarity: Minimum similarity threshold (0.0-1.0)
+            filters: Optional metadata filters (language, chunk_type)
+
+        Returns:
+            List of matching chunks with similarity scores
+        """
+        allow = None
+        if filters and ("language" in filters or "chunk_type" in filters):
+            where, params = self._where({"project_id": project_id, **filters})
+            allowed = {
+                row[0] for row in await self._store.run(lambda conn: conn.execute(
+                    f"SELECT chunk_id FROM {self.TABLE_NAME} WHERE {where}", params
+                ).fetchall())
+            }
+            allow = allowed.__contains__
+
+        hits = await self._store.search(
+            self.TABLE_NAME, project_id, query_embedding, k=limit * 2, allow=allow
+        )
+        hits = [(chunk_id, score) for chunk_id, score in hits if score >= min_similarity]
+        if not hits:
+            return []
+
+        scores = dict(hits)
+        placeholders = ",".join("?" * len(scores))
+        rows = await self._store.run(lambda conn: conn.execute(
+            f"SELECT * FROM {self.TABLE_NAME} WHERE project_id = ? AND chunk_id IN ({placeholders})",
+            (project_id, *scores)
+        ).fetchall())
+        chunks = sorted(
+            (self._row_to_chunk(row, score=scores[row["chunk_id"]]) for row in rows),
+            key=lambda chunk: chunk["score"],
+            reverse=True
+        )
+
+        # Deduplicate by file_path + line range
+        seen = set()
+        unique_results = []
+        for chunk in chunks:
+            key = (chunk["file_path"], chunk["start_line"], chunk["end_line"])
+            if key not in seen:
+                seen.add(key)
+                unique_results.append(chunk)
+
+        logger.info(f"Local vector search returned {len(unique_results[:limit])} results for project {project_id}")
+        return unique_results[:limit]
+
+    async def _lexical_index(self, project_id: str):
+        """BM25 index of a project's chunks (loaded from the table on first use)"""
+        async def load():
+            rows = await self._store.run(lambda conn: conn.execute(
+                f"SELECT chunk_id, content, symbols, language, chunk_type FROM {self.TABLE_NAME} "
+                "WHERE project_id = ?",
+                (project_id,)
+            ).fetchall())
+            return [
+                lexical_document({**dict(row), "symbols": json.loads(row["symbols"] or "[]")}, row["chunk_id"])
+                for row in rows
+            ]
+
+        return await lexical_indexes.get(("local", project_id), load)
+
+    async def _get_chunks(self, project_id: str, scores: Dict[str, float]) -> List[Dict[str, Any]]:
+        """Fetch chunks by chunk_id, in the order of scores, with the given scores"""
+        if not scores:
+            return []
+        placeholders = ",".join("?" * len(scores))
+        rows = await self._store.run(lambda conn: conn.execute(
+            f"SELECT * FROM {self.TABLE_NAME} WHERE project_id = ? AND chunk_id IN ({placeholders})",
+            (project_id, *scores)
+        ).fetchall())
+        by_id = {row["chunk_id"]: row for row in rows}
+        return [
+            self._row_to_chunk(by_id[chunk_id], score=score)
+            for chunk_id, score in scores.items() if chunk_id in by_id
+        ]
+
+    async def lexical_search(
+        self,
+        project_id: str,
+        query: str,
+        limit: int = 20,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """BM25 search over chunk content and symbols (see MongoDBCodebaseRepository.lexical_search)."""
+        index = await self._lexical_index(project_id)
+        hits = index.search(query, k=limit, filters=lexical_filters(filters))
+        return await self._get_chunks(project_id, dict(hits))
+
+    async def find_symbol(
+        self,
+        project_id: str,
+        symbol: str,
+        limit: int = 20,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Chunks defining a symbol (see MongoDBCodebaseRepository.find_symbol)."""
+        index = await self._lexical_index(project_id)
+        chunk_ids = index.lookup_symbol(symbol, filters=lexical_filters(filters))[:limit]
+        return await self._get_chunks(project_id, {chunk_id: 1.0 for chunk_id in chunk_ids})
+
+    async def replace_file_symbols(
+        self,
+        project_id: str,
+        file_path: str,
+        language: Optional[str],
+        symbols: List[Dict[str, Any]]
+    ) -> int:
+        """Replace the symbol definitions of a file (see MongoDBCodebaseRepository.replace_file_symbols)."""
+        def replace(conn):
+            conn.execute(
+                f"DELETE FROM {self.SYMBOL_TABLE_NAME} WHERE project_id = ? AND file_path = ?",
+                (project_id, file_path)
+            )
+            conn.executemany(
+                f"INSERT INTO {self.SYMBOL_TABLE_NAME} "
+                "(project_id, name, name_lower, kind, file_path, start_line, end_line, container, language) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        project_id, symbol["name"], symbol["name"].lower(), symbol["kind"], file_path,
+                        symbol["start_line"], symbol["end_line"], symbol.get("container"), language
+                    )
+                    for symbol in symbols
+                ]
+            )
+
+        await self._store.run(replace)
+        return len(symbols)
+
+    async def seed_symbols_from_chunks(self, project_id: str) -> int:
+        """Fill the symbol table from stored chunk symbols (see MongoDBCodebaseRepository.seed_symbols_from_chunks)."""
+        def seed(conn):
+            rows = conn.execute(
+                f"SELECT file_path, language, chunk_type, start_line, end_line, symbols FROM {self.TABLE_NAME} "
+                "WHERE project_id = ? AND symbols != '[]'",
+                (project_id,)
+            ).fetchall()
+            records = [
+                (project_id, name, name.lower(), row["chunk_type"], row["file_path"],
+                 row["start_line"], row["end_line"], None, row["language"])
+                for row in rows
+                for name in json.loads(row["symbols"] or "[]") if name
+            ]
+            conn.execute(f"DELETE FROM {self.SYMBOL_TABLE_NAME} WHERE project_id = ?", (project_id,))
+            conn.executemany(
+                f"INSERT INTO {self.SYMBOL_TABLE_NAME} "
+                "(project_id, name, name_lower, kind, file_path, start_line, end_line, container, language) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                records
+            )
+            return len(records)
+
+        seeded = await self._store.run(seed)
+        logger.info(f"Seeded {seeded} symbols from chunks for project {project_id}")
+        return seeded
+
+    async def count_symbols(self, project_id: str) -> int:
+        """Number of symbol definitions of a project"""
+        return await self._store.run(lambda conn: conn.execute(
+            f"SELECT COUNT(*) FROM {self.SYMBOL_TABLE_NAME} WHERE project_id = ?", (project_id,)
+        ).fetchone()[0])
+
+    async def search_symbols(
+        self,
+        project_id: str,
+        query: str,
+        match: str = "fuzzy",
+        kind: Optional[str] = None,
+        language: Optional[str] = None,
+        limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """Find symbol definitions by name (see MongoDBCodebaseRepository.search_symbols)."""
+        check_symbol_match(match)
+        name, container = split_symbol_query(query)
+        if not name:
+            return []
+
+        lower = name.lower()
+        if match == "exact":
+            clauses, params = ["name_lower = ?"], [lower]
+        elif match == "prefix":
+            clauses, params = ["name_lower >= ?", "name_lower < ?"], [lower, prefix_upper_bound(lower)]
+        else:
+            clauses, params = ["name_lower LIKE ? ESCAPE '\\'"], [fuzzy_like_pattern(lower)]
+        if kind:
+            clauses.append("kind = ?")
+            params.append(kind)
+        if language:
+            clauses.append("language = ?")
+            params.append(language)
+
+        rows = await self._store.run(lambda conn: conn.execute(
+            "SELECT name, kind, file_path, start_line, end_line, container, language "
+            f"FROM {self.SYMBOL_TABLE_NAME} WHERE project_id = ? AND {' AND '.join(clauses)} LIMIT ?",
+            (project_id, *params, SYMBOL_CANDIDATE_LIMIT)
+        ).fetchall())
+        return rank_symbols(name, [dict(row) for row in rows], match, limit, container)
+
+    async def get_indexed_files(self, project_id: str) -> List[str]:
+        """Get list of all indexed files for a project."""
+        rows = await self._store.run(lambda conn: conn.execute(
+            f"SELECT DISTINCT file_path FROM {self.TABLE_NAME} WHERE project_id = ? ORDER BY file_path",
+            (project_id,)
+        ).fetchall())
+        return [row[0] for row in rows]
+
+    async def get_stats(self, project_id: str) -> Dict[str, Any]:
+        """Get indexing statistics for a project."""
+        def query(conn):
+            total, files = conn.execute(
+                f"SELECT COUNT(*), COUNT(DISTINCT file_path) FROM {self.TABLE_NAME} WHERE project_id = ?",
+                (project_id,)
+            ).fetchone()
+            by_language = conn.execute(
+                f"SELECT language, COUNT(*) FROM {self.TABLE_NAME} WHERE project_id = ? "
+                "GROUP BY language ORDER BY COUNT(*) DESC",
+                (project_id,)
+            ).fetchall()
+            by_chunk_type = conn.execute(
+                f"SELECT chunk_type, COUNT(*) FROM {self.TABLE_NAME} WHERE project_id = ? "
+                "GROUP BY chunk_type ORDER BY COUNT(*) DESC",
+                (project_id,)
+            ).fetchall()
+            symbols = conn.execute(
+                f"SELECT COUNT(*) FROM {self.SYMBOL_TABLE_NAME} WHERE project_id = ?", (project_id,)
+            ).fetchone()[0]
+            return total, files, symbols, by_language, by_chunk_type
+
+        total, files, symbols, by_language, by_chunk_type = await self._store.run(query)
+        return {
+            "total_chunks": total,
+            "total_files": files,
+            "total_symbols": symbols,
+            "by_language": {row[0]: row[1] for row in by_language},
+            "by_chunk_type": {row[0]: row[1] for row in by_chunk_type}
+        }
+
+    async def ensure_indexes(self):
+        """Tables and indexes are created with the local vector store"""
+
+    @staticmethod
+    def _chunk_id(chunk: Dict[str, Any]) -> str:
+        """Stable chunk_id, derived like MongoDBCodebaseRepository._build_chunk_doc()"""
+        if chunk.get("chunk_id"):
+            return chunk["chunk_id"]
+        chunk_key = f"{chunk['project_id']}:{chunk['file_path']}:{chunk['start_line']}:{chunk['end_line']}"
+        return hashlib.sha256(chunk_key.encode()).hexdigest()[:24]
+
+    @staticmethod
+    def _entity_to_chunk(entity: Any) -> Dict[str, Any]:
+        if isinstance(entity, dict):
+            return entity
+        return {
+            "project_id": entity.project_id,
+            "file_path": entity.file_path,
+            "content": entity.content,
+            "embedding": entity.embedding,
+            "start_line": entity.start_line,
+            "end_line": entity.end_line,
+            "language": entity.language,
+            "chunk_type": entity.chunk_type,
+            "symbols": entity.symbols,
+            "summary": entity.summary,
+            "file_hash": entity.file_hash
+        }
+
+    @staticmethod
+    def _where(filters: Optional[Dict[str, Any]]):
+        clauses, params = ["1=1"], []
+        for field in ("project_id", "file_path", "language", "chunk_type"):
+            if filters and field in filters:
+                clauses.append(f"{field} = ?")
+                params.append(filters[field])
+        return " AND ".join(clauses), tuple(params)
+
+    @staticmethod
+    def _row_to_chunk(row, score: Optional[float] = None) -> Dict[str, Any]:
+        """Convert a table row to the chunk dict returned by MongoDBCodebaseRepository."""
+        return {
+            "id": row["chunk_id"],
+            "chunk_id": row["chunk_id"],
+            "project_id": row["project_id"],
+            "file_path": row["file_path"],
+            "content": row["content"],
+            "start_line": row["start_line"],
+            "end_line": row["end_line"],
+            "language": row["language"],
+            "chunk_type": row["chunk_type"],
+            "symbols": json.loads(row["symbols"] or "[]"),
+            "summary": row["summary"],
+            "file_hash": row["file_hash"],
+            "indexed_at": row["indexed_at"],
+            "score": score
+        }
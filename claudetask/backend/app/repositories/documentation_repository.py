@@ -5,6 +5,7 @@ from motor.motor_asyncio import AsyncIOMotorDatabase
 from datetime import datetime
 import logging
 import hashlib
+import json
 
 from .base import BaseRepository
 
@@ -165,6 +166,70 @@ class MongoDBDocumentationRepository(BaseRepository):
         result = await self._collection.insert_one(doc)
         return str(result.inserted_id)
 
+    async def save_chunks_bulk(
+        self,
+        chunks: List[Dict[str, Any]],
+        batch_size: int = 500
+    ) -> int:
+        """
+        Save many documentation chunks with unordered bulk upserts.
+
+        Each chunk dict takes the same fields as save_chunk() arguments.
+        Chunks are keyed by a deterministic chunk_id (project, file, line range)
+        so re-saving the same section replaces it instead of duplicating it.
+
+        Args:
+            chunks: Chunk dicts (project_id, file_path, content, embedding,
+                start_line, end_line, doc_type, title, headings, summary, file_hash)
+            batch_size: Operations per bulk_write call
+
+        Returns:
+            Number of chunks written (upserted + matched)
+        """
+        from pymongo import UpdateOne
+
+        written = 0
+
+        for i in range(0, len(chunks), batch_size):
+            docs = {}
+            for chunk in chunks[i:i + batch_size]:
+                chunk_key = f"{chunk['project_id']}:{chunk['file_path']}:{chunk['start_line']}:{chunk['end_line']}"
+                chunk_id = hashlib.sha256(chunk_key.encode()).hexdigest()[:24]
+
+                doc = {
+                    "chunk_id": chunk_id,
+                    "project_id": chunk["project_id"],
+                    "file_path": chunk["file_path"],
+                    "content": chunk["content"],
+                    "embedding": chunk["embedding"],
+                    "start_line": chunk["start_line"],
+                    "end_line": chunk["end_line"],
+                    "doc_type": chunk["doc_type"],
+                    "title": chunk.get("title") or "",
+                    "headings": chunk.get("headings") or [],
+                    "summary": chunk.get("summary") or "",
+                    "file_hash": chunk.get("file_hash") or hashlib.sha256(chunk["content"].encode()).hexdigest(),
+                    "indexed_at": datetime.utcnow(),
+                    "metadata": chunk.get("metadata") or {}
+                }
+                # Same chunk twice in one batch would race in an unordered bulk - keep the last
+                docs[chunk_id] = doc
+
+            operations = [
+                UpdateOne(
+                    {"chunk_id": doc["chunk_id"], "project_id": doc["project_id"]},
+                    {"$set": doc},
+                    upsert=True
+                )
+                for doc in docs.values()
+            ]
+
+            result = await self._collection.bulk_write(operations, ordered=False)
+            written += result.upserted_count + result.matched_count
+
+        logger.debug(f"Bulk saved {written} documentation chunks")
+        return written
+
     async def delete_by_project(self, project_id: str) -> int:
         """Delete all documentation chunks for a project."""
         result = await self._collection.delete_many({"project_id": project_id})
@@ -310,6 +375,12 @@ class MongoDBDocumentationRepository(BaseRepository):
             ("doc_type", 1)
         ])
 
+        # Chunk lookup for bulk upserts
+        await self._collection.create_index([
+            ("project_id", 1),
+            ("chunk_id", 1)
+        ])
+
         # Index for file hash lookups (change detection)
         await self._collection.create_index([
             ("project_id", 1),
@@ -341,3 +412,268 @@ class MongoDBDocumentationRepository(BaseRepository):
         if isinstance(entity, dict):
             return {k: v for k, v in entity.items() if k != "id" and k != "_id"}
         return {}
+
+
+class SQLiteDocumentationRepository(BaseRepository):
+    """
+    Local implementation of documentation repository for projects without MongoDB Atlas.
+
+    Chunks are stored in the local vector store (SQLite) with all-MiniLM-L6-v2
+    embeddings (384d) and searched in-process. Same interface and result
+    format as MongoDBDocumentationRepository.
+
+    Table: doc_chunks
+    """
+
+    TABLE_NAME = "doc_chunks"
+
+    def __init__(self, store):
+        """
+        Initialize local documentation repository.
+
+        Args:
+            store: LocalVectorStore instance
+        """
+        self._store = store
+
+    async def get_by_id(self, id: str) -> Optional[Dict[str, Any]]:
+        """Retrieve documentation chunk by chunk_id."""
+        row = await self._store.run(lambda conn: conn.execute(
+            f"SELECT * FROM {self.TABLE_NAME} WHERE chunk_id = ?", (id,)
+        ).fetchone())
+        return self._row_to_chunk(row) if row else None
+
+    async def create(self, entity: Any) -> str:
+        """Create new documentation chunk."""
+        await self.save_chunks_bulk([entity])
+        return self._chunk_id(entity)
+
+    async def update(self, entity: Any) -> None:
+        """Update documentation chunk."""
+        await self.save_chunks_bulk([entity])
+
+    async def delete(self, id: str) -> None:
+        """Delete documentation chunk by chunk_id."""
+        row = await self.get_by_id(id)
+        if row:
+            await self._store.run(lambda conn: conn.execute(
+                f"DELETE FROM {self.TABLE_NAME} WHERE chunk_id = ?", (id,)
+            ))
+            await self._store.index_remove(self.TABLE_NAME, row["project_id"], [id])
+
+    async def list(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """List documentation chunks."""
+        where, params = self._where(filters)
+        rows = await self._store.run(lambda conn: conn.execute(
+            f"SELECT * FROM {self.TABLE_NAME} WHERE {where} ORDER BY file_path, start_line LIMIT ? OFFSET ?",
+            (*params, limit, skip)
+        ).fetchall())
+        return [self._row_to_chunk(row) for row in rows]
+
+    async def count(self, filters: Optional[Dict[str, Any]] = None) -> int:
+        """Count documentation chunks."""
+        where, params = self._where(filters)
+        return await self._store.run(lambda conn: conn.execute(
+            f"SELECT COUNT(*) FROM {self.TABLE_NAME} WHERE {where}", params
+        ).fetchone()[0])
+
+    async def save_chunks_bulk(
+        self,
+        chunks: List[Dict[str, Any]],
+        batch_size: int = 500
+    ) -> int:
+        """
+        Save many documentation chunks (upsert by chunk_id) in one transaction.
+
+        Args:
+            chunks: Chunk dicts as for MongoDBDocumentationRepository.save_chunks_bulk()
+            batch_size: Unused (kept for interface compatibility)
+
+        Returns:
+            Number of chunks written
+        """
+        if not chunks:
+            return 0
+
+        now = datetime.utcnow().isoformat()
+        rows = {}
+        vectors: Dict[str, Dict[str, List[float]]] = {}
+        for chunk in chunks:
+            chunk_id = self._chunk_id(chunk)
+            rows[chunk_id] = (
+                chunk["project_id"], chunk_id, chunk["file_path"], chunk["content"],
+                chunk["start_line"], chunk["end_line"], chunk["doc_type"],
+                chunk.get("title") or "", json.dumps(chunk.get("headings") or []),
+                chunk.get("summary") or "",
+                chunk.get("file_hash") or hashlib.sha256(chunk["content"].encode()).hexdigest(),
+                now, json.dumps(chunk.get("metadata") or {}), self._store.pack(chunk["embedding"])
+            )
+            vectors.setdefault(chunk["project_id"], {})[chunk_id] = chunk["embedding"]
+
+        await self._store.run(lambda conn: conn.executemany(
+            f"INSERT OR REPLACE INTO {self.TABLE_NAME} "
+            "(project_id, chunk_id, file_path, content, start_line, end_line, doc_type, title, "
+            "headings, summary, file_hash, indexed_at, metadata, embedding) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            list(rows.values())
+        ))
+        for project_id, project_vectors in vectors.items():
+            await self._store.index_add(self.TABLE_NAME, project_id, list(project_vectors), list(project_vectors.values()))
+
+        logger.debug(f"Bulk saved {len(rows)} documentation chunks (local)")
+        return len(rows)
+
+    async def delete_by_project(self, project_id: str) -> int:
+        """Delete all documentation chunks for a project."""
+        deleted = await self._store.run(lambda conn: conn.execute(
+            f"DELETE FROM {self.TABLE_NAME} WHERE project_id = ?", (project_id,)
+        ).rowcount)
+        await self._store.index_drop(self.TABLE_NAME, project_id)
+        return deleted
+
+    async def delete_by_file(self, project_id: str, file_path: str) -> int:
+        """Delete all chunks for a specific file."""
+        def delete(conn):
+            chunk_ids = [row[0] for row in conn.execute(
+                f"SELECT chunk_id FROM {self.TABLE_NAME} WHERE project_id = ? AND file_path = ?",
+                (project_id, file_path)
+            ).fetchall()]
+            conn.execute(
+                f"DELETE FROM {self.TABLE_NAME} WHERE project_id = ? AND file_path = ?",
+                (project_id, file_path)
+            )
+            return chunk_ids
+
+        chunk_ids = await self._store.run(delete)
+        await self._store.index_remove(self.TABLE_NAME, project_id, chunk_ids)
+        return len(chunk_ids)
+
+    async def get_file_hashes(self, project_id: str) -> Dict[str, str]:
+        """Get file hashes for all indexed documentation files."""
+        rows = await self._store.run(lambda conn: conn.execute(
+            f"SELECT file_path, MIN(file_hash) FROM {self.TABLE_NAME} WHERE project_id = ? GROUP BY file_path",
+            (project_id,)
+        ).fetchall())
+        return {row[0]: row[1] for row in rows}
+
+    async def vector_search(
+        self,
+        project_id: str,
+        query_embedding: List[float],
+        limit: int = 20,
+        min_similarity: float = 0.0,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Perform vector similarity search for documentation with the local vector index.
+
+        Args:
+            project_id: Project to search within
+            query_embedding: 384-dimensional query vector
+            limit: Maximum results to return
+            min_similarity: Minimum similarity threshold (0.0-1.0)
+            filters: Additional filters (doc_type)
+
+        Returns:
+            List of matching documentation chunks with similarity scores
+        """
+        allow = None
+        if filters and "doc_type" in filters:
+            allowed = {
+                row[0] for row in await self._store.run(lambda conn: conn.execute(
+                    f"SELECT chunk_id FROM {self.TABLE_NAME} WHERE project_id = ? AND doc_type = ?",
+                    (project_id, filters["doc_type"])
+                ).fetchall())
+            }
+            allow = allowed.__contains__
+
+        hits = await self._store.search(
+            self.TABLE_NAME, project_id, query_embedding, k=limit, allow=allow
+        )
+        scores = {chunk_id: score for chunk_id, score in hits if score >= min_similarity}
+        if not scores:
+            return []
+
+        placeholders = ",".join("?" * len(scores))
+        rows = await self._store.run(lambda conn: conn.execute(
+            f"SELECT * FROM {self.TABLE_NAME} WHERE project_id = ? AND chunk_id IN ({placeholders})",
+            (project_id, *scores)
+        ).fetchall())
+
+        results = []
+        for row in rows:
+            result = self._row_to_chunk(row)
+            result["_id"] = result.pop("id")
+            result["similarity_score"] = scores[row["chunk_id"]]
+            results.append(result)
+        return sorted(results, key=lambda result: result["similarity_score"], reverse=True)
+
+    async def get_stats(self, project_id: str) -> Dict[str, Any]:
+        """Get indexing statistics for a project."""
+        def query(conn):
+            total, files, last_indexed = conn.execute(
+                f"SELECT COUNT(*), COUNT(DISTINCT file_path), MAX(indexed_at) FROM {self.TABLE_NAME} "
+                "WHERE project_id = ?",
+                (project_id,)
+            ).fetchone()
+            doc_types = conn.execute(
+                f"SELECT DISTINCT doc_type FROM {self.TABLE_NAME} WHERE project_id = ?", (project_id,)
+            ).fetchall()
+            return total, files, last_indexed, [row[0] for row in doc_types]
+
+        total, files, last_indexed, doc_types = await self._store.run(query)
+        return {
+            "total_chunks": total,
+            "unique_files": files,
+            "doc_types": doc_types,
+            "last_indexed": last_indexed
+        }
+
+    async def get_indexed_files(self, project_id: str) -> List[str]:
+        """Get list of all indexed documentation files."""
+        rows = await self._store.run(lambda conn: conn.execute(
+            f"SELECT DISTINCT file_path FROM {self.TABLE_NAME} WHERE project_id = ? ORDER BY file_path",
+            (project_id,)
+        ).fetchall())
+        return [row[0] for row in rows]
+
+    async def ensure_indexes(self):
+        """Tables and indexes are created with the local vector store"""
+
+    @staticmethod
+    def _chunk_id(chunk: Dict[str, Any]) -> str:
+        """Deterministic chunk_id, as in MongoDBDocumentationRepository.save_chunks_bulk()"""
+        chunk_key = f"{chunk['project_id']}:{chunk['file_path']}:{chunk['start_line']}:{chunk['end_line']}"
+        return hashlib.sha256(chunk_key.encode()).hexdigest()[:24]
+
+    @staticmethod
+    def _where(filters: Optional[Dict[str, Any]]):
+        clauses, params = ["1=1"], []
+        for field in ("project_id", "file_path", "doc_type"):
+            if filters and field in filters:
+                clauses.append(f"{field} = ?")
+                params.append(filters[field])
+        return " AND ".join(clauses), tuple(params)
+
+    @staticmethod
+    def _row_to_chunk(row) -> Dict[str, Any]:
+        """Convert a table row to the chunk dict returned by MongoDBDocumentationRepository."""
+        return {
+            "id": row["chunk_id"],
+            "project_id": row["project_id"],
+            "file_path": row["file_path"],
+            "content": row["content"],
+            "start_line": row["start_line"],
+            "end_line": row["end_line"],
+            "doc_type": row["doc_type"],
+            "title": row["title"],
+            "headings": json.loads(row["headings"] or "[]"),
+            "summary": row["summary"],
+            "file_hash": row["file_hash"],
+            "indexed_at": row["indexed_at"]
+        }
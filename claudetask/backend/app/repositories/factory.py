@@ -8,7 +8,7 @@ from .base import BaseRepository
 from .project_repository import SQLiteProjectRepository, MongoDBProjectRepository
 from .task_repository import SQLiteTaskRepository, MongoDBTaskRepository
 from .memory_repository import SQLiteMemoryRepository, MongoDBMemoryRepository
-from .codebase_repository import MongoDBCodebaseRepository
+from .codebase_repository import MongoDBCodebaseRepository, SQLiteCodebaseRepository
 from .skill_repository import MongoDBSkillRepository
 from .hook_repository import MongoDBHookRepository
 from .mcp_config_repository import MongoDBMCPConfigRepository
@@ -203,19 +203,18 @@ class RepositoryFactory:
     async def get_codebase_repository(
         project_id: str,
         db: Optional[AsyncSession] = None
-    ) -> Optional[MongoDBCodebaseRepository]:
+    ) -> Union[SQLiteCodebaseRepository, MongoDBCodebaseRepository]:
         """
-        Get codebase repository for MongoDB storage mode.
+        Get codebase repository based on project's storage mode.
 
-        Note: Codebase repository only available for MongoDB mode.
-        For local mode, use the existing ChromaDB-based RAG service.
+        Local projects use the local vector store (local_vectors.db).
 
         Args:
             project_id: Project ID to determine storage mode
             db: SQLAlchemy async session
 
         Returns:
-            MongoDBCodebaseRepository if MongoDB mode, None for local mode
+            Appropriate codebase repository implementation
 
         Raises:
             ValueError: If MongoDB not connected
@@ -231,8 +230,8 @@ class RepositoryFactory:
             mongodb = mongodb_manager.get_database()
             return MongoDBCodebaseRepository(mongodb)
 
-        # Return None for local mode - caller should use ChromaDB RAG
-        return None
+        from .local_vector_store import get_local_vector_store
+        return SQLiteCodebaseRepository(get_local_vector_store())
 
     @staticmethod
     async def get_skill_repository() -> MongoDBSkillRepository:
@@ -0,0 +1,401 @@
+"""Local (offline) vector storage for projects without MongoDB Atlas"""
+
+import sys
+import json
+import sqlite3
+import asyncio
+import logging
+import threading
+from array import array
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# EmbeddingStore and VectorIndex live in mcp_server/embeddings, shared with the MCP bridge
+mcp_server_path = Path(__file__).parent.parent.parent.parent / "mcp_server"
+if str(mcp_server_path) not in sys.path:
+    sys.path.insert(0, str(mcp_server_path))
+
+
+class LocalVectorStore:
+    """
+    SQLite file holding local code chunks and symbols, documentation chunks and memory
+    vectors, plus memory-mapped embedding stores for searching them.
+
+    Rows (including float32 embedding blobs) are the source of truth. Each
+    (table, project) has an EmbeddingStore (append-only float32 file) that
+    the repositories' writes are applied to, so queries never touch the
+    blobs. A store whose vector count disagrees with its table is rebuilt
+    from the blobs when opened. Past hnsw_threshold vectors (and with
+    hnswlib installed) an in-memory HNSW VectorIndex answers unfiltered
+    queries instead of the exact scan.
+
+    Usage:
+        store = get_local_vector_store()
+        rows = await store.run(lambda conn: conn.execute("SELECT ...").fetchall())
+        hits = await store.search("code_chunks", project_id, query_vector, k=20)
+    """
+
+    # ID column of each vector table
+    ID_COLUMNS = {
+        "code_chunks": "chunk_id",
+        "doc_chunks": "chunk_id",
+        "memory_vectors": "message_id",
+    }
+
+    def __init__(self, db_path: str, vectors_dir: Optional[str] = None, hnsw_threshold: int = 50_000):
+        """
+        Open (or create) the store.
+
+        Args:
+            db_path: SQLite file path
+            vectors_dir: Directory of the embedding stores (default: "local_vectors" next to db_path)
+            hnsw_threshold: Vectors per index from which HNSW is used (if installed)
+        """
+        self.db_path = str(db_path)
+        self.vectors_dir = Path(vectors_dir) if vectors_dir else Path(self.db_path).parent / "local_vectors"
+        self.hnsw_threshold = hnsw_threshold
+        self._lock = threading.RLock()
+        self._stores: Dict[Tuple[str, str], Any] = {}
+        self._hnsw: Dict[Tuple[str, str], Any] = {}
+
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+    def _create_schema(self):
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS code_chunks (
+                project_id TEXT NOT NULL,
+                chunk_id TEXT NOT NULL,
+                file_path TEXT NOT NULL,
+                content TEXT NOT NULL,
+                start_line INTEGER,
+                end_line INTEGER,
+                language TEXT,
+                chunk_type TEXT,
+                symbols TEXT,
+                summary TEXT,
+                file_hash TEXT,
+                indexed_at TEXT,
+                embedding BLOB NOT NULL,
+                PRIMARY KEY (project_id, chunk_id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_code_chunks_file ON code_chunks(project_id, file_path);
+
+            CREATE TABLE IF NOT EXISTS code_index_state (
+                project_id TEXT PRIMARY KEY,
+                last_commit TEXT,
+                dirty_files TEXT,
+                file_stats TEXT,
+                updated_at TEXT
+            );
+
+            CREATE TABLE IF NOT EXISTS code_symbols (
+                project_id TEXT NOT NULL,
+                name TEXT NOT NULL,
+                name_lower TEXT NOT NULL,
+                kind TEXT,
+                file_path TEXT NOT NULL,
+                start_line INTEGER,
+                end_line INTEGER,
+                container TEXT,
+                language TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_code_symbols_name ON code_symbols(project_id, name_lower);
+            CREATE INDEX IF NOT EXISTS idx_code_symbols_file ON code_symbols(project_id, file_path);
+
+            CREATE TABLE IF NOT EXISTS doc_chunks (
+                project_id TEXT NOT NULL,
+                chunk_id TEXT NOT NULL,
+                file_path TEXT NOT NULL,
+                content TEXT NOT NULL,
+                start_line INTEGER,
+                end_line INTEGER,
+                doc_type TEXT,
+                title TEXT,
+                headings TEXT,
+                summary TEXT,
+                file_hash TEXT,
+                indexed_at TEXT,
+                metadata TEXT,
+                embedding BLOB NOT NULL,
+                PRIMARY KEY (project_id, chunk_id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_doc_chunks_file ON doc_chunks(project_id, file_path);
+
+            CREATE TABLE IF NOT EXISTS memory_vectors (
+                project_id TEXT NOT NULL,
+                message_id TEXT NOT NULL,
+                embedding BLOB NOT NULL,
+                PRIMARY KEY (project_id, message_id)
+            );
+        """)
+        self._conn.commit()
+
+    @staticmethod
+    def pack(vector: Sequence[float]) -> bytes:
+        """Encode a vector as a float32 blob"""
+        return array('f', vector).tobytes()
+
+    async def run(self, fn: Callable[[sqlite3.Connection], Any]) -> Any:
+        """
+        Run a function with the connection in a worker thread.
+
+        The function runs inside a transaction that is committed on success.
+        """
+        def call():
+            with self._lock:
+                try:
+                    result = fn(self._conn)
+                    self._conn.commit()
+                    return result
+                except Exception:
+                    self._conn.rollback()
+                    raise
+
+        return await asyncio.to_thread(call)
+
+    # ==================
+    # Embedding stores
+    # ==================
+
+    def _store_path(self, table: str, project_id: str) -> Path:
+        safe_project = "".join(c if c.isalnum() or c in "-_" else "_" for c in project_id)
+        return self.vectors_dir / table / safe_project
+
+    def _open_store(self, table: str, project_id: str):
+        """
+        Get the embedding store of a (table, project), rebuilding it from the
+        stored blobs if missing or out of sync (caller holds lock).
+
+        Returns:
+            EmbeddingStore, or None if the table has no vectors for the project
+        """
+        key = (table, project_id)
+        if key in self._stores:
+            return self._stores[key]
+
+        count = self._count(table, project_id)
+        if not count:
+            self._drop_store(table, project_id)
+            return None
+
+        store = self._existing_store(table, project_id)
+        if store is None or len(store) != count:
+            if store is not None:
+                logger.info(f"Embedding store {table}/{project_id} out of sync ({len(store)} vs {count} rows), rebuilding")
+            self._drop_store(table, project_id)
+            store = self._rebuild_store(table, project_id, self._store_path(table, project_id))
+
+        self._stores[key] = store
+        return store
+
+    def _existing_store(self, table: str, project_id: str, dimensions: Optional[int] = None):
+        """Open the store files of a (table, project) if present (and of the given dimensions)"""
+        from embeddings.embedding_store import EmbeddingStore
+
+        path = self._store_path(table, project_id)
+        meta_path = path / EmbeddingStore.META_FILE
+        if not meta_path.exists():
+            return None
+        stored = json.loads(meta_path.read_text())["dimensions"]
+        if dimensions is not None and stored != dimensions:
+            return None
+        return EmbeddingStore(str(path), stored)
+
+    def _rebuild_store(self, table: str, project_id: str, path: Path):
+        """Write the embedding store of a (table, project) from the stored blobs"""
+        import numpy as np
+        from embeddings.embedding_store import EmbeddingStore
+
+        id_column = self.ID_COLUMNS[table]
+        rows = self._conn.execute(
+            f"SELECT {id_column}, embedding FROM {table} WHERE project_id = ?",
+            (project_id,)
+        ).fetchall()
+
+        # Vectors from another model (different dimensions) are not searchable together
+        dimensions = len(rows[-1][1]) // 4
+        rows = [row for row in rows if len(row[1]) == dimensions * 4]
+
+        store = EmbeddingStore(str(path), dimensions)
+        vectors = np.frombuffer(b"".join(row[1] for row in rows), dtype=np.float32).reshape(len(rows), dimensions)
+        store.add([row[0] for row in rows], vectors)
+        logger.info(f"Built local embedding store {table}/{project_id}: {len(rows)} vectors ({dimensions}d)")
+        return store
+
+    def _drop_store(self, table: str, project_id: str):
+        import shutil
+
+        store = self._stores.pop((table, project_id), None)
+        if store is not None:
+            store.close()
+        self._hnsw.pop((table, project_id), None)
+        shutil.rmtree(self._store_path(table, project_id), ignore_errors=True)
+
+    def _hnsw_index(self, table: str, project_id: str, store):
+        """HNSW index over a large store, built on first use (caller holds lock)"""
+        from embeddings.vector_index import VectorIndex, HNSW_AVAILABLE
+
+        if not HNSW_AVAILABLE or len(store) < self.hnsw_threshold:
+            return None
+
+        key = (table, project_id)
+        index = self._hnsw.get(key)
+        if index is None:
+            index = VectorIndex(store.dimensions, hnsw_threshold=self.hnsw_threshold)
+            ids, vectors = store.live()
+            index.add(ids, vectors)
+            self._hnsw[key] = index
+        return index
+
+    async def index_add(self, table: str, project_id: str, ids: Sequence[str], vectors: Sequence[Sequence[float]]):
+        """Apply saved vectors (already committed to the table) to the embedding store"""
+        if not ids:
+            return
+
+        def call():
+            with self._lock:
+                key = (table, project_id)
+                dimensions = len(vectors[0])
+                store = self._stores.get(key)
+                if store is not None and store.dimensions != dimensions:
+                    # Embedding model changed - rebuilt from the table on next use
+                    self._drop_store(table, project_id)
+                    store = None
+
+                if store is None:
+                    store = self._existing_store(table, project_id, dimensions)
+                    if store is not None:
+                        store.add(list(ids), vectors)
+                    self._attach(table, project_id, store)
+                    return
+
+                store.add(list(ids), vectors)
+                index = self._hnsw.get(key)
+                if index is not None:
+                    index.add(list(ids), vectors)
+
+        await asyncio.to_thread(call)
+
+    async def index_remove(self, table: str, project_id: str, ids: Sequence[str]):
+        """Apply deletions to the embedding store"""
+        def call():
+            with self._lock:
+                key = (table, project_id)
+                store = self._stores.get(key)
+                if store is None:
+                    store = self._existing_store(table, project_id)
+                    if store is not None:
+                        store.remove(list(ids))
+                    self._attach(table, project_id, store)
+                    return
+
+                store.remove(list(ids))
+                index = self._hnsw.get(key)
+                if index is not None:
+                    index.remove(list(ids))
+
+        await asyncio.to_thread(call)
+
+    async def index_drop(self, table: str, project_id: str):
+        """Delete the embedding store of a project (after deleting all its rows)"""
+        def call():
+            with self._lock:
+                self._drop_store(table, project_id)
+
+        await asyncio.to_thread(call)
+
+    def _attach(self, table: str, project_id: str, store):
+        """
+        Keep a store opened from disk for a write if it matches its table,
+        otherwise delete it so the next search rebuilds it (caller holds lock).
+        """
+        if store is not None and len(store) == self._count(table, project_id):
+            self._stores[(table, project_id)] = store
+        else:
+            self._drop_store(table, project_id)
+
+    def _count(self, table: str, project_id: str) -> int:
+        return self._conn.execute(
+            f"SELECT COUNT(*) FROM {table} WHERE project_id = ?", (project_id,)
+        ).fetchone()[0]
+
+    async def search(
+        self,
+        table: str,
+        project_id: str,
+        query_vector: Sequence[float],
+        k: int,
+        allow: Optional[Callable[[str], bool]] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Nearest-neighbor search over a project's vectors.
+
+        Args:
+            table: Table holding the vectors
+            project_id: Project ID
+            query_vector: Query embedding
+            k: Number of results
+            allow: Optional predicate on IDs
+
+        Returns:
+            (id, cosine similarity) pairs, best first
+        """
+        def call():
+            with self._lock:
+                store = self._open_store(table, project_id)
+                if store is None:
+                    return []
+                if len(query_vector) != store.dimensions:
+                    raise ValueError(
+                        f"Query has {len(query_vector)} dimensions, index {table}/{project_id} "
+                        f"has {store.dimensions}; reindex with the current embedding model"
+                    )
+                index = self._hnsw_index(table, project_id, store)
+            if index is not None:
+                return index.search(query_vector, k=k, allow=allow)
+            return store.search([query_vector], k=k, allow=allow)[0]
+
+        return await asyncio.to_thread(call)
+
+    def stats(self) -> Dict[str, Any]:
+        """Opened embedding stores and their sizes"""
+        with self._lock:
+            return {
+                f"{table}/{project_id}": {
+                    **store.stats(),
+                    "mode": "hnsw" if (table, project_id) in self._hnsw else "exact"
+                }
+                for (table, project_id), store in self._stores.items()
+            }
+
+    def close(self):
+        with self._lock:
+            for store in self._stores.values():
+                store.close()
+            self._stores.clear()
+            self._hnsw.clear()
+            self._conn.close()
+
+
+_store: Optional[LocalVectorStore] = None
+
+
+def get_local_vector_store() -> LocalVectorStore:
+    """
+    Get the process-wide local vector store.
+
+    Lives in the backend data directory (local_vectors.db, with the
+    embedding stores under local_vectors/).
+    """
+    global _store
+    if _store is None:
+        from claudetask.config import get_config
+        _store = LocalVectorStore(str(get_config().backend_data_dir / "local_vectors.db"))
+    return _store
@@ -0,0 +1,460 @@
+"""
+Sidecar offset index for the file-based MCP call and hook logs.
+
+mcp_calls.log and hooks.log are append-only text logs in which one MCP
+call (or hook execution) spans several lines. LogIndex groups lines into
+entries as the file grows and keeps, per entry, the byte range of its
+lines plus the fields the log pages filter on (timestamp, name, status).
+Running counters make stats O(1), and a log page only reads the byte
+ranges of the entries it returns.
+
+Each index lives in memory for the process and is persisted next to its
+log as an append-only JSONL sidecar (".mcp_calls.log.idx"): a header line
+identifying the log file, then one line per closed entry. Entries that
+later lines can still change (the last MCP call, the running hook) are
+not persisted; after a restart the log is re-read from the end of the
+last closed entry. A log that was truncated, rotated or replaced (other
+inode, shrunk, or different first line) is re-indexed from the start.
+Rotated segments are indexed in memory by load_segment_index.
+"""
+
+import io
+import os
+import re
+import gzip
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+INDEX_FORMAT_VERSION = 1
+
+# Fields of an index entry
+START, END, TIMESTAMP, NAME, STATUS = range(5)
+
+_READ_BLOCK = 1 << 20
+_HEAD_BYTES = 256
+
+_MCP_LINE_RE = re.compile(r'^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3}) - (\S+) - (\w+) - (.+)$')
+_HOOK_LINE_RE = re.compile(r'^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}) \| ([^|]+) \| ([^|]+) \| (.+)$')
+_HOOK_ALT_LINE_RE = re.compile(r'^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},?\d*) - (\w+) - (.+)$')
+
+
+def parse_mcp_log_line(line: str) -> Optional[Dict[str, Any]]:
+    """Parse a single MCP log line into a structured format."""
+    match = _MCP_LINE_RE.match(line.strip())
+
+    if match:
+        timestamp_str, logger_name, level, message = match.groups()
+
+        log_type = "info"
+        tool_name = None
+
+        if "🔵 MCP CALL RECEIVED:" in message:
+            log_type = "request"
+            tool_name = message.split("🔵 MCP CALL RECEIVED:")[1].strip()
+        elif "✅ MCP CALL SUCCESS:" in message:
+            log_type = "success"
+            tool_name = message.split("✅ MCP CALL SUCCESS:")[1].strip()
+        elif "❌ MCP CALL ERROR:" in message:
+            log_type = "error"
+            tool_name = message.split("❌ MCP CALL ERROR:")[1].strip()
+        elif "📥 Arguments:" in message:
+            log_type = "arguments"
+        elif "📤 Result preview:" in message:
+            log_type = "result"
+        elif "🔴 Error:" in message:
+            log_type = "error_detail"
+        elif "=" * 10 in message:
+            log_type = "separator"
+
+        return {
+            "timestamp": timestamp_str,
+            "logger": logger_name,
+            "level": level,
+            "message": message,
+            "log_type": log_type,
+            "tool_name": tool_name
+        }
+
+    return None
+
+
+def parse_hook_log_line(line: str) -> Optional[Dict[str, Any]]:
+    """Parse a single hook log line into a structured format."""
+    match = _HOOK_LINE_RE.match(line.strip())
+
+    if match:
+        timestamp_str, hook_name, status, message = match.groups()
+        return {
+            "timestamp": timestamp_str.strip(),
+            "hook_name": hook_name.strip(),
+            "status": status.strip().lower(),
+            "message": message.strip()
+        }
+
+    alt_match = _HOOK_ALT_LINE_RE.match(line.strip())
+
+    if alt_match:
+        timestamp_str, level, message = alt_match.groups()
+
+        hook_name = "unknown"
+        status = level.lower()
+
+        if "HOOK START:" in message:
+            hook_name = message.split("HOOK START:")[1].strip().split()[0]
+            status = "start"
+        elif "HOOK END:" in message:
+            hook_name = message.split("HOOK END:")[1].strip().split()[0]
+            status = "success"
+        elif "HOOK ERROR:" in message:
+            hook_name = message.split("HOOK ERROR:")[1].strip().split()[0]
+            status = "error"
+        elif "HOOK SKIP:" in message:
+            hook_name = message.split("HOOK SKIP:")[1].strip().split()[0]
+            status = "skipped"
+
+        return {
+            "timestamp": timestamp_str.strip(),
+            "hook_name": hook_name,
+            "status": status,
+            "message": message
+        }
+
+    return None
+
+
+class LogIndex:
+    """
+    Incrementally maintained index of one grouped log file.
+
+    Subclasses define how parsed lines group into entries. An entry is a
+    list [start, end, timestamp, name, status]; its position in the index
+    is its id (entries are in file order).
+
+    Usage:
+        index = get_log_index(log_file, "mcp")
+        if index.refresh():
+            ordinals = index.select(status_filter="error")
+            for ordinal, lines in index.read(ordinals[:50]):
+                ...
+    """
+
+    def __init__(self, log_file: Path):
+        """
+        Initialize an empty index (loaded from its sidecar on first refresh).
+
+        Args:
+            log_file: Log file to index
+        """
+        self.log_file = Path(log_file)
+        self.index_file = self.log_file.with_name(f".{self.log_file.name}.idx")
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._data: Optional[bytes] = None  # Content of a rotated segment (see load_segment_index)
+        self._clear_state()
+
+    def _source(self) -> BinaryIO:
+        """Readable bytes of the log (the file, or the in-memory segment)"""
+        return io.BytesIO(self._data) if self._data is not None else open(self.log_file, "rb")
+
+    def _clear_state(self) -> None:
+        self.entries: List[list] = []
+        self.offset = 0  # Log bytes indexed so far (always at a line boundary)
+        self.inode: Optional[int] = None
+        self.head: Optional[bytes] = None  # Start of the first line, identifies the log
+        self.status_counts: Dict[str, int] = {}
+        self.name_counts: Dict[Optional[str], int] = {}
+        self._open: Optional[int] = None  # Entry later lines may still change
+        self._persisted = 0  # Entries written to the sidecar
+
+    # ==================
+    # Grouping (per log format)
+    # ==================
+
+    def parse(self, line: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def add_line(self, parsed: Dict[str, Any], start: int, end: int) -> None:
+        """Apply one parsed line spanning log bytes start..end"""
+        raise NotImplementedError
+
+    def _add_entry(self, start: int, end: int, timestamp: str, name: Optional[str], status: str, is_open: bool) -> None:
+        self.entries.append([start, end, timestamp, name, status])
+        self._count(name, status, 1)
+        if is_open:
+            self._open = len(self.entries) - 1
+
+    def _set_status(self, entry: list, status: str) -> None:
+        self.status_counts[entry[STATUS]] -= 1
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        entry[STATUS] = status
+
+    def _count(self, name: Optional[str], status: str, delta: int) -> None:
+        self.name_counts[name] = self.name_counts.get(name, 0) + delta
+        self.status_counts[status] = self.status_counts.get(status, 0) + delta
+
+    # ==================
+    # Maintenance
+    # ==================
+
+    def refresh(self) -> bool:
+        """
+        Bring the index up to date with the log file.
+
+        Returns:
+            Whether the log file exists
+        """
+        with self._lock:
+            try:
+                stat = os.stat(self.log_file)
+            except FileNotFoundError:
+                if self.offset:
+                    self._reset()
+                return False
+
+            if not self._loaded:
+                self._loaded = True
+                self._load(stat)
+            if self.offset and self._replaced(stat):
+                logger.info(f"Log file {self.log_file} was truncated or replaced, re-indexing it")
+                self._reset()
+            self.inode = stat.st_ino
+
+            if stat.st_size > self.offset:
+                self._index_from(self.offset)
+                self._persist()
+            return True
+
+    def reset(self) -> None:
+        """Forget all entries and delete the sidecar (e.g. after the log was cleared)"""
+        with self._lock:
+            self._reset()
+
+    def _reset(self) -> None:
+        self._clear_state()
+        try:
+            self.index_file.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not delete log index {self.index_file}: {e}")
+
+    def _replaced(self, stat: os.stat_result) -> bool:
+        if stat.st_ino != self.inode or stat.st_size < self.offset:
+            return True
+        with open(self.log_file, "rb") as f:
+            return f.read(len(self.head)) != self.head
+
+    def _index_from(self, offset: int) -> None:
+        """Group the complete lines after offset (a partly written last line waits for the next refresh)"""
+        with open(self.log_file, "rb") as f:
+            f.seek(offset)
+            pending = b""
+            while True:
+                block = f.read(_READ_BLOCK)
+                if not block:
+                    break
+                data = pending + block
+                complete = data.rfind(b"\n") + 1
+                pending = data[complete:]
+                if not complete:
+                    continue
+
+                if self.head is None:
+                    self.head = data[:min(data.find(b"\n") + 1, _HEAD_BYTES)]
+                self._index_lines(data[:complete], offset)
+                offset += complete
+        self.offset = offset
+
+    def _index_lines(self, data: bytes, offset: int) -> None:
+        """Group complete lines (data ends with a newline) that start at log offset"""
+        start = offset
+        for raw in data.split(b"\n")[:-1]:
+            end = start + len(raw) + 1
+            parsed = self.parse(raw.decode("utf-8", errors="replace"))
+            if parsed:
+                self.add_line(parsed, start, end)
+            start = end
+
+    # ==================
+    # Sidecar
+    # ==================
+
+    def _persist(self) -> None:
+        """Append newly closed entries to the sidecar"""
+        closed = self._open if self._open is not None else len(self.entries)
+        if closed <= self._persisted:
+            return
+        try:
+            with open(self.index_file, "a" if self._persisted else "w", encoding="utf-8") as f:
+                if not self._persisted:
+                    header = {"version": INDEX_FORMAT_VERSION, "inode": self.inode, "head": self.head.hex()}
+                    f.write(json.dumps(header) + "\n")
+                for entry in self.entries[self._persisted:closed]:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._persisted = closed
+        except OSError as e:
+            logger.warning(f"Could not write log index {self.index_file}: {e}")
+
+    def _load(self, stat: os.stat_result) -> None:
+        """Restore closed entries from the sidecar if it still describes this log"""
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                header = json.loads(f.readline())
+                entries = [json.loads(line) for line in f]
+            head = bytes.fromhex(header["head"])
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable log index {self.index_file}: {e}")
+            return
+
+        if header.get("version") != INDEX_FORMAT_VERSION or header.get("inode") != stat.st_ino or not entries:
+            return
+        previous_start = -1
+        for entry in entries:
+            if len(entry) != 5 or entry[START] <= previous_start or entry[END] > stat.st_size:
+                logger.warning(f"Ignoring inconsistent log index {self.index_file}")
+                return
+            previous_start = entry[START]
+        with open(self.log_file, "rb") as f:
+            if f.read(len(head)) != head:
+                return
+
+        self.entries = entries
+        self.offset = max(entry[END] for entry in entries)
+        self.inode = stat.st_ino
+        self.head = head
+        for entry in entries:
+            self._count(entry[NAME], entry[STATUS], 1)
+        self._persisted = len(entries)
+        logger.debug(f"Loaded {len(entries)} entries of {self.log_file} from {self.index_file}")
+
+    # ==================
+    # Queries
+    # ==================
+
+    def select(self, name_filter: Optional[str] = None, status_filter: Optional[str] = None) -> Sequence[int]:
+        """
+        Ids of the entries matching the filters, newest first.
+
+        Args:
+            name_filter: Case-insensitive substring of the tool/hook name
+            status_filter: Exact status
+
+        Returns:
+            Sequence of entry ids (a range when unfiltered, so slicing it is O(1))
+        """
+        if not name_filter and not status_filter:
+            return range(len(self.entries) - 1, -1, -1)
+        name_filter = name_filter.lower() if name_filter else None
+        return [
+            ordinal for ordinal in range(len(self.entries) - 1, -1, -1)
+            if (not status_filter or self.entries[ordinal][STATUS] == status_filter)
+            and (not name_filter or name_filter in (self.entries[ordinal][NAME] or "").lower())
+        ]
+
+    def read(self, ordinals: Sequence[int]) -> Iterator[Tuple[int, List[str]]]:
+        """
+        Log lines of entries, read from their byte ranges.
+
+        Yields:
+            (entry id, lines) for each requested entry
+        """
+        with self._source() as f:
+            for ordinal in ordinals:
+                entry = self.entries[ordinal]
+                f.seek(entry[START])
+                data = f.read(entry[END] - entry[START])
+                yield ordinal, data.decode("utf-8", errors="replace").splitlines()
+
+
+class McpCallIndex(LogIndex):
+    """Index of mcp_calls.log: an entry is a call, from its request line to the next request"""
+
+    def parse(self, line: str) -> Optional[Dict[str, Any]]:
+        return parse_mcp_log_line(line)
+
+    def add_line(self, parsed: Dict[str, Any], start: int, end: int) -> None:
+        log_type = parsed["log_type"]
+        if log_type == "request":
+            self._add_entry(start, end, parsed["timestamp"], parsed["tool_name"], "pending", is_open=True)
+        elif self._open is not None and log_type != "separator":
+            entry = self.entries[self._open]
+            entry[END] = end
+            if log_type in ("success", "error"):
+                self._set_status(entry, log_type)
+
+
+class HookExecutionIndex(LogIndex):
+    """
+    Index of hooks.log: an entry is a hook execution, from its start line to the
+    next start (lines of other hooks in between are entries of their own).
+    """
+
+    def parse(self, line: str) -> Optional[Dict[str, Any]]:
+        return parse_hook_log_line(line)
+
+    def add_line(self, parsed: Dict[str, Any], start: int, end: int) -> None:
+        status = parsed["status"]
+        if status == "start":
+            self._add_entry(start, end, parsed["timestamp"], parsed["hook_name"], "running", is_open=True)
+        elif self._open is not None and parsed["hook_name"] == self.entries[self._open][NAME]:
+            entry = self.entries[self._open]
+            entry[END] = end
+            if status in ("success", "error", "skipped"):
+                self._set_status(entry, status)
+        else:
+            self._add_entry(start, end, parsed["timestamp"], parsed["hook_name"], status, is_open=False)
+
+
+LOG_INDEX_TYPES = {"mcp": McpCallIndex, "hook": HookExecutionIndex}
+
+
+def load_segment_index(segment: Path, kind: str) -> LogIndex:
+    """
+    In-memory index of a rotated log segment (gzipped or plain).
+
+    Segments never change, so the whole segment is read (decompressed) once
+    and its entries are read from memory; nothing is persisted.
+
+    Args:
+        segment: Segment file
+        kind: "mcp" or "hook"
+    """
+    segment = Path(segment)
+    with (gzip.open(segment, "rb") if segment.suffix == ".gz" else open(segment, "rb")) as f:
+        data = f.read()
+    if data and not data.endswith(b"\n"):
+        data += b"\n"
+
+    index = LOG_INDEX_TYPES[kind](segment)
+    index._loaded = True
+    index._data = data
+    index._index_lines(data, 0)
+    index.offset = len(data)
+    return index
+
+# Indexes of this process, shared by all repository instances
+_indexes: Dict[Tuple[str, str], LogIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_log_index(log_file: Path, kind: str) -> LogIndex:
+    """
+    Process-wide index of a log file.
+
+    Args:
+        log_file: Log file path
+        kind: "mcp" (mcp_calls.log) or "hook" (hooks.log)
+    """
+    key = (kind, os.path.abspath(log_file))
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = LOG_INDEX_TYPES[kind](log_file)
+        return index
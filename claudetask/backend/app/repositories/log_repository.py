@@ -1,24 +1,79 @@
 """Log repository implementations for MongoDB and file-based storage"""
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, AsyncIterator, Iterable, Tuple
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from datetime import datetime
+from datetime import datetime, timedelta
+from contextlib import AsyncExitStack, asynccontextmanager
 from bson import ObjectId
+from bson.errors import InvalidId
 from pathlib import Path
-import re
+import os
+import json
+import base64
+import asyncio
+import logging
 
 from .base import BaseRepository
+from .log_index import parse_mcp_log_line, parse_hook_log_line
+from .log_segments import get_segmented_log
+
+logger = logging.getLogger(__name__)
+
+# Filtered totals are counted up to this many matches, then reported as estimates
+COUNT_LIMIT = 10000
+
+# MongoDB error code of a $text query on a collection without text index
+INDEX_NOT_FOUND = 27
+
+# Counters older than this are recounted on the next stats call (heals drift
+# from other backend processes, which do not share the counter locks)
+COUNTER_MAX_AGE = timedelta(hours=24)
+
+
+def encode_log_cursor(doc: Dict[str, Any]) -> str:
+    """Keyset pagination cursor positioned after a log document"""
+    raw = json.dumps([doc["timestamp"].isoformat(), str(doc["_id"])])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_log_cursor(cursor: str) -> Optional[Tuple[datetime, ObjectId]]:
+    """(timestamp, _id) of a cursor, or None if it is malformed"""
+    try:
+        timestamp, doc_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(timestamp), ObjectId(doc_id)
+    except (ValueError, TypeError, InvalidId):
+        return None
 
 
 class MongoDBLogRepository(BaseRepository):
     """
     MongoDB implementation of log repository.
 
-    Manages two collections:
+    Manages three collections:
     - mcp_logs: MCP call logs
     - hook_logs: Hook execution logs
+    - log_counters: Entries per project, log type, name and status; kept
+      up to date on ingest so stats and unfiltered totals need no scan.
+      A rebuild writes a new generation of counters and switches the
+      project's marker document over to it in one update.
+
+    Search uses the collections' text indexes and falls back to regular
+    expressions without them. Pages are read by keyset on
+    (timestamp, _id) when given a cursor.
     """
 
+    # Log type -> (name field, full-text searched fields)
+    LOG_FIELDS = {
+        "mcp": ("tool_name", ("arguments", "result", "error")),
+        "hook": ("hook_name", ("message", "error"))
+    }
+
+    # Collections found without text index (searched by regex until restart)
+    _without_text_index: set = set()
+
+    # Per (log type, project): ingest and counter rebuilds of this process take turns
+    _counter_locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+
     def __init__(self, db: AsyncIOMotorDatabase):
         """
         Initialize MongoDB log repository.
@@ -29,6 +84,7 @@ class MongoDBLogRepository(BaseRepository):
         self._db = db
         self._mcp_logs = db["mcp_logs"]
         self._hook_logs = db["hook_logs"]
+        self._log_counters = db["log_counters"]
 
     # ==================
     # BaseRepository Implementation
@@ -58,8 +114,15 @@ class MongoDBLogRepository(BaseRepository):
 
     async def delete(self, id: str) -> None:
         """Delete log entry by ID."""
-        await self._mcp_logs.delete_one({"_id": ObjectId(id)})
-        await self._hook_logs.delete_one({"_id": ObjectId(id)})
+        for log_type in self.LOG_FIELDS:
+            collection = self._collection(log_type)
+            found = await collection.find_one({"_id": ObjectId(id)}, {"project_id": 1})
+            if not found:
+                continue
+            async with self._counting(log_type, [found["project_id"]]):
+                doc = await collection.find_one_and_delete({"_id": ObjectId(id)})
+                if doc:
+                    await self._count_logs(log_type, [doc], -1)
 
     async def list(
         self,
@@ -115,19 +178,50 @@ class MongoDBLogRepository(BaseRepository):
 
     async def create_mcp_log(self, log: Dict[str, Any]) -> str:
         """Create new MCP log entry."""
-        doc = {
+        doc = self._build_mcp_log_doc(log)
+        async with self._counting("mcp", [doc["project_id"]]):
+            result = await self._mcp_logs.insert_one(doc)
+            await self._count_logs("mcp", [doc])
+        return str(result.inserted_id)
+
+    async def create_mcp_logs_bulk(self, logs: List[Dict[str, Any]]) -> int:
+        """
+        Create many MCP log entries in one round trip.
+
+        Args:
+            logs: Log entries (same fields as create_mcp_log)
+
+        Returns:
+            Number of entries inserted
+        """
+        if not logs:
+            return 0
+        docs = [self._build_mcp_log_doc(log) for log in logs]
+        project_ids = {doc["project_id"] for doc in docs}
+        async with self._counting("mcp", project_ids):
+            try:
+                # Unordered: one bad document does not stop the rest of the batch
+                result = await self._mcp_logs.insert_many(docs, ordered=False)
+            except Exception:
+                # Some documents may have been inserted: recount on the next stats call
+                await self._invalidate_counters("mcp", project_ids)
+                raise
+            await self._count_logs("mcp", docs)
+        return len(result.inserted_ids)
+
+    def _build_mcp_log_doc(self, log: Dict[str, Any]) -> Dict[str, Any]:
+        """Build MCP log document from a log entry."""
+        return {
             "project_id": log["project_id"],
             "tool_name": log.get("tool_name"),
             "status": log.get("status", "pending"),
             "arguments": log.get("arguments"),
             "result": log.get("result"),
             "error": log.get("error"),
-            "timestamp": log.get("timestamp", datetime.utcnow()),
+            "timestamp": log.get("timestamp") or datetime.utcnow(),
             "end_timestamp": log.get("end_timestamp"),
             "raw_logs": log.get("raw_logs", [])
         }
-        result = await self._mcp_logs.insert_one(doc)
-        return str(result.inserted_id)
 
     async def get_mcp_logs(
         self,
@@ -136,61 +230,45 @@ class MongoDBLogRepository(BaseRepository):
         offset: int = 0,
         tool_filter: Optional[str] = None,
         status_filter: Optional[str] = None,
-        search: Optional[str] = None
+        search: Optional[str] = None,
+        cursor: Optional[str] = None,
+        exact_count: bool = False
     ) -> Dict[str, Any]:
-        """Get MCP logs with filtering and pagination."""
-        query = {"project_id": project_id}
-
-        if tool_filter:
-            query["tool_name"] = {"$regex": tool_filter, "$options": "i"}
-
-        if status_filter:
-            query["status"] = status_filter
-
-        if search:
-            query["$or"] = [
-                {"tool_name": {"$regex": search, "$options": "i"}},
-                {"arguments": {"$regex": search, "$options": "i"}},
-                {"result": {"$regex": search, "$options": "i"}},
-                {"error": {"$regex": search, "$options": "i"}}
-            ]
-
-        # Get total count
-        total = await self._mcp_logs.count_documents(query)
-
-        # Get logs with pagination
-        cursor = self._mcp_logs.find(query).sort("timestamp", -1).skip(offset).limit(limit)
-        logs = []
-        async for doc in cursor:
-            logs.append(self._doc_to_mcp_log(doc))
+        """
+        Get MCP logs with filtering and pagination.
 
+        Args:
+            project_id: Project whose logs to read
+            limit: Page size
+            offset: Entries to skip (ignored when a cursor is given)
+            tool_filter: Case-insensitive pattern on the tool name
+            status_filter: Exact status
+            search: Words or phrase in tool name, arguments, result or error
+            cursor: next_cursor of the previous page
+            exact_count: Count all matches instead of estimating filtered totals
+
+        Returns:
+            Page of calls with total, total_exact and next_cursor
+        """
+        docs, total, total_exact = await self._find_logs(
+            "mcp", project_id, limit, offset, tool_filter, status_filter, search, cursor, exact_count
+        )
         return {
-            "calls": logs,
+            "calls": [self._doc_to_mcp_log(doc) for doc in docs],
             "total": total,
+            "total_exact": total_exact,
             "limit": limit,
-            "offset": offset
+            "offset": offset,
+            "next_cursor": encode_log_cursor(docs[-1]) if len(docs) == limit else None
         }
 
     async def get_mcp_stats(self, project_id: str) -> Dict[str, Any]:
-        """Get MCP log statistics for a project."""
-        query = {"project_id": project_id}
-
-        total = await self._mcp_logs.count_documents(query)
-        success_count = await self._mcp_logs.count_documents({**query, "status": "success"})
-        error_count = await self._mcp_logs.count_documents({**query, "status": "error"})
+        """Get MCP log statistics for a project (from the ingest counters)."""
+        total, status_counts, tools_used = await self._counted_stats("mcp", project_id)
+        success_count = status_counts.get("success", 0)
+        error_count = status_counts.get("error", 0)
         pending_count = total - success_count - error_count
 
-        # Get tools usage
-        pipeline = [
-            {"$match": query},
-            {"$group": {"_id": "$tool_name", "count": {"$sum": 1}}},
-            {"$sort": {"count": -1}}
-        ]
-        cursor = self._mcp_logs.aggregate(pipeline)
-        tools_used = {}
-        async for doc in cursor:
-            tools_used[doc["_id"] or "unknown"] = doc["count"]
-
         return {
             "total_calls": total,
             "success_count": success_count,
@@ -203,7 +281,9 @@ class MongoDBLogRepository(BaseRepository):
 
     async def clear_mcp_logs(self, project_id: str) -> int:
         """Clear all MCP logs for a project."""
-        result = await self._mcp_logs.delete_many({"project_id": project_id})
+        async with self._counting("mcp", [project_id]):
+            result = await self._mcp_logs.delete_many({"project_id": project_id})
+            await self._rebuild_counters("mcp", project_id)
         return result.deleted_count
 
     # ==================
@@ -218,12 +298,14 @@ class MongoDBLogRepository(BaseRepository):
             "status": log.get("status", "running"),
             "message": log.get("message"),
             "error": log.get("error"),
-            "timestamp": log.get("timestamp", datetime.utcnow()),
+            "timestamp": log.get("timestamp") or datetime.utcnow(),
             "end_timestamp": log.get("end_timestamp"),
             "duration_ms": log.get("duration_ms"),
             "raw_logs": log.get("raw_logs", [])
         }
-        result = await self._hook_logs.insert_one(doc)
+        async with self._counting("hook", [doc["project_id"]]):
+            result = await self._hook_logs.insert_one(doc)
+            await self._count_logs("hook", [doc])
         return str(result.inserted_id)
 
     async def get_hook_logs(
@@ -233,59 +315,44 @@ class MongoDBLogRepository(BaseRepository):
         offset: int = 0,
         hook_filter: Optional[str] = None,
         status_filter: Optional[str] = None,
-        search: Optional[str] = None
+        search: Optional[str] = None,
+        cursor: Optional[str] = None,
+        exact_count: bool = False
     ) -> Dict[str, Any]:
-        """Get hook logs with filtering and pagination."""
-        query = {"project_id": project_id}
-
-        if hook_filter:
-            query["hook_name"] = {"$regex": hook_filter, "$options": "i"}
-
-        if status_filter:
-            query["status"] = status_filter
-
-        if search:
-            query["$or"] = [
-                {"hook_name": {"$regex": search, "$options": "i"}},
-                {"message": {"$regex": search, "$options": "i"}},
-                {"error": {"$regex": search, "$options": "i"}}
-            ]
-
-        # Get total count
-        total = await self._hook_logs.count_documents(query)
-
-        # Get logs with pagination
-        cursor = self._hook_logs.find(query).sort("timestamp", -1).skip(offset).limit(limit)
-        logs = []
-        async for doc in cursor:
-            logs.append(self._doc_to_hook_log(doc))
+        """
+        Get hook logs with filtering and pagination.
 
+        Args:
+            project_id: Project whose logs to read
+            limit: Page size
+            offset: Entries to skip (ignored when a cursor is given)
+            hook_filter: Case-insensitive pattern on the hook name
+            status_filter: Exact status
+            search: Words or phrase in hook name, message or error
+            cursor: next_cursor of the previous page
+            exact_count: Count all matches instead of estimating filtered totals
+
+        Returns:
+            Page of executions with total, total_exact and next_cursor
+        """
+        docs, total, total_exact = await self._find_logs(
+            "hook", project_id, limit, offset, hook_filter, status_filter, search, cursor, exact_count
+        )
         return {
-            "executions": logs,
+            "executions": [self._doc_to_hook_log(doc) for doc in docs],
             "total": total,
+            "total_exact": total_exact,
             "limit": limit,
-            "offset": offset
+            "offset": offset,
+            "next_cursor": encode_log_cursor(docs[-1]) if len(docs) == limit else None
         }
 
     async def get_hook_stats(self, project_id: str) -> Dict[str, Any]:
-        """Get hook log statistics for a project."""
-        query = {"project_id": project_id}
-
-        total = await self._hook_logs.count_documents(query)
-        success_count = await self._hook_logs.count_documents({**query, "status": "success"})
-        error_count = await self._hook_logs.count_documents({**query, "status": "error"})
-        skipped_count = await self._hook_logs.count_documents({**query, "status": "skipped"})
-
-        # Get hooks usage
-        pipeline = [
-            {"$match": query},
-            {"$group": {"_id": "$hook_name", "count": {"$sum": 1}}},
-            {"$sort": {"count": -1}}
-        ]
-        cursor = self._hook_logs.aggregate(pipeline)
-        hooks_used = {}
-        async for doc in cursor:
-            hooks_used[doc["_id"] or "unknown"] = doc["count"]
+        """Get hook log statistics for a project (from the ingest counters)."""
+        total, status_counts, hooks_used = await self._counted_stats("hook", project_id)
+        success_count = status_counts.get("success", 0)
+        error_count = status_counts.get("error", 0)
+        skipped_count = status_counts.get("skipped", 0)
 
         return {
             "total_executions": total,
@@ -299,9 +366,288 @@ class MongoDBLogRepository(BaseRepository):
 
     async def clear_hook_logs(self, project_id: str) -> int:
         """Clear all hook logs for a project."""
-        result = await self._hook_logs.delete_many({"project_id": project_id})
+        async with self._counting("hook", [project_id]):
+            result = await self._hook_logs.delete_many({"project_id": project_id})
+            await self._rebuild_counters("hook", project_id)
         return result.deleted_count
 
+    # ==================
+    # Queries
+    # ==================
+
+    def _collection(self, log_type: str):
+        return self._mcp_logs if log_type == "mcp" else self._hook_logs
+
+    async def _find_logs(
+        self,
+        log_type: str,
+        project_id: str,
+        limit: int,
+        offset: int,
+        name_filter: Optional[str],
+        status_filter: Optional[str],
+        search: Optional[str],
+        cursor: Optional[str],
+        exact_count: bool
+    ) -> Tuple[List[Dict[str, Any]], int, bool]:
+        """
+        One page of log documents, newest first.
+
+        Returns:
+            (documents, total matches, whether the total is exact)
+        """
+        from pymongo.errors import OperationFailure
+
+        collection = self._collection(log_type)
+        name_field = self.LOG_FIELDS[log_type][0]
+
+        query: Dict[str, Any] = {"project_id": project_id}
+        if name_filter:
+            query[name_field] = {"$regex": name_filter, "$options": "i"}
+        if status_filter:
+            query["status"] = status_filter
+
+        if not (name_filter or search or exact_count):
+            total, status_counts, _ = await self._counted_stats(log_type, project_id)
+            total = status_counts.get(status_filter, 0) if status_filter else total
+            return await self._read_page(collection, query, limit, offset, cursor), total, False
+
+        text_index = collection.name not in self._without_text_index
+        try:
+            return await self._find_matching(
+                collection, query, self._search_condition(log_type, search, text_index),
+                limit, offset, cursor, exact_count
+            )
+        except OperationFailure as e:
+            if e.code != INDEX_NOT_FOUND or not text_index:
+                raise
+            logger.warning(f"No text index on {collection.name}, searching with regular expressions")
+            self._without_text_index.add(collection.name)
+            return await self._find_matching(
+                collection, query, self._search_condition(log_type, search, False),
+                limit, offset, cursor, exact_count
+            )
+
+    async def _find_matching(
+        self,
+        collection,
+        query: Dict[str, Any],
+        search_condition: Optional[Dict[str, Any]],
+        limit: int,
+        offset: int,
+        cursor: Optional[str],
+        exact_count: bool
+    ) -> Tuple[List[Dict[str, Any]], int, bool]:
+        if search_condition:
+            query = {**query, **search_condition}
+        if exact_count:
+            total = await collection.count_documents(query)
+            total_exact = True
+        else:
+            total = await collection.count_documents(query, limit=COUNT_LIMIT)
+            total_exact = total < COUNT_LIMIT
+        return await self._read_page(collection, query, limit, offset, cursor), total, total_exact
+
+    def _search_condition(self, log_type: str, search: Optional[str], text_index: bool) -> Optional[Dict[str, Any]]:
+        """
+        Query condition of a search.
+
+        With a text index the searched fields are matched by words (the
+        whole search as one phrase); names, which the text index does not
+        split at underscores, are still matched as patterns on their index.
+        """
+        if not search:
+            return None
+        name_field, text_fields = self.LOG_FIELDS[log_type]
+        name_condition = {name_field: {"$regex": search, "$options": "i"}}
+        if text_index:
+            phrase = '"' + search.replace('"', " ").strip() + '"'
+            return {"$or": [{"$text": {"$search": phrase}}, name_condition]}
+        return {"$or": [name_condition] + [
+            {field: {"$regex": search, "$options": "i"}} for field in text_fields
+        ]}
+
+    async def _read_page(
+        self,
+        collection,
+        query: Dict[str, Any],
+        limit: int,
+        offset: int,
+        cursor: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        """Documents of a page: by keyset after the cursor, else by offset"""
+        position = decode_log_cursor(cursor) if cursor else None
+        if position is not None:
+            timestamp, doc_id = position
+            after = {"$or": [
+                {"timestamp": {"$lt": timestamp}},
+                {"timestamp": timestamp, "_id": {"$lt": doc_id}}
+            ]}
+            query = {"$and": [query, after]}
+
+        found = collection.find(query).sort([("timestamp", -1), ("_id", -1)])
+        if position is None and offset:
+            found = found.skip(offset)
+        return [doc async for doc in found.limit(limit)]
+
+    # ==================
+    # Counters
+    # ==================
+
+    def _counter_id(self, log_type: str, project_id: str, generation: str, name: Optional[str], status: Optional[str]) -> str:
+        return json.dumps([log_type, project_id, generation, name, status])
+
+    def _marker_id(self, log_type: str, project_id: str) -> str:
+        # Names the generation of counters covering all of a project's logs
+        return json.dumps([log_type, project_id])
+
+    @asynccontextmanager
+    async def _counting(self, log_type: str, project_ids: Iterable[str]) -> AsyncIterator[None]:
+        """
+        Hold the counter locks of projects while their logs are written and counted.
+
+        A rebuild holds the same lock, so no write falls between its count
+        and the switch to its counters. Locks are taken in a fixed order.
+        """
+        async with AsyncExitStack() as stack:
+            for project_id in sorted(set(project_ids)):
+                lock = self._counter_locks.setdefault((log_type, project_id), asyncio.Lock())
+                await stack.enter_async_context(lock)
+            yield
+
+    async def _count_logs(self, log_type: str, docs: Iterable[Dict[str, Any]], delta: int = 1) -> None:
+        """Add inserted (or, with delta -1, deleted) log documents to the counters (counter locks held)"""
+        from pymongo import UpdateOne
+
+        name_field = self.LOG_FIELDS[log_type][0]
+        counts: Dict[Tuple[str, Optional[str], Optional[str]], int] = {}
+        for doc in docs:
+            key = (doc["project_id"], doc.get(name_field), doc.get("status"))
+            counts[key] = counts.get(key, 0) + delta
+
+        project_ids = {project_id for project_id, _, _ in counts}
+        try:
+            generations = await self._counter_generations(log_type, project_ids)
+            # Projects without counters are counted from their logs on the next stats call
+            operations = [
+                UpdateOne(
+                    {"_id": self._counter_id(log_type, project_id, generations[project_id], name, status)},
+                    {
+                        "$inc": {"count": count},
+                        "$setOnInsert": {
+                            "project_id": project_id, "log_type": log_type,
+                            "generation": generations[project_id], "name": name, "status": status
+                        }
+                    },
+                    upsert=True
+                )
+                for (project_id, name, status), count in counts.items()
+                if project_id in generations
+            ]
+            if operations:
+                await self._log_counters.bulk_write(operations, ordered=False)
+        except Exception as e:
+            logger.warning(f"Failed to update {log_type} log counters, they will be rebuilt: {e}")
+            await self._invalidate_counters(log_type, project_ids)
+
+    async def _counter_generations(self, log_type: str, project_ids: Iterable[str]) -> Dict[str, str]:
+        """Current counter generation of each project that has one"""
+        markers = self._log_counters.find({
+            "_id": {"$in": [self._marker_id(log_type, project_id) for project_id in project_ids]}
+        })
+        return {marker["project_id"]: marker["generation"] async for marker in markers if marker.get("generation")}
+
+    async def _counted_stats(self, log_type: str, project_id: str) -> Tuple[int, Dict[Optional[str], int], Dict[str, int]]:
+        """
+        Entries of a project by status and by name, from the counters.
+
+        Returns:
+            (total, entries per status, entries per name, most used first)
+        """
+        generation = await self._current_generation(log_type, project_id)
+        if generation is None:
+            async with self._counting(log_type, [project_id]):
+                # Another caller may have rebuilt them while this one waited
+                generation = await self._current_generation(log_type, project_id)
+                if generation is None:
+                    generation = await self._rebuild_counters(log_type, project_id)
+
+        total = 0
+        status_counts: Dict[Optional[str], int] = {}
+        name_counts: Dict[str, int] = {}
+        found = self._log_counters.find({"project_id": project_id, "log_type": log_type, "generation": generation})
+        async for counter in found:
+            if "status" not in counter:
+                continue  # The marker
+            count = counter["count"]
+            if count <= 0:
+                continue
+            total += count
+            status_counts[counter["status"]] = status_counts.get(counter["status"], 0) + count
+            name = counter["name"] or "unknown"
+            name_counts[name] = name_counts.get(name, 0) + count
+
+        return total, status_counts, dict(sorted(name_counts.items(), key=lambda item: -item[1]))
+
+    async def _current_generation(self, log_type: str, project_id: str) -> Optional[str]:
+        """Generation of a project's counters, or None if they are missing or due for a recount"""
+        marker = await self._log_counters.find_one({"_id": self._marker_id(log_type, project_id)})
+        if not marker or not marker.get("generation") or marker["counted_at"] < datetime.utcnow() - COUNTER_MAX_AGE:
+            return None
+        return marker["generation"]
+
+    async def _rebuild_counters(self, log_type: str, project_id: str) -> str:
+        """
+        Recount a project's logs into a new generation of counters (counter lock held).
+
+        Readers and ingest keep using the previous generation until the
+        marker is switched over, then the previous one is deleted.
+
+        Returns:
+            The new generation
+        """
+        from pymongo import InsertOne
+
+        generation = str(ObjectId())
+        name_field = self.LOG_FIELDS[log_type][0]
+        pipeline = [
+            {"$match": {"project_id": project_id}},
+            {"$group": {"_id": {"name": f"${name_field}", "status": "$status"}, "count": {"$sum": 1}}}
+        ]
+        operations = []
+        async for group in self._collection(log_type).aggregate(pipeline):
+            name, status = group["_id"].get("name"), group["_id"].get("status")
+            operations.append(InsertOne({
+                "_id": self._counter_id(log_type, project_id, generation, name, status),
+                "project_id": project_id, "log_type": log_type, "generation": generation,
+                "name": name, "status": status, "count": group["count"]
+            }))
+        if operations:
+            await self._log_counters.bulk_write(operations, ordered=False)
+
+        await self._log_counters.update_one(
+            {"_id": self._marker_id(log_type, project_id)},
+            {"$set": {
+                "project_id": project_id, "log_type": log_type,
+                "generation": generation, "counted_at": datetime.utcnow()
+            }},
+            upsert=True
+        )
+        await self._log_counters.delete_many({
+            "project_id": project_id, "log_type": log_type, "generation": {"$ne": generation}
+        })
+        logger.info(f"Rebuilt {log_type} log counters of project {project_id}")
+        return generation
+
+    async def _invalidate_counters(self, log_type: str, project_ids: Iterable[str]) -> None:
+        """Have the counters of projects rebuilt on their next stats call"""
+        try:
+            await self._log_counters.delete_many({
+                "_id": {"$in": [self._marker_id(log_type, project_id) for project_id in project_ids]}
+            })
+        except Exception as e:
+            logger.warning(f"Failed to invalidate {log_type} log counters: {e}")
+
     # ==================
     # Utility Methods
     # ==================
@@ -344,15 +690,30 @@ class MongoDBLogRepository(BaseRepository):
         """Create MongoDB indexes for optimal performance."""
         # MCP logs indexes
         await self._mcp_logs.create_index("project_id")
-        await self._mcp_logs.create_index([("project_id", 1), ("timestamp", -1)])
+        await self._mcp_logs.create_index([("project_id", 1), ("timestamp", -1), ("_id", -1)])
         await self._mcp_logs.create_index("tool_name")
         await self._mcp_logs.create_index("status")
+        await self._mcp_logs.create_index(
+            [("arguments", "text"), ("result", "text"), ("error", "text")],
+            name="mcp_logs_text",
+            default_language="none",
+            language_override="text_language"
+        )
 
         # Hook logs indexes
         await self._hook_logs.create_index("project_id")
-        await self._hook_logs.create_index([("project_id", 1), ("timestamp", -1)])
+        await self._hook_logs.create_index([("project_id", 1), ("timestamp", -1), ("_id", -1)])
         await self._hook_logs.create_index("hook_name")
         await self._hook_logs.create_index("status")
+        await self._hook_logs.create_index(
+            [("message", "text"), ("error", "text")],
+            name="hook_logs_text",
+            default_language="none",
+            language_override="text_language"
+        )
+
+        # Log counters indexes
+        await self._log_counters.create_index([("project_id", 1), ("log_type", 1), ("generation", 1)])
 
 
 class FileLogRepository:
@@ -362,6 +723,12 @@ class FileLogRepository:
     Used for local storage mode. Reads/writes logs from/to files:
     - MCP: {project_path}/.claudetask/logs/mcp/mcp_calls.log
     - Hooks: {project_path}/.claudetask/logs/hooks/hooks.log
+
+    Calls and executions are located through a sidecar offset index
+    (see log_index.py) that is updated from the last indexed offset, so
+    pages read only the entries they return and stats are O(1). Rotated
+    (gzipped) segments of both logs are included; a page decompresses only
+    the segments it reaches into (see log_segments.py).
     """
 
     def __init__(self, project_path: str):
@@ -374,6 +741,24 @@ class FileLogRepository:
         self._project_path = project_path
         self._mcp_log_file = Path(project_path) / ".claudetask" / "logs" / "mcp" / "mcp_calls.log"
         self._hook_log_file = Path(project_path) / ".claudetask" / "logs" / "hooks" / "hooks.log"
+        self._mcp_log = get_segmented_log(self._mcp_log_file, "mcp")
+        self._hook_log = get_segmented_log(self._hook_log_file, "hook")
+
+    def _log_file_stats(self, log_file: Path, log) -> Dict[str, Any]:
+        """File details of a log (active file and rotated segments) for stats responses."""
+        stats = {
+            "log_file": str(log_file),
+            "log_file_exists": True,
+            "log_file_size_kb": 0,
+            "log_file_modified": None,
+            "rotated_segments": len(log.segments),
+            "rotated_segments_size_kb": round(log.segment_bytes() / 1024, 2)
+        }
+        if log_file.exists():
+            file_stats = os.stat(log_file)
+            stats["log_file_size_kb"] = round(file_stats.st_size / 1024, 2)
+            stats["log_file_modified"] = datetime.fromtimestamp(file_stats.st_mtime).isoformat()
+        return stats
 
     # ==================
     # MCP Log Methods
@@ -381,43 +766,7 @@ class FileLogRepository:
 
     def _parse_mcp_log_line(self, line: str) -> Optional[Dict[str, Any]]:
         """Parse a single MCP log line into a structured format."""
-        pattern = r'^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3}) - (\S+) - (\w+) - (.+)$'
-        match = re.match(pattern, line.strip())
-
-        if match:
-            timestamp_str, logger, level, message = match.groups()
-
-            log_type = "info"
-            tool_name = None
-
-            if "🔵 MCP CALL RECEIVED:" in message:
-                log_type = "request"
-                tool_name = message.split("🔵 MCP CALL RECEIVED:")[1].strip()
-            elif "✅ MCP CALL SUCCESS:" in message:
-                log_type = "success"
-                tool_name = message.split("✅ MCP CALL SUCCESS:")[1].strip()
-            elif "❌ MCP CALL ERROR:" in message:
-                log_type = "error"
-                tool_name = message.split("❌ MCP CALL ERROR:")[1].strip()
-            elif "📥 Arguments:" in message:
-                log_type = "arguments"
-            elif "📤 Result preview:" in message:
-                log_type = "result"
-            elif "🔴 Error:" in message:
-                log_type = "error_detail"
-            elif "=" * 10 in message:
-                log_type = "separator"
-
-            return {
-                "timestamp": timestamp_str,
-                "logger": logger,
-                "level": level,
-                "message": message,
-                "log_type": log_type,
-                "tool_name": tool_name
-            }
-
-        return None
+        return parse_mcp_log_line(line)
 
     def _group_mcp_logs_into_calls(self, logs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Group individual MCP log lines into call objects."""
@@ -478,6 +827,17 @@ class FileLogRepository:
 
         return calls
 
+    def _read_mcp_calls(self, entries) -> List[Dict[str, Any]]:
+        """Group the lines of indexed calls ((id, tool name, lines) tuples) into call objects."""
+        calls = []
+        for entry_id, _, lines in entries:
+            parsed_logs = [p for p in map(self._parse_mcp_log_line, lines) if p]
+            grouped = self._group_mcp_logs_into_calls(parsed_logs)
+            if grouped:
+                grouped[0]["id"] = entry_id
+                calls.append(grouped[0])
+        return calls
+
     async def get_mcp_logs(
         self,
         limit: int = 100,
@@ -486,8 +846,8 @@ class FileLogRepository:
         status_filter: Optional[str] = None,
         search: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Get MCP logs from file with filtering and pagination."""
-        if not self._mcp_log_file.exists():
+        """Get MCP logs from file with filtering and pagination (newest first)."""
+        if not self._mcp_log.refresh():
             return {
                 "calls": [],
                 "total": 0,
@@ -497,35 +857,20 @@ class FileLogRepository:
                 "log_file_exists": False
             }
 
-        with open(self._mcp_log_file, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-
-        parsed_logs = []
-        for line in lines:
-            parsed = self._parse_mcp_log_line(line)
-            if parsed:
-                parsed_logs.append(parsed)
-
-        calls = self._group_mcp_logs_into_calls(parsed_logs)
-
-        if tool_filter:
-            calls = [c for c in calls if tool_filter.lower() in (c.get("tool_name") or "").lower()]
-
-        if status_filter:
-            calls = [c for c in calls if c.get("status") == status_filter]
-
         if search:
+            # Search covers arguments/results, so every candidate call is read
             search_lower = search.lower()
-            calls = [c for c in calls if (
+            calls = [c for c in self._read_mcp_calls(self._mcp_log.scan(tool_filter, status_filter)) if (
                 search_lower in (c.get("tool_name") or "").lower() or
                 search_lower in (c.get("arguments") or "").lower() or
                 search_lower in (c.get("result") or "").lower() or
                 search_lower in (c.get("error") or "").lower()
             )]
-
-        calls.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
-        total = len(calls)
-        calls = calls[offset:offset + limit]
+            total = len(calls)
+            calls = calls[offset:offset + limit]
+        else:
+            total, entries = self._mcp_log.page(limit, offset, tool_filter, status_filter)
+            calls = self._read_mcp_calls(entries)
 
         return {
             "calls": calls,
@@ -538,7 +883,7 @@ class FileLogRepository:
 
     async def get_mcp_stats(self) -> Dict[str, Any]:
         """Get MCP log statistics from file."""
-        if not self._mcp_log_file.exists():
+        if not self._mcp_log.refresh():
             return {
                 "total_calls": 0,
                 "success_count": 0,
@@ -550,53 +895,34 @@ class FileLogRepository:
                 "log_file_exists": False
             }
 
-        with open(self._mcp_log_file, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-
-        parsed_logs = [self._parse_mcp_log_line(line) for line in lines]
-        parsed_logs = [l for l in parsed_logs if l]
-
-        calls = self._group_mcp_logs_into_calls(parsed_logs)
-
-        tools_used = {}
-        success_count = 0
-        error_count = 0
-
-        for call in calls:
-            tool = call.get("tool_name", "unknown")
-            tools_used[tool] = tools_used.get(tool, 0) + 1
-
-            if call.get("status") == "success":
-                success_count += 1
-            elif call.get("status") == "error":
-                error_count += 1
-
-        tools_used = dict(sorted(tools_used.items(), key=lambda x: x[1], reverse=True))
-
-        import os
-        file_stats = os.stat(self._mcp_log_file)
+        total, status_counts, name_counts = self._mcp_log.counts()
+        success_count = status_counts.get("success", 0)
+        error_count = status_counts.get("error", 0)
+        tools_used = dict(sorted(
+            ((tool, count) for tool, count in name_counts.items() if count),
+            key=lambda x: x[1], reverse=True
+        ))
 
         return {
-            "total_calls": len(calls),
+            "total_calls": total,
             "success_count": success_count,
             "error_count": error_count,
-            "pending_count": len(calls) - success_count - error_count,
-            "success_rate": round(success_count / len(calls) * 100, 2) if calls else 0,
+            "pending_count": total - success_count - error_count,
+            "success_rate": round(success_count / total * 100, 2) if total else 0,
             "tools_used": tools_used,
             "unique_tools": len(tools_used),
-            "log_file": str(self._mcp_log_file),
-            "log_file_exists": True,
-            "log_file_size_kb": round(file_stats.st_size / 1024, 2),
-            "log_file_modified": datetime.fromtimestamp(file_stats.st_mtime).isoformat()
+            **self._log_file_stats(self._mcp_log_file, self._mcp_log)
         }
 
     async def clear_mcp_logs(self) -> Dict[str, str]:
-        """Clear MCP log file."""
-        if not self._mcp_log_file.exists():
+        """Clear MCP log file and its rotated segments."""
+        if not self._mcp_log_file.exists() and not self._mcp_log.refresh():
             return {"message": "No log file to clear"}
 
-        with open(self._mcp_log_file, 'w', encoding='utf-8') as f:
-            f.write("")
+        if self._mcp_log_file.exists():
+            with open(self._mcp_log_file, 'w', encoding='utf-8') as f:
+                f.write("")
+        self._mcp_log.clear()
 
         return {"message": "Logs cleared successfully"}
 
@@ -606,48 +932,7 @@ class FileLogRepository:
 
     def _parse_hook_log_line(self, line: str) -> Optional[Dict[str, Any]]:
         """Parse a single hook log line into a structured format."""
-        pattern = r'^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}) \| ([^|]+) \| ([^|]+) \| (.+)$'
-        match = re.match(pattern, line.strip())
-
-        if match:
-            timestamp_str, hook_name, status, message = match.groups()
-            return {
-                "timestamp": timestamp_str.strip(),
-                "hook_name": hook_name.strip(),
-                "status": status.strip().lower(),
-                "message": message.strip()
-            }
-
-        alt_pattern = r'^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},?\d*) - (\w+) - (.+)$'
-        alt_match = re.match(alt_pattern, line.strip())
-
-        if alt_match:
-            timestamp_str, level, message = alt_match.groups()
-
-            hook_name = "unknown"
-            status = level.lower()
-
-            if "HOOK START:" in message:
-                hook_name = message.split("HOOK START:")[1].strip().split()[0]
-                status = "start"
-            elif "HOOK END:" in message:
-                hook_name = message.split("HOOK END:")[1].strip().split()[0]
-                status = "success"
-            elif "HOOK ERROR:" in message:
-                hook_name = message.split("HOOK ERROR:")[1].strip().split()[0]
-                status = "error"
-            elif "HOOK SKIP:" in message:
-                hook_name = message.split("HOOK SKIP:")[1].strip().split()[0]
-                status = "skipped"
-
-            return {
-                "timestamp": timestamp_str.strip(),
-                "hook_name": hook_name,
-                "status": status,
-                "message": message
-            }
-
-        return None
+        return parse_hook_log_line(line)
 
     def _group_hook_logs_into_executions(self, logs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Group individual hook log lines into execution objects."""
@@ -696,6 +981,19 @@ class FileLogRepository:
 
         return executions
 
+    def _read_hook_executions(self, entries) -> List[Dict[str, Any]]:
+        """Group the lines of indexed executions ((id, hook name, lines) tuples) into execution objects."""
+        executions = []
+        for entry_id, name, lines in entries:
+            # The range of a running/finished execution also spans lines of other hooks
+            parsed_logs = [p for p in map(self._parse_hook_log_line, lines) if p]
+            parsed_logs = parsed_logs[:1] + [p for p in parsed_logs[1:] if p.get("hook_name") == name]
+            grouped = self._group_hook_logs_into_executions(parsed_logs)
+            if grouped:
+                grouped[0]["id"] = entry_id
+                executions.append(grouped[0])
+        return executions
+
     async def get_hook_logs(
         self,
         limit: int = 100,
@@ -704,8 +1002,8 @@ class FileLogRepository:
         status_filter: Optional[str] = None,
         search: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Get hook logs from file with filtering and pagination."""
-        if not self._hook_log_file.exists():
+        """Get hook logs from file with filtering and pagination (newest first)."""
+        if not self._hook_log.refresh():
             return {
                 "executions": [],
                 "total": 0,
@@ -715,34 +1013,18 @@ class FileLogRepository:
                 "log_file_exists": False
             }
 
-        with open(self._hook_log_file, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-
-        parsed_logs = []
-        for line in lines:
-            parsed = self._parse_hook_log_line(line)
-            if parsed:
-                parsed_logs.append(parsed)
-
-        executions = self._group_hook_logs_into_executions(parsed_logs)
-
-        if hook_filter:
-            executions = [e for e in executions if hook_filter.lower() in (e.get("hook_name") or "").lower()]
-
-        if status_filter:
-            executions = [e for e in executions if e.get("status") == status_filter]
-
         if search:
             search_lower = search.lower()
-            executions = [e for e in executions if (
+            executions = [e for e in self._read_hook_executions(self._hook_log.scan(hook_filter, status_filter)) if (
                 search_lower in (e.get("hook_name") or "").lower() or
                 search_lower in (e.get("message") or "").lower() or
                 search_lower in (e.get("error") or "").lower()
             )]
-
-        executions.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
-        total = len(executions)
-        executions = executions[offset:offset + limit]
+            total = len(executions)
+            executions = executions[offset:offset + limit]
+        else:
+            total, entries = self._hook_log.page(limit, offset, hook_filter, status_filter)
+            executions = self._read_hook_executions(entries)
 
         return {
             "executions": executions,
@@ -755,7 +1037,7 @@ class FileLogRepository:
 
     async def get_hook_stats(self) -> Dict[str, Any]:
         """Get hook log statistics from file."""
-        if not self._hook_log_file.exists():
+        if not self._hook_log.refresh():
             return {
                 "total_executions": 0,
                 "success_count": 0,
@@ -767,55 +1049,34 @@ class FileLogRepository:
                 "log_file_exists": False
             }
 
-        with open(self._hook_log_file, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-
-        parsed_logs = [self._parse_hook_log_line(line) for line in lines]
-        parsed_logs = [l for l in parsed_logs if l]
-
-        executions = self._group_hook_logs_into_executions(parsed_logs)
-
-        hooks_used = {}
-        success_count = 0
-        error_count = 0
-        skipped_count = 0
-
-        for exec in executions:
-            hook = exec.get("hook_name", "unknown")
-            hooks_used[hook] = hooks_used.get(hook, 0) + 1
-
-            if exec.get("status") == "success":
-                success_count += 1
-            elif exec.get("status") == "error":
-                error_count += 1
-            elif exec.get("status") == "skipped":
-                skipped_count += 1
-
-        hooks_used = dict(sorted(hooks_used.items(), key=lambda x: x[1], reverse=True))
-
-        import os
-        file_stats = os.stat(self._hook_log_file)
+        total, status_counts, name_counts = self._hook_log.counts()
+        success_count = status_counts.get("success", 0)
+        error_count = status_counts.get("error", 0)
+        skipped_count = status_counts.get("skipped", 0)
+        hooks_used = dict(sorted(
+            ((hook, count) for hook, count in name_counts.items() if count),
+            key=lambda x: x[1], reverse=True
+        ))
 
         return {
-            "total_executions": len(executions),
+            "total_executions": total,
             "success_count": success_count,
             "error_count": error_count,
             "skipped_count": skipped_count,
-            "success_rate": round(success_count / len(executions) * 100, 2) if executions else 0,
+            "success_rate": round(success_count / total * 100, 2) if total else 0,
             "hooks_used": hooks_used,
             "unique_hooks": len(hooks_used),
-            "log_file": str(self._hook_log_file),
-            "log_file_exists": True,
-            "log_file_size_kb": round(file_stats.st_size / 1024, 2),
-            "log_file_modified": datetime.fromtimestamp(file_stats.st_mtime).isoformat()
+            **self._log_file_stats(self._hook_log_file, self._hook_log)
         }
 
     async def clear_hook_logs(self) -> Dict[str, str]:
-        """Clear hook log file."""
-        if not self._hook_log_file.exists():
+        """Clear hook log file and its rotated segments."""
+        if not self._hook_log_file.exists() and not self._hook_log.refresh():
             return {"message": "No hook log file to clear"}
 
-        with open(self._hook_log_file, 'w', encoding='utf-8') as f:
-            f.write("")
+        if self._hook_log_file.exists():
+            with open(self._hook_log_file, 'w', encoding='utf-8') as f:
+                f.write("")
+        self._hook_log.clear()
 
         return {"message": "Hook logs cleared successfully"}
@@ -0,0 +1,414 @@
+"""
+Segment-aware reading of the file-based MCP and hook logs.
+
+With rotation (mcp_server/log_rotation.py) a log is its active file plus
+rotated, usually gzipped, segments. SegmentedLog presents them as one
+sequence of entries, newest first:
+
+- the active file through its incremental LogIndex;
+- each segment through a summary (entries per name and status), computed
+  once by decompressing the segment and kept in a sidecar
+  (".mcp_calls.log.segments.json"), so totals, stats and page offsets
+  need no decompression;
+- a segment's entries are only decompressed when a page reaches into it
+  (the most recently used segments stay in memory).
+
+Entry ids count from the oldest retained segment.
+
+LogFollower tails the active file for streaming (services/log_stream.py)
+and keeps going across rotations.
+"""
+
+import os
+import sys
+import json
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .log_index import LogIndex, get_log_index, load_segment_index, NAME, STATUS
+
+# Make mcp_server modules (log_rotation) importable the same way the indexers do
+mcp_server_path = Path(__file__).parent.parent.parent.parent / "mcp_server"
+if str(mcp_server_path) not in sys.path:
+    sys.path.insert(0, str(mcp_server_path))
+
+from log_rotation import log_segments, segment_key
+from log_rotation import LogRotationPolicy  # noqa: F401 - re-exported for the routers
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_FORMAT_VERSION = 1
+
+# (entry id, tool/hook name, log lines) of one entry
+LogEntryLines = Tuple[int, Optional[str], List[str]]
+
+
+class SegmentedLog:
+    """
+    Active log file plus its rotated segments, read as one log.
+
+    Usage:
+        log = get_segmented_log(log_file, "mcp")
+        if log.refresh():
+            total, page = log.page(limit=50, offset=0, status_filter="error")
+            for entry_id, name, lines in page:
+                ...
+    """
+
+    def __init__(self, log_file: Path, kind: str, cached_segments: int = 2):
+        """
+        Initialize segmented log.
+
+        Args:
+            log_file: Active log file
+            kind: "mcp" or "hook"
+            cached_segments: Decompressed segments kept in memory
+        """
+        self.log_file = Path(log_file)
+        self.kind = kind
+        self.active = get_log_index(self.log_file, kind)
+        self.summary_file = self.log_file.with_name(f".{self.log_file.name}.segments.json")
+        self.segments: List[Path] = []  # Oldest first
+        self._summaries: Optional[Dict[str, Dict[str, Any]]] = None
+        self._loaded: "OrderedDict[str, LogIndex]" = OrderedDict()
+        self._cached_segments = cached_segments
+        self._lock = threading.Lock()
+
+    def refresh(self) -> bool:
+        """
+        Update the active index and summarize new segments.
+
+        Returns:
+            Whether the log exists (active file or any segment)
+        """
+        exists = self.active.refresh()
+        segments = log_segments(self.log_file)
+        with self._lock:
+            self.segments = segments
+            self._summarize(segments)
+        return exists or bool(segments)
+
+    def clear(self) -> None:
+        """Delete all segments and forget the active file's index"""
+        with self._lock:
+            for segment in log_segments(self.log_file):
+                try:
+                    segment.unlink()
+                except FileNotFoundError:
+                    pass
+            try:
+                self.summary_file.unlink()
+            except FileNotFoundError:
+                pass
+            self.segments = []
+            self._summaries = {}
+            self._loaded.clear()
+        self.active.reset()
+
+    # ==================
+    # Queries
+    # ==================
+
+    def page(
+        self,
+        limit: int,
+        offset: int,
+        name_filter: Optional[str] = None,
+        status_filter: Optional[str] = None
+    ) -> Tuple[int, List[LogEntryLines]]:
+        """
+        One page of matching entries, newest first.
+
+        Only the segments the page overlaps are decompressed.
+
+        Returns:
+            (total matching entries, entries of the page)
+        """
+        sources = self._sources(name_filter, status_filter)
+        total = sum(count for _, _, count in sources)
+
+        entries: List[LogEntryLines] = []
+        skip, remaining = offset, limit
+        for base, segment, count in sources:
+            if remaining <= 0:
+                break
+            if skip >= count:
+                skip -= count
+                continue
+            index = self._index(segment)
+            ordinals = index.select(name_filter, status_filter)[skip:skip + remaining]
+            entries.extend(self._read(index, base, ordinals))
+            remaining -= len(ordinals)
+            skip = 0
+        return total, entries
+
+    def scan(self, name_filter: Optional[str] = None, status_filter: Optional[str] = None) -> Iterator[LogEntryLines]:
+        """All matching entries, newest first (decompresses segments as it reaches them)"""
+        for base, segment, count in self._sources(name_filter, status_filter):
+            if count:
+                index = self._index(segment)
+                yield from self._read(index, base, index.select(name_filter, status_filter))
+
+    def counts(self) -> Tuple[int, Dict[str, int], Dict[Optional[str], int]]:
+        """
+        Entry counters over the active file and all segments.
+
+        Returns:
+            (total entries, entries per status, entries per name)
+        """
+        total = len(self.active.entries)
+        status_counts = dict(self.active.status_counts)
+        name_counts = dict(self.active.name_counts)
+        with self._lock:
+            summaries = [self._summaries[segment_key(segment)] for segment in self.segments]
+        for summary in summaries:
+            total += summary["entries"]
+            for name, status, count in summary["counts"]:
+                status_counts[status] = status_counts.get(status, 0) + count
+                name_counts[name] = name_counts.get(name, 0) + count
+        return total, status_counts, name_counts
+
+    def segment_bytes(self) -> int:
+        """Size on disk of the rotated segments"""
+        size = 0
+        for segment in self.segments:
+            try:
+                size += segment.stat().st_size
+            except FileNotFoundError:
+                continue
+        return size
+
+    def _sources(self, name_filter: Optional[str], status_filter: Optional[str]) -> List[Tuple[int, Optional[Path], int]]:
+        """(id of first entry, segment or None for the active file, matching entries), newest first"""
+        name_filter = name_filter.lower() if name_filter else None
+        with self._lock:
+            segments = [(segment, self._summaries[segment_key(segment)]) for segment in self.segments]
+
+        sources = []
+        base = 0
+        for segment, summary in segments:
+            count = sum(
+                n for name, status, n in summary["counts"]
+                if (not status_filter or status == status_filter)
+                and (not name_filter or name_filter in (name or "").lower())
+            )
+            sources.append((base, segment, count))
+            base += summary["entries"]
+        sources.append((base, None, len(self.active.select(name_filter, status_filter))))
+        sources.reverse()
+        return sources
+
+    def _read(self, index: LogIndex, base: int, ordinals: Sequence[int]) -> Iterator[LogEntryLines]:
+        for ordinal, lines in index.read(ordinals):
+            yield base + ordinal, index.entries[ordinal][NAME], lines
+
+    # ==================
+    # Segments
+    # ==================
+
+    def _index(self, segment: Optional[Path]) -> LogIndex:
+        """Index of the active file (None) or of a segment (decompressed on first use)"""
+        if segment is None:
+            return self.active
+        key = segment_key(segment)
+        with self._lock:
+            index = self._loaded.get(key)
+            if index is not None:
+                self._loaded.move_to_end(key)
+                return index
+        index = self._load_segment(segment)
+        with self._lock:
+            self._loaded[key] = index
+            while len(self._loaded) > self._cached_segments:
+                self._loaded.popitem(last=False)
+        return index
+
+    def _load_segment(self, segment: Path) -> LogIndex:
+        try:
+            return load_segment_index(segment, self.kind)
+        except FileNotFoundError:
+            # Compressed since it was listed
+            return load_segment_index(segment.with_name(segment.name + ".gz"), self.kind)
+
+    def _summarize(self, segments: List[Path]) -> None:
+        """Make sure every segment has a summary; drop summaries of deleted segments (lock held)"""
+        if self._summaries is None:
+            self._summaries = self._read_summaries()
+
+        keys = [segment_key(segment) for segment in segments]
+        changed = False
+        for key, segment in zip(keys, segments):
+            if key in self._summaries:
+                continue
+            index = self._load_segment(segment)
+            counts: Dict[Tuple[Optional[str], str], int] = {}
+            for entry in index.entries:
+                counts[(entry[NAME], entry[STATUS])] = counts.get((entry[NAME], entry[STATUS]), 0) + 1
+            self._summaries[key] = {
+                "entries": len(index.entries),
+                "counts": [[name, status, count] for (name, status), count in counts.items()]
+            }
+            self._loaded[key] = index
+            changed = True
+        while len(self._loaded) > self._cached_segments:
+            self._loaded.popitem(last=False)
+
+        for key in set(self._summaries) - set(keys):
+            del self._summaries[key]
+            self._loaded.pop(key, None)
+            changed = True
+        if changed:
+            self._write_summaries()
+
+    def _read_summaries(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.summary_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == SUMMARY_FORMAT_VERSION:
+                return data["segments"]
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, AttributeError) as e:
+            logger.warning(f"Ignoring unreadable segment summaries {self.summary_file}: {e}")
+        return {}
+
+    def _write_summaries(self) -> None:
+        partial = self.summary_file.with_name(self.summary_file.name + ".tmp")
+        try:
+            with open(partial, "w", encoding="utf-8") as f:
+                json.dump({"version": SUMMARY_FORMAT_VERSION, "segments": self._summaries}, f, ensure_ascii=False)
+            os.replace(partial, self.summary_file)
+        except OSError as e:
+            logger.warning(f"Could not write segment summaries {self.summary_file}: {e}")
+
+
+# Segmented logs of this process, shared by all repository instances
+_segmented_logs: Dict[Tuple[str, str], SegmentedLog] = {}
+_segmented_logs_lock = threading.Lock()
+
+
+def get_segmented_log(log_file: Path, kind: str) -> SegmentedLog:
+    """
+    Process-wide segmented view of a log.
+
+    Args:
+        log_file: Active log file
+        kind: "mcp" (mcp_calls.log) or "hook" (hooks.log)
+    """
+    key = (kind, os.path.abspath(log_file))
+    with _segmented_logs_lock:
+        log = _segmented_logs.get(key)
+        if log is None:
+            log = _segmented_logs[key] = SegmentedLog(log_file, kind)
+        return log
+
+
+class LogFollower:
+    """
+    Reads the lines appended to a log, following it across rotations.
+
+    The log stays open between reads: once it has been rotated, the rest
+    of the moved segment is read through the open handle (even if it was
+    compressed and deleted meanwhile), then reading continues at the start
+    of the new active file.
+
+    Usage:
+        follower = LogFollower(log_file)
+        try:
+            while True:
+                for line in follower.read_lines():
+                    ...
+                await asyncio.sleep(1)
+        finally:
+            follower.close()
+    """
+
+    def __init__(self, log_file: Path, position: int = 0):
+        """
+        Initialize follower.
+
+        Args:
+            log_file: Active log file
+            position: Byte offset in the active file to start at
+        """
+        self.log_file = Path(log_file)
+        self.position = position
+        self.inode: Optional[int] = None  # Of the file being read
+        self._file = None
+        self._pending = b""
+
+    @property
+    def offset(self) -> int:
+        """Byte offset just past the last complete line read"""
+        return self.position - len(self._pending)
+
+    def read_lines(self) -> List[str]:
+        """Complete lines appended since the last call"""
+        return [line for _, _, line in self.read_entries()]
+
+    def read_entries(self) -> List[Tuple[int, int, str]]:
+        """
+        Complete lines appended since the last call, with where they end.
+
+        Returns:
+            (inode of the file, byte offset just past the line, line) per line
+        """
+        if self._file is None:
+            try:
+                self._file = open(self.log_file, "rb")
+            except FileNotFoundError:
+                return []
+            opened = os.fstat(self._file.fileno())
+            self.inode = opened.st_ino
+            if opened.st_size < self.position:
+                self.position = 0
+            self._file.seek(self.position)
+        else:
+            opened = os.fstat(self._file.fileno())
+            try:
+                current = os.stat(self.log_file)
+            except FileNotFoundError:
+                current = None
+            if current is None or current.st_ino != opened.st_ino:
+                # Rotated: finish the moved segment, then start on the new file
+                entries = self._split(self._file.read(), final=True)
+                self.close()
+                self.position = 0
+                return entries + self.read_entries()
+            if opened.st_size < self.position:
+                # Truncated in place (logs cleared)
+                self._file.seek(0)
+                self.position = 0
+                self._pending = b""
+
+        return self._split(self._file.read())
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _split(self, data: bytes, final: bool = False) -> List[Tuple[int, int, str]]:
+        start = self.offset
+        self.position += len(data)
+        data = self._pending + data
+
+        entries = []
+        begin = 0
+        newline = data.find(b"\n")
+        while newline >= 0:
+            entries.append((self.inode, start + newline + 1, self._decode(data[begin:newline])))
+            begin = newline + 1
+            newline = data.find(b"\n", begin)
+        self._pending = data[begin:]
+        if final and self._pending:
+            entries.append((self.inode, start + len(data), self._decode(self._pending)))
+            self._pending = b""
+        return entries
+
+    @staticmethod
+    def _decode(line: bytes) -> str:
+        return line.rstrip(b"\r").decode("utf-8", errors="replace")
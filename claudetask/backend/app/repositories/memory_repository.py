@@ -1,5 +1,6 @@
 """Memory repository implementations for conversation storage and vector search"""
 
+import json
 from typing import Optional, List, Dict, Any
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, text
@@ -13,18 +14,30 @@ class SQLiteMemoryRepository(BaseRepository):
     """
     SQLite implementation of conversation memory repository.
 
-    Uses ChromaDB for vector search with all-MiniLM-L6-v2 embeddings (384d).
-    This implementation maintains backward compatibility with local storage.
+    Messages are stored in the conversation_memory table; their
+    all-MiniLM-L6-v2 embeddings (384d) are stored and searched with the
+    local vector store (memory_vectors table), so search works offline.
     """
 
-    def __init__(self, db: AsyncSession):
+    VECTOR_TABLE_NAME = "memory_vectors"
+
+    def __init__(self, db: AsyncSession, vector_store=None):
         """
         Initialize SQLite memory repository.
 
         Args:
             db: SQLAlchemy async session
+            vector_store: LocalVectorStore (default: process-wide store)
         """
         self._db = db
+        self._vector_store = vector_store
+
+    @property
+    def vector_store(self):
+        if self._vector_store is None:
+            from .local_vector_store import get_local_vector_store
+            self._vector_store = get_local_vector_store()
+        return self._vector_store
 
     async def get_by_id(self, id: str) -> Optional[Dict[str, Any]]:
         """Retrieve conversation message by ID from SQLite."""
@@ -38,10 +51,18 @@ class SQLiteMemoryRepository(BaseRepository):
         return None
 
     async def create(self, entity: Any) -> str:
-        """Create new conversation message in SQLite."""
-        # This would use ChromaDB for actual storage
-        # For now, placeholder implementation
-        pass
+        """Create new conversation message in SQLite (without embedding)."""
+        metadata = dict(entity.get("metadata") or {})
+        for field in ("message_type", "session_id", "task_id"):
+            if entity.get(field) is not None:
+                metadata.setdefault(field, entity[field])
+
+        return await self.save_message(
+            project_id=entity["project_id"],
+            content=entity["content"],
+            embedding=entity.get("embedding"),
+            metadata=metadata
+        )
 
     async def update(self, entity: Any) -> None:
         """Update conversation message in SQLite."""
@@ -49,10 +70,19 @@ class SQLiteMemoryRepository(BaseRepository):
 
     async def delete(self, id: str) -> None:
         """Delete conversation message from SQLite."""
+        row = await self.get_by_id(id)
         query = text("DELETE FROM conversation_memory WHERE id = :id")
         await self._db.execute(query, {"id": int(id)})
         await self._db.commit()
 
+        if row:
+            project_id = row["project_id"]
+            await self.vector_store.run(lambda conn: conn.execute(
+                f"DELETE FROM {self.VECTOR_TABLE_NAME} WHERE project_id = ? AND message_id = ?",
+                (project_id, str(id))
+            ))
+            await self.vector_store.index_remove(self.VECTOR_TABLE_NAME, project_id, [str(id)])
+
     async def list(
         self,
         skip: int = 0,
@@ -103,19 +133,100 @@ class SQLiteMemoryRepository(BaseRepository):
         """
         Save conversation message with embedding.
 
-        For SQLite mode, this delegates to ChromaDB.
+        The message goes to conversation_memory, the embedding (if any) to
+        the local vector store.
 
         Args:
             project_id: Project ID
             content: Message content
-            embedding: 384-dimensional vector (all-MiniLM-L6-v2)
+            embedding: 384-dimensional vector (all-MiniLM-L6-v2), or None
             metadata: Additional metadata (message_type, session_id, etc.)
 
         Returns:
             ID of saved message
         """
-        # Placeholder - actual implementation would use ChromaDB
-        return "1"
+        query = text("""
+            INSERT INTO conversation_memory
+            (project_id, session_id, task_id, message_type, content, timestamp, metadata)
+            VALUES (:project_id, :session_id, :task_id, :message_type, :content, :timestamp, :metadata)
+        """)
+        result = await self._db.execute(query, {
+            "project_id": project_id,
+            "session_id": metadata.get("session_id"),
+            "task_id": metadata.get("task_id"),
+            "message_type": metadata.get("message_type", "unknown"),
+            "content": content,
+            "timestamp": datetime.utcnow(),
+            "metadata": json.dumps(metadata)
+        })
+        await self._db.commit()
+
+        message_id = str(result.lastrowid)
+        if embedding:
+            await self.save_embeddings(project_id, [message_id], [embedding])
+
+        return message_id
+
+    async def save_embeddings(
+        self,
+        project_id: str,
+        message_ids: List[str],
+        embeddings: List[List[float]]
+    ) -> None:
+        """
+        Store embeddings of existing messages in the local vector store.
+
+        Args:
+            project_id: Project ID
+            message_ids: Message IDs
+            embeddings: One vector per message
+        """
+        store = self.vector_store
+        await store.run(lambda conn: conn.executemany(
+            f"INSERT OR REPLACE INTO {self.VECTOR_TABLE_NAME} (project_id, message_id, embedding) VALUES (?, ?, ?)",
+            [(project_id, str(message_id), store.pack(vector)) for message_id, vector in zip(message_ids, embeddings)]
+        ))
+        await store.index_add(self.VECTOR_TABLE_NAME, project_id, [str(message_id) for message_id in message_ids], embeddings)
+
+    async def get_messages_without_embeddings(self, project_id: str, limit: int = 500) -> List[Dict[str, Any]]:
+        """
+        Get messages that have no vector yet (saved before local vector search).
+
+        Args:
+            project_id: Project ID
+            limit: Maximum number of messages
+
+        Returns:
+            Messages (id, content), newest first
+        """
+        embedded = set(await self.vector_store.run(lambda conn: [
+            row[0] for row in conn.execute(
+                f"SELECT message_id FROM {self.VECTOR_TABLE_NAME} WHERE project_id = ?", (project_id,)
+            ).fetchall()
+        ]))
+
+        # Cheap check first: every message has a vector (the usual case)
+        total = await self._db.execute(
+            text("SELECT COUNT(*) FROM conversation_memory WHERE project_id = :project_id"),
+            {"project_id": project_id}
+        )
+        if total.scalar() <= len(embedded):
+            return []
+
+        query = text("""
+            SELECT id, content FROM conversation_memory
+            WHERE project_id = :project_id
+            ORDER BY id DESC
+        """)
+        result = await self._db.execute(query, {"project_id": project_id})
+
+        missing = []
+        for row in result:
+            if str(row.id) not in embedded:
+                missing.append({"id": str(row.id), "content": row.content})
+                if len(missing) >= limit:
+                    break
+        return missing
 
     async def vector_search(
         self,
@@ -125,19 +236,45 @@ class SQLiteMemoryRepository(BaseRepository):
         filters: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
         """
-        Semantic search using ChromaDB (for local storage).
+        Semantic search with the local vector store (for local storage).
 
         Args:
             project_id: Project ID to search within
             query_embedding: Query vector (384d)
             limit: Maximum number of results
-            filters: Optional metadata filters
+            filters: Optional metadata filters (session_id)
 
         Returns:
             List of matching messages with similarity scores
         """
-        # Placeholder - actual implementation would use ChromaDB
-        return []
+        allow = None
+        if filters and filters.get("session_id"):
+            result = await self._db.execute(
+                text("SELECT id FROM conversation_memory WHERE project_id = :project_id AND session_id = :session_id"),
+                {"project_id": project_id, "session_id": filters["session_id"]}
+            )
+            allowed = {str(row.id) for row in result}
+            allow = allowed.__contains__
+
+        hits = await self.vector_store.search(
+            self.VECTOR_TABLE_NAME, project_id, query_embedding, k=limit, allow=allow
+        )
+        if not hits:
+            return []
+
+        scores = {int(message_id): score for message_id, score in hits}
+        id_params = {f"id_{i}": message_id for i, message_id in enumerate(scores)}
+        query = text(
+            f"SELECT * FROM conversation_memory WHERE id IN ({', '.join(':' + name for name in id_params)})"
+        )
+        result = await self._db.execute(query, id_params)
+
+        messages = []
+        for row in result.fetchall():
+            message = dict(row._mapping)
+            message["score"] = scores[message["id"]]
+            messages.append(message)
+        return sorted(messages, key=lambda message: message["score"], reverse=True)
 
     # ==================
     # Summary Methods (SQLite)
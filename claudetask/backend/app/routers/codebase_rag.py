@@ -1,27 +1,35 @@
 """
-Codebase RAG API endpoints for MongoDB Atlas integration.
+Codebase RAG API endpoints.
 
 These endpoints provide:
 - Full codebase indexing
 - Incremental reindexing
-- Semantic code search via MongoDB Atlas Vector Search
+- Semantic, lexical (BM25) and hybrid code search
+- Symbol lookup ("go to definition") by exact name, prefix or fuzzy match
 - Indexing statistics
 
-All endpoints require MongoDB Atlas storage mode to be configured.
+Projects in MongoDB Atlas storage mode use Atlas Vector Search with Voyage
+AI embeddings; local projects use the local vector store (SQLite file plus
+in-process vector index) with the local embedding model.
 """
 
 import os
 import logging
-from typing import Optional, List
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
+from typing import Optional, List, Dict, Any
+from fastapi import APIRouter, HTTPException, Depends, Query
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database import get_db
+from ..database import get_db, AsyncSessionLocal
 from ..database_mongodb import mongodb_manager
-from ..repositories.codebase_repository import MongoDBCodebaseRepository
-from ..services.codebase_indexer import CodebaseIndexer, CodebaseSearchService
-from ..services.embedding_service import VoyageEmbeddingService
+from ..repositories.codebase_repository import MongoDBCodebaseRepository, SQLiteCodebaseRepository
+from ..repositories.factory import RepositoryFactory
+from ..repositories.local_vector_store import get_local_vector_store
+from ..services.codebase_indexer import CodebaseIndexer, CodebaseSearchService, search_scope
+from ..services.rag_engine import rag_engine
+from ..services.indexing_jobs import indexing_jobs, IndexingJob, ProgressCallback
+from .indexing_jobs import job_response
+from retrieval import query_cache
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +58,7 @@ class SearchRequest(BaseModel):
     limit: int = 20
     min_similarity: float = 0.0
     language: Optional[str] = None
+    mode: str = "hybrid"  # semantic, lexical or hybrid
 
 
 class ReindexRequest(BaseModel):
@@ -73,44 +82,115 @@ def get_voyage_api_key() -> str:
     return api_key
 
 
-async def get_codebase_services(project_id: str):
+async def get_storage_mode(project_id: str) -> str:
+    """Get the storage mode ("local" or "mongodb") of a project"""
+    async with AsyncSessionLocal() as db:
+        return await RepositoryFactory.get_storage_mode_for_project(project_id, db)
+
+
+async def get_codebase_repository(project_id: str):
+    """
+    Get the codebase repository for a project's storage mode.
+
+    Args:
+        project_id: Project ID
+
+    Returns:
+        Tuple of (repository, storage_mode)
+
+    Raises:
+        HTTPException: If the project uses MongoDB and it is not connected
+    """
+    storage_mode = await get_storage_mode(project_id)
+
+    if storage_mode == "mongodb":
+        if not mongodb_manager.client:
+            raise HTTPException(
+                status_code=503,
+                detail="MongoDB not connected. Configure MongoDB Atlas in Settings → Cloud Storage."
+            )
+        return MongoDBCodebaseRepository(mongodb_manager.get_database()), storage_mode
+
+    return SQLiteCodebaseRepository(get_local_vector_store()), storage_mode
+
+
+async def get_codebase_services(project_id: str, progress_callback: Optional[ProgressCallback] = None):
     """
     Get codebase repository, indexer, and search service.
 
+    Args:
+        project_id: Project ID
+        progress_callback: Progress callback for the indexer (indexing jobs)
+
     Returns:
         Tuple of (repository, indexer, search_service)
 
     Raises:
-        HTTPException: If MongoDB not configured
+        HTTPException: If MongoDB not connected (MongoDB projects) or the
+            local embedding model is unavailable (local projects)
     """
-    if not mongodb_manager.client:
-        raise HTTPException(
-            status_code=503,
-            detail="MongoDB not connected. Configure MongoDB Atlas in Settings → Cloud Storage."
-        )
+    repository, storage_mode = await get_codebase_repository(project_id)
 
     try:
-        db = mongodb_manager.get_database()
-        repository = MongoDBCodebaseRepository(db)
-
-        # Ensure indexes exist
-        await repository.ensure_indexes()
+        if storage_mode == "mongodb":
+            # Ensure indexes exist
+            await repository.ensure_indexes()
 
-        # Create embedding service
-        api_key = get_voyage_api_key()
-        embedding_service = VoyageEmbeddingService(api_key)
+            # Create embedding service
+            api_key = get_voyage_api_key()
+            embedding_service = rag_engine.get_voyage_service(api_key)
+        else:
+            embedding_service = await rag_engine.get_local_embedding_service()
 
         # Create indexer and search service
-        indexer = CodebaseIndexer(repository, embedding_service)
+        indexer = CodebaseIndexer(repository, embedding_service, progress_callback=progress_callback)
         search_service = CodebaseSearchService(repository, embedding_service)
 
         return repository, indexer, search_service
 
+    except ImportError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Local embedding model not available ({e}). Install sentence-transformers and numpy."
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to initialize codebase services: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def run_codebase_job(job: IndexingJob, progress_callback: ProgressCallback) -> Dict[str, Any]:
+    """Execute a queued codebase indexing job (runner for indexing_jobs)"""
+    _, indexer, _ = await get_codebase_services(job.project_id, progress_callback=progress_callback)
+
+    try:
+        if job.operation == "index":
+            return await indexer.index_codebase(
+                project_id=job.project_id,
+                repo_path=job.repo_path,
+                full_reindex=job.full_reindex
+            )
+        if job.operation == "reindex":
+            return await indexer.reindex_changed_files(
+                project_id=job.project_id,
+                repo_path=job.repo_path
+            )
+        return await indexer.index_files(
+            project_id=job.project_id,
+            file_paths=job.file_paths,
+            repo_path=job.repo_path
+        )
+    except BaseException:
+        # Failed or cancelled (including shutdown) after the indexer may have
+        # written chunks: drop cached results of the old index
+        query_cache.bump(search_scope(job.project_id))
+        raise
+
+
+indexing_jobs.register_runner("codebase", run_codebase_job)
+
+
 # ==================
 # Endpoints
 # ==================
@@ -119,48 +199,38 @@ async def get_codebase_services(project_id: str):
 async def index_codebase(
     project_id: str,
     request: IndexRequest,
-    background_tasks: BackgroundTasks
+    wait: bool = Query(False, description="Wait for completion and return statistics")
 ):
     """
     Index entire codebase for a project.
 
-    This operation can take several minutes for large codebases.
-    Consider running in background for large repositories.
+    Indexing runs as a background job; the response contains the job ID
+    for /api/indexing/jobs/{job_id}. A trigger arriving while another job
+    for the project is queued is merged into it.
 
     Args:
         project_id: Project ID
         request: Index request with repo_path and full_reindex flag
+        wait: Wait for the job to finish (can take several minutes)
 
     Returns:
-        Indexing statistics
+        Queued job, or indexing statistics when wait is set
     """
-    repository, indexer, _ = await get_codebase_services(project_id)
-
-    try:
-        logger.info(f"Starting codebase indexing for project {project_id}")
-
-        # Run indexing
-        stats = await indexer.index_codebase(
-            project_id=project_id,
-            repo_path=request.repo_path,
-            full_reindex=request.full_reindex
-        )
+    await get_codebase_services(project_id)
 
-        return {
-            "status": "success",
-            "message": "Codebase indexing completed",
-            **stats
-        }
-
-    except Exception as e:
-        logger.error(f"Indexing failed for project {project_id}: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    logger.info(f"Queueing codebase indexing for project {project_id}")
+    job, merged = indexing_jobs.submit(
+        project_id, "codebase", "index", request.repo_path,
+        full_reindex=request.full_reindex
+    )
+    return await job_response(job, merged, wait, "Codebase indexing completed")
 
 
 @router.post("/{project_id}/index-files")
 async def index_files(
     project_id: str,
-    request: IndexFilesRequest
+    request: IndexFilesRequest,
+    wait: bool = Query(False, description="Wait for completion and return statistics")
 ):
     """
     Index specific files.
@@ -169,39 +239,31 @@ async def index_files(
     - Re-indexing modified files
     - Adding new files to index
 
+    File lists of triggers queued for the same project are combined.
+
     Args:
         project_id: Project ID
         request: List of file paths and repo path
+        wait: Wait for the job to finish
 
     Returns:
-        Indexing statistics
+        Queued job, or indexing statistics when wait is set
     """
-    repository, indexer, _ = await get_codebase_services(project_id)
-
-    try:
-        logger.info(f"Indexing {len(request.file_paths)} files for project {project_id}")
-
-        stats = await indexer.index_files(
-            project_id=project_id,
-            file_paths=request.file_paths,
-            repo_path=request.repo_path
-        )
+    await get_codebase_services(project_id)
 
-        return {
-            "status": "success",
-            "message": f"Indexed {stats['indexed_files']} files",
-            **stats
-        }
-
-    except Exception as e:
-        logger.error(f"File indexing failed for project {project_id}: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    logger.info(f"Queueing indexing of {len(request.file_paths)} files for project {project_id}")
+    job, merged = indexing_jobs.submit(
+        project_id, "codebase", "index_files", request.repo_path,
+        file_paths=request.file_paths
+    )
+    return await job_response(job, merged, wait, "File indexing completed")
 
 
 @router.post("/{project_id}/reindex")
 async def reindex_codebase(
     project_id: str,
-    request: ReindexRequest
+    request: ReindexRequest,
+    wait: bool = Query(False, description="Wait for completion and return statistics")
 ):
     """
     Incrementally reindex changed files.
@@ -212,29 +274,16 @@ async def reindex_codebase(
     Args:
         project_id: Project ID
         request: Reindex request with repo path
+        wait: Wait for the job to finish
 
     Returns:
-        Reindexing statistics
+        Queued job, or reindexing statistics when wait is set
     """
-    repository, indexer, _ = await get_codebase_services(project_id)
+    await get_codebase_services(project_id)
 
-    try:
-        logger.info(f"Starting incremental reindex for project {project_id}")
-
-        stats = await indexer.reindex_changed_files(
-            project_id=project_id,
-            repo_path=request.repo_path
-        )
-
-        return {
-            "status": "success",
-            "message": "Incremental reindex completed",
-            **stats
-        }
-
-    except Exception as e:
-        logger.error(f"Reindex failed for project {project_id}: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    logger.info(f"Queueing incremental reindex for project {project_id}")
+    job, merged = indexing_jobs.submit(project_id, "codebase", "reindex", request.repo_path)
+    return await job_response(job, merged, wait, "Incremental reindex completed")
 
 
 @router.post("/{project_id}/search")
@@ -245,8 +294,11 @@ async def search_codebase(
     """
     Search codebase using natural language query.
 
-    Uses MongoDB Atlas Vector Search with Voyage AI embeddings
-    for semantic code search.
+    Uses MongoDB Atlas Vector Search with Voyage AI embeddings for
+    MongoDB projects and the local vector store for local projects. The
+    default hybrid mode fuses semantic results with a BM25 ranking over
+    chunk content and symbols; identifier queries naming a defined symbol
+    are answered from the symbol index directly.
 
     Args:
         project_id: Project ID
@@ -265,16 +317,68 @@ async def search_codebase(
             query=request.query,
             limit=request.limit,
             min_similarity=request.min_similarity,
-            language=request.language
+            language=request.language,
+            mode=request.mode
         )
 
         return results
 
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Search failed for project {project_id}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/{project_id}/symbols")
+async def search_symbols(
+    project_id: str,
+    q: str = Query(..., min_length=1, description="Symbol name, prefix or abbreviation"),
+    match: str = Query("fuzzy", description="exact, prefix or fuzzy"),
+    kind: Optional[str] = Query(None, description="Filter by kind (function, class)"),
+    language: Optional[str] = Query(None, description="Filter by language"),
+    limit: int = Query(20, ge=1, le=200)
+):
+    """
+    Find symbol definitions in the project's symbol table.
+
+    The symbol table is maintained by the indexer (one entry per function
+    or class definition with its full line range), so lookups need neither
+    embeddings nor a semantic search.
+
+    Args:
+        project_id: Project ID
+        q: Symbol name ("Class.method" looks up "method")
+        match: "exact" (case-insensitive), "prefix" or "fuzzy" (characters in order)
+        kind: Optional kind filter
+        language: Optional language filter
+        limit: Maximum number of results
+
+    Returns:
+        Matching definitions (name, kind, file_path, start_line, end_line, language, score), best first
+    """
+    repository, _ = await get_codebase_repository(project_id)
+
+    try:
+        symbols = await repository.search_symbols(
+            project_id, q, match=match, kind=kind, language=language, limit=limit
+        )
+
+        return {
+            "project_id": project_id,
+            "query": q,
+            "match": match,
+            "total": len(symbols),
+            "symbols": symbols
+        }
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Symbol search failed for project {project_id}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/{project_id}/stats")
 async def get_stats(project_id: str):
     """
@@ -283,10 +387,14 @@ async def get_stats(project_id: str):
     Returns:
         - Total chunks indexed
         - Total files indexed
+        - Total symbol definitions
         - Breakdown by language
         - Breakdown by chunk type
+        - Query cache hit/miss metrics (query embeddings and search results)
     """
-    if not mongodb_manager.client:
+    try:
+        repository, storage_mode = await get_codebase_repository(project_id)
+    except HTTPException:
         return {
             "total_chunks": 0,
             "total_files": 0,
@@ -294,11 +402,10 @@ async def get_stats(project_id: str):
         }
 
     try:
-        db = mongodb_manager.get_database()
-        repository = MongoDBCodebaseRepository(db)
-
         stats = await repository.get_stats(project_id)
         stats["status"] = "active"
+        stats["storage_mode"] = storage_mode
+        stats["query_cache"] = query_cache.stats(search_scope(project_id))
 
         return stats
 
@@ -320,16 +427,9 @@ async def get_indexed_files(project_id: str):
     Returns:
         List of file paths
     """
-    if not mongodb_manager.client:
-        raise HTTPException(
-            status_code=503,
-            detail="MongoDB not connected"
-        )
+    repository, _ = await get_codebase_repository(project_id)
 
     try:
-        db = mongodb_manager.get_database()
-        repository = MongoDBCodebaseRepository(db)
-
         files = await repository.get_indexed_files(project_id)
 
         return {
@@ -356,17 +456,11 @@ async def delete_project_index(project_id: str):
     Returns:
         Number of deleted chunks
     """
-    if not mongodb_manager.client:
-        raise HTTPException(
-            status_code=503,
-            detail="MongoDB not connected"
-        )
+    repository, _ = await get_codebase_repository(project_id)
 
     try:
-        db = mongodb_manager.get_database()
-        repository = MongoDBCodebaseRepository(db)
-
         deleted = await repository.delete_by_project(project_id)
+        query_cache.bump(search_scope(project_id))
 
         return {
             "status": "success",
@@ -4,21 +4,28 @@ Documentation RAG API endpoints.
 These endpoints provide:
 - Full documentation indexing
 - Incremental reindexing
-- Semantic documentation search via MongoDB Atlas Vector Search
+- Semantic documentation search (MongoDB Atlas Vector Search, or the
+  local vector store for projects in local storage mode)
 - Indexing statistics
 """
 
 import os
 import logging
-from typing import Optional
+from typing import Optional, Dict, Any
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 
+from ..database import AsyncSessionLocal
 from ..database_mongodb import mongodb_manager
-from ..repositories.documentation_repository import MongoDBDocumentationRepository
-from ..services.documentation_indexer import DocumentationIndexer, DocumentationSearchService
-from ..services.embedding_service import VoyageEmbeddingService
+from ..repositories.documentation_repository import MongoDBDocumentationRepository, SQLiteDocumentationRepository
+from ..repositories.factory import RepositoryFactory
+from ..repositories.local_vector_store import get_local_vector_store
+from ..services.documentation_indexer import DocumentationIndexer, DocumentationSearchService, search_scope
+from ..services.rag_engine import rag_engine
+from ..services.indexing_jobs import indexing_jobs, IndexingJob, ProgressCallback
+from .indexing_jobs import job_response
+from retrieval import query_cache
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/documentation-rag", tags=["documentation-rag"])
@@ -53,12 +60,31 @@ class SearchRequest(BaseModel):
 
 # Helper functions
 
-async def get_documentation_services(project_id: str):
+async def get_documentation_services(project_id: str, progress_callback: Optional[ProgressCallback] = None):
     """
     Get documentation repository, indexer, and search service.
 
-    Requires MongoDB storage mode with Voyage AI API key.
+    MongoDB projects require a Voyage AI API key; local projects use the
+    local vector store and embedding model.
+    progress_callback is passed to the indexer (indexing jobs).
     """
+    async with AsyncSessionLocal() as session:
+        storage_mode = await RepositoryFactory.get_storage_mode_for_project(project_id, session)
+
+    if storage_mode != "mongodb":
+        try:
+            repository = SQLiteDocumentationRepository(get_local_vector_store())
+            embedding_service = await rag_engine.get_local_embedding_service()
+        except ImportError as e:
+            raise HTTPException(
+                status_code=503,
+                detail=f"Local embedding model not available ({e}). Install sentence-transformers and numpy."
+            )
+
+        indexer = DocumentationIndexer(repository, embedding_service, progress_callback=progress_callback)
+        search_service = DocumentationSearchService(repository, embedding_service)
+        return repository, indexer, search_service
+
     # Check MongoDB connection
     if not mongodb_manager.client:
         raise HTTPException(
@@ -81,8 +107,8 @@ async def get_documentation_services(project_id: str):
         # Ensure indexes exist
         await repository.ensure_indexes()
 
-        embedding_service = VoyageEmbeddingService(voyage_api_key)
-        indexer = DocumentationIndexer(repository, embedding_service)
+        embedding_service = rag_engine.get_voyage_service(voyage_api_key)
+        indexer = DocumentationIndexer(repository, embedding_service, progress_callback=progress_callback)
         search_service = DocumentationSearchService(repository, embedding_service)
 
         return repository, indexer, search_service
@@ -92,123 +118,124 @@ async def get_documentation_services(project_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def run_documentation_job(job: IndexingJob, progress_callback: ProgressCallback) -> Dict[str, Any]:
+    """Execute a queued documentation indexing job (runner for indexing_jobs)"""
+    _, indexer, _ = await get_documentation_services(job.project_id, progress_callback=progress_callback)
+
+    try:
+        if job.operation == "index":
+            return await indexer.index_documentation(
+                project_id=job.project_id,
+                repo_path=job.repo_path,
+                full_reindex=job.full_reindex
+            )
+        if job.operation == "reindex":
+            return await indexer.reindex_changed_files(
+                project_id=job.project_id,
+                repo_path=job.repo_path
+            )
+        return await indexer.index_files(
+            project_id=job.project_id,
+            file_paths=job.file_paths,
+            repo_path=job.repo_path
+        )
+    except BaseException:
+        # Failed or cancelled (including shutdown) after the indexer may have
+        # written chunks: drop cached results of the old index
+        query_cache.bump(search_scope(job.project_id))
+        raise
+
+
+indexing_jobs.register_runner("documentation", run_documentation_job)
+
+
 # Endpoints
 
 @router.post("/{project_id}/index")
 async def index_documentation(
     project_id: str,
-    request: IndexDocumentationRequest
+    request: IndexDocumentationRequest,
+    wait: bool = Query(False, description="Wait for completion and return statistics")
 ):
     """
     Index documentation files for a project.
 
     Supports full reindex or incremental indexing.
     Indexes markdown files from docs/, README, CONTRIBUTING, etc.
+    Runs as a background job (see /api/indexing/jobs).
 
     Args:
         project_id: Project ID
         request: Index request with repo_path and full_reindex flag
+        wait: Wait for the job to finish
 
     Returns:
-        Indexing statistics
+        Queued job, or indexing statistics when wait is set
     """
-    repository, indexer, _ = await get_documentation_services(project_id)
-
-    try:
-        logger.info(f"Starting documentation indexing for project {project_id}")
+    await get_documentation_services(project_id)
 
-        stats = await indexer.index_documentation(
-            project_id=project_id,
-            repo_path=request.repo_path,
-            full_reindex=request.full_reindex
-        )
-
-        return {
-            "status": "success",
-            "message": "Documentation indexing completed",
-            **stats
-        }
-
-    except Exception as e:
-        logger.error(f"Documentation indexing failed for project {project_id}: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    logger.info(f"Queueing documentation indexing for project {project_id}")
+    job, merged = indexing_jobs.submit(
+        project_id, "documentation", "index", request.repo_path,
+        full_reindex=request.full_reindex
+    )
+    return await job_response(job, merged, wait, "Documentation indexing completed")
 
 
 @router.post("/{project_id}/index-files")
 async def index_documentation_files(
     project_id: str,
-    request: IndexFilesRequest
+    request: IndexFilesRequest,
+    wait: bool = Query(False, description="Wait for completion and return statistics")
 ):
     """
     Index specific documentation files.
 
-    Re-indexes existing files or adds new ones.
+    Re-indexes existing files or adds new ones. Runs as a background job.
 
     Args:
         project_id: Project ID
         request: List of file paths to index
+        wait: Wait for the job to finish
 
     Returns:
-        Indexing statistics
+        Queued job, or indexing statistics when wait is set
     """
-    repository, indexer, _ = await get_documentation_services(project_id)
+    await get_documentation_services(project_id)
 
-    try:
-        logger.info(f"Indexing {len(request.file_paths)} documentation files for project {project_id}")
-
-        stats = await indexer.index_files(
-            project_id=project_id,
-            file_paths=request.file_paths,
-            repo_path=request.repo_path
-        )
-
-        return {
-            "status": "success",
-            "message": "File indexing completed",
-            **stats
-        }
-
-    except Exception as e:
-        logger.error(f"File indexing failed for project {project_id}: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    logger.info(f"Queueing indexing of {len(request.file_paths)} documentation files for project {project_id}")
+    job, merged = indexing_jobs.submit(
+        project_id, "documentation", "index_files", request.repo_path,
+        file_paths=request.file_paths
+    )
+    return await job_response(job, merged, wait, "File indexing completed")
 
 
 @router.post("/{project_id}/reindex")
 async def reindex_documentation(
     project_id: str,
-    request: ReindexRequest
+    request: ReindexRequest,
+    wait: bool = Query(False, description="Wait for completion and return statistics")
 ):
     """
     Incrementally reindex changed documentation files.
 
     Only processes files that have been modified since last indexing.
+    Runs as a background job.
 
     Args:
         project_id: Project ID
         request: Reindex request with repo path
+        wait: Wait for the job to finish
 
     Returns:
-        Reindexing statistics
+        Queued job, or reindexing statistics when wait is set
     """
-    repository, indexer, _ = await get_documentation_services(project_id)
+    await get_documentation_services(project_id)
 
-    try:
-        logger.info(f"Starting incremental documentation reindex for project {project_id}")
-
-        stats = await indexer.reindex_changed_files(
-            project_id=project_id,
-            repo_path=request.repo_path
-        )
-
-        return {
-            "status": "success",
-            "message": "Incremental reindex completed",
-            **stats
-        }
-
-    except Exception as e:
-        logger.error(f"Documentation reindex failed for project {project_id}: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    logger.info(f"Queueing incremental documentation reindex for project {project_id}")
+    job, merged = indexing_jobs.submit(project_id, "documentation", "reindex", request.repo_path)
+    return await job_response(job, merged, wait, "Incremental reindex completed")
 
 
 @router.post("/{project_id}/search")
@@ -219,7 +246,8 @@ async def search_documentation(
     """
     Search documentation using natural language query.
 
-    Uses MongoDB Atlas Vector Search with voyage-3-large embeddings.
+    Uses MongoDB Atlas Vector Search with voyage-3-large embeddings, or
+    the local vector store for local projects.
 
     Args:
         project_id: Project ID
@@ -258,13 +286,15 @@ async def get_stats(project_id: str):
     """
     Get documentation indexing statistics for a project.
 
-    Returns total chunks, unique files, doc types, and last indexed time.
+    Returns total chunks, unique files, doc types, last indexed time and
+    query cache hit/miss metrics.
     """
     repository, _, _ = await get_documentation_services(project_id)
 
     try:
         stats = await repository.get_stats(project_id)
         stats["status"] = "active"
+        stats["query_cache"] = query_cache.stats(search_scope(project_id))
         return stats
 
     except Exception as e:
@@ -304,6 +334,7 @@ async def delete_project_documentation_index(project_id: str):
 
     try:
         deleted = await repository.delete_by_project(project_id)
+        query_cache.bump(search_scope(project_id))
 
         return {
             "status": "success",
@@ -0,0 +1,117 @@
+"""
+Shared embedding API endpoints.
+
+MCP bridges started with CLAUDETASK_EMBEDDING_BACKEND=remote embed through
+these endpoints instead of loading their own copy of the model. Concurrent
+requests from all bridges are micro-batched into single model calls and
+share the backend's persistent embedding cache.
+"""
+
+import logging
+from typing import Optional, List
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel, Field
+
+from ..services.rag_engine import rag_engine
+from retrieval import query_cache
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/embeddings", tags=["embeddings"])
+
+MAX_TEXTS_PER_REQUEST = 2048
+
+
+# ==================
+# Request/Response Models
+# ==================
+
+class EncodeRequest(BaseModel):
+    """Request to embed texts with the shared model"""
+    texts: List[str] = Field(..., description="Texts to embed")
+    model: Optional[str] = Field(None, description="Expected model name (rejected if it differs)")
+
+
+class EncodeResponse(BaseModel):
+    """Embedding vectors in input order"""
+    embeddings: List[List[float]]
+    model: str
+    dimensions: int
+
+
+# ==================
+# Endpoints
+# ==================
+
+@router.get("/info")
+async def get_embedding_info():
+    """
+    Describe the shared embedding model.
+
+    Returns 503 until the model is loaded, so bridges fall back to an
+    in-process model instead of blocking on the backend warm-up.
+    """
+    if not rag_engine.is_ready():
+        raise HTTPException(status_code=503, detail="Embedding model is still loading")
+
+    service = await rag_engine.get_service()
+    embedder = service.embedding_model
+    return {
+        "model": service.config.embedding_model,
+        "dimensions": embedder.get_sentence_embedding_dimension(),
+        "cache_key": embedder.cache_key,
+        "backend": embedder.backend,
+        "ready": True
+    }
+
+
+@router.post("/encode", response_model=EncodeResponse)
+async def encode_texts(request: EncodeRequest):
+    """
+    Embed texts with the shared model.
+
+    Requests arriving within a few milliseconds of each other are combined
+    into one model call.
+    """
+    if len(request.texts) > MAX_TEXTS_PER_REQUEST:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_TEXTS_PER_REQUEST} texts per request"
+        )
+
+    try:
+        service = await rag_engine.get_service()
+    except Exception as e:
+        logger.error(f"Embedding service unavailable: {e}")
+        raise HTTPException(status_code=503, detail=str(e))
+
+    model_name = service.config.embedding_model
+    if request.model and request.model != model_name:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Embedding service serves {model_name}, not {request.model}"
+        )
+
+    try:
+        batcher = await rag_engine.get_embedding_batcher()
+        embeddings = await batcher.submit(request.texts)
+    except Exception as e:
+        logger.error(f"Embedding request failed: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return EncodeResponse(
+        embeddings=embeddings,
+        model=model_name,
+        dimensions=len(embeddings[0]) if embeddings else service.embedding_model.get_sentence_embedding_dimension()
+    )
+
+
+@router.get("/stats")
+async def get_embedding_stats():
+    """Micro-batching statistics of the shared embedding endpoint, and the backend's query cache"""
+    status = rag_engine.status()
+    return {
+        "ready": status["ready"],
+        "batcher": status["embedding_batcher"],
+        "query_cache": query_cache.stats()
+    }
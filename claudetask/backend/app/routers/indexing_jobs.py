@@ -0,0 +1,146 @@
+"""
+Indexing job API endpoints.
+
+Codebase and documentation indexing runs as background jobs (see
+services/indexing_jobs.py). These endpoints report job status and
+progress, stream progress updates and cancel jobs.
+"""
+
+import json
+import asyncio
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from ..services.indexing_jobs import (
+    indexing_jobs, IndexingJob, ACTIVE_STATUSES, JOB_FAILED, JOB_CANCELLED
+)
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/indexing/jobs", tags=["indexing-jobs"])
+
+HEARTBEAT_INTERVAL = 15.0
+
+
+# ==================
+# Helper Functions
+# ==================
+
+async def job_response(job: IndexingJob, merged: bool, wait: bool, message: str):
+    """
+    Build the response of an endpoint that submitted an indexing job.
+
+    Args:
+        job: Submitted (or merged-into) job
+        merged: Whether the trigger was coalesced into an already queued job
+        wait: Wait for the job and return its statistics (synchronous API)
+        message: Message for the completed job
+
+    Returns:
+        202 response with the job when not waiting, otherwise the indexing statistics
+
+    Raises:
+        HTTPException: If waiting and the job failed or was cancelled
+    """
+    if not wait:
+        return JSONResponse(status_code=202, content={
+            "status": job.status,
+            "message": "Indexing job merged into queued job" if merged else "Indexing job queued",
+            "job_id": job.job_id,
+            "merged": merged,
+            "progress_url": f"{router.prefix}/{job.job_id}",
+            "events_url": f"{router.prefix}/{job.job_id}/events",
+            "job": job.to_dict()
+        })
+
+    job = await indexing_jobs.wait(job.job_id)
+    if job.status == JOB_FAILED:
+        raise HTTPException(status_code=500, detail=job.error)
+    if job.status == JOB_CANCELLED:
+        raise HTTPException(status_code=409, detail=f"Indexing job {job.job_id} was cancelled")
+
+    return {
+        "status": "success",
+        "message": message,
+        "job_id": job.job_id,
+        **(job.result or {})
+    }
+
+
+def _get_job_or_404(job_id: str) -> IndexingJob:
+    job = indexing_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Indexing job {job_id} not found")
+    return job
+
+
+# ==================
+# Endpoints
+# ==================
+
+@router.get("")
+async def list_jobs(
+    project_id: Optional[str] = Query(None, description="Filter by project ID"),
+    kind: Optional[str] = Query(None, description="Filter by kind (codebase/documentation)"),
+    status: Optional[str] = Query(None, description="Filter by status (queued/running/completed/failed/cancelled)"),
+    limit: int = Query(50, ge=1, le=200, description="Number of jobs to return")
+):
+    """List indexing jobs, newest first"""
+    jobs = indexing_jobs.list_jobs(project_id=project_id, kind=kind, status=status)
+    return {
+        "jobs": [job.to_dict() for job in jobs[:limit]],
+        "total": len(jobs)
+    }
+
+
+@router.get("/{job_id}")
+async def get_job(job_id: str):
+    """Get status and progress of an indexing job"""
+    return _get_job_or_404(job_id).to_dict()
+
+
+@router.post("/{job_id}/cancel")
+async def cancel_job(job_id: str):
+    """
+    Cancel an indexing job.
+
+    Queued jobs are dropped immediately; running jobs stop after the
+    current file or embedding batch. Chunks saved so far are kept.
+    """
+    _get_job_or_404(job_id)
+    job = indexing_jobs.cancel(job_id)
+    return job.to_dict()
+
+
+@router.get("/{job_id}/events")
+async def stream_job_events(job_id: str):
+    """Stream progress of an indexing job using Server-Sent Events until it finishes"""
+    _get_job_or_404(job_id)
+
+    async def generate():
+        queue = indexing_jobs.subscribe(job_id)
+        try:
+            while True:
+                try:
+                    snapshot = await asyncio.wait_for(queue.get(), HEARTBEAT_INTERVAL)
+                except asyncio.TimeoutError:
+                    yield ": heartbeat\n\n"
+                    continue
+
+                yield f"data: {json.dumps(snapshot)}\n\n"
+                if snapshot["status"] not in ACTIVE_STATUSES:
+                    break
+        finally:
+            indexing_jobs.unsubscribe(job_id, queue)
+
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+        }
+    )
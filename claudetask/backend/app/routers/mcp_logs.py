@@ -5,23 +5,51 @@ Logs are stored based on project storage_mode:
 - mongodb: MongoDB collections (mcp_logs, hook_logs)
 """
 
-from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi import APIRouter, HTTPException, Query, Depends, Header
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from pathlib import Path
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
-import json
-import asyncio
+from pydantic import BaseModel, Field
+from dataclasses import asdict
 
 from ..database import get_db
 from ..models import Project
 from ..repositories.factory import RepositoryFactory
-from ..repositories.log_repository import MongoDBLogRepository, FileLogRepository
+from ..repositories.log_repository import MongoDBLogRepository, FileLogRepository, decode_log_cursor
+from ..repositories.log_segments import LogRotationPolicy
+from ..services.log_stream import get_log_tailer
 
 router = APIRouter(prefix="/api/mcp-logs", tags=["mcp-logs"])
 
+MAX_BULK_INGEST_ENTRIES = 1000
+
+
+class McpLogEntry(BaseModel):
+    """MCP call log entry sent by an MCP bridge"""
+    tool_name: str
+    status: str
+    arguments: Optional[str] = None
+    result: Optional[str] = None
+    error: Optional[str] = None
+    timestamp: Optional[datetime] = Field(None, description="Time of the call (UTC); defaults to receipt time")
+
+
+class McpLogBatch(BaseModel):
+    """Batch of MCP call log entries"""
+    entries: List[McpLogEntry]
+
+
+class LogRotationSettings(BaseModel):
+    """Rotation and retention of a project's file-based MCP and hook logs"""
+    max_bytes: int = Field(10 * 1024 * 1024, ge=0, description="Rotate a log at this size in bytes (0: never by size)")
+    rotate_interval_hours: float = Field(24.0, ge=0, description="Rotate a log once its first entry is this old (0: never by age)")
+    max_segments: int = Field(20, ge=0, description="Rotated segments kept per log (0: no limit)")
+    max_age_days: float = Field(30.0, ge=0, description="Delete rotated segments older than this (0: no limit)")
+    compress: bool = Field(True, description="Gzip rotated segments")
+
 
 async def get_active_project(db: AsyncSession):
     """Get the active project."""
@@ -36,10 +64,15 @@ async def get_mcp_logs(
     tool_filter: Optional[str] = Query(None, description="Filter by tool name"),
     status_filter: Optional[str] = Query(None, description="Filter by status (success/error/pending)"),
     search: Optional[str] = Query(None, description="Search in log messages"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page (MongoDB storage; replaces offset)"),
+    exact_count: bool = Query(False, description="Count all matches instead of estimating large filtered totals (MongoDB storage)"),
     db: AsyncSession = Depends(get_db)
 ):
     """Get MCP call logs with pagination and filtering for the active project"""
 
+    if cursor is not None and decode_log_cursor(cursor) is None:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
     project = await get_active_project(db)
 
     if not project:
@@ -64,7 +97,9 @@ async def get_mcp_logs(
                 offset=offset,
                 tool_filter=tool_filter,
                 status_filter=status_filter,
-                search=search
+                search=search,
+                cursor=cursor,
+                exact_count=exact_count
             )
             result["project_name"] = project.name
             result["project_path"] = project.path
@@ -153,9 +188,15 @@ async def get_raw_logs(
 @router.get("/stream/{project_id}")
 async def stream_logs(
     project_id: str,
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
     db: AsyncSession = Depends(get_db)
 ):
-    """Stream logs in real-time using Server-Sent Events for a specific project - only for file-based storage"""
+    """Stream logs in real-time using Server-Sent Events for a specific project - only for file-based storage
+
+    All clients of a project share one watcher of the log. Each event's id is
+    its position in the log; a reconnecting client (EventSource sends
+    Last-Event-ID) gets the events it missed, others the whole active log.
+    """
 
     result = await db.execute(select(Project).where(Project.id == project_id))
     project = result.scalar_one_or_none()
@@ -166,36 +207,8 @@ async def stream_logs(
     log_file = Path(project.path) / ".claudetask" / "logs" / "mcp" / "mcp_calls.log"
 
     async def generate():
-        import re
-        pattern = r'^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3}) - (\S+) - (\w+) - (.+)$'
-
-        last_position = 0
-
-        while True:
-            if log_file.exists():
-                try:
-                    with open(log_file, 'r', encoding='utf-8') as f:
-                        f.seek(last_position)
-                        new_content = f.read()
-                        last_position = f.tell()
-
-                        if new_content:
-                            new_lines = new_content.strip().split('\n')
-                            for line in new_lines:
-                                match = re.match(pattern, line.strip())
-                                if match:
-                                    timestamp_str, logger, level, message = match.groups()
-                                    parsed = {
-                                        "timestamp": timestamp_str,
-                                        "logger": logger,
-                                        "level": level,
-                                        "message": message
-                                    }
-                                    yield f"data: {json.dumps(parsed)}\n\n"
-                except Exception as e:
-                    yield f"data: {json.dumps({'error': str(e)})}\n\n"
-
-            await asyncio.sleep(1)
+        async for frame in get_log_tailer(log_file).stream(last_event_id):
+            yield frame
 
     return StreamingResponse(
         generate(),
@@ -304,10 +317,15 @@ async def get_hooks_logs(
     hook_filter: Optional[str] = Query(None, description="Filter by hook name"),
     status_filter: Optional[str] = Query(None, description="Filter by status (success/error/running/skipped)"),
     search: Optional[str] = Query(None, description="Search in log messages"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page (MongoDB storage; replaces offset)"),
+    exact_count: bool = Query(False, description="Count all matches instead of estimating large filtered totals (MongoDB storage)"),
     db: AsyncSession = Depends(get_db)
 ):
     """Get Hook execution logs with pagination and filtering for the active project"""
 
+    if cursor is not None and decode_log_cursor(cursor) is None:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
     project = await get_active_project(db)
 
     if not project:
@@ -331,7 +349,9 @@ async def get_hooks_logs(
                 offset=offset,
                 hook_filter=hook_filter,
                 status_filter=status_filter,
-                search=search
+                search=search,
+                cursor=cursor,
+                exact_count=exact_count
             )
             result["project_name"] = project.name
             result["project_path"] = project.path
@@ -455,6 +475,51 @@ async def clear_hooks_logs(db: AsyncSession = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Failed to clear hook logs: {str(e)}")
 
 
+# ============================================================================
+# LOG ROTATION ENDPOINTS
+# ============================================================================
+
+@router.get("/rotation")
+async def get_log_rotation(db: AsyncSession = Depends(get_db)):
+    """Get the log rotation and retention policy of the active project (file-based storage)"""
+
+    project = await get_active_project(db)
+
+    if not project:
+        raise HTTPException(status_code=404, detail="No active project found")
+
+    policy = LogRotationPolicy.load(project.path)
+    return {
+        **LogRotationSettings(**asdict(policy)).model_dump(),
+        "project_name": project.name
+    }
+
+
+@router.put("/rotation")
+async def update_log_rotation(settings: LogRotationSettings, db: AsyncSession = Depends(get_db)):
+    """
+    Update the log rotation and retention policy of the active project.
+
+    Hook logs apply it on the next hook run; MCP servers started afterwards
+    apply it to the MCP call log.
+    """
+
+    project = await get_active_project(db)
+
+    if not project:
+        raise HTTPException(status_code=404, detail="No active project found")
+
+    try:
+        LogRotationPolicy(**settings.model_dump()).save(project.path)
+    except OSError as e:
+        raise HTTPException(status_code=500, detail=f"Failed to save log rotation policy: {str(e)}")
+
+    return {
+        **settings.model_dump(),
+        "project_name": project.name
+    }
+
+
 # ============================================================================
 # LOG INGESTION ENDPOINTS (for MCP server to write logs)
 # ============================================================================
@@ -504,6 +569,49 @@ async def ingest_mcp_log(
         raise HTTPException(status_code=500, detail=f"Failed to ingest log: {str(e)}")
 
 
+@router.post("/ingest/mcp/bulk")
+async def ingest_mcp_logs_bulk(
+    batch: McpLogBatch,
+    db: AsyncSession = Depends(get_db)
+):
+    """Ingest a batch of MCP log entries - flushed periodically by MCP bridges in mongodb mode"""
+
+    if len(batch.entries) > MAX_BULK_INGEST_ENTRIES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {MAX_BULK_INGEST_ENTRIES} entries per batch"
+        )
+
+    project = await get_active_project(db)
+
+    if not project:
+        raise HTTPException(status_code=400, detail="No active project found")
+
+    # Check if MongoDB mode
+    storage_mode = getattr(project, 'storage_mode', 'local')
+    if storage_mode != "mongodb":
+        return {"message": "Skipped - storage_mode is not mongodb", "storage_mode": storage_mode, "inserted": 0}
+
+    try:
+        log_repo = await RepositoryFactory.get_log_repository(
+            project_id=str(project.id),
+            project_path=project.path,
+            db=db
+        )
+
+        if isinstance(log_repo, MongoDBLogRepository):
+            inserted = await log_repo.create_mcp_logs_bulk([
+                {"project_id": str(project.id), **entry.model_dump()}
+                for entry in batch.entries
+            ])
+            return {"message": "Logs created", "inserted": inserted, "storage_mode": "mongodb"}
+
+        return {"message": "Skipped - not MongoDB storage", "storage_mode": storage_mode, "inserted": 0}
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to ingest logs: {str(e)}")
+
+
 @router.post("/ingest/hook")
 async def ingest_hook_log(
     hook_name: str,
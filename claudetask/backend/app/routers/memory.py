@@ -15,7 +15,8 @@ from pydantic import BaseModel, Field
 
 from ..database import get_db
 from ..repositories.factory import RepositoryFactory
-from ..services.embedding_service import VoyageEmbeddingService
+from ..services.rag_engine import rag_engine
+from retrieval import query_cache
 
 logger = logging.getLogger(__name__)
 
@@ -61,12 +62,19 @@ class SearchRequest(BaseModel):
 # Helper Functions
 # ==================
 
-async def get_embedding_service():
-    """Get embedding service based on availability"""
+async def get_embedding_service(storage_mode: str = "mongodb"):
+    """Get embedding service based on storage mode and availability"""
+    if storage_mode != "mongodb":
+        try:
+            return await rag_engine.get_local_embedding_service()
+        except ImportError as e:
+            logger.warning(f"Local embedding service unavailable: {e}")
+            return None
+
     voyage_key = os.getenv("VOYAGE_AI_API_KEY") or os.getenv("VOYAGE_API_KEY")
     if voyage_key:
         try:
-            return VoyageEmbeddingService(voyage_key)
+            return rag_engine.get_voyage_service(voyage_key)
         except RuntimeError as e:
             # voyageai module not installed
             logger.warning(f"Embedding service unavailable: {e}")
@@ -74,6 +82,28 @@ async def get_embedding_service():
     return None
 
 
+def memory_scope(project_id: str) -> tuple:
+    """Query cache scope of a project's memory search (bumped whenever messages or vectors are written)"""
+    return ("memory", project_id)
+
+
+async def backfill_local_embeddings(repo, project_id: str, embedding_service, batch_size: int = 500):
+    """
+    Embed local messages saved without a vector (before local vector search
+    existed or while the embedding model was unavailable).
+
+    Runs before each local search; a no-op once every message has a vector.
+    """
+    pending = await repo.get_messages_without_embeddings(project_id, limit=batch_size)
+    if not pending:
+        return
+
+    embeddings = await embedding_service.generate_embeddings([msg["content"] for msg in pending])
+    await repo.save_embeddings(project_id, [msg["id"] for msg in pending], embeddings)
+    query_cache.bump(memory_scope(project_id))
+    logger.info(f"Embedded {len(pending)} memory messages for project {project_id[:8]}")
+
+
 # ==================
 # Endpoints
 # ==================
@@ -106,9 +136,9 @@ async def save_conversation_message(
 
         # Generate embedding if possible
         embedding = None
-        embedding_service = await get_embedding_service()
+        embedding_service = await get_embedding_service(storage_mode)
 
-        if storage_mode == "mongodb" and embedding_service:
+        if embedding_service:
             try:
                 embeddings = await embedding_service.generate_embeddings([request.content])
                 if embeddings:
@@ -137,6 +167,7 @@ async def save_conversation_message(
                 "metadata": metadata
             })
 
+        query_cache.bump(memory_scope(project_id))
         logger.info(f"Saved conversation message for project {project_id[:8]}")
 
         return {
@@ -521,7 +552,8 @@ async def get_memory_stats(
     """
     Get memory statistics for a project.
 
-    Returns message count, summary info, and storage mode.
+    Returns message count, summary info, storage mode and query cache
+    hit/miss metrics.
     """
     try:
         repo = await RepositoryFactory.get_memory_repository(project_id, db)
@@ -531,7 +563,8 @@ async def get_memory_stats(
 
         return {
             **stats,
-            "storage_mode": storage_mode
+            "storage_mode": storage_mode,
+            "query_cache": query_cache.stats(memory_scope(project_id))
         }
 
     except ValueError as e:
@@ -675,25 +708,30 @@ async def search_memory(
     """
     Search project memory using semantic search.
 
-    Uses MongoDB Atlas Vector Search or ChromaDB based on storage_mode.
+    Uses MongoDB Atlas Vector Search or the local vector store based on
+    storage_mode, with a text search fallback.
     """
     try:
         repo = await RepositoryFactory.get_memory_repository(project_id, db)
         storage_mode = await RepositoryFactory.get_storage_mode_for_project(project_id, db)
 
         # Generate query embedding
-        embedding_service = await get_embedding_service()
+        embedding_service = await get_embedding_service(storage_mode)
 
-        if storage_mode == "mongodb" and embedding_service:
+        if embedding_service:
             try:
-                embeddings = await embedding_service.generate_embeddings([request.query])
-                if embeddings:
-                    query_embedding = embeddings[0]
+                if storage_mode != "mongodb":
+                    await backfill_local_embeddings(repo, project_id, embedding_service)
 
-                    # Build filters
-                    filters = {}
-                    if request.session_id:
-                        filters["session_id"] = request.session_id
+                # Build filters
+                filters = {}
+                if request.session_id:
+                    filters["session_id"] = request.session_id
+
+                async def search():
+                    query_embedding = await embedding_service.generate_query_embedding(request.query)
+                    if not query_embedding:
+                        return None
 
                     # Perform vector search
                     results = await repo.vector_search(
@@ -714,7 +752,13 @@ async def search_memory(
                             "timestamp": result.get("timestamp").isoformat() if result.get("timestamp") and hasattr(result.get("timestamp"), 'isoformat') else str(result.get("timestamp")) if result.get("timestamp") else None,
                             "score": result.get("score")
                         })
+                    return formatted_results
 
+                # Cached per memory version (new messages and backfilled vectors bump it)
+                formatted_results = await query_cache.results(
+                    memory_scope(project_id), (storage_mode, request.query, request.limit, request.session_id), search
+                )
+                if formatted_results is not None:
                     return {
                         "query": request.query,
                         "results": formatted_results,
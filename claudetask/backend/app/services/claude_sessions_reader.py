@@ -2,24 +2,54 @@
 Claude Code Sessions Reader Service
 Reads and parses Claude Code session data from ~/.claude/projects/
 Similar to Claudia's approach
+
+Parsed sessions are kept in a SessionCatalog (session_catalog.py), so
+transcripts are only read again as far as they changed.
 """
 
 import os
 import json
+import sqlite3
 import logging
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 from collections import defaultdict
 
+from .session_catalog import SessionCatalog, TranscriptLines
+
 logger = logging.getLogger(__name__)
 
+# Characters of a transcript searched at a time
+SEARCH_CHUNK_CHARS = 1024 * 1024
+
 
 class ClaudeSessionsReader:
     """Service for reading Claude Code sessions from local storage"""
 
-    def __init__(self):
+    def __init__(self, catalog_path: Optional[str] = None):
+        """
+        Initialize reader.
+
+        Args:
+            catalog_path: Session catalog file (default: session_catalog.db in the .claudetask data directory)
+        """
         self.claude_projects_dir = Path.home() / ".claude" / "projects"
+        self._catalog_path = catalog_path
+        self._catalog: Optional[SessionCatalog] = None
+
+    def _get_catalog(self) -> SessionCatalog:
+        if self._catalog is None:
+            path = self._catalog_path
+            if path is None:
+                from claudetask.config import get_config
+                path = str(get_config().data_dir / "session_catalog.db")
+            try:
+                self._catalog = SessionCatalog(path, self._new_session_metadata, self._parse_session_lines)
+            except (sqlite3.Error, OSError) as e:
+                logger.warning(f"Session catalog {path} unavailable, keeping it in memory: {e}")
+                self._catalog = SessionCatalog(":memory:", self._new_session_metadata, self._parse_session_lines)
+        return self._catalog
 
     def get_all_projects(self) -> List[Dict[str, Any]]:
         """
@@ -92,17 +122,33 @@ class ClaudeSessionsReader:
             logger.warning(f"Project not found: {project_name}")
             return sessions
 
-        project_dir = project_dirs[0]
+        return self.get_directory_sessions(project_dirs[0])
 
-        for session_file in project_dir.glob("*.jsonl"):
-            try:
-                session_data = self._parse_session_file(session_file)
-                sessions.append(session_data)
-            except Exception as e:
-                logger.error(f"Failed to parse session {session_file.name}: {e}")
-                continue
+    def get_directory_sessions(self, project_dir: Path) -> List[Dict[str, Any]]:
+        """
+        Get all sessions of a project directory, most recent first
+
+        Only transcripts that changed since the last call are parsed.
+
+        Args:
+            project_dir: Directory of the project's session JSONL files
+
+        Returns:
+            List of sessions with metadata
+        """
+        return self._get_catalog().sessions(Path(project_dir))
+
+    def get_session_metadata(self, session_file: Path) -> Dict[str, Any]:
+        """
+        Get metadata of one session (from the catalog, parsed as far as needed)
+
+        Args:
+            session_file: Path to session JSONL file
 
-        return sorted(sessions, key=lambda x: x['last_timestamp'], reverse=True)
+        Returns:
+            Session metadata and statistics
+        """
+        return self._get_catalog().session(Path(session_file))
 
     def _parse_session_file(self, session_file: Path) -> Dict[str, Any]:
         """
@@ -114,11 +160,15 @@ class ClaudeSessionsReader:
         Returns:
             Session metadata and statistics
         """
-        session_id = session_file.stem
+        metadata = self._new_session_metadata(session_file)
+        with open(session_file, 'r', encoding='utf-8') as f:
+            self._parse_session_lines(metadata, enumerate(f, 1))
+        return metadata
 
-        # Session metadata
-        metadata = {
-            "session_id": session_id,
+    def _new_session_metadata(self, session_file: Path) -> Dict[str, Any]:
+        """Metadata of a session before any of its lines are parsed"""
+        return {
+            "session_id": session_file.stem,
             "file_path": str(session_file),
             "file_size": session_file.stat().st_size,
             "created_at": None,
@@ -129,89 +179,88 @@ class ClaudeSessionsReader:
             "message_count": 0,
             "user_messages": 0,
             "assistant_messages": 0,
-            "tool_calls": defaultdict(int),
+            "tool_calls": {},
             "commands_used": [],
             "files_modified": [],
             "errors": []
         }
 
-        first_timestamp = None
-        last_timestamp = None
-
-        # Parse JSONL file line by line
-        with open(session_file, 'r', encoding='utf-8') as f:
-            for line_num, line in enumerate(f, 1):
-                try:
-                    entry = json.loads(line.strip())
-
-                    # Extract metadata from first entry
-                    if line_num == 1:
-                        metadata["cwd"] = entry.get("cwd")
-                        metadata["git_branch"] = entry.get("gitBranch")
-                        metadata["claude_version"] = entry.get("version")
-                        first_timestamp = entry.get("timestamp")
-
-                    # Track timestamps
-                    timestamp = entry.get("timestamp")
-                    if timestamp:
-                        last_timestamp = timestamp
-
-                    # Count message types
-                    entry_type = entry.get("type")
-                    subtype = entry.get("subtype")
-
-                    if entry_type == "user":
-                        metadata["user_messages"] += 1
-                        metadata["message_count"] += 1
-                    elif entry_type == "assistant":
-                        metadata["assistant_messages"] += 1
-                        metadata["message_count"] += 1
-
-                    # Track tool calls
-                    if entry_type == "tool_use":
-                        tool_name = entry.get("name", "unknown")
-                        metadata["tool_calls"][tool_name] += 1
-
-                    # Track commands
-                    if subtype == "local_command":
-                        content = entry.get("content", "")
-                        if "<command-name>" in content:
-                            command = content.split("<command-name>")[1].split("</command-name>")[0]
-                            if command not in metadata["commands_used"]:
-                                metadata["commands_used"].append(command)
-
-                    # Track file modifications
-                    if entry_type == "tool_result":
-                        tool_name = entry.get("name")
-                        if tool_name in ["Write", "Edit", "MultiEdit"]:
-                            # Extract file path from tool parameters
-                            params = entry.get("parameters", {})
-                            file_path = params.get("file_path")
-                            if file_path and file_path not in metadata["files_modified"]:
-                                metadata["files_modified"].append(file_path)
-
-                    # Track errors
-                    if entry.get("level") == "error" or entry_type == "error":
-                        metadata["errors"].append({
-                            "timestamp": timestamp,
-                            "content": entry.get("content", "Unknown error")[:200]
-                        })
-
-                except json.JSONDecodeError as e:
-                    logger.error(f"Invalid JSON at line {line_num} in {session_file.name}: {e}")
-                    continue
-                except Exception as e:
-                    logger.error(f"Error parsing line {line_num} in {session_file.name}: {e}")
-                    continue
+    def _parse_session_lines(self, metadata: Dict[str, Any], lines: TranscriptLines) -> None:
+        """
+        Apply session JSONL lines to a session's metadata
 
-        # Set timestamps
-        metadata["created_at"] = first_timestamp
-        metadata["last_timestamp"] = last_timestamp
+        Resumable: the catalog passes only the lines appended since the
+        previous call, numbered on from the lines before them.
 
-        # Convert defaultdict to regular dict
-        metadata["tool_calls"] = dict(metadata["tool_calls"])
+        Args:
+            metadata: Session metadata (from _new_session_metadata), updated in place
+            lines: (line number, line) pairs
+        """
+        session_name = Path(metadata["file_path"]).name
 
-        return metadata
+        for line_num, line in lines:
+            try:
+                entry = json.loads(line.strip())
+
+                # Extract metadata from first entry
+                if line_num == 1:
+                    metadata["cwd"] = entry.get("cwd")
+                    metadata["git_branch"] = entry.get("gitBranch")
+                    metadata["claude_version"] = entry.get("version")
+                    metadata["created_at"] = entry.get("timestamp")
+
+                # Track timestamps
+                timestamp = entry.get("timestamp")
+                if timestamp:
+                    metadata["last_timestamp"] = timestamp
+
+                # Count message types
+                entry_type = entry.get("type")
+                subtype = entry.get("subtype")
+
+                if entry_type == "user":
+                    metadata["user_messages"] += 1
+                    metadata["message_count"] += 1
+                elif entry_type == "assistant":
+                    metadata["assistant_messages"] += 1
+                    metadata["message_count"] += 1
+
+                # Track tool calls
+                if entry_type == "tool_use":
+                    tool_name = entry.get("name", "unknown")
+                    metadata["tool_calls"][tool_name] = metadata["tool_calls"].get(tool_name, 0) + 1
+
+                # Track commands
+                if subtype == "local_command":
+                    content = entry.get("content", "")
+                    if "<command-name>" in content:
+                        command = content.split("<command-name>")[1].split("</command-name>")[0]
+                        if command not in metadata["commands_used"]:
+                            metadata["commands_used"].append(command)
+
+                # Track file modifications
+                if entry_type == "tool_result":
+                    tool_name = entry.get("name")
+                    if tool_name in ["Write", "Edit", "MultiEdit"]:
+                        # Extract file path from tool parameters
+                        params = entry.get("parameters", {})
+                        file_path = params.get("file_path")
+                        if file_path and file_path not in metadata["files_modified"]:
+                            metadata["files_modified"].append(file_path)
+
+                # Track errors
+                if entry.get("level") == "error" or entry_type == "error":
+                    metadata["errors"].append({
+                        "timestamp": timestamp,
+                        "content": entry.get("content", "Unknown error")[:200]
+                    })
+
+            except json.JSONDecodeError as e:
+                logger.error(f"Invalid JSON at line {line_num} in {session_name}: {e}")
+                continue
+            except Exception as e:
+                logger.error(f"Error parsing line {line_num} in {session_name}: {e}")
+                continue
 
     def get_session_details(
         self,
@@ -244,7 +293,7 @@ class ClaudeSessionsReader:
             return None
 
         # Get basic metadata
-        session_data = self._parse_session_file(session_file)
+        session_data = self.get_session_metadata(session_file)
 
         if include_messages:
             # Parse full message history
@@ -301,22 +350,33 @@ class ClaudeSessionsReader:
         query_lower = query.lower()
 
         for project_dir in project_dirs:
-            for session_file in project_dir.glob("*.jsonl"):
+            for session_data in self.get_directory_sessions(project_dir):
+                session_file = Path(session_data["file_path"])
                 try:
-                    # Quick search in file content
-                    with open(session_file, 'r', encoding='utf-8') as f:
-                        content = f.read()
-
-                        if query_lower in content.lower():
-                            session_data = self._parse_session_file(session_file)
-                            session_data["project"] = project_dir.name
-                            results.append(session_data)
+                    if self._file_contains(session_file, query_lower):
+                        session_data["project"] = project_dir.name
+                        results.append(session_data)
 
                 except Exception as e:
                     logger.error(f"Error searching session {session_file.name}: {e}")
                     continue
 
-        return sorted(results, key=lambda x: x['last_timestamp'], reverse=True)
+        return sorted(results, key=lambda x: x['last_timestamp'] or "", reverse=True)
+
+    def _file_contains(self, session_file: Path, query_lower: str) -> bool:
+        """Case-insensitive search of a transcript, read in chunks"""
+        overlap = max(len(query_lower) - 1, 0)
+        with open(session_file, 'r', encoding='utf-8') as f:
+            carry = ""
+            while True:
+                chunk = f.read(SEARCH_CHUNK_CHARS)
+                if not chunk:
+                    return False
+                text = carry + chunk.lower()
+                if query_lower in text:
+                    return True
+                # Keep the end of this chunk in case a match spans two chunks
+                carry = text[len(text) - overlap:] if overlap else ""
 
     def get_session_statistics(self, project_name: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -340,13 +400,15 @@ class ClaudeSessionsReader:
 
         sessions = []
 
+        # Sessions come from the catalog: only changed transcripts are parsed
         if project_name:
             sessions = self.get_project_sessions(project_name)
-        else:
-            projects = self.get_all_projects()
-            for project in projects:
-                project_sessions = self.get_project_sessions(project["name"])
-                sessions.extend(project_sessions)
+        elif self.claude_projects_dir.exists():
+            project_dirs = [d for d in self.claude_projects_dir.iterdir()
+                           if d.is_dir() and not d.name.startswith('.')]
+            for project_dir in project_dirs:
+                sessions.extend(self.get_directory_sessions(project_dir))
+            self._get_catalog().prune(project_dirs)
 
         # Aggregate statistics
         for session in sessions:
@@ -5,28 +5,67 @@ import sys
 import asyncio
 import hashlib
 import logging
-from typing import List, Dict, Any, Optional, Set
+from typing import Callable, List, Dict, Any, Optional, Tuple
 from pathlib import Path
 
-# Add chunking module to path
+# Add chunking and retrieval modules to path
 mcp_server_path = Path(__file__).parent.parent.parent.parent / "mcp_server"
 if str(mcp_server_path) not in sys.path:
     sys.path.insert(0, str(mcp_server_path))
 
-from chunking import GenericChunker, ChunkMetadata
+from chunking import (
+    CodeChunker, ChunkMetadata, SymbolDefinition, ChunkingPipeline, ChangeDetector, stable_chunk_ids
+)
+from retrieval import looks_like_identifier, reciprocal_rank_fusion, query_cache
 from ..services.embedding_service import VoyageEmbeddingService
 
 logger = logging.getLogger(__name__)
 
 
+# file_hash of chunks saved before their file is complete: differs from every
+# real hash (and sorts first), so an interrupted file is re-indexed next run
+PENDING_FILE_HASH = ""
+
+
+def search_scope(project_id: str) -> tuple:
+    """Query cache scope of a project's code index (bumped after every indexing run, also failed ones)"""
+    return ("codebase", project_id)
+
+
+class PendingFiles:
+    """
+    Indexed files waiting for their new chunks to be embedded and saved.
+
+    Nothing of a queued file is written until it is flushed, so an
+    interrupted run leaves it with its old hash (or none) and it is picked
+    up again by the next incremental reindex.
+    """
+
+    def __init__(self):
+        self.files: List[Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[str]]] = []
+        self.to_embed = 0
+
+    def add(
+        self,
+        chunks: List[Dict[str, Any]],
+        added: List[Dict[str, Any]],
+        removed: Optional[List[str]] = None
+    ):
+        """Queue a file: all its chunks, the ones needing embedding and stale chunk IDs"""
+        self.files.append((chunks, added, removed or []))
+        self.to_embed += len(added)
+
+
 class CodebaseIndexer:
     """
     Service for indexing codebase into MongoDB Atlas with Voyage AI embeddings.
 
     Features:
     - Full codebase indexing
-    - Incremental updates based on file changes
+    - Incremental updates based on file changes (git diff, hashing fallback)
+    - Chunk-level reindexing (only new/modified chunks are re-embedded)
     - Semantic code chunking
+    - Symbol table (definitions with full line ranges) updated per indexed file
     - Voyage AI voyage-3-large embeddings (1024d)
     - MongoDB Atlas Vector Search integration
 
@@ -58,7 +97,10 @@ class CodebaseIndexer:
         embedding_service: VoyageEmbeddingService,
         chunk_size: int = 500,
         chunk_overlap: int = 50,
-        batch_size: int = 100  # Voyage AI batch limit (rate limit: 2000 RPS)
+        batch_size: int = 1000,  # Chunks per embed+save round (split into API requests by token budget)
+        max_workers: Optional[int] = None,
+        use_git_change_detection: bool = True,
+        progress_callback: Optional[Callable[[Dict[str, int]], None]] = None
     ):
         """
         Initialize codebase indexer.
@@ -68,12 +110,30 @@ class CodebaseIndexer:
             embedding_service: VoyageEmbeddingService instance
             chunk_size: Target chunk size in tokens
             chunk_overlap: Overlap between chunks
-            batch_size: Number of chunks to embed in one batch (max 100)
+            batch_size: Chunks embedded and saved per round; the embedding service
+                packs them into concurrent API requests by token budget
+            max_workers: Chunking worker processes for full indexing (default: CPU count)
+            use_git_change_detection: Find changed files via git instead of hashing the tree
+            progress_callback: Receives progress updates ({"files_total": n},
+                {"files_done": n} or {"chunks_embedded": increment}); may raise
+                to stop indexing at that point (e.g. job cancellation)
         """
         self.repository = repository
         self.embedding_service = embedding_service
-        self.chunker = GenericChunker(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+        self.chunker = CodeChunker(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
         self.batch_size = batch_size
+        self.pipeline = ChunkingPipeline(
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            max_workers=max_workers
+        )
+        self.use_git_change_detection = use_git_change_detection
+        self.progress_callback = progress_callback
+
+    def _report_progress(self, **progress: int):
+        """Forward progress to the callback (a checkpoint where indexing may be stopped)"""
+        if self.progress_callback:
+            self.progress_callback(progress)
 
     async def index_codebase(
         self,
@@ -103,54 +163,83 @@ class CodebaseIndexer:
             "indexed_files": 0,
             "skipped_files": 0,
             "total_chunks": 0,
+            "chunks_kept": 0,
+            "chunks_added": 0,
+            "chunks_removed": 0,
             "errors": []
         }
 
-        # Collect all files to index
-        files_to_index = []
-
-        for root, dirs, files in os.walk(repo_path):
-            # Skip directories
-            dirs[:] = [d for d in dirs if d not in self.SKIP_DIRS]
-
-            for file in files:
-                ext = os.path.splitext(file)[1].lower()
-                if ext not in self.SUPPORTED_EXTENSIONS:
-                    continue
-
-                file_path = os.path.join(root, file)
-                relative_path = os.path.relpath(file_path, repo_path)
-                files_to_index.append((file_path, relative_path))
+        # Stage 1: discover files (worker thread)
+        files_to_index = await self.pipeline.discover(repo_path, self.SUPPORTED_EXTENSIONS, self.SKIP_DIRS)
 
         stats["total_files"] = len(files_to_index)
         logger.info(f"Found {len(files_to_index)} files to index")
+        self._report_progress(files_total=len(files_to_index))
+        files_done = 0
 
-        # Index files in batches
-        all_chunks = []
+        # Stage 3: embed and save while later files are still being chunked
+        pending = PendingFiles()
 
-        for file_path, relative_path in files_to_index:
-            try:
-                chunks = await self._process_file(project_id, file_path, relative_path)
-                all_chunks.extend(chunks)
-                stats["indexed_files"] += 1
+        async def on_file(chunked):
+            nonlocal files_done
 
-                if stats["indexed_files"] % 10 == 0:
-                    logger.info(f"Processed {stats['indexed_files']}/{stats['total_files']} files")
+            files_done += 1
+            self._report_progress(files_done=files_done)
 
-            except Exception as e:
-                logger.error(f"Failed to process {relative_path}: {e}")
-                stats["errors"].append({"file": relative_path, "error": str(e)})
+            if chunked.error:
+                logger.error(f"Failed to process {chunked.relative_path}: {chunked.error}")
+                stats["errors"].append({"file": chunked.relative_path, "error": chunked.error})
                 stats["skipped_files"] += 1
+                return
+
+            await self._save_file_symbols(project_id, chunked.relative_path, chunked.language, chunked.symbols)
+
+            chunk_ids = stable_chunk_ids(
+                chunked.relative_path,
+                [(content, metadata) for content, metadata, _ in chunked.chunks]
+            )
+            chunks = [
+                self._chunk_to_dict(
+                    project_id, chunked.relative_path, chunked.file_hash,
+                    content, metadata, summary, chunk_id
+                )
+                for (content, metadata, summary), chunk_id in zip(chunked.chunks, chunk_ids)
+            ]
+
+            if full_reindex:
+                # Nothing stored after delete_by_project - skip the diff round trip
+                stats["chunks_added"] += len(chunks)
+                pending.add(chunks, chunks)
+            else:
+                pending.add(chunks, *await self._sync_file_chunks(project_id, chunked.relative_path, chunks, stats))
+
+            stats["indexed_files"] += 1
 
-        # Generate embeddings and save to MongoDB in batches
-        if all_chunks:
-            stats["total_chunks"] = await self._save_chunks_with_embeddings(project_id, all_chunks)
+            if stats["indexed_files"] % 10 == 0:
+                logger.info(f"Processed {stats['indexed_files']}/{stats['total_files']} files")
+
+            if pending.to_embed >= self.batch_size:
+                stats["total_chunks"] += await self._save_pending_files(project_id, pending)
+
+        # Stage 2: read + chunk in a process pool
+        await self.pipeline.run(
+            (
+                (file_path, relative_path, self._detect_language(os.path.splitext(file_path)[1]))
+                for file_path, relative_path in files_to_index
+            ),
+            on_file
+        )
+
+        # Generate embeddings and save remaining chunks
+        stats["total_chunks"] += await self._save_pending_files(project_id, pending)
 
         logger.info(
             f"Indexing complete: {stats['indexed_files']} files, "
-            f"{stats['total_chunks']} chunks, {len(stats['errors'])} errors"
+            f"{stats['total_chunks']} chunks embedded, {stats['chunks_kept']} kept, "
+            f"{stats['chunks_removed']} removed, {len(stats['errors'])} errors"
         )
 
+        query_cache.bump(search_scope(project_id))
         return stats
 
     async def index_files(
@@ -176,12 +265,18 @@ class CodebaseIndexer:
             "indexed_files": 0,
             "skipped_files": 0,
             "total_chunks": 0,
+            "chunks_kept": 0,
+            "chunks_added": 0,
+            "chunks_removed": 0,
             "errors": []
         }
 
-        all_chunks = []
+        pending = PendingFiles()
+        self._report_progress(files_total=len(file_paths))
+
+        for files_done, file_path in enumerate(file_paths):
+            self._report_progress(files_done=files_done)
 
-        for file_path in file_paths:
             # Convert to absolute path if needed
             if not os.path.isabs(file_path):
                 abs_path = os.path.join(repo_path, file_path)
@@ -203,12 +298,9 @@ class CodebaseIndexer:
                 continue
 
             try:
-                # Delete existing chunks for this file
-                await self.repository.delete_by_file(project_id, relative_path)
-
-                # Process file
+                # Process file, keeping chunks whose content is unchanged
                 chunks = await self._process_file(project_id, abs_path, relative_path)
-                all_chunks.extend(chunks)
+                pending.add(chunks, *await self._sync_file_chunks(project_id, relative_path, chunks, stats))
                 stats["indexed_files"] += 1
 
             except Exception as e:
@@ -216,10 +308,15 @@ class CodebaseIndexer:
                 stats["errors"].append({"file": relative_path, "error": str(e)})
                 stats["skipped_files"] += 1
 
-        # Save chunks with embeddings
-        if all_chunks:
-            stats["total_chunks"] = await self._save_chunks_with_embeddings(project_id, all_chunks)
+            # Save in rounds so an interrupted run keeps what was already embedded
+            if pending.to_embed >= self.batch_size:
+                stats["total_chunks"] += await self._save_pending_files(project_id, pending)
+
+        # Save remaining chunks with embeddings
+        stats["total_chunks"] += await self._save_pending_files(project_id, pending)
 
+        self._report_progress(files_done=len(file_paths))
+        query_cache.bump(search_scope(project_id))
         return stats
 
     async def reindex_changed_files(
@@ -230,7 +327,9 @@ class CodebaseIndexer:
         """
         Incremental reindex - only process changed files.
 
-        Compares file hashes to detect changes.
+        Uses git (diff since the last indexed commit plus working-tree status)
+        to find candidates, falling back to hashing the tree with an
+        mtime/size pre-check when git data is unavailable.
 
         Args:
             project_id: Project ID
@@ -241,88 +340,109 @@ class CodebaseIndexer:
         """
         logger.info(f"Starting incremental reindex for project {project_id}")
 
-        # Get existing file hashes from database
+        # Get existing file hashes and change-detection state from database
         existing_hashes = await self.repository.get_file_hashes(project_id)
+        index_state = await self.repository.get_index_state(project_id)
+
+        # Indexed before the symbol table existed: seed it from the stored chunks,
+        # files reindexed below get exact definition ranges
+        if existing_hashes and not await self.repository.count_symbols(project_id):
+            await self.repository.seed_symbols_from_chunks(project_id)
 
         stats = {
+            "change_detection": None,
+            "files_checked": 0,
             "new_files": 0,
             "updated_files": 0,
             "unchanged_files": 0,
             "deleted_files": 0,
             "total_chunks": 0,
+            "chunks_kept": 0,
+            "chunks_added": 0,
+            "chunks_removed": 0,
             "errors": []
         }
 
-        files_to_index = []
-        current_files: Set[str] = set()
-
-        # Walk through repository
-        for root, dirs, files in os.walk(repo_path):
-            dirs[:] = [d for d in dirs if d not in self.SKIP_DIRS]
-
-            for file in files:
-                ext = os.path.splitext(file)[1].lower()
-                if ext not in self.SUPPORTED_EXTENSIONS:
-                    continue
-
-                file_path = os.path.join(root, file)
-                relative_path = os.path.relpath(file_path, repo_path)
-                current_files.add(relative_path)
-
-                # Calculate current file hash
-                try:
-                    with open(file_path, 'rb') as f:
-                        current_hash = hashlib.sha256(f.read()).hexdigest()
-                except Exception as e:
-                    logger.warning(f"Failed to read {relative_path}: {e}")
-                    continue
-
-                # Check if file changed
-                stored_hash = existing_hashes.get(relative_path)
-
-                if stored_hash is None:
-                    # New file
-                    files_to_index.append((file_path, relative_path, current_hash, "new"))
-                    stats["new_files"] += 1
-                elif stored_hash != current_hash:
-                    # File changed
-                    files_to_index.append((file_path, relative_path, current_hash, "updated"))
-                    stats["updated_files"] += 1
-                else:
-                    # File unchanged
-                    stats["unchanged_files"] += 1
+        detector = ChangeDetector(
+            repo_path,
+            self.SUPPORTED_EXTENSIONS,
+            self.SKIP_DIRS,
+            use_git=self.use_git_change_detection
+        )
+        changes = await asyncio.to_thread(
+            detector.detect,
+            existing_hashes,
+            index_state.get("file_stats"),
+            index_state.get("last_commit"),
+            index_state.get("dirty_files")
+        )
+
+        stats["change_detection"] = changes.mode
+        stats["files_checked"] = changes.checked
+        stats["new_files"] = len(changes.added)
+        stats["updated_files"] = len(changes.modified)
+        stats["unchanged_files"] = changes.unchanged
+
+        files_to_index = [
+            (os.path.join(repo_path, relative_path), relative_path, file_hash, "new")
+            for relative_path, file_hash in changes.added.items()
+        ] + [
+            (os.path.join(repo_path, relative_path), relative_path, file_hash, "updated")
+            for relative_path, file_hash in changes.modified.items()
+        ]
 
         # Handle deleted files
-        deleted_files = set(existing_hashes.keys()) - current_files
-        for deleted_file in deleted_files:
+        for deleted_file in changes.deleted:
             await self.repository.delete_by_file(project_id, deleted_file)
             stats["deleted_files"] += 1
 
         # Index new and changed files
-        all_chunks = []
+        pending = PendingFiles()
+        self._report_progress(files_total=len(files_to_index))
 
-        for file_path, relative_path, file_hash, status in files_to_index:
+        for files_done, (file_path, relative_path, file_hash, status) in enumerate(files_to_index, 1):
             try:
-                if status == "updated":
-                    # Delete existing chunks first
-                    await self.repository.delete_by_file(project_id, relative_path)
-
                 chunks = await self._process_file(project_id, file_path, relative_path, file_hash)
-                all_chunks.extend(chunks)
+
+                if status == "updated":
+                    # Only new or modified chunks need embedding
+                    pending.add(chunks, *await self._sync_file_chunks(project_id, relative_path, chunks, stats))
+                else:
+                    stats["chunks_added"] += len(chunks)
+                    pending.add(chunks, chunks)
 
             except Exception as e:
                 logger.error(f"Failed to index {relative_path}: {e}")
                 stats["errors"].append({"file": relative_path, "error": str(e)})
+                # Force a re-check next run
+                changes.file_stats.pop(relative_path, None)
+                changes.dirty_files.append(relative_path)
 
-        # Save chunks with embeddings
-        if all_chunks:
-            stats["total_chunks"] = await self._save_chunks_with_embeddings(project_id, all_chunks)
+            # Save in rounds: files already saved count as unchanged if the run is interrupted
+            if pending.to_embed >= self.batch_size:
+                stats["total_chunks"] += await self._save_pending_files(project_id, pending)
+
+            self._report_progress(files_done=files_done)
+
+        # Save remaining chunks with embeddings
+        stats["total_chunks"] += await self._save_pending_files(project_id, pending)
+
+        await self.repository.save_index_state(
+            project_id,
+            changes.head_commit,
+            changes.dirty_files,
+            changes.file_stats
+        )
 
         logger.info(
-            f"Incremental reindex complete: {stats['new_files']} new, "
-            f"{stats['updated_files']} updated, {stats['deleted_files']} deleted"
+            f"Incremental reindex complete ({changes.mode} change detection, "
+            f"{changes.checked} files checked): {stats['new_files']} new, "
+            f"{stats['updated_files']} updated, {stats['deleted_files']} deleted files; "
+            f"{stats['chunks_kept']} chunks kept, {stats['chunks_added']} added, "
+            f"{stats['chunks_removed']} removed"
         )
 
+        query_cache.bump(search_scope(project_id))
         return stats
 
     async def _process_file(
@@ -333,7 +453,7 @@ class CodebaseIndexer:
         file_hash: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
-        Process a single file into chunks.
+        Process a single file into chunks and replace its symbol table entries.
 
         Args:
             project_id: Project ID
@@ -357,27 +477,163 @@ class CodebaseIndexer:
         language = self._detect_language(ext)
 
         # Chunk the file
-        chunks = self.chunker.chunk_code(content, relative_path, language)
+        chunks, symbols = self.chunker.chunk_and_extract(content, relative_path, language)
+        chunk_ids = stable_chunk_ids(relative_path, chunks)
+
+        await self._save_file_symbols(project_id, relative_path, language, symbols)
 
         # Convert to dictionaries
-        result = []
-        for chunk_content, metadata in chunks:
-            summary = self.chunker.generate_summary(chunk_content, metadata)
-
-            result.append({
-                "project_id": project_id,
-                "file_path": relative_path,
-                "content": chunk_content,
-                "start_line": metadata.start_line,
-                "end_line": metadata.end_line,
-                "language": metadata.language,
-                "chunk_type": metadata.chunk_type,
-                "symbols": metadata.symbols,
-                "summary": summary,
-                "file_hash": file_hash
-            })
-
-        return result
+        return [
+            self._chunk_to_dict(
+                project_id,
+                relative_path,
+                file_hash,
+                chunk_content,
+                metadata,
+                self.chunker.generate_summary(chunk_content, metadata),
+                chunk_id
+            )
+            for (chunk_content, metadata), chunk_id in zip(chunks, chunk_ids)
+        ]
+
+    async def _save_file_symbols(
+        self,
+        project_id: str,
+        relative_path: str,
+        language: str,
+        symbols: List[SymbolDefinition]
+    ) -> int:
+        """Replace the stored symbol definitions of a file."""
+        return await self.repository.replace_file_symbols(
+            project_id,
+            relative_path,
+            language,
+            [
+                {
+                    "name": symbol.name,
+                    "kind": symbol.kind,
+                    "start_line": symbol.start_line,
+                    "end_line": symbol.end_line,
+                    "container": symbol.container
+                }
+                for symbol in symbols
+            ]
+        )
+
+    async def _sync_file_chunks(
+        self,
+        project_id: str,
+        relative_path: str,
+        chunks: List[Dict[str, Any]],
+        stats: Dict[str, Any]
+    ) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """
+        Reconcile a file's stored chunks with freshly chunked ones.
+
+        Chunks whose stable ID is already stored keep their embedding, only
+        new or modified chunks need embedding, and the rest are stale. Nothing
+        is written here: _save_pending_files refreshes hashes and deletes
+        stale chunks once the file's new chunks are saved.
+
+        Args:
+            project_id: Project ID
+            relative_path: Relative file path
+            chunks: Chunk dictionaries from _process_file
+            stats: Stats dict updated in place (chunks_kept/added/removed)
+
+        Returns:
+            Tuple of (chunk dictionaries that still need embedding, stale chunk IDs)
+        """
+        existing = await self.repository.get_file_chunk_positions(project_id, relative_path)
+
+        new_ids = {chunk["chunk_id"] for chunk in chunks}
+        added = [chunk for chunk in chunks if chunk["chunk_id"] not in existing]
+        removed = [chunk_id for chunk_id in existing if chunk_id not in new_ids]
+
+        stats["chunks_kept"] += len(chunks) - len(added)
+        stats["chunks_added"] += len(added)
+        stats["chunks_removed"] += len(removed)
+
+        return added, removed
+
+    async def _save_pending_files(self, project_id: str, pending: PendingFiles) -> int:
+        """
+        Embed and save the new chunks of queued files, then finalize the files.
+
+        New chunks are saved with PENDING_FILE_HASH; only after all of them are
+        stored are stale chunks deleted and the real file hash (and line
+        numbers) written to every chunk of the files. If saving fails or is
+        cancelled (job cancellation at a progress checkpoint, shutdown), the
+        chunks this round already saved are deleted again so the files keep
+        their previous chunks; should that fail too, the pending hash still
+        makes the next incremental reindex pick them up again.
+
+        Args:
+            project_id: Project ID
+            pending: Queued files, emptied by this call
+
+        Returns:
+            Number of chunks saved
+        """
+        files, pending.files, pending.to_embed = pending.files, [], 0
+        added = [{**chunk, "file_hash": PENDING_FILE_HASH} for _, file_added, _ in files for chunk in file_added]
+
+        try:
+            saved = await self._save_chunks_with_embeddings(project_id, added)
+        except (Exception, asyncio.CancelledError):
+            await self._roll_back_chunks(project_id, [chunk["chunk_id"] for chunk in added])
+            raise
+
+        removed = [chunk_id for _, _, stale in files for chunk_id in stale]
+        if removed:
+            await self.repository.delete_chunks(project_id, removed)
+
+        positions = [chunk for chunks, _, _ in files for chunk in chunks]
+        if positions:
+            # file_hash drives change detection, so it is written last
+            await self.repository.update_chunk_positions(project_id, positions)
+
+        return saved
+
+    async def _roll_back_chunks(self, project_id: str, chunk_ids: List[str]):
+        """Delete chunks of an interrupted save round (only new chunk IDs, never kept ones)"""
+        if not chunk_ids:
+            return
+        try:
+            deleted = await self.repository.delete_chunks(project_id, chunk_ids)
+            logger.info(f"Rolled back {deleted} chunks of an interrupted save round")
+        except Exception as e:
+            logger.warning(f"Failed to roll back interrupted save round: {e}")
+
+    def _chunk_to_dict(
+        self,
+        project_id: str,
+        relative_path: str,
+        file_hash: str,
+        chunk_content: str,
+        metadata: ChunkMetadata,
+        summary: str,
+        stable_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Build the chunk dictionary stored in MongoDB (without embedding)."""
+        chunk = {
+            "project_id": project_id,
+            "file_path": relative_path,
+            "content": chunk_content,
+            "start_line": metadata.start_line,
+            "end_line": metadata.end_line,
+            "language": metadata.language,
+            "chunk_type": metadata.chunk_type,
+            "symbols": metadata.symbols,
+            "summary": summary,
+            "file_hash": file_hash
+        }
+
+        if stable_id is not None:
+            # Content-based ID: unchanged code keeps its ID when lines shift
+            chunk["chunk_id"] = hashlib.sha256(f"{project_id}:{stable_id}".encode()).hexdigest()[:24]
+
+        return chunk
 
     async def _save_chunks_with_embeddings(
         self,
@@ -415,24 +671,14 @@ class CodebaseIndexer:
                     input_type="document"
                 )
 
-                # Save each chunk with its embedding
-                for j, chunk in enumerate(batch):
-                    await self.repository.save_chunk(
-                        project_id=chunk["project_id"],
-                        file_path=chunk["file_path"],
-                        content=chunk["content"],
-                        embedding=embeddings[j],
-                        start_line=chunk["start_line"],
-                        end_line=chunk["end_line"],
-                        language=chunk["language"],
-                        chunk_type=chunk["chunk_type"],
-                        symbols=chunk["symbols"],
-                        summary=chunk["summary"],
-                        file_hash=chunk["file_hash"]
-                    )
-                    saved_count += 1
+                # Bulk upsert the whole batch in one round trip
+                saved_count += await self.repository.save_chunks_bulk([
+                    {**chunk, "embedding": embeddings[j]}
+                    for j, chunk in enumerate(batch)
+                ])
 
                 logger.debug(f"Saved batch {i // self.batch_size + 1}, total {saved_count} chunks")
+                self._report_progress(chunks_embedded=len(batch))
 
             except Exception as e:
                 logger.error(f"Failed to save batch: {e}")
@@ -470,25 +716,30 @@ class CodebaseIndexer:
 
 class CodebaseSearchService:
     """
-    Service for semantic code search using MongoDB Atlas Vector Search.
+    Service for code search over a codebase repository.
 
     Provides:
-    - Natural language code search
+    - Natural language code search (embeddings)
+    - Lexical search (BM25 over content and symbols)
+    - Hybrid search fusing both rankings (reciprocal rank fusion)
+    - Exact symbol lookup without embedding the query
     - Language/type filtering
     - Similarity threshold control
     """
 
+    SEARCH_MODES = ("semantic", "lexical", "hybrid")
+
     def __init__(
         self,
-        repository,  # MongoDBCodebaseRepository
+        repository,  # MongoDBCodebaseRepository or SQLiteCodebaseRepository
         embedding_service: VoyageEmbeddingService
     ):
         """
         Initialize search service.
 
         Args:
-            repository: MongoDBCodebaseRepository instance
-            embedding_service: VoyageEmbeddingService instance
+            repository: MongoDBCodebaseRepository or SQLiteCodebaseRepository instance
+            embedding_service: VoyageEmbeddingService (or LocalEmbeddingService) instance
         """
         self.repository = repository
         self.embedding_service = embedding_service
@@ -499,37 +750,112 @@ class CodebaseSearchService:
         query: str,
         limit: int = 20,
         min_similarity: float = 0.0,
-        language: Optional[str] = None
+        language: Optional[str] = None,
+        mode: str = "hybrid"
     ) -> List[Dict[str, Any]]:
         """
-        Search codebase using natural language query.
+        Search codebase.
+
+        In lexical and hybrid mode, a query that is a bare identifier naming
+        a defined symbol (e.g. "CodebaseIndexer") returns the defining chunks
+        directly, without embedding the query. Results are cached per index
+        version (see retrieval.query_cache).
 
         Args:
             project_id: Project ID
-            query: Natural language search query
+            query: Natural language query or identifiers
             limit: Maximum number of results
-            min_similarity: Minimum similarity threshold (0.0-1.0)
+            min_similarity: Minimum cosine similarity of results (0.0-1.0). In
+                hybrid mode, results found only lexically have no similarity
+                and are dropped when it is set; lexical mode and symbol
+                lookups ignore it.
             language: Optional language filter (e.g., "python", "typescript")
+            mode: "semantic" (embeddings), "lexical" (BM25) or "hybrid" (both, fused)
 
         Returns:
-            List of matching code chunks with similarity scores
+            List of matching code chunks. "score" is the cosine similarity of
+            semantic matches; "match" tells which retriever found the chunk
+            ("symbol", "semantic", "lexical" or "both") and hybrid results
+            carry "rrf_score".
+
+        Raises:
+            ValueError: If mode is unknown
         """
-        # Generate query embedding
-        query_embedding = await self.embedding_service.generate_query_embedding(query)
+        if mode not in self.SEARCH_MODES:
+            raise ValueError(f"Unknown search mode '{mode}' (expected one of {', '.join(self.SEARCH_MODES)})")
 
         # Build filters
         filters = {}
         if language:
             filters["language"] = language
 
-        # Perform vector search
-        results = await self.repository.vector_search(
-            project_id=project_id,
-            query_embedding=query_embedding,
-            limit=limit,
-            min_similarity=min_similarity,
-            filters=filters
+        return await query_cache.results(
+            search_scope(project_id),
+            (query, mode, limit, min_similarity, language),
+            lambda: self._search(project_id, query, limit, min_similarity, filters, mode)
+        )
+
+    async def _search(
+        self,
+        project_id: str,
+        query: str,
+        limit: int,
+        min_similarity: float,
+        filters: Dict[str, Any],
+        mode: str
+    ) -> List[Dict[str, Any]]:
+        """Run a search (uncached)"""
+        if mode != "semantic" and looks_like_identifier(query):
+            matches = await self.repository.find_symbol(project_id, query, limit=limit, filters=filters)
+            if matches:
+                logger.info(f"Symbol lookup answered '{query}' with {len(matches)} chunks")
+                return [{**chunk, "match": "symbol"} for chunk in matches]
+
+        if mode == "lexical":
+            results = await self.repository.lexical_search(project_id, query, limit=limit, filters=filters)
+            return [{**chunk, "bm25_score": chunk["score"], "match": "lexical"} for chunk in results]
+
+        # Generate query embedding
+        query_embedding = await self.embedding_service.generate_query_embedding(query)
+
+        if mode == "semantic":
+            results = await self.repository.vector_search(
+                project_id=project_id,
+                query_embedding=query_embedding,
+                limit=limit,
+                min_similarity=min_similarity,
+                filters=filters
+            )
+            return [{**chunk, "match": "semantic"} for chunk in results]
+
+        # Hybrid: fuse the two rankings, each over twice the requested results
+        semantic, lexical = await asyncio.gather(
+            self.repository.vector_search(
+                project_id=project_id,
+                query_embedding=query_embedding,
+                limit=limit * 2,
+                min_similarity=min_similarity,
+                filters=filters
+            ),
+            self.repository.lexical_search(project_id, query, limit=limit * 2, filters=filters)
         )
+        semantic_chunks = {chunk["chunk_id"]: chunk for chunk in semantic}
+        lexical_chunks = {chunk["chunk_id"]: chunk for chunk in lexical}
+
+        fused = reciprocal_rank_fusion([list(semantic_chunks), list(lexical_chunks)])
+        if min_similarity > 0:
+            # Same threshold as semantic mode: every result must have a similarity above it
+            fused = [(chunk_id, rrf_score) for chunk_id, rrf_score in fused if chunk_id in semantic_chunks]
+
+        results = []
+        for chunk_id, rrf_score in fused[:limit]:
+            in_semantic, in_lexical = chunk_id in semantic_chunks, chunk_id in lexical_chunks
+            chunk = dict(semantic_chunks[chunk_id] if in_semantic else lexical_chunks[chunk_id])
+            chunk["score"] = semantic_chunks[chunk_id]["score"] if in_semantic else None
+            chunk["bm25_score"] = lexical_chunks[chunk_id]["score"] if in_lexical else None
+            chunk["rrf_score"] = rrf_score
+            chunk["match"] = "both" if in_semantic and in_lexical else "semantic" if in_semantic else "lexical"
+            results.append(chunk)
 
         return results
 
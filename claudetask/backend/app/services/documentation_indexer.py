@@ -2,16 +2,23 @@
 
 import os
 import re
+import asyncio
 import hashlib
 import logging
-from typing import List, Dict, Any, Optional, Set
+from typing import Callable, List, Dict, Any, Optional, Set
 from pathlib import Path
 
 from ..services.embedding_service import VoyageEmbeddingService
+from retrieval import query_cache
 
 logger = logging.getLogger(__name__)
 
 
+def search_scope(project_id: str) -> tuple:
+    """Query cache scope of a project's documentation index (bumped after every indexing run, also failed ones)"""
+    return ("documentation", project_id)
+
+
 class DocumentationIndexer:
     """
     Service for indexing documentation into MongoDB Atlas with Voyage AI embeddings.
@@ -49,7 +56,8 @@ class DocumentationIndexer:
         embedding_service: VoyageEmbeddingService,
         chunk_size: int = 1000,
         chunk_overlap: int = 100,
-        batch_size: int = 100  # Voyage AI batch limit (rate limit: 2000 RPS)
+        batch_size: int = 1000,  # Chunks per embed+save round (split into API requests by token budget)
+        progress_callback: Optional[Callable[[Dict[str, int]], None]] = None
     ):
         """
         Initialize documentation indexer.
@@ -59,13 +67,23 @@ class DocumentationIndexer:
             embedding_service: VoyageEmbeddingService instance
             chunk_size: Target chunk size in characters
             chunk_overlap: Overlap between chunks
-            batch_size: Number of chunks to embed in one batch
+            batch_size: Chunks embedded and saved per round; the embedding service
+                packs them into concurrent API requests by token budget
+            progress_callback: Receives progress updates ({"files_total": n},
+                {"files_done": n} or {"chunks_embedded": increment}); may raise
+                to stop indexing at that point (e.g. job cancellation)
         """
         self.repository = repository
         self.embedding_service = embedding_service
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
         self.batch_size = batch_size
+        self.progress_callback = progress_callback
+
+    def _report_progress(self, **progress: int):
+        """Forward progress to the callback (a checkpoint where indexing may be stopped)"""
+        if self.progress_callback:
+            self.progress_callback(progress)
 
     async def index_documentation(
         self,
@@ -133,12 +151,13 @@ class DocumentationIndexer:
         logger.info(f"Found {len(files_to_index)} documentation files to index")
 
         # Index files
-        all_chunks = []
+        pending_chunks = []
+        self._report_progress(files_total=len(files_to_index))
 
-        for file_path, relative_path in files_to_index:
+        for files_done, (file_path, relative_path) in enumerate(files_to_index, 1):
             try:
                 chunks = await self._process_file(project_id, file_path, relative_path)
-                all_chunks.extend(chunks)
+                pending_chunks.extend(chunks)
                 stats["indexed_files"] += 1
 
                 if stats["indexed_files"] % 5 == 0:
@@ -149,15 +168,23 @@ class DocumentationIndexer:
                 stats["errors"].append({"file": relative_path, "error": str(e)})
                 stats["skipped_files"] += 1
 
-        # Generate embeddings and save to MongoDB in batches
-        if all_chunks:
-            stats["total_chunks"] = await self._save_chunks_with_embeddings(project_id, all_chunks)
+            # Save in rounds so an interrupted run keeps what was already embedded
+            if len(pending_chunks) >= self.batch_size:
+                batch, pending_chunks = pending_chunks, []
+                stats["total_chunks"] += await self._save_chunks_with_embeddings(project_id, batch)
+
+            self._report_progress(files_done=files_done)
+
+        # Generate embeddings and save remaining chunks to MongoDB
+        if pending_chunks:
+            stats["total_chunks"] += await self._save_chunks_with_embeddings(project_id, pending_chunks)
 
         logger.info(
             f"Documentation indexing complete: {stats['indexed_files']} files, "
             f"{stats['total_chunks']} chunks, {len(stats['errors'])} errors"
         )
 
+        query_cache.bump(search_scope(project_id))
         return stats
 
     async def index_files(
@@ -186,9 +213,12 @@ class DocumentationIndexer:
             "errors": []
         }
 
-        all_chunks = []
+        pending_chunks = []
+        self._report_progress(files_total=len(file_paths))
+
+        for files_done, file_path in enumerate(file_paths):
+            self._report_progress(files_done=files_done)
 
-        for file_path in file_paths:
             # Convert to absolute path if needed
             if not os.path.isabs(file_path):
                 abs_path = os.path.join(repo_path, file_path)
@@ -215,7 +245,7 @@ class DocumentationIndexer:
 
                 # Process file
                 chunks = await self._process_file(project_id, abs_path, relative_path)
-                all_chunks.extend(chunks)
+                pending_chunks.extend(chunks)
                 stats["indexed_files"] += 1
 
             except Exception as e:
@@ -223,10 +253,17 @@ class DocumentationIndexer:
                 stats["errors"].append({"file": relative_path, "error": str(e)})
                 stats["skipped_files"] += 1
 
-        # Save chunks with embeddings
-        if all_chunks:
-            stats["total_chunks"] = await self._save_chunks_with_embeddings(project_id, all_chunks)
+            # Save in rounds so an interrupted run keeps what was already embedded
+            if len(pending_chunks) >= self.batch_size:
+                batch, pending_chunks = pending_chunks, []
+                stats["total_chunks"] += await self._save_chunks_with_embeddings(project_id, batch)
 
+        # Save remaining chunks with embeddings
+        if pending_chunks:
+            stats["total_chunks"] += await self._save_chunks_with_embeddings(project_id, pending_chunks)
+
+        self._report_progress(files_done=len(file_paths))
+        query_cache.bump(search_scope(project_id))
         return stats
 
     async def reindex_changed_files(
@@ -310,29 +347,38 @@ class DocumentationIndexer:
             stats["deleted_files"] += 1
 
         # Index new and changed files
-        all_chunks = []
+        pending_chunks = []
+        self._report_progress(files_total=len(files_to_index))
 
-        for file_path, relative_path, file_hash, status in files_to_index:
+        for files_done, (file_path, relative_path, file_hash, status) in enumerate(files_to_index, 1):
             try:
                 if status == "updated":
                     await self.repository.delete_by_file(project_id, relative_path)
 
                 chunks = await self._process_file(project_id, file_path, relative_path, file_hash)
-                all_chunks.extend(chunks)
+                pending_chunks.extend(chunks)
 
             except Exception as e:
                 logger.error(f"Failed to index {relative_path}: {e}")
                 stats["errors"].append({"file": relative_path, "error": str(e)})
 
-        # Save chunks with embeddings
-        if all_chunks:
-            stats["total_chunks"] = await self._save_chunks_with_embeddings(project_id, all_chunks)
+            # Save in rounds: files already saved count as unchanged if the run is interrupted
+            if len(pending_chunks) >= self.batch_size:
+                batch, pending_chunks = pending_chunks, []
+                stats["total_chunks"] += await self._save_chunks_with_embeddings(project_id, batch)
+
+            self._report_progress(files_done=files_done)
+
+        # Save remaining chunks with embeddings
+        if pending_chunks:
+            stats["total_chunks"] += await self._save_chunks_with_embeddings(project_id, pending_chunks)
 
         logger.info(
             f"Incremental doc reindex complete: {stats['new_files']} new, "
             f"{stats['updated_files']} updated, {stats['deleted_files']} deleted"
         )
 
+        query_cache.bump(search_scope(project_id))
         return stats
 
     async def _process_file(
@@ -563,7 +609,32 @@ class DocumentationIndexer:
         project_id: str,
         chunks: List[Dict[str, Any]]
     ) -> int:
-        """Generate embeddings and save chunks to MongoDB."""
+        """
+        Generate embeddings and save chunks to MongoDB.
+
+        Rounds hold whole files. If a round fails or is cancelled after part
+        of it was saved, its files are deleted again: a partly saved file
+        would carry its new hash and never be completed, a missing one is
+        indexed as new by the next incremental reindex.
+        """
+        try:
+            return await self._save_chunk_batches(project_id, chunks)
+        except (Exception, asyncio.CancelledError):
+            file_paths = list(dict.fromkeys(chunk["file_path"] for chunk in chunks))
+            try:
+                for file_path in file_paths:
+                    await self.repository.delete_by_file(project_id, file_path)
+                logger.info(f"Rolled back {len(file_paths)} doc files of an interrupted save round")
+            except Exception as e:
+                logger.warning(f"Failed to roll back interrupted doc save round: {e}")
+            raise
+
+    async def _save_chunk_batches(
+        self,
+        project_id: str,
+        chunks: List[Dict[str, Any]]
+    ) -> int:
+        """Embed and save chunks in batches of batch_size."""
         saved_count = 0
 
         # Process in batches
@@ -583,24 +654,14 @@ class DocumentationIndexer:
                     input_type="document"
                 )
 
-                # Save each chunk with its embedding
-                for j, chunk in enumerate(batch):
-                    await self.repository.save_chunk(
-                        project_id=chunk["project_id"],
-                        file_path=chunk["file_path"],
-                        content=chunk["content"],
-                        embedding=embeddings[j],
-                        start_line=chunk["start_line"],
-                        end_line=chunk["end_line"],
-                        doc_type=chunk["doc_type"],
-                        title=chunk["title"],
-                        headings=chunk["headings"],
-                        summary=chunk["summary"],
-                        file_hash=chunk["file_hash"]
-                    )
-                    saved_count += 1
+                # Bulk upsert the whole batch in one round trip
+                saved_count += await self.repository.save_chunks_bulk([
+                    {**chunk, "embedding": embeddings[j]}
+                    for j, chunk in enumerate(batch)
+                ])
 
                 logger.debug(f"Saved doc batch {i // self.batch_size + 1}, total {saved_count} chunks")
+                self._report_progress(chunks_embedded=len(batch))
 
             except Exception as e:
                 logger.error(f"Failed to save doc batch: {e}")
@@ -641,25 +702,27 @@ class DocumentationSearchService:
 
         Returns:
             List of matching documentation chunks with similarity scores
+            (cached per index version, see retrieval.query_cache)
         """
-        # Generate query embedding
-        query_embedding = await self.embedding_service.generate_query_embedding(query)
-
-        # Build filters
-        filters = {}
-        if doc_type:
-            filters["doc_type"] = doc_type
-
-        # Perform vector search
-        results = await self.repository.vector_search(
-            project_id=project_id,
-            query_embedding=query_embedding,
-            limit=limit,
-            min_similarity=min_similarity,
-            filters=filters
-        )
-
-        return results
+        async def search():
+            # Generate query embedding
+            query_embedding = await self.embedding_service.generate_query_embedding(query)
+
+            # Build filters
+            filters = {}
+            if doc_type:
+                filters["doc_type"] = doc_type
+
+            # Perform vector search
+            return await self.repository.vector_search(
+                project_id=project_id,
+                query_embedding=query_embedding,
+                limit=limit,
+                min_similarity=min_similarity,
+                filters=filters
+            )
+
+        return await query_cache.results(search_scope(project_id), (query, limit, min_similarity, doc_type), search)
 
     async def get_stats(self, project_id: str) -> Dict[str, Any]:
         """Get indexing statistics for a project."""
@@ -12,7 +12,8 @@ class EmbeddingServiceFactory:
     Factory for creating embedding service instances based on storage mode.
 
     Storage modes:
-    - "local": all-MiniLM-L6-v2 (384 dimensions) via sentence-transformers
+    - "local": all-MiniLM-L6-v2 (384 dimensions) via sentence-transformers,
+      or ONNX Runtime (int8) with CLAUDETASK_EMBEDDING_BACKEND=onnx
     - "mongodb": voyage-3-large (1024 dimensions) via Voyage AI API
 
     This factory follows the Abstract Factory pattern, providing a unified
@@ -63,7 +64,7 @@ class EmbeddingServiceFactory:
     @staticmethod
     def _create_local_service():
         """
-        Create sentence-transformers service for local storage.
+        Create local embedding engine for local storage.
 
         Uses all-MiniLM-L6-v2 model:
         - 384 dimensions
@@ -71,32 +72,43 @@ class EmbeddingServiceFactory:
         - Runs locally (no API calls)
         - Integrated with ChromaDB
 
+        The engine is selected with CLAUDETASK_EMBEDDING_BACKEND:
+        - "torch" (default): sentence-transformers on PyTorch
+        - "onnx": ONNX Runtime, int8 unless CLAUDETASK_EMBEDDING_QUANTIZE=false,
+          intra-op threads from CLAUDETASK_EMBEDDING_THREADS
+
         Returns:
-            SentenceTransformer model instance
+            Embedder with a SentenceTransformer-compatible encode()
 
         Raises:
-            ImportError: If sentence-transformers not installed
+            ImportError: If the selected backend's dependencies are not installed
         """
-        try:
-            from sentence_transformers import SentenceTransformer
+        import sys
+        from pathlib import Path
+
+        mcp_server_path = Path(__file__).parent.parent.parent.parent / "mcp_server"
+        if str(mcp_server_path) not in sys.path:
+            sys.path.insert(0, str(mcp_server_path))
+
+        from embeddings import create_local_embedder
 
-            # Load all-MiniLM-L6-v2 model
-            # This model is cached locally after first download
-            model = SentenceTransformer("all-MiniLM-L6-v2")
+        try:
+            # Model files are cached locally after first download
+            model = create_local_embedder("all-MiniLM-L6-v2")
 
             logger.info(
-                "Loaded local embedding model: all-MiniLM-L6-v2 (384 dimensions)"
+                f"Loaded local embedding model: all-MiniLM-L6-v2 (384 dimensions, "
+                f"{model.backend} backend)"
             )
 
             return model
 
         except ImportError as e:
-            logger.error(
-                "sentence-transformers not installed. "
-                "Install with: pip install sentence-transformers"
-            )
+            logger.error(f"Local embedding backend dependencies missing: {e}")
             raise ImportError(
-                "sentence-transformers required for local storage mode. "
+                "sentence-transformers required for local storage mode "
+                "(or onnxruntime, tokenizers and huggingface_hub with "
+                "CLAUDETASK_EMBEDDING_BACKEND=onnx). "
                 "Install with: pip install sentence-transformers"
             ) from e
 
@@ -1,8 +1,11 @@
 """Embedding service for generating semantic vectors with voyage-3-large model"""
 
+import os
+import sys
 import asyncio
 import logging
-from typing import List, Optional
+from pathlib import Path
+from typing import Any, Dict, List, Optional
 
 try:
     import voyageai
@@ -11,6 +14,14 @@ except ImportError:
     voyageai = None
     VOYAGEAI_AVAILABLE = False
 
+# Make mcp_server modules (embeddings) importable the same way the indexers do
+mcp_server_path = Path(__file__).parent.parent.parent.parent / "mcp_server"
+if str(mcp_server_path) not in sys.path:
+    sys.path.insert(0, str(mcp_server_path))
+
+from embeddings import AdaptiveRateLimiter, EmbeddingScheduler, RateLimitError
+from retrieval import query_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,11 +35,17 @@ class VoyageEmbeddingService:
     - Better retrieval accuracy for RAG applications
 
     This service handles:
-    - Batch processing for efficiency (max 100 texts/batch)
+    - Batches packed by token budget (up to 1000 texts / ~100K tokens)
+    - Several batches in flight concurrently (EmbeddingScheduler)
+    - Adaptive token-bucket rate limiting that backs off on 429s
+    - Per-batch latency metrics (get_metrics)
     - Async/await for FastAPI integration
-    - Rate limit handling and retries
     - Error handling and logging
 
+    Setting VOYAGE_API_BASE_URL (or base_url) sends requests to a
+    Voyage-compatible HTTP endpoint instead of the SDK, e.g. a local
+    fake embedding server for load tests.
+
     Usage:
         service = VoyageEmbeddingService(api_key="vo-...")
         embeddings = await service.generate_embeddings(["text1", "text2"])
@@ -39,7 +56,13 @@ class VoyageEmbeddingService:
         api_key: str,
         batch_delay: float = 0.0,
         retry_base_delay: float = 1.0,
-        max_retries: int = 5
+        max_retries: int = 5,
+        cache=None,
+        max_concurrency: int = 4,
+        requests_per_second: Optional[float] = None,
+        tokens_per_minute: Optional[float] = 3_000_000,
+        max_batch_tokens: int = 100_000,
+        base_url: Optional[str] = None
     ):
         """
         Initialize Voyage AI embedding service.
@@ -49,16 +72,24 @@ class VoyageEmbeddingService:
             batch_delay: Delay in seconds between batches (default: 0 for high RPS tiers)
             retry_base_delay: Base delay for exponential backoff on rate limits (default: 1s)
             max_retries: Max retries for rate limit errors (default: 5)
+            cache: Optional EmbeddingCache; cached texts skip the API call
+            max_concurrency: Batches in flight at once
+            requests_per_second: Request rate ceiling (default: 1/batch_delay, or 25)
+            tokens_per_minute: Token rate ceiling (None: unlimited)
+            max_batch_tokens: Estimated token budget per request (API limit: 120K)
+            base_url: Voyage-compatible HTTP endpoint (default: VOYAGE_API_BASE_URL or SDK)
 
         Raises:
             ValueError: If API key is invalid or missing
             RuntimeError: If voyageai module is not installed
 
         Rate limit tiers:
-            - Free tier (3 RPM): batch_delay=20, retry_base_delay=20
-            - Paid tier (2000 RPS): batch_delay=0, retry_base_delay=1
+            - Free tier (3 RPM): batch_delay=20, retry_base_delay=20, max_concurrency=1
+            - Paid tier (2000 RPM): batch_delay=0, retry_base_delay=1
         """
-        if not VOYAGEAI_AVAILABLE:
+        self.base_url = (base_url or os.getenv("VOYAGE_API_BASE_URL") or "").rstrip("/") or None
+
+        if not VOYAGEAI_AVAILABLE and self.base_url is None:
             raise RuntimeError(
                 "voyageai module not installed. Install with: pip install voyageai"
             )
@@ -69,28 +100,53 @@ class VoyageEmbeddingService:
         if not api_key.startswith("vo-"):
             logger.warning("Voyage AI API key should start with 'vo-'. Key may be invalid.")
 
-        self.client = voyageai.Client(api_key=api_key)
+        self.api_key = api_key
+        self.client = voyageai.Client(api_key=api_key) if VOYAGEAI_AVAILABLE else None
+        self.async_client = (
+            voyageai.AsyncClient(api_key=api_key)
+            if VOYAGEAI_AVAILABLE and hasattr(voyageai, "AsyncClient") else None
+        )
+        self._http_client = None
         self.model = "voyage-3-large"
         self.dimensions = 1024
-        self.max_batch_size = 100  # Voyage AI API limit
+        self.max_batch_size = 1000  # Voyage AI API limit (texts per request)
         self.max_retries = max_retries
-        self.batch_delay = batch_delay  # Delay between batches (0 for high RPS)
+        self.batch_delay = batch_delay  # Minimum spacing between requests (0 for high RPS)
         self.retry_base_delay = retry_base_delay  # Base delay for rate limit retries
+        self.cache = cache  # Content-addressed cache shared with other indexers
+
+        if requests_per_second is None:
+            requests_per_second = 1.0 / batch_delay if batch_delay > 0 else 25.0
+
+        # Query and document traffic count against the same API limits
+        self.request_limiter = AdaptiveRateLimiter(
+            rate=requests_per_second,
+            burst=max(1.0, min(requests_per_second, float(max_concurrency)))
+        )
+        self.token_limiter = AdaptiveRateLimiter(
+            rate=tokens_per_minute / 60,
+            burst=max(tokens_per_minute / 60, float(max_batch_tokens))
+        ) if tokens_per_minute else None
+
+        self.max_concurrency = max_concurrency
+        self.max_batch_tokens = max_batch_tokens
+        self._schedulers: Dict[str, EmbeddingScheduler] = {}
 
     async def generate_embeddings(
         self,
         texts: List[str],
-        batch_size: int = 100,
+        batch_size: Optional[int] = None,
         input_type: str = "document"
     ) -> List[List[float]]:
         """
         Generate voyage-3-large embeddings for multiple texts.
 
-        Processes texts in batches for efficiency and to respect API rate limits.
+        Texts are packed into batches by token budget and sent concurrently
+        under the adaptive rate limiter.
 
         Args:
             texts: List of texts to embed
-            batch_size: Number of texts per batch (max 100)
+            batch_size: Maximum texts per request (default/max: 1000)
             input_type: Type of input text ("document" or "query")
                        - "document": For texts to be stored and searched
                        - "query": For search queries
@@ -109,47 +165,61 @@ class VoyageEmbeddingService:
         if not texts:
             return []
 
-        # Validate batch size
-        batch_size = min(batch_size, self.max_batch_size)
-
-        all_embeddings = []
-        total_batches = (len(texts) - 1) // batch_size + 1
-
-        # Process in batches
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i:i + batch_size]
-            batch_num = i // batch_size + 1
+        if self.cache is None:
+            return await self._embed_batches(texts, batch_size, input_type)
 
-            try:
-                # Voyage AI SDK is sync, run in executor for async compatibility
-                embeddings = await asyncio.to_thread(
-                    self._generate_batch,
-                    batch,
-                    input_type
-                )
+        # Query and document embeddings differ, so input_type is part of the cache key
+        cache_model = f"{self.model}:{input_type}"
+        vectors, missing = await asyncio.to_thread(self.cache.lookup, cache_model, texts)
 
-                all_embeddings.extend(embeddings)
+        if missing:
+            missing_texts = [texts[i] for i in missing]
+            computed = await self._embed_batches(missing_texts, batch_size, input_type)
+            await asyncio.to_thread(self.cache.store, cache_model, missing_texts, computed)
+            for i, vector in zip(missing, computed):
+                vectors[i] = vector
 
-                logger.debug(
-                    f"Generated {len(embeddings)} embeddings "
-                    f"(batch {batch_num}/{total_batches})"
-                )
+        logger.debug(f"Embedding cache: {len(texts) - len(missing)}/{len(texts)} hits")
+        return vectors
 
-                # Add delay between batches (0 for high RPS tiers like 2000 RPS)
-                if batch_num < total_batches and self.batch_delay > 0:
-                    await asyncio.sleep(self.batch_delay)
-
-            except Exception as e:
-                logger.error(f"Failed to generate embeddings for batch {batch_num}: {e}")
-                raise
+    async def _embed_batches(
+        self,
+        texts: List[str],
+        batch_size: Optional[int],
+        input_type: str
+    ) -> List[List[float]]:
+        """Call the Voyage AI API for texts through the scheduler (no caching)."""
+        scheduler = self._get_scheduler(input_type)
 
-        return all_embeddings
+        try:
+            return await scheduler.embed(texts, max_batch_size=batch_size)
+        except Exception as e:
+            logger.error(f"Failed to generate embeddings for {len(texts)} texts: {e}")
+            raise
+
+    def _get_scheduler(self, input_type: str) -> EmbeddingScheduler:
+        """One scheduler (and latency window) per input type, sharing the rate limiters"""
+        scheduler = self._schedulers.get(input_type)
+        if scheduler is None:
+            async def embed_batch(batch: List[str]) -> List[List[float]]:
+                return await self._embed_request(batch, input_type)
+
+            scheduler = EmbeddingScheduler(
+                embed_batch,
+                max_concurrency=self.max_concurrency,
+                max_batch_size=self.max_batch_size,
+                max_batch_tokens=self.max_batch_tokens,
+                max_retries=self.max_retries,
+                retry_base_delay=self.retry_base_delay,
+                request_limiter=self.request_limiter,
+                token_limiter=self.token_limiter
+            )
+            self._schedulers[input_type] = scheduler
+        return scheduler
 
-    def _generate_batch(self, texts: List[str], input_type: str) -> List[List[float]]:
+    async def _embed_request(self, texts: List[str], input_type: str) -> List[List[float]]:
         """
-        Generate embeddings for a single batch (sync method for executor).
-
-        Includes retry logic with exponential backoff for rate limit errors.
+        Send one embedding request (retries are handled by the scheduler).
 
         Args:
             texts: Batch of texts to embed
@@ -159,41 +229,72 @@ class VoyageEmbeddingService:
             List of embedding vectors
 
         Raises:
-            Exception: If API call fails after all retries
+            RateLimitError: On HTTP 429 from a base_url endpoint
+            Exception: SDK or HTTP errors
         """
-        import time
-
-        last_error = None
-
-        for attempt in range(self.max_retries):
-            try:
-                response = self.client.embed(
-                    texts,
-                    model=self.model,
-                    input_type=input_type
-                )
-                return response.embeddings
-
-            except Exception as e:
-                last_error = e
-                error_str = str(e).lower()
-
-                # Check if it's a rate limit error
-                if "rate limit" in error_str or "429" in error_str or "too many requests" in error_str:
-                    # Calculate delay with exponential backoff
-                    delay = self.retry_base_delay * (2 ** attempt)
-                    logger.warning(
-                        f"Rate limit hit, attempt {attempt + 1}/{self.max_retries}. "
-                        f"Waiting {delay:.1f}s before retry..."
-                    )
-                    time.sleep(delay)
-                else:
-                    # Non-rate-limit error, raise immediately
-                    raise
-
-        # All retries exhausted
-        logger.error(f"Failed after {self.max_retries} retries: {last_error}")
-        raise last_error
+        if self.base_url is not None:
+            return await self._embed_http(texts, input_type)
+
+        if self.async_client is not None:
+            response = await self.async_client.embed(texts, model=self.model, input_type=input_type)
+        else:
+            # Older SDKs are sync only
+            response = await asyncio.to_thread(
+                self.client.embed, texts, model=self.model, input_type=input_type
+            )
+        return response.embeddings
+
+    async def _embed_http(self, texts: List[str], input_type: str) -> List[List[float]]:
+        """POST to a Voyage-compatible /embeddings endpoint"""
+        import httpx
+
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                timeout=httpx.Timeout(60.0, connect=5.0)
+            )
+
+        response = await self._http_client.post(
+            "/embeddings",
+            json={"input": texts, "model": self.model, "input_type": input_type}
+        )
+
+        if response.status_code == 429:
+            retry_after = response.headers.get("Retry-After")
+            raise RateLimitError(
+                f"429 Too Many Requests from {self.base_url}",
+                retry_after=float(retry_after) if retry_after else None
+            )
+        response.raise_for_status()
+
+        data = sorted(response.json()["data"], key=lambda item: item.get("index", 0))
+        return [item["embedding"] for item in data]
+
+    def get_metrics(self, recent: int = 0) -> Dict[str, Any]:
+        """
+        Per-batch latency, throughput and rate limiter state.
+
+        Args:
+            recent: Include the last N per-batch records
+
+        Returns:
+            Metrics keyed by input type ("document", "query")
+        """
+        return {
+            "model": self.model,
+            "transport": "http" if self.base_url else ("async_sdk" if self.async_client else "sdk"),
+            "by_input_type": {
+                input_type: scheduler.get_metrics(recent)
+                for input_type, scheduler in self._schedulers.items()
+            }
+        }
+
+    async def close(self):
+        """Close the HTTP client (base_url transport only)"""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
 
     async def generate_single_embedding(
         self,
@@ -223,7 +324,8 @@ class VoyageEmbeddingService:
         """
         Generate embedding for a search query.
 
-        Uses input_type="query" for optimal query representation.
+        Uses input_type="query" for optimal query representation. Repeated
+        queries are answered from the process-wide query embedding LRU.
 
         Args:
             query: Search query text
@@ -235,7 +337,9 @@ class VoyageEmbeddingService:
             query_embedding = await service.generate_query_embedding("What is Python?")
             # Use for vector search against document embeddings
         """
-        return await self.generate_single_embedding(query, input_type="query")
+        return await query_cache.embedding(
+            f"{self.model}:query", query, lambda: self.generate_single_embedding(query, input_type="query")
+        )
 
     async def validate_api_key(self) -> bool:
         """
@@ -273,3 +377,66 @@ class VoyageEmbeddingService:
             "voyage-3-large"
         """
         return self.model
+
+
+class LocalEmbeddingService:
+    """
+    all-MiniLM-L6-v2 embeddings (384 dimensions) from the backend's shared model.
+
+    Offers the VoyageEmbeddingService methods used by the indexers and search
+    services, so local-mode projects can use them without Voyage AI. Requests
+    go through the shared micro-batcher (and persistent embedding cache).
+
+    Usage:
+        service = await rag_engine.get_local_embedding_service()
+        embeddings = await service.generate_embeddings(["text1", "text2"])
+    """
+
+    def __init__(self, batcher, model: str, dimensions: int):
+        """
+        Initialize local embedding service.
+
+        Args:
+            batcher: MicroBatcher over the shared RAGService model
+            model: Model name
+            dimensions: Embedding dimensions
+        """
+        self.batcher = batcher
+        self.model = model
+        self.dimensions = dimensions
+
+    async def generate_embeddings(
+        self,
+        texts: List[str],
+        batch_size: Optional[int] = None,
+        input_type: str = "document"
+    ) -> List[List[float]]:
+        """
+        Generate embeddings for multiple texts.
+
+        Args:
+            texts: List of texts to embed
+            batch_size: Unused (the micro-batcher sizes model calls)
+            input_type: Unused (MiniLM embeds queries and documents alike)
+
+        Returns:
+            List of 384-dimensional embedding vectors
+        """
+        return await self.batcher.submit(texts)
+
+    async def generate_single_embedding(self, text: str, input_type: str = "document") -> List[float]:
+        """Generate embedding for a single text."""
+        embeddings = await self.generate_embeddings([text], input_type=input_type)
+        return embeddings[0] if embeddings else []
+
+    async def generate_query_embedding(self, query: str) -> List[float]:
+        """Generate embedding for a search query (cached in the query embedding LRU)."""
+        return await query_cache.embedding(
+            self.model, query, lambda: self.generate_single_embedding(query, input_type="query")
+        )
+
+    def get_embedding_dimensions(self) -> int:
+        return self.dimensions
+
+    def get_model_name(self) -> str:
+        return self.model
@@ -0,0 +1,445 @@
+"""
+Background job queue for codebase and documentation indexing.
+
+Indexing endpoints enqueue a job and return its ID immediately instead of
+running the whole index inside the HTTP request. Jobs for the same project
+and index kind run one at a time; triggers that arrive while a job is
+queued are merged into it (a full index absorbs a reindex, which absorbs a
+file list), so bursts of merge hooks cost one run.
+
+Running jobs report progress (files done, chunks embedded, ETA) through the
+indexers' progress callbacks, which are also the cancellation checkpoints.
+Chunks are saved in rounds of whole files as indexing proceeds, and job
+state is persisted, so jobs interrupted by a restart are re-queued and skip
+already indexed work. A round interrupted by cancellation or shutdown is
+rolled back by the indexer, so its files are indexed again by the next run.
+"""
+
+import os
+import json
+import time
+import uuid
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+ACTIVE_STATUSES = {JOB_QUEUED, JOB_RUNNING}
+
+# Broader operations absorb narrower ones when jobs are coalesced
+OPERATION_RANK = {"index_files": 0, "reindex": 1, "index": 2}
+
+ProgressCallback = Callable[[Dict[str, int]], None]
+JobRunner = Callable[["IndexingJob", ProgressCallback], Awaitable[Dict[str, Any]]]
+
+
+class IndexingCancelled(Exception):
+    """Raised at an indexing checkpoint when the job was cancelled"""
+
+
+@dataclass
+class IndexingJob:
+    """State of one indexing job"""
+    job_id: str
+    project_id: str
+    kind: str  # "codebase" or "documentation"
+    operation: str  # "index", "reindex" or "index_files"
+    repo_path: str
+    full_reindex: bool = False
+    file_paths: List[str] = field(default_factory=list)
+    status: str = JOB_QUEUED
+    files_total: int = 0
+    files_done: int = 0
+    chunks_embedded: int = 0
+    coalesced: int = 0  # Triggers merged into this job
+    resumed: bool = False
+    cancel_requested: bool = False
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return (self.project_id, self.kind)
+
+    def eta_seconds(self) -> Optional[float]:
+        """Remaining time estimated from the file rate so far"""
+        if self.status != JOB_RUNNING or not self.started_at or not self.files_done or not self.files_total:
+            return None
+        elapsed = time.time() - self.started_at
+        return round(elapsed / self.files_done * (self.files_total - self.files_done), 1)
+
+    def merge(self, operation: str, full_reindex: bool, file_paths: Optional[List[str]]):
+        """Fold another trigger for the same project and kind into this queued job"""
+        self.coalesced += 1
+
+        if OPERATION_RANK[operation] > OPERATION_RANK[self.operation]:
+            self.operation = operation
+            self.full_reindex = full_reindex
+            self.file_paths = list(file_paths or []) if operation == "index_files" else []
+        elif operation == self.operation:
+            if operation == "index":
+                self.full_reindex = self.full_reindex or full_reindex
+            elif operation == "index_files":
+                self.file_paths = list(dict.fromkeys(self.file_paths + list(file_paths or [])))
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["eta_seconds"] = self.eta_seconds()
+        data["percent"] = (
+            100 if self.status == JOB_COMPLETED
+            else int(100 * self.files_done / self.files_total) if self.files_total else 0
+        )
+        return data
+
+
+class IndexingJobManager:
+    """
+    Per-project indexing job queue with coalescing, cancellation and progress.
+
+    Usage:
+        indexing_jobs.register_runner("codebase", run_codebase_job)
+        job, merged = indexing_jobs.submit("project-1", "codebase", "reindex", "/path/to/repo")
+        await indexing_jobs.wait(job.job_id)
+    """
+
+    def __init__(self, max_concurrent_jobs: int = 2, history_size: int = 200):
+        """
+        Initialize job manager.
+
+        Environment variables:
+        - INDEXING_MAX_CONCURRENT_JOBS: Jobs running at once across projects (default: 2)
+
+        Args:
+            max_concurrent_jobs: Default for INDEXING_MAX_CONCURRENT_JOBS
+            history_size: Finished jobs kept for status queries
+        """
+        self.max_concurrent_jobs = int(os.getenv("INDEXING_MAX_CONCURRENT_JOBS", str(max_concurrent_jobs)))
+        self.history_size = history_size
+
+        self._jobs: Dict[str, IndexingJob] = {}
+        self._pending: Dict[Tuple[str, str], Deque[IndexingJob]] = {}
+        self._workers: Dict[Tuple[str, str], asyncio.Task] = {}
+        self._runners: Dict[str, JobRunner] = {}
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._done_events: Dict[str, asyncio.Event] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._state_path: Optional[Path] = None
+
+    # ==================
+    # Registration and persistence
+    # ==================
+
+    def register_runner(self, kind: str, runner: JobRunner):
+        """
+        Register the coroutine that executes jobs of one kind.
+
+        Args:
+            kind: Index kind ("codebase" or "documentation")
+            runner: async runner(job, progress_callback) -> stats
+        """
+        self._runners[kind] = runner
+
+    def _get_state_path(self) -> Path:
+        if self._state_path is None:
+            from claudetask.config import get_config
+            self._state_path = get_config().backend_data_dir / "indexing_jobs.json"
+        return self._state_path
+
+    def _persist(self):
+        """Save unfinished jobs so they can be resumed after a restart"""
+        active = [asdict(job) for job in self._jobs.values() if job.status in ACTIVE_STATUSES]
+        try:
+            path = self._get_state_path()
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(active))
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Failed to persist indexing jobs: {e}")
+
+    async def resume_interrupted(self) -> int:
+        """
+        Re-queue jobs that were queued or running when the backend stopped.
+
+        Returns:
+            Number of resumed jobs
+        """
+        path = self._get_state_path()
+        if not path.exists():
+            return 0
+
+        try:
+            saved = json.loads(path.read_text())
+        except Exception as e:
+            logger.warning(f"Failed to read interrupted indexing jobs: {e}")
+            return 0
+
+        resumed = 0
+        for data in saved:
+            if data.get("kind") not in self._runners:
+                continue
+            # A full reindex already deleted the old chunks when it started; resuming
+            # as a regular index keeps everything embedded before the interruption
+            full_reindex = data.get("full_reindex", False) and data.get("status") == JOB_QUEUED
+            job, _ = self.submit(
+                data["project_id"], data["kind"], data["operation"], data["repo_path"],
+                full_reindex=full_reindex, file_paths=data.get("file_paths")
+            )
+            job.resumed = True
+            resumed += 1
+
+        if resumed:
+            logger.info(f"Resumed {resumed} interrupted indexing job(s)")
+        return resumed
+
+    # ==================
+    # Queue operations
+    # ==================
+
+    def submit(
+        self,
+        project_id: str,
+        kind: str,
+        operation: str,
+        repo_path: str,
+        full_reindex: bool = False,
+        file_paths: Optional[List[str]] = None
+    ) -> Tuple[IndexingJob, bool]:
+        """
+        Enqueue an indexing job, merging it into a queued job for the same project and kind.
+
+        A job that is already running is never modified; a new trigger queues a
+        follow-up run so changes made after it started are picked up.
+
+        Args:
+            project_id: Project ID
+            kind: Index kind ("codebase" or "documentation")
+            operation: "index", "reindex" or "index_files"
+            repo_path: Repository root
+            full_reindex: Delete existing chunks first (operation "index")
+            file_paths: Files to index (operation "index_files")
+
+        Returns:
+            Tuple of (job, merged) - merged is True if an existing queued job absorbed the trigger
+
+        Raises:
+            ValueError: If the kind has no runner or the operation is unknown
+        """
+        if kind not in self._runners:
+            raise ValueError(f"No indexing runner registered for {kind}")
+        if operation not in OPERATION_RANK:
+            raise ValueError(f"Unknown indexing operation: {operation}")
+
+        key = (project_id, kind)
+        pending = self._pending.setdefault(key, deque())
+
+        if pending:
+            job = pending[-1]
+            job.merge(operation, full_reindex, file_paths)
+            logger.info(
+                f"Coalesced {operation} into queued {kind} job {job.job_id} "
+                f"for project {project_id} ({job.coalesced} merged)"
+            )
+            self._notify(job)
+            self._persist()
+            return job, True
+
+        job = IndexingJob(
+            job_id=uuid.uuid4().hex[:12],
+            project_id=project_id,
+            kind=kind,
+            operation=operation,
+            repo_path=repo_path,
+            full_reindex=full_reindex,
+            file_paths=list(file_paths or [])
+        )
+        self._jobs[job.job_id] = job
+        self._done_events[job.job_id] = asyncio.Event()
+        pending.append(job)
+        self._trim_history()
+        self._persist()
+
+        worker = self._workers.get(key)
+        if worker is None or worker.done():
+            self._workers[key] = asyncio.create_task(self._run_key(key))
+
+        logger.info(f"Queued {kind} {operation} job {job.job_id} for project {project_id}")
+        return job, False
+
+    async def _run_key(self, key: Tuple[str, str]):
+        """Run queued jobs of one project and kind in order"""
+        pending = self._pending[key]
+        while pending:
+            job = pending[0]
+            if self._semaphore is None:
+                self._semaphore = asyncio.Semaphore(self.max_concurrent_jobs)
+
+            async with self._semaphore:
+                if not pending or pending[0] is not job:
+                    continue  # Cancelled while waiting for a slot
+                # Dequeue only once a slot is free, so triggers keep merging while waiting
+                pending.popleft()
+                await self._execute(job)
+
+    async def _execute(self, job: IndexingJob):
+        runner = self._runners[job.kind]
+        job.status = JOB_RUNNING
+        job.started_at = time.time()
+        self._notify(job)
+        self._persist()
+
+        def on_progress(progress: Dict[str, int]):
+            if job.cancel_requested:
+                raise IndexingCancelled(f"Job {job.job_id} cancelled")
+            if "files_total" in progress:
+                job.files_total = progress["files_total"]
+            if "files_done" in progress:
+                job.files_done = progress["files_done"]
+            job.chunks_embedded += progress.get("chunks_embedded", 0)
+            self._notify(job)
+
+        try:
+            job.result = await runner(job, on_progress)
+            job.status = JOB_COMPLETED
+            logger.info(f"Indexing job {job.job_id} completed in {time.time() - job.started_at:.1f}s")
+        except IndexingCancelled:
+            job.status = JOB_CANCELLED
+            logger.info(f"Indexing job {job.job_id} cancelled after {job.files_done}/{job.files_total} files")
+        except Exception as e:
+            job.status = JOB_FAILED
+            job.error = str(e)
+            logger.error(f"Indexing job {job.job_id} failed: {e}", exc_info=True)
+        finally:
+            job.finished_at = time.time()
+            self._notify(job)
+            self._persist()
+            self._done_events[job.job_id].set()
+
+    def cancel(self, job_id: str) -> Optional[IndexingJob]:
+        """
+        Cancel a job: queued jobs are dropped, running jobs stop at the next checkpoint.
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            The job, or None if unknown
+        """
+        job = self._jobs.get(job_id)
+        if job is None or job.status not in ACTIVE_STATUSES:
+            return job
+
+        job.cancel_requested = True
+        if job.status == JOB_QUEUED:
+            pending = self._pending.get(job.key)
+            if pending and job in pending:
+                pending.remove(job)
+            job.status = JOB_CANCELLED
+            job.finished_at = time.time()
+            self._done_events[job.job_id].set()
+            self._notify(job)
+            self._persist()
+        return job
+
+    async def wait(self, job_id: str, timeout: Optional[float] = None) -> IndexingJob:
+        """
+        Wait until a job has finished.
+
+        Args:
+            job_id: Job ID
+            timeout: Seconds to wait (None = no limit)
+
+        Raises:
+            KeyError: If the job is unknown
+            asyncio.TimeoutError: If the job is still active after timeout
+        """
+        await asyncio.wait_for(self._done_events[job_id].wait(), timeout)
+        return self._jobs[job_id]
+
+    # ==================
+    # Queries and progress streaming
+    # ==================
+
+    def get(self, job_id: str) -> Optional[IndexingJob]:
+        return self._jobs.get(job_id)
+
+    def list_jobs(
+        self,
+        project_id: Optional[str] = None,
+        kind: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> List[IndexingJob]:
+        """List jobs, newest first"""
+        jobs = [
+            job for job in self._jobs.values()
+            if (project_id is None or job.project_id == project_id)
+            and (kind is None or job.kind == kind)
+            and (status is None or job.status == status)
+        ]
+        return sorted(jobs, key=lambda job: job.created_at, reverse=True)
+
+    def subscribe(self, job_id: str) -> asyncio.Queue:
+        """
+        Subscribe to progress snapshots of a job.
+
+        The queue holds only the latest snapshot, so slow consumers skip
+        intermediate updates instead of falling behind.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+        self._subscribers.setdefault(job_id, set()).add(queue)
+        job = self._jobs.get(job_id)
+        if job is not None:
+            queue.put_nowait(job.to_dict())
+        return queue
+
+    def unsubscribe(self, job_id: str, queue: asyncio.Queue):
+        subscribers = self._subscribers.get(job_id)
+        if subscribers:
+            subscribers.discard(queue)
+            if not subscribers:
+                del self._subscribers[job_id]
+
+    def _notify(self, job: IndexingJob):
+        subscribers = self._subscribers.get(job.job_id)
+        if not subscribers:
+            return
+        snapshot = job.to_dict()
+        for queue in subscribers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(snapshot)
+
+    def _trim_history(self):
+        """Forget the oldest finished jobs beyond history_size"""
+        finished = [job for job in self._jobs.values() if job.status not in ACTIVE_STATUSES]
+        for job in finished[:max(0, len(finished) - self.history_size)]:
+            del self._jobs[job.job_id]
+            self._done_events.pop(job.job_id, None)
+
+    async def shutdown(self):
+        """Stop workers; unfinished jobs stay persisted for resume_interrupted()"""
+        for worker in self._workers.values():
+            worker.cancel()
+        for worker in self._workers.values():
+            try:
+                await worker
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._workers.clear()
+
+
+# Singleton instance
+indexing_jobs = IndexingJobManager()
@@ -0,0 +1,298 @@
+"""
+Shared live tailing of the MCP call log for Server-Sent Events.
+
+One LogTailer per log file serves every connected client:
+- it waits for changes with watchfiles (inotify on Linux, shipped with
+  uvicorn[standard]) and falls back to polling once a second without it;
+- appended lines are read, parsed and encoded once, then fanned out to a
+  bounded queue per client;
+- a client whose queue overflows is disconnected. EventSource reconnects
+  with Last-Event-ID and the client resumes where it stopped.
+
+An event id is "<inode>-<offset>": the active log file and the byte offset
+just past the line. A resume point therefore stays meaningful across
+rotations. Recent events are replayed from memory; older ones are re-read
+from the file.
+"""
+
+import os
+import re
+import json
+import asyncio
+import logging
+from collections import deque
+from pathlib import Path
+from typing import AsyncIterator, Deque, Dict, List, Optional, Set, Tuple
+
+try:
+    from watchfiles import awatch
+    WATCHFILES_AVAILABLE = True
+except ImportError:
+    awatch = None
+    WATCHFILES_AVAILABLE = False
+
+from ..repositories.log_segments import LogFollower
+
+logger = logging.getLogger(__name__)
+
+STREAM_LINE_PATTERN = re.compile(r'^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3}) - (\S+) - (\w+) - (.+)$')
+
+CATCH_UP_CHUNK_BYTES = 1024 * 1024
+
+
+def parse_stream_line(line: str) -> Optional[Dict[str, str]]:
+    """Streamed fields of a log line, or None for continuation lines"""
+    match = STREAM_LINE_PATTERN.match(line.strip())
+    if not match:
+        return None
+    timestamp_str, logger_name, level, message = match.groups()
+    return {
+        "timestamp": timestamp_str,
+        "logger": logger_name,
+        "level": level,
+        "message": message
+    }
+
+
+def parse_event_id(event_id: Optional[str]) -> Optional[Tuple[int, int]]:
+    """(inode, offset) of an event id, or None if it is missing or malformed"""
+    try:
+        inode, offset = event_id.split("-")
+        return int(inode), int(offset)
+    except (AttributeError, ValueError):
+        return None
+
+
+def encode_event(inode: int, offset: int, data: Dict[str, str]) -> str:
+    """SSE frame of a log line"""
+    return f"id: {inode}-{offset}\ndata: {json.dumps(data)}\n\n"
+
+
+class LogSubscription:
+    """One client of a tailer: a bounded queue of encoded events"""
+
+    def __init__(self, max_queued: int):
+        self.queue: "asyncio.Queue[str]" = asyncio.Queue(max_queued)
+        self.lagged = False
+
+    def push(self, frame: str) -> bool:
+        """Queue a frame; False (and lagged) if the client fell behind"""
+        try:
+            self.queue.put_nowait(frame)
+            return True
+        except asyncio.QueueFull:
+            self.lagged = True
+            return False
+
+
+class LogTailer:
+    """
+    Follows one log file for all its streaming clients.
+
+    Meant for one event loop (the backend's). Started by the first client
+    and stopped when the last one disconnects.
+
+    Usage:
+        tailer = get_log_tailer(log_file)
+        async for frame in tailer.stream(last_event_id):
+            ...  # "id: ...\\ndata: {...}\\n\\n"
+    """
+
+    def __init__(
+        self,
+        log_file: Path,
+        poll_interval: float = 1.0,
+        replay_events: int = 1000,
+        max_queued: int = 1000
+    ):
+        """
+        Initialize tailer at the end of the log.
+
+        Args:
+            log_file: Active log file
+            poll_interval: Seconds between reads without watchfiles
+            replay_events: Recent events kept for resuming clients
+            max_queued: Events queued per client before it is disconnected
+        """
+        self.log_file = Path(log_file)
+        self.poll_interval = poll_interval
+        self.max_queued = max_queued
+        self._follower = LogFollower(self.log_file, _last_line_end(self.log_file))
+        self._replay: Deque[Tuple[int, int, str]] = deque(maxlen=replay_events)
+        self._subscribers: Set[LogSubscription] = set()
+        self._stop = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._poll()
+
+    # ==================
+    # Clients
+    # ==================
+
+    async def stream(self, last_event_id: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        SSE frames for one client: missed events first, then live ones.
+
+        Args:
+            last_event_id: Id of the last event the client received
+                (None: stream the active log from its start)
+        """
+        subscription = self._subscribe()
+        # Everything up to here was published before subscribing, anything
+        # later arrives through the queue
+        inode, offset = self._follower.inode, self._follower.offset
+        replay = self._replay_after(parse_event_id(last_event_id))
+        try:
+            yield "retry: 1000\n\n"
+            if replay is not None:
+                for frame in replay:
+                    yield frame
+            elif inode is not None:
+                resume = parse_event_id(last_event_id)
+                start = resume[1] if resume and resume[0] == inode and resume[1] <= offset else 0
+                async for frame in self._catch_up(inode, start, offset):
+                    yield frame
+
+            while not (subscription.lagged and subscription.queue.empty()):
+                yield await subscription.queue.get()
+            logger.info(f"Log stream client fell behind on {self.log_file}, disconnecting it")
+        finally:
+            self._unsubscribe(subscription)
+
+    def _subscribe(self) -> LogSubscription:
+        subscription = LogSubscription(self.max_queued)
+        self._subscribers.add(subscription)
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return subscription
+
+    def _unsubscribe(self, subscription: LogSubscription) -> None:
+        self._subscribers.discard(subscription)
+        if not self._subscribers and _tailers.get(str(self.log_file)) is self:
+            # Next client starts a fresh tailer
+            del _tailers[str(self.log_file)]
+            self._stop.set()
+
+    def _replay_after(self, resume: Optional[Tuple[int, int]]) -> Optional[List[str]]:
+        """Buffered frames after an event id, or None if it is not buffered"""
+        if resume is None:
+            return None
+        frames = None
+        for inode, offset, frame in self._replay:
+            if frames is not None:
+                frames.append(frame)
+            elif (inode, offset) == resume:
+                frames = []
+        return frames
+
+    async def _catch_up(self, inode: int, start: int, end: int) -> AsyncIterator[str]:
+        """Frames of the lines in [start, end) of the active file, read from disk"""
+        try:
+            f = open(self.log_file, "rb")
+        except FileNotFoundError:
+            return
+        with f:
+            if os.fstat(f.fileno()).st_ino != inode:
+                return  # Rotated meanwhile: live events continue in the new file
+            f.seek(start)
+            position, pending = start, b""
+            while position < end:
+                data = f.read(min(CATCH_UP_CHUNK_BYTES, end - position))
+                if not data:
+                    break
+                lines = (pending + data).split(b"\n")
+                pending = lines.pop()
+                position += len(data)
+                line_end = position - len(pending)
+                frames = []
+                for line in reversed(lines):
+                    parsed = parse_stream_line(line.decode("utf-8", errors="replace"))
+                    if parsed is not None:
+                        frames.append(encode_event(inode, line_end, parsed))
+                    line_end -= len(line) + 1
+                for frame in reversed(frames):
+                    yield frame
+
+    # ==================
+    # Tailing
+    # ==================
+
+    async def _run(self) -> None:
+        watch = WATCHFILES_AVAILABLE
+        try:
+            while not self._stop.is_set():
+                self._poll()
+                if watch and self.log_file.parent.is_dir():
+                    try:
+                        await self._watch()
+                    except Exception as e:
+                        logger.warning(f"Watching {self.log_file} failed, polling instead: {e}")
+                        watch = False
+                else:
+                    try:
+                        await asyncio.wait_for(self._stop.wait(), self.poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
+        finally:
+            self._follower.close()
+
+    async def _watch(self) -> None:
+        """Read the log on every change until stopped"""
+        name = self.log_file.name
+        async for _ in awatch(
+            self.log_file.parent,
+            watch_filter=lambda change, path: os.path.basename(path).startswith(name),
+            debounce=50,
+            step=20,
+            stop_event=self._stop,
+            rust_timeout=5000,  # Also read every 5s, in case a change was missed
+            yield_on_timeout=True,
+            recursive=False
+        ):
+            self._poll()
+
+    def _poll(self) -> None:
+        """Read appended lines and publish them to all clients"""
+        try:
+            entries = self._follower.read_entries()
+        except OSError as e:
+            logger.warning(f"Failed to read {self.log_file}: {e}")
+            self._publish(f"data: {json.dumps({'error': str(e)})}\n\n")
+            return
+
+        for inode, offset, line in entries:
+            parsed = parse_stream_line(line)
+            if parsed is None:
+                continue
+            frame = encode_event(inode, offset, parsed)
+            self._replay.append((inode, offset, frame))
+            self._publish(frame)
+
+    def _publish(self, frame: str) -> None:
+        for subscription in list(self._subscribers):
+            if not subscription.push(frame):
+                self._subscribers.discard(subscription)
+
+
+def _last_line_end(log_file: Path) -> int:
+    """Offset just past the last complete line of a log (0 if it is missing)"""
+    try:
+        with open(log_file, "rb") as f:
+            size = f.seek(0, 2)
+            f.seek(max(0, size - 65536))
+            tail = f.read()
+    except FileNotFoundError:
+        return 0
+    return size - len(tail) + tail.rfind(b"\n") + 1
+
+
+# Tailers of this process by log file, while they have clients
+_tailers: Dict[str, LogTailer] = {}
+
+
+def get_log_tailer(log_file: Path) -> LogTailer:
+    """Shared tailer of a log file (created for its first client)"""
+    key = str(Path(log_file))
+    tailer = _tailers.get(key)
+    if tailer is None:
+        tailer = _tailers[key] = LogTailer(Path(log_file))
+    return tailer
@@ -0,0 +1,275 @@
+"""Process-wide RAG engine shared by all backend routers"""
+
+import os
+import sys
+import time
+import asyncio
+import logging
+from pathlib import Path
+from typing import Optional, Dict, Any
+
+# Make mcp_server modules (rag, chunking) importable the same way the indexers do
+mcp_server_path = Path(__file__).parent.parent.parent.parent / "mcp_server"
+if str(mcp_server_path) not in sys.path:
+    sys.path.insert(0, str(mcp_server_path))
+
+logger = logging.getLogger(__name__)
+
+
+class RAGEngine:
+    """
+    Lifecycle manager for the shared local RAG service and embedding clients.
+
+    Loading a SentenceTransformer model and opening a ChromaDB PersistentClient
+    takes several seconds and hundreds of MB, so it must happen once per process
+    rather than once per request. This manager handles:
+    - Lazy, lock-protected initialization of a single RAGService
+    - Background warm-up at FastAPI startup
+    - Readiness state for health probes
+    - Reuse of VoyageEmbeddingService clients (one per API key)
+    - The persistent embedding cache shared by all indexers
+    - The micro-batched embedding endpoint used by MCP bridges in remote mode
+      and by local-mode (offline) code, documentation and memory search
+
+    Usage:
+        await rag_engine.warm_up()              # at startup (non-blocking task)
+        rag_service = await rag_engine.get_service()
+        status = rag_engine.status()             # for /health/rag
+    """
+
+    STATE_COLD = "cold"
+    STATE_LOADING = "loading"
+    STATE_READY = "ready"
+    STATE_FAILED = "failed"
+
+    def __init__(self):
+        """
+        Initialize engine state. Nothing is loaded until first use or warm-up.
+
+        Configuration is read from environment variables:
+        - RAG_WARMUP_ON_STARTUP: Load the model at startup (default: "true")
+        - EMBEDDING_BATCH_MAX_SIZE: Texts per shared model call (default: 64)
+        - EMBEDDING_BATCH_MAX_WAIT_MS: Micro-batching window (default: 5)
+        """
+        self._service = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._warmup_task: Optional[asyncio.Task] = None
+        self._voyage_services: Dict[str, Any] = {}
+        self._batcher = None
+        self.state: str = self.STATE_COLD
+        self.error: Optional[str] = None
+        self.load_time_ms: Optional[float] = None
+        self.warmup_on_startup: bool = os.getenv(
+            "RAG_WARMUP_ON_STARTUP", "true"
+        ).lower() in ("1", "true", "yes")
+        self.batch_max_size: int = int(os.getenv("EMBEDDING_BATCH_MAX_SIZE", "64"))
+        self.batch_max_wait_ms: float = float(os.getenv("EMBEDDING_BATCH_MAX_WAIT_MS", "5"))
+
+    def _get_lock(self) -> asyncio.Lock:
+        """Create the init lock lazily so it binds to the running event loop"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    async def get_service(self):
+        """
+        Get the shared RAGService, initializing it on first call.
+
+        Concurrent callers during initialization wait on the same load
+        instead of each loading their own model.
+
+        Returns:
+            Initialized RAGService instance
+
+        Raises:
+            ImportError: If RAG dependencies (chromadb, sentence-transformers) missing
+            Exception: If initialization fails
+        """
+        if self._service is not None:
+            return self._service
+
+        async with self._get_lock():
+            if self._service is not None:
+                return self._service
+
+            from rag.rag_service import RAGService, RAGConfig
+            from claudetask.config import get_config
+
+            self.state = self.STATE_LOADING
+            self.error = None
+            start_time = time.time()
+
+            # The backend serves the remote embedders, so it always loads a model itself
+            embedding_backend = os.getenv("CLAUDETASK_EMBEDDING_BACKEND", "torch")
+            if embedding_backend == "remote":
+                embedding_backend = os.getenv("CLAUDETASK_EMBEDDING_FALLBACK", "torch")
+
+            try:
+                rag_config = RAGConfig(
+                    chromadb_path=str(get_config().chromadb_dir),
+                    embedding_backend=embedding_backend
+                )
+                service = RAGService(rag_config)
+                await service.initialize()
+            except Exception as e:
+                self.state = self.STATE_FAILED
+                self.error = str(e)
+                logger.error(f"Shared RAG engine initialization failed: {e}")
+                raise
+
+            self._service = service
+            self.load_time_ms = (time.time() - start_time) * 1000
+            self.state = self.STATE_READY
+            logger.info(f"Shared RAG engine ready in {self.load_time_ms:.0f}ms")
+
+            return self._service
+
+    async def warm_up(self):
+        """
+        Start loading the RAG service in the background.
+
+        Returns immediately; the first user query will not pay the model
+        load cost if warm-up finishes before it arrives.
+        """
+        if not self.warmup_on_startup:
+            logger.info("RAG warm-up disabled (RAG_WARMUP_ON_STARTUP=false)")
+            return
+
+        if self._warmup_task is not None and not self._warmup_task.done():
+            return
+
+        async def _run_warmup():
+            try:
+                await self.get_service()
+            except Exception as e:
+                logger.warning(f"RAG warm-up skipped: {e}")
+
+        self._warmup_task = asyncio.create_task(_run_warmup())
+
+    async def get_embedding_batcher(self):
+        """
+        Get the micro-batcher that coalesces encode requests from all MCP bridges.
+
+        Concurrent first callers share one batcher (a second one would split
+        the requests it is meant to coalesce).
+
+        Returns:
+            MicroBatcher over the shared RAGService model (and embedding cache)
+        """
+        if self._batcher is not None:
+            return self._batcher
+
+        service = await self.get_service()
+
+        async with self._get_lock():
+            if self._batcher is None:
+                from embeddings import MicroBatcher
+
+                self._batcher = MicroBatcher(
+                    service.encode_texts,
+                    max_batch_size=self.batch_max_size,
+                    max_wait_ms=self.batch_max_wait_ms
+                )
+        return self._batcher
+
+    async def get_local_embedding_service(self):
+        """
+        Get the embedding service for local-mode code, documentation and memory search.
+
+        Returns:
+            LocalEmbeddingService over the shared model (loads it on first use)
+
+        Raises:
+            ImportError: If local embedding dependencies are missing
+        """
+        batcher = await self.get_embedding_batcher()
+        service = await self.get_service()
+
+        from .embedding_service import LocalEmbeddingService
+        return LocalEmbeddingService(
+            batcher,
+            model=service.config.embedding_model,
+            dimensions=service.embedding_model.get_sentence_embedding_dimension()
+        )
+
+    def get_voyage_service(self, api_key: str):
+        """
+        Get a shared VoyageEmbeddingService for an API key.
+
+        Args:
+            api_key: Voyage AI API key
+
+        Returns:
+            VoyageEmbeddingService instance (cached per key)
+
+        Raises:
+            ValueError: If API key is missing
+            RuntimeError: If voyageai module is not installed
+        """
+        service = self._voyage_services.get(api_key)
+        if service is None:
+            from .embedding_service import VoyageEmbeddingService
+            service = VoyageEmbeddingService(api_key, cache=self.get_embedding_cache())
+            self._voyage_services[api_key] = service
+        return service
+
+    def get_embedding_cache(self):
+        """
+        Get the persistent embedding cache shared with the MCP bridges.
+
+        Lives next to the ChromaDB directory so local (MiniLM) and cloud
+        (Voyage) indexers read and write the same file.
+
+        Returns:
+            EmbeddingCache instance, or None if it cannot be opened
+        """
+        try:
+            from embeddings import get_embedding_cache
+            from claudetask.config import get_config
+
+            return get_embedding_cache(str(get_config().chromadb_dir.parent / "embedding_cache.db"))
+        except Exception as e:
+            logger.warning(f"Embedding cache unavailable: {e}")
+            return None
+
+    def is_ready(self) -> bool:
+        """Check if the shared RAG service is loaded"""
+        return self.state == self.STATE_READY
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Get readiness status for health probes.
+
+        Returns:
+            Status dictionary with state, load time, last error, embedding
+            cache stats, Voyage batch latency metrics and micro-batching stats
+        """
+        cache = self.get_embedding_cache()
+
+        return {
+            "state": self.state,
+            "ready": self.is_ready(),
+            "load_time_ms": self.load_time_ms,
+            "error": self.error,
+            "embedding_cache": cache.stats() if cache else {"enabled": False},
+            "voyage": [service.get_metrics() for service in self._voyage_services.values()],
+            "embedding_batcher": self._batcher.stats() if self._batcher else None
+        }
+
+    async def shutdown(self):
+        """Cancel pending warm-up and release the shared service"""
+        if self._warmup_task is not None and not self._warmup_task.done():
+            self._warmup_task.cancel()
+        self._warmup_task = None
+        if self._batcher is not None:
+            await self._batcher.close()
+            self._batcher = None
+        self._service = None
+        for service in self._voyage_services.values():
+            await service.close()
+        self._voyage_services.clear()
+        self.state = self.STATE_COLD
+
+
+# Global instance
+rag_engine = RAGEngine()
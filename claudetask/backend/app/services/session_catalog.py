@@ -0,0 +1,206 @@
+"""
+Persistent catalog of parsed Claude Code session transcripts.
+
+Parsing a transcript (~/.claude/projects/<project>/<session>.jsonl) means
+reading all of it, and transcripts only ever grow. The catalog, a SQLite
+file in the .claudetask data directory, keeps each session's parsed
+metadata (messages, tool counts, files modified, errors...) together with
+the file's size and mtime and how far it was parsed:
+
+- an unchanged file (same size and mtime) is not read at all;
+- a file that grew is parsed from where the last parse stopped;
+- a file that shrank, was rewritten or replaced is parsed again.
+"""
+
+import json
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Bump when the parsing of ClaudeSessionsReader changes: cataloged sessions are parsed again
+PARSER_VERSION = 1
+
+# Leading bytes compared to tell a grown file from a replaced one
+HEAD_BYTES = 256
+
+# (line number, line) of transcript lines
+TranscriptLines = Iterable[Tuple[int, str]]
+
+
+class SessionCatalog:
+    """
+    SQLite catalog of session metadata, updated incrementally from the transcripts.
+
+    Parsing itself is the reader's: new_metadata creates the empty metadata
+    of a session, parse_lines applies transcript lines to it.
+
+    Usage:
+        catalog = SessionCatalog(db_path, reader._new_session_metadata, reader._parse_session_lines)
+        sessions = catalog.sessions(project_dir)     # parses new and grown transcripts only
+        session = catalog.session(session_file)
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        new_metadata: Callable[[Path], Dict[str, Any]],
+        parse_lines: Callable[[Dict[str, Any], TranscriptLines], None]
+    ):
+        """
+        Open (or create) the catalog.
+
+        Args:
+            db_path: SQLite file path (":memory:" for a catalog that is not kept)
+            new_metadata: Empty metadata of a session file
+            parse_lines: Apply (line number, line) pairs to a session's metadata
+        """
+        self.db_path = str(db_path)
+        self._new_metadata = new_metadata
+        self._parse_lines = parse_lines
+        self._lock = threading.RLock()
+
+        if self.db_path != ":memory:":
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS sessions (
+                path TEXT PRIMARY KEY,
+                project_dir TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime REAL NOT NULL,
+                parsed_bytes INTEGER NOT NULL,
+                parsed_lines INTEGER NOT NULL,
+                head BLOB NOT NULL,
+                parser_version INTEGER NOT NULL,
+                metadata TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_sessions_project ON sessions(project_dir);
+        """)
+        self._conn.commit()
+
+    def sessions(self, project_dir: Path) -> List[Dict[str, Any]]:
+        """
+        Metadata of all sessions of a project directory, most recent first.
+
+        Transcripts that changed since they were cataloged are (re)parsed,
+        sessions whose transcript is gone are dropped.
+        """
+        project_dir = Path(project_dir)
+        files = {str(path): path for path in project_dir.glob("*.jsonl")}
+
+        sessions = []
+        with self._lock:
+            rows = {
+                row["path"]: row
+                for row in self._conn.execute("SELECT * FROM sessions WHERE project_dir = ?", (str(project_dir),))
+            }
+            try:
+                for path, session_file in files.items():
+                    try:
+                        sessions.append(self._update(session_file, rows.get(path)))
+                    except Exception as e:
+                        logger.error(f"Failed to parse session {session_file.name}: {e}")
+
+                vanished = [(path,) for path in rows if path not in files]
+                if vanished:
+                    self._conn.executemany("DELETE FROM sessions WHERE path = ?", vanished)
+            finally:
+                self._conn.commit()
+
+        return sorted(sessions, key=lambda x: x['last_timestamp'] or "", reverse=True)
+
+    def session(self, session_file: Path) -> Dict[str, Any]:
+        """Metadata of one session (parsed as far as needed)"""
+        session_file = Path(session_file)
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM sessions WHERE path = ?", (str(session_file),)).fetchone()
+            try:
+                return self._update(session_file, row)
+            finally:
+                self._conn.commit()
+
+    def prune(self, project_dirs: Iterable[Path]) -> int:
+        """
+        Drop the sessions of all other project directories.
+
+        Returns:
+            Number of sessions dropped
+        """
+        keep = [str(Path(project_dir)) for project_dir in project_dirs]
+        with self._lock:
+            cursor = self._conn.execute(
+                f"DELETE FROM sessions WHERE project_dir NOT IN ({','.join('?' * len(keep))})",
+                keep
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    # ==================
+    # Parsing
+    # ==================
+
+    def _update(self, session_file: Path, row: Optional[sqlite3.Row]) -> Dict[str, Any]:
+        """Bring a session's catalog entry up to date with its transcript (lock held)"""
+        stat = session_file.stat()
+        current = row is not None and row["parser_version"] == PARSER_VERSION
+        if current and row["size"] == stat.st_size and row["mtime"] == stat.st_mtime:
+            return json.loads(row["metadata"])
+
+        with open(session_file, "rb") as f:
+            head = f.read(HEAD_BYTES)
+            if current and stat.st_size > row["size"] and head[:len(row["head"])] == row["head"]:
+                # Appended to: parse the new lines only
+                metadata = json.loads(row["metadata"])
+                parsed_bytes, parsed_lines = row["parsed_bytes"], row["parsed_lines"]
+            else:
+                metadata = self._new_metadata(session_file)
+                parsed_bytes, parsed_lines = 0, 0
+
+            f.seek(parsed_bytes)
+            lines = _TranscriptTail(f, parsed_bytes, parsed_lines)
+            self._parse_lines(metadata, lines)
+
+        metadata["file_size"] = stat.st_size
+        self._conn.execute(
+            "INSERT OR REPLACE INTO sessions "
+            "(path, project_dir, size, mtime, parsed_bytes, parsed_lines, head, parser_version, metadata) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                str(session_file), str(session_file.parent), stat.st_size, stat.st_mtime,
+                lines.offset, lines.count, head, PARSER_VERSION, json.dumps(metadata)
+            )
+        )
+        return metadata
+
+
+class _TranscriptTail:
+    """
+    Complete lines of a transcript from a byte offset, numbered on from the
+    lines before it; offset and count tell how far it was consumed.
+
+    A last line without newline is only consumed if it is valid JSON (a
+    line still being written is left for the next update).
+    """
+
+    def __init__(self, f, offset: int, count: int):
+        self.offset = offset
+        self.count = count
+        self._file = f
+
+    def __iter__(self) -> Iterator[Tuple[int, str]]:
+        for raw in self._file:
+            if not raw.endswith(b"\n"):
+                try:
+                    json.loads(raw)
+                except ValueError:
+                    return
+            self.offset += len(raw)
+            self.count += 1
+            yield self.count, raw.decode("utf-8", errors="replace")
@@ -0,0 +1,132 @@
+"""
+Unix socket listener for co-located MCP bridges.
+
+When CLAUDETASK_BACKEND_UDS is set, the API is also served on that Unix
+socket, next to the TCP port the frontend uses. Bridges started with the
+same variable (mcp_server/backend_client.py) then skip TCP entirely.
+
+The listener is started from the app's startup hook, so it runs however
+the app is served (`python -m app.main`, `uvicorn app.main:app`). It is an
+extra uvicorn server without lifespan and without signal handlers: the
+main server owns both and stops the listener from its shutdown hook.
+"""
+
+import os
+import stat
+import socket
+import asyncio
+import logging
+import contextlib
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+UDS_ENV_VAR = "CLAUDETASK_BACKEND_UDS"
+
+
+def _create_server(app):
+    import uvicorn
+
+    class SocketServer(uvicorn.Server):
+        """uvicorn server that leaves signal handling to the main server"""
+
+        def install_signal_handlers(self) -> None:  # uvicorn < 0.29
+            pass
+
+        @contextlib.contextmanager
+        def capture_signals(self):  # uvicorn >= 0.29
+            yield
+
+    # log_config=None keeps the logging the main server configured
+    return SocketServer(uvicorn.Config(app, lifespan="off", log_config=None))
+
+
+def _bind(path: str) -> socket.socket:
+    """Bind a Unix socket at path, replacing a stale socket file"""
+    try:
+        if stat.S_ISSOCK(os.stat(path).st_mode):
+            os.unlink(path)
+    except FileNotFoundError:
+        pass
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.bind(path)
+        os.chmod(path, 0o666)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+class UnixSocketListener:
+    """
+    Serves the app on a Unix socket alongside the main server.
+
+    Usage:
+        await uds_listener.start(app)     # startup hook
+        await uds_listener.shutdown()     # shutdown hook
+    """
+
+    def __init__(self):
+        self.path: Optional[str] = None
+        self._server = None
+        self._task: Optional[asyncio.Task] = None
+        self._inode: Optional[int] = None
+
+    async def start(self, app, path: Optional[str] = None) -> bool:
+        """
+        Start listening on path (default: $CLAUDETASK_BACKEND_UDS).
+
+        A socket that cannot be bound is logged and skipped, the TCP API
+        keeps working.
+
+        Returns:
+            Whether the listener is running
+        """
+        path = path or os.getenv(UDS_ENV_VAR)
+        if not path or self._task is not None:
+            return self._task is not None
+
+        try:
+            sock = _bind(path)
+        except OSError as e:
+            logger.warning(f"Not listening on Unix socket {path}: {e}")
+            return False
+
+        self.path = path
+        self._inode = os.stat(path).st_ino
+        self._server = _create_server(app)
+        self._task = asyncio.create_task(self._serve(sock))
+        logger.info(f"Serving the API on Unix socket {path}")
+        return True
+
+    async def _serve(self, sock: socket.socket) -> None:
+        try:
+            await self._server.serve(sockets=[sock])
+        except Exception as e:
+            logger.error(f"Unix socket listener on {self.path} failed: {e}")
+        finally:
+            sock.close()
+
+    async def shutdown(self) -> None:
+        """Stop accepting connections, let open requests finish, remove the socket"""
+        if self._task is None:
+            return
+        self._server.should_exit = True
+        try:
+            await self._task
+        except (asyncio.CancelledError, Exception):
+            pass
+        # Leave the socket alone if another backend took over the path
+        try:
+            if os.stat(self.path).st_ino == self._inode:
+                os.unlink(self.path)
+        except OSError:
+            pass
+        self._server = None
+        self._task = None
+        self.path = None
+
+
+# Singleton instance
+uds_listener = UnixSocketListener()
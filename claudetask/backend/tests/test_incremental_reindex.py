@@ -0,0 +1,176 @@
+"""
+Test Incremental Codebase Reindexing
+
+Verifies that CodebaseIndexer.reindex_changed_files (local SQLite repository,
+hashing change detection):
+- Re-embeds only new or modified chunks of a changed file
+- Deletes stale chunks and removes deleted files
+- Rolls back a save round that fails or is cancelled partway, so the file
+  keeps its previous chunks and hash and the next run re-embeds it
+- Leaves a file looking changed even when that rollback fails
+"""
+
+import os
+import sys
+import asyncio
+import tempfile
+from pathlib import Path
+
+# Add backend directory to path to import the app package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.repositories.codebase_repository import SQLiteCodebaseRepository
+from app.repositories.local_vector_store import LocalVectorStore
+from app.services.codebase_indexer import CodebaseIndexer, PENDING_FILE_HASH
+
+
+class FakeEmbeddingService:
+    """Deterministic 384d embeddings; optionally fails after a number of calls"""
+
+    def __init__(self):
+        self.embedded = 0
+        self.calls_left = None
+
+    async def generate_embeddings(self, texts, input_type="document"):
+        if self.calls_left is not None:
+            if self.calls_left == 0:
+                raise RuntimeError("embedding service unavailable")
+            self.calls_left -= 1
+        self.embedded += len(texts)
+        return [[float(len(text) % 7 + 1)] + [0.0] * 383 for text in texts]
+
+
+def function_source(name: str, body: str = "return 1") -> str:
+    return f"def {name}():\n" + "\n".join(f"    x_{i} = {i}" for i in range(30)) + f"\n    {body}\n\n\n"
+
+
+def write(repo: Path, relative_path: str, content: str):
+    path = repo / relative_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+async def test_incremental_reindex():
+    """Test chunk-level reindexing and recovery from failed or cancelled saves"""
+    print("\n" + "="*80)
+    print("TEST: Incremental Codebase Reindex")
+    print("="*80)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = Path(tmp) / "repo"
+        write(repo, "a.py", "".join(function_source(f"alpha_{i}") for i in range(6)))
+        write(repo, "b.py", "".join(function_source(f"beta_{i}") for i in range(6)))
+
+        store = LocalVectorStore(os.path.join(tmp, "local.db"))
+        repository = SQLiteCodebaseRepository(store)
+        embeddings = FakeEmbeddingService()
+        indexer = CodebaseIndexer(repository, embeddings, batch_size=4, use_git_change_detection=False)
+
+        # TEST 1: first run embeds everything
+        print("\nTEST 1: Initial index")
+        print("-" * 80)
+
+        stats = await indexer.reindex_changed_files("p1", str(repo))
+        initial_chunks = stats["chunks_added"]
+        assert stats["new_files"] == 2
+        assert initial_chunks > 0 and embeddings.embedded == initial_chunks
+        print(f"✅ Indexed 2 files, {initial_chunks} chunks")
+
+        # TEST 2: changing one function re-embeds only its chunks
+        print("\nTEST 2: Chunk-level reindex of a modified file")
+        print("-" * 80)
+
+        write(repo, "a.py", "".join(
+            function_source(f"alpha_{i}", "return 2" if i == 3 else "return 1") for i in range(6)
+        ))
+        embeddings.embedded = 0
+        stats = await indexer.reindex_changed_files("p1", str(repo))
+
+        assert stats["updated_files"] == 1 and stats["unchanged_files"] == 1
+        assert stats["chunks_kept"] > 0 and stats["chunks_added"] >= 1
+        assert stats["chunks_added"] == stats["chunks_removed"]
+        assert embeddings.embedded == stats["chunks_added"] < initial_chunks
+        assert await repository.count({"project_id": "p1"}) == initial_chunks
+        print(f"✅ {stats['chunks_kept']} chunks kept, {stats['chunks_added']} re-embedded")
+
+        # TEST 3: a save failure partway leaves the file changed
+        print("\nTEST 3: Failure partway through a file")
+        print("-" * 80)
+
+        before = await repository.get_file_hashes("p1")
+        write(repo, "b.py", "".join(function_source(f"beta_{i}", "return 3") for i in range(6)))
+        embeddings.embedded = 0
+        embeddings.calls_left = 1  # first sub-batch saved, second one fails
+
+        try:
+            await indexer.reindex_changed_files("p1", str(repo))
+            assert False, "reindex should have failed"
+        except RuntimeError:
+            pass
+
+        assert embeddings.embedded > 0, "no batch was saved before the failure"
+        assert await repository.get_file_hashes("p1") == before
+        assert await repository.count({"project_id": "p1"}) == initial_chunks
+        print("✅ Partially saved round rolled back, file keeps its previous chunks")
+
+        # TEST 4: cancellation at a progress checkpoint, rollback failing too
+        print("\nTEST 4: Cancellation with a failing rollback")
+        print("-" * 80)
+
+        class Cancelled(Exception):
+            pass
+
+        def cancel_after_first_batch(progress):
+            if progress.get("chunks_embedded"):
+                raise Cancelled()
+
+        async def delete_fails(project_id, chunk_ids):
+            raise RuntimeError("database unavailable")
+
+        embeddings.calls_left = None
+        indexer.progress_callback = cancel_after_first_batch
+        repository.delete_chunks, delete_chunks = delete_fails, repository.delete_chunks
+        try:
+            await indexer.reindex_changed_files("p1", str(repo))
+            assert False, "reindex should have been cancelled"
+        except Cancelled:
+            pass
+        finally:
+            indexer.progress_callback = None
+            repository.delete_chunks = delete_chunks
+
+        after = await repository.get_file_hashes("p1")
+        assert after["a.py"] == before["a.py"]
+        assert after["b.py"] == PENDING_FILE_HASH, "partially saved file was marked up to date"
+        print("✅ Partially saved file still looks changed")
+
+        # TEST 5: next run re-embeds the interrupted file and cleans up
+        print("\nTEST 5: Recovery run")
+        print("-" * 80)
+
+        stats = await indexer.reindex_changed_files("p1", str(repo))
+        assert stats["updated_files"] == 1 and stats["unchanged_files"] == 1
+        stored_b = {chunk["file_hash"] for chunk in await repository.list(limit=1000, filters={"file_path": "b.py"})}
+        assert len(stored_b) == 1 and PENDING_FILE_HASH not in stored_b
+        assert await repository.count({"project_id": "p1"}) == initial_chunks
+        stats = await indexer.reindex_changed_files("p1", str(repo))
+        assert stats["updated_files"] == 0 and stats["chunks_added"] == 0
+        print("✅ Interrupted file re-indexed, index is consistent")
+
+        # TEST 6: deleted files are removed
+        print("\nTEST 6: Deleted file")
+        print("-" * 80)
+
+        os.remove(repo / "b.py")
+        stats = await indexer.reindex_changed_files("p1", str(repo))
+        assert stats["deleted_files"] == 1
+        assert set(await repository.get_file_hashes("p1")) == {"a.py"}
+        print("✅ Deleted file removed from the index")
+
+    print("\n" + "="*80)
+    print("✅ ALL INCREMENTAL REINDEX TESTS PASSED")
+    print("="*80)
+
+
+if __name__ == "__main__":
+    asyncio.run(test_incremental_reindex())
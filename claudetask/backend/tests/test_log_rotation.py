@@ -0,0 +1,172 @@
+"""
+Test Log Rotation and Segment Paging
+
+Verifies that:
+- rotate_log moves the active log aside and writers that reopen it by name
+  continue in a fresh file
+- compress_segment keeps lines appended to a segment after the rename, and
+  leaves a segment plain when it is written to while being compressed
+- prune_segments keeps at most max_segments segments
+- SegmentedLog pages newest first across the active file and gzipped
+  segments, with filters, and only decompresses the segments a page reaches
+"""
+
+import sys
+import time
+import shutil
+import tempfile
+from pathlib import Path
+
+# Add backend directory to path to import the app package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.repositories.log_segments import SegmentedLog
+
+# Importable once app.repositories.log_segments set up the mcp_server path
+import log_rotation
+from log_rotation import LogRotationPolicy, compress_segment, log_segments, prune_segments, rotate_log
+
+
+def mcp_call(tool_name: str, status: str = "success") -> str:
+    """Log lines of one MCP call, as written by the MCP server"""
+    stamp = time.strftime("%Y-%m-%d %H:%M:%S,000")
+    outcome = "✅ MCP CALL SUCCESS" if status == "success" else "❌ MCP CALL ERROR"
+    return (
+        f"{stamp} - mcp_calls - INFO - 🔵 MCP CALL RECEIVED: {tool_name}\n"
+        f"{stamp} - mcp_calls - INFO - 📥 Arguments: {{}}\n"
+        f"{stamp} - mcp_calls - INFO - {outcome}: {tool_name}\n"
+    )
+
+
+def append(log_file: Path, text: str):
+    with open(log_file, "a", encoding="utf-8") as f:
+        f.write(text)
+
+
+def test_log_rotation():
+    """Test rotation, compression of late writes, retention and paging"""
+    print("\n" + "="*80)
+    print("TEST: Log Rotation and Segment Paging")
+    print("="*80)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log_file = Path(tmp) / "mcp_calls.log"
+        plain = LogRotationPolicy(compress=False, max_segments=0, max_age_days=0)
+
+        # TEST 1: rotation moves the log aside
+        print("\nTEST 1: Rotate")
+        print("-" * 80)
+
+        append(log_file, mcp_call("tool_0"))
+        writer = open(log_file, "a", encoding="utf-8")  # opened before the rotation
+        segment = rotate_log(log_file, plain)
+        assert segment is not None and not log_file.exists()
+        assert log_segments(log_file) == [segment]
+        assert rotate_log(log_file, plain) is None
+        append(log_file, mcp_call("tool_1"))
+        assert "tool_1" in log_file.read_text() and "tool_1" not in segment.read_text()
+        print(f"✅ Log moved to {segment.name}, next write starts a fresh file")
+
+        # TEST 2: late writes survive compression
+        print("\nTEST 2: Compress a segment that is still written to")
+        print("-" * 80)
+
+        writer.write(mcp_call("tool_late"))
+        writer.flush()
+        started = time.time()
+        compressed = compress_segment(segment, idle_seconds=0.3)
+        assert time.time() - started >= 0.25, "segment was compressed while it was being written"
+        assert compressed.name.endswith(".gz") and not segment.exists()
+        segment_text = log_rotation.gzip.open(compressed, "rt", encoding="utf-8").read()
+        assert "tool_0" in segment_text and "tool_late" in segment_text
+        print("✅ Waited for the segment to go idle, late call kept")
+
+        writer.close()
+        writer = open(log_file, "a", encoding="utf-8")
+        second = rotate_log(log_file, plain)
+        copy = shutil.copyfileobj
+
+        def copy_then_write(source, sink, length):
+            copy(source, sink, length)
+            writer.write(mcp_call("tool_during"))
+            writer.flush()
+
+        log_rotation.shutil.copyfileobj = copy_then_write
+        try:
+            assert compress_segment(second, idle_seconds=0) == second
+        finally:
+            log_rotation.shutil.copyfileobj = copy
+            writer.close()
+        assert not second.with_name(second.name + ".gz").exists()
+        assert not second.with_name(second.name + ".gz.tmp").exists()
+        assert "tool_during" in second.read_text()
+        print("✅ Segment written to during compression left plain, nothing lost")
+
+        # TEST 3: retention
+        print("\nTEST 3: Prune segments")
+        print("-" * 80)
+
+        compress_segment(second, idle_seconds=0)
+        for i in range(3):
+            append(log_file, mcp_call(f"old_{i}"))
+            rotate_log(log_file, plain)
+        assert len(log_segments(log_file)) == 5
+        deleted = prune_segments(log_file, LogRotationPolicy(max_segments=4, max_age_days=0))
+        assert deleted == [compressed] and len(log_segments(log_file)) == 4
+        print(f"✅ Oldest segment deleted, {len(log_segments(log_file))} kept")
+
+        # TEST 4: paging across the active file and segments
+        print("\nTEST 4: Segment paging")
+        print("-" * 80)
+
+        shutil.rmtree(tmp)
+        Path(tmp).mkdir()
+        policy = LogRotationPolicy(compress=False, max_segments=0, max_age_days=0)
+        calls = []
+        for segment_number in range(3):
+            for i in range(10):
+                name = f"tool_{segment_number}_{i}"
+                status = "error" if i % 5 == 0 else "success"
+                append(log_file, mcp_call(name, status))
+                calls.append((name, status))
+            compress_segment(rotate_log(log_file, policy), idle_seconds=0)
+        for i in range(5):
+            name = f"active_{i}"
+            append(log_file, mcp_call(name))
+            calls.append((name, "success"))
+        newest_first = list(reversed(calls))
+
+        log = SegmentedLog(log_file, "mcp", cached_segments=1)
+        assert log.refresh()
+        assert len(log.segments) == 3 and all(s.name.endswith(".gz") for s in log.segments)
+
+        total, page = log.page(limit=8, offset=0)
+        assert total == 35
+        assert [name for _, name, _ in page] == [name for name, _ in newest_first[:8]]
+        assert [entry_id for entry_id, _, _ in page] == list(range(34, 26, -1))
+        assert len(log._loaded) == 1, "page decompressed segments it does not reach"
+
+        total, page = log.page(limit=10, offset=25)
+        assert [name for _, name, _ in page] == [name for name, _ in newest_first[25:35]]
+        assert all("MCP CALL RECEIVED" in lines[0] for _, _, lines in page)
+
+        errors = [name for name, status in newest_first if status == "error"]
+        total, page = log.page(limit=4, offset=1, status_filter="error")
+        assert total == len(errors) == 6
+        assert [name for _, name, _ in page] == errors[1:5]
+
+        total, page = log.page(limit=5, offset=0, name_filter="tool_1_3")
+        assert total == 1 and page[0][1] == "tool_1_3"
+
+        total, status_counts, _ = log.counts()
+        assert total == 35 and status_counts["success"] == 29 and status_counts["error"] == 6
+        assert SegmentedLog(log_file, "mcp").refresh() and log.summary_file.exists()
+        print("✅ Pages, filters and counts span the active file and 3 gzipped segments")
+
+    print("\n" + "="*80)
+    print("✅ ALL LOG ROTATION TESTS PASSED")
+    print("="*80)
+
+
+if __name__ == "__main__":
+    test_log_rotation()
@@ -0,0 +1,169 @@
+"""
+Test Query Cache Invalidation
+
+Verifies that:
+- A repeated codebase search is answered from the cache, without querying
+  the repository again
+- Reindexing a project bumps its index version, so the next search sees
+  the new code, while other projects keep their cached results
+- A search that was running while its scope was bumped is not cached
+- Concurrent identical misses share one computation, and query embeddings
+  are cached per (model, text)
+- Results expire after the TTL
+"""
+
+import os
+import sys
+import asyncio
+import tempfile
+from pathlib import Path
+
+# Add backend directory to path to import the app package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.repositories.codebase_repository import SQLiteCodebaseRepository
+from app.repositories.local_vector_store import LocalVectorStore
+from app.services.codebase_indexer import CodebaseIndexer, CodebaseSearchService, search_scope
+
+from retrieval import QueryCache, query_cache
+
+
+class FakeEmbeddingService:
+    """Deterministic 384d embeddings"""
+
+    async def generate_embeddings(self, texts, input_type="document"):
+        return [[float(len(text) % 7 + 1)] + [0.0] * 383 for text in texts]
+
+    async def generate_query_embedding(self, query):
+        return (await self.generate_embeddings([query]))[0]
+
+
+def write(repo: Path, relative_path: str, content: str):
+    path = repo / relative_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+async def test_query_cache():
+    """Test cached searches and their invalidation"""
+    print("\n" + "="*80)
+    print("TEST: Query Cache Invalidation")
+    print("="*80)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = Path(tmp) / "repo"
+        write(repo, "billing.py", "def charge_invoice(invoice):\n    return invoice.total\n")
+
+        store = LocalVectorStore(os.path.join(tmp, "local.db"))
+        repository = SQLiteCodebaseRepository(store)
+        embeddings = FakeEmbeddingService()
+        indexer = CodebaseIndexer(repository, embeddings, use_git_change_detection=False)
+        search_service = CodebaseSearchService(repository, embeddings)
+        await indexer.reindex_changed_files("p1", str(repo))
+        await indexer.reindex_changed_files("p2", str(repo))
+
+        searches = []
+        lexical_search = repository.lexical_search
+
+        async def counting_search(project_id, query, **kwargs):
+            searches.append(project_id)
+            return await lexical_search(project_id, query, **kwargs)
+
+        repository.lexical_search = counting_search
+
+        # TEST 1: repeated search is a cache hit
+        print("\nTEST 1: Repeated search")
+        print("-" * 80)
+
+        first = await search_service.search("p1", "refund invoice", mode="lexical")
+        again = await search_service.search("p1", "refund invoice", mode="lexical")
+        other = await search_service.search("p2", "refund invoice", mode="lexical")
+        assert first == again and len(first) == 1
+        assert searches == ["p1", "p2"], "repeated search reached the repository"
+        scope_stats = query_cache.stats(search_scope("p1"))["scope"]
+        assert scope_stats["hits"] >= 1
+        again[0]["content"] = "mutated by caller"
+        assert (await search_service.search("p1", "refund invoice", mode="lexical"))[0]["content"] != "mutated by caller"
+        print(f"✅ Second search served from cache ({scope_stats})")
+
+        # TEST 2: reindex invalidates the project's results
+        print("\nTEST 2: Invalidation on reindex")
+        print("-" * 80)
+
+        version = query_cache.version(search_scope("p1"))
+        write(repo, "billing.py", "def refund_invoice(invoice):\n    return -invoice.total\n")
+        await indexer.reindex_changed_files("p1", str(repo))
+        assert query_cache.version(search_scope("p1")) > version
+
+        searches.clear()
+        fresh = await search_service.search("p1", "refund invoice", mode="lexical")
+        assert searches == ["p1"]
+        assert "refund_invoice" in fresh[0]["content"] and fresh != first
+        assert await search_service.search("p2", "refund invoice", mode="lexical") == other
+        assert searches == ["p1"], "other project's results were invalidated"
+        print("✅ Reindexed project searched again, other project still cached")
+
+    # TEST 3: bump during a search
+    print("\nTEST 3: Scope bumped while searching")
+    print("-" * 80)
+
+    cache = QueryCache(ttl=None)
+    computed = []
+
+    async def search_while_indexing():
+        computed.append(1)
+        cache.bump("scope")
+        return ["stale"]
+
+    assert await cache.results("scope", "q", search_while_indexing) == ["stale"]
+    assert await cache.results("scope", "q", search_while_indexing) == ["stale"]
+    assert len(computed) == 2, "results computed against an old index version were cached"
+    print("✅ Results of a search overlapping a write are not cached")
+
+    # TEST 4: concurrent misses and query embeddings
+    print("\nTEST 4: Shared computation and embedding cache")
+    print("-" * 80)
+
+    calls = []
+
+    async def slow_search():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return [{"id": 1}]
+
+    results = await asyncio.gather(*[cache.results("scope", "slow", slow_search) for _ in range(5)])
+    assert len(calls) == 1 and all(result == [{"id": 1}] for result in results)
+    assert len({id(result) for result in results}) == 5, "waiters share one result object"
+
+    async def embed():
+        calls.append(1)
+        return [0.1, 0.2]
+
+    calls.clear()
+    await cache.embedding("model-a", "query", embed)
+    await cache.embedding("model-a", "query", embed)
+    await cache.embedding("model-b", "query", embed)
+    assert len(calls) == 2
+    assert cache.stats()["embeddings"]["hits"] == 1
+    print(f"✅ 5 concurrent misses ran one search, {cache.stats()['embeddings']}")
+
+    # TEST 5: TTL
+    print("\nTEST 5: Result TTL")
+    print("-" * 80)
+
+    cache = QueryCache(ttl=0.05)
+    calls.clear()
+    await cache.results("scope", "q", slow_search)
+    await cache.results("scope", "q", slow_search)
+    await asyncio.sleep(0.1)
+    await cache.results("scope", "q", slow_search)
+    assert len(calls) == 2
+    print("✅ Expired results recomputed")
+
+    print("\n" + "="*80)
+    print("✅ ALL QUERY CACHE TESTS PASSED")
+    print("="*80)
+
+
+if __name__ == "__main__":
+    asyncio.run(test_query_cache())
@@ -0,0 +1,166 @@
+"""
+Test Session Catalog
+
+Verifies that the SessionCatalog behind ClaudeSessionsReader:
+- Gives the same metadata as parsing a transcript in full
+- Does not read unchanged transcripts, and parses only the appended lines
+  of a grown one (a partly written last line waits for the next call)
+- Parses a replaced or shrunk transcript again, as well as sessions
+  cataloged by an older parser version
+- Is kept across reader instances, drops sessions whose transcript is gone
+  and prunes deleted project directories
+"""
+
+import sys
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+# Add backend directory to path to import the app package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services import session_catalog
+from app.services.claude_sessions_reader import ClaudeSessionsReader
+
+
+def transcript_line(i: int, **fields) -> str:
+    """One transcript entry (JSON line)"""
+    entry = {
+        "type": ["user", "assistant", "tool_use", "tool_result"][i % 4],
+        "timestamp": f"2026-01-01T00:{i // 60:02d}:{i % 60:02d}Z",
+        "name": ["Edit", "Bash"][i % 2],
+        "parameters": {"file_path": f"/src/f{i % 5}.py"}
+    }
+    if i == 0:
+        entry.update(cwd="/root/proj", gitBranch="main", version="1.0")
+    if i % 17 == 0:
+        entry.update(level="error", content=f"boom {i}")
+    entry.update(fields)
+    return json.dumps(entry) + "\n"
+
+
+def append(path: Path, text: str):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(text)
+
+
+def as_json(metadata):
+    return json.loads(json.dumps(metadata))
+
+
+def test_session_catalog():
+    """Test incremental parsing of growing and replaced transcripts"""
+    print("\n" + "="*80)
+    print("TEST: Session Catalog")
+    print("="*80)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        projects = Path(tmp) / "projects"
+        project_dir = projects / "-root-proj"
+        project_dir.mkdir(parents=True)
+        long_session = project_dir / "a.jsonl"
+        short_session = project_dir / "b.jsonl"
+        long_session.write_text("".join(transcript_line(i) for i in range(100)) + "not json\n")
+        short_session.write_text("".join(transcript_line(i) for i in range(5)))
+
+        catalog_path = str(Path(tmp) / "session_catalog.db")
+        reader = ClaudeSessionsReader(catalog_path=catalog_path)
+        reader.claude_projects_dir = projects
+
+        def same_as_full_parse(session_file: Path):
+            assert as_json(reader.get_session_metadata(session_file)) == \
+                as_json(reader._parse_session_file(session_file))
+
+        parsed = []
+        catalog = reader._get_catalog()
+        parse_lines = catalog._parse_lines
+
+        def recording_parse(metadata, lines):
+            lines = list(lines)
+            parsed.append([number for number, _ in lines])
+            parse_lines(metadata, lines)
+
+        catalog._parse_lines = recording_parse
+
+        # TEST 1: first listing parses everything, second reads nothing
+        print("\nTEST 1: Catalog matches a full parse")
+        print("-" * 80)
+
+        sessions = reader.get_directory_sessions(project_dir)
+        assert len(sessions) == 2 and len(parsed) == 2
+        same_as_full_parse(long_session)
+        same_as_full_parse(short_session)
+        parsed.clear()
+        assert reader.get_directory_sessions(project_dir) == sessions
+        assert parsed == [], "unchanged transcripts were parsed again"
+        print("✅ Same metadata as a full parse, unchanged transcripts not read")
+
+        # TEST 2: growth
+        print("\nTEST 2: Grown transcript")
+        print("-" * 80)
+
+        append(long_session, "".join(transcript_line(i) for i in range(100, 110)))
+        reader.get_directory_sessions(project_dir)
+        assert parsed == [list(range(102, 112))], parsed
+        same_as_full_parse(long_session)
+
+        parsed.clear()
+        partial = transcript_line(110)
+        append(long_session, partial[:20])
+        reader.get_directory_sessions(project_dir)
+        assert parsed == [[]], "partly written line was parsed"
+        append(long_session, partial[20:])
+        reader.get_directory_sessions(project_dir)
+        assert parsed == [[], [112]], parsed
+        same_as_full_parse(long_session)
+        print("✅ Only appended lines parsed, partial line waited for its end")
+
+        # TEST 3: replacement and parser version
+        print("\nTEST 3: Replaced transcript and parser upgrade")
+        print("-" * 80)
+
+        parsed.clear()
+        short_session.write_text("".join(transcript_line(i, cwd="/elsewhere") for i in range(3)))
+        reader.get_directory_sessions(project_dir)
+        assert parsed == [[1, 2, 3]], parsed
+        same_as_full_parse(short_session)
+
+        parsed.clear()
+        session_catalog.PARSER_VERSION += 1
+        try:
+            reader.get_directory_sessions(project_dir)
+            assert sorted(len(lines) for lines in parsed) == [3, 112]
+        finally:
+            session_catalog.PARSER_VERSION -= 1
+        print("✅ Replaced transcript and old parser rows parsed from the start")
+
+        # TEST 4: persistence, vanished transcripts, pruning
+        print("\nTEST 4: Persistence and cleanup")
+        print("-" * 80)
+
+        reader.get_directory_sessions(project_dir)  # back to the current parser version
+        other = ClaudeSessionsReader(catalog_path=catalog_path)
+        other.claude_projects_dir = projects
+
+        def fail_parse(metadata, lines):
+            raise AssertionError("cataloged transcript parsed again")
+
+        other._get_catalog()._parse_lines = fail_parse
+        assert other.get_directory_sessions(project_dir) == reader.get_directory_sessions(project_dir)
+
+        short_session.unlink()
+        assert [s["session_id"] for s in reader.get_directory_sessions(project_dir)] == ["a"]
+
+        shutil.rmtree(project_dir)
+        reader.get_session_statistics()
+        assert catalog._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0] == 0
+        print("✅ Catalog reused by a new reader, deleted sessions and projects dropped")
+
+    print("\n" + "="*80)
+    print("✅ ALL SESSION CATALOG TESTS PASSED")
+    print("="*80)
+
+
+if __name__ == "__main__":
+    test_session_catalog()
@@ -0,0 +1,139 @@
+"""
+Shared HTTP client for MCP bridge → backend calls.
+
+One long-lived httpx.AsyncClient per bridge process instead of a new client
+(and a new TCP connection) per tool call:
+
+- Keep-alive connection pool sized for concurrent tool calls
+- HTTP/2 when the h2 package is installed and the backend speaks it
+  (uvicorn serves HTTP/1.1, where pooling alone removes the connect cost)
+- Per-call timeouts on top of a short connect timeout
+- Optional Unix-domain-socket transport when bridge and backend share a host
+  (CLAUDETASK_BACKEND_UDS, matching the backend's socket)
+"""
+
+import os
+import logging
+import importlib.util
+from typing import Any, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 5.0  # httpx default, used by handlers that never set one
+CONNECT_TIMEOUT = 5.0
+
+
+class BackendClient:
+    """
+    Pooled HTTP client shared by all tool handlers of one MCP bridge.
+
+    Usage:
+        backend = BackendClient("http://localhost:3333")
+        async with backend.session(timeout=60.0) as client:
+            response = await client.get(f"{backend.base_url}/api/projects/active")
+        await backend.aclose()
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        uds: Optional[str] = None,
+        http2: Optional[bool] = None,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 60.0
+    ):
+        """
+        Initialize client settings (the connection pool is created lazily).
+
+        Args:
+            base_url: Backend URL (kept for URL building and Host headers with UDS)
+            uds: Unix socket path (default: env CLAUDETASK_BACKEND_UDS)
+            http2: Enable HTTP/2 (default: when the h2 package is installed)
+            max_connections: Pool size limit
+            max_keepalive_connections: Idle connections kept open
+            keepalive_expiry: Seconds an idle connection is kept
+        """
+        self.base_url = base_url.rstrip("/")
+        self.uds = (uds if uds is not None else os.getenv("CLAUDETASK_BACKEND_UDS")) or None
+        self.http2 = http2 if http2 is not None else importlib.util.find_spec("h2") is not None
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The shared httpx client, created on first use"""
+        if self._client is None or self._client.is_closed:
+            transport = httpx.AsyncHTTPTransport(
+                uds=self.uds,
+                http2=self.http2,
+                limits=self.limits,
+                retries=1  # retry connect errors once (e.g. backend restart)
+            )
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                transport=transport,
+                timeout=httpx.Timeout(DEFAULT_TIMEOUT, connect=CONNECT_TIMEOUT)
+            )
+            logger.info(
+                f"Backend HTTP client: {self.uds or self.base_url} "
+                f"(http2={'on' if self.http2 else 'off'}, pool={self.limits.max_connections})"
+            )
+        return self._client
+
+    def session(self, timeout: Optional[float] = None) -> "_TimeoutScopedClient":
+        """
+        Borrow the shared client with a call-specific timeout.
+
+        Drop-in replacement for `async with httpx.AsyncClient(timeout=...) as client`;
+        leaving the block does not close the pooled connections.
+
+        Args:
+            timeout: Read/write/pool timeout in seconds (default: DEFAULT_TIMEOUT)
+        """
+        return _TimeoutScopedClient(self, timeout if timeout is not None else DEFAULT_TIMEOUT)
+
+    async def aclose(self):
+        """Close pooled connections"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class _TimeoutScopedClient:
+    """httpx.AsyncClient-like view of the shared client with a fixed timeout"""
+
+    def __init__(self, backend: BackendClient, timeout: float):
+        self._backend = backend
+        self._timeout = httpx.Timeout(timeout, connect=min(timeout, CONNECT_TIMEOUT))
+
+    async def __aenter__(self) -> "_TimeoutScopedClient":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        kwargs.setdefault("timeout", self._timeout)
+        return await self._backend.client.request(method, url, **kwargs)
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def put(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("PUT", url, **kwargs)
+
+    async def patch(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("PATCH", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("DELETE", url, **kwargs)
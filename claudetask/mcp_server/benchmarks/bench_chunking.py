@@ -0,0 +1,108 @@
+"""
+Benchmark code chunking: GenericChunker vs the language-aware CodeChunker.
+
+Both chunkers run over the Python/JavaScript/TypeScript sources of this
+repository (or --root) with the same chunk size. Reported per language:
+throughput (files/s, chunks/s), chunk size (average lines and estimated
+tokens), the share of chunks over chunk_size, and how many lines are
+duplicated by overlapping chunks.
+
+Usage:
+    cd claudetask/mcp_server
+    python benchmarks/bench_chunking.py [--root ../..] [--chunk-size 500] [--repeat 3]
+"""
+
+import os
+import sys
+import time
+import argparse
+from pathlib import Path
+
+MCP_SERVER_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(MCP_SERVER_DIR))
+
+LANGUAGES = {".py": "python", ".js": "javascript", ".jsx": "javascript", ".ts": "typescript", ".tsx": "typescript"}
+SKIP_DIRS = {"node_modules", ".git", "venv", ".venv", "__pycache__", "dist", "build"}
+
+
+def load_sources(root: Path):
+    sources = []
+    for directory, dirnames, filenames in os.walk(root):
+        dirnames[:] = [name for name in dirnames if name not in SKIP_DIRS]
+        for filename in filenames:
+            language = LANGUAGES.get(os.path.splitext(filename)[1])
+            if language:
+                path = Path(directory, filename)
+                try:
+                    sources.append((str(path.relative_to(root)), language, path.read_text(encoding="utf-8")))
+                except (OSError, UnicodeDecodeError):
+                    continue
+    return sources
+
+
+def measure(chunker, sources, repeat: int):
+    """Best-of-repeat chunking time plus chunk statistics of the last run"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [chunker.chunk_code(code, path, language) for path, language, code in sources]
+        best = min(best, time.perf_counter() - start)
+
+    chunks = [chunk for result in results for chunk in result]
+    lines = sum(metadata.end_line - metadata.start_line + 1 for _, metadata in chunks)
+    tokens = sum(chunker.count_tokens(content) for content, _ in chunks)
+    oversized = sum(1 for content, _ in chunks if chunker.count_tokens(content) > chunker.chunk_size)
+
+    duplicated = 0
+    for result in results:
+        covered_to = 0
+        for _, metadata in sorted(result, key=lambda chunk: chunk[1].start_line):
+            duplicated += max(0, min(covered_to, metadata.end_line) - metadata.start_line + 1)
+            covered_to = max(covered_to, metadata.end_line)
+    source_lines = sum(code.count("\n") + 1 for _, _, code in sources)
+
+    return {
+        "seconds": best,
+        "files_per_s": len(sources) / best if best else 0.0,
+        "chunks_per_s": len(chunks) / best if best else 0.0,
+        "chunks": len(chunks),
+        "avg_lines": lines / len(chunks) if chunks else 0.0,
+        "avg_tokens": tokens / len(chunks) if chunks else 0.0,
+        "oversized": oversized / len(chunks) if chunks else 0.0,
+        "duplicated": duplicated / source_lines if source_lines else 0.0
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--root", default=str(MCP_SERVER_DIR.parent.parent), help="Repository to chunk")
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--chunk-overlap", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    from chunking import CodeChunker, GenericChunker
+
+    sources = load_sources(Path(args.root).resolve())
+    print(f"{len(sources)} files, {sum(len(code) for _, _, code in sources) / 2 ** 20:.1f} MB, "
+          f"chunk_size={args.chunk_size}\n")
+    print(f"{'language':<11} {'chunker':<8} {'files':>6} {'files/s':>8} {'chunks':>7} {'chunks/s':>9} "
+          f"{'lines':>6} {'tokens':>7} {'>size':>6} {'dup':>6}")
+
+    chunkers = {
+        "generic": GenericChunker(chunk_size=args.chunk_size, chunk_overlap=args.chunk_overlap),
+        "code": CodeChunker(chunk_size=args.chunk_size, chunk_overlap=args.chunk_overlap)
+    }
+    for language in sorted(set(LANGUAGES.values())) + ["all"]:
+        subset = [source for source in sources if language in ("all", source[1])]
+        if not subset:
+            continue
+        for name, chunker in chunkers.items():
+            result = measure(chunker, subset, args.repeat)
+            print(f"{language:<11} {name:<8} {len(subset):>6} {result['files_per_s']:>8.0f} {result['chunks']:>7} "
+                  f"{result['chunks_per_s']:>9.0f} {result['avg_lines']:>6.1f} {result['avg_tokens']:>7.1f} "
+                  f"{result['oversized']:>6.1%} {result['duplicated']:>6.1%}")
+
+
+if __name__ == "__main__":
+    main()
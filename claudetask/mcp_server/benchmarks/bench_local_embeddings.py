@@ -0,0 +1,136 @@
+"""
+Benchmark local embedding backends (torch vs ONNX fp32 vs ONNX int8).
+
+Each backend runs in a fresh subprocess so that load time and peak RSS are
+measured in isolation. Texts are real code chunks from this repository.
+Vectors are compared against the torch backend to confirm that the backends
+can share the existing 384d collections.
+
+Usage:
+    cd claudetask/mcp_server
+    python benchmarks/bench_local_embeddings.py [--texts 2000] [--threads 4] [--batch-size 64]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import subprocess
+import tempfile
+from pathlib import Path
+
+MCP_SERVER_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(MCP_SERVER_DIR))
+
+CONFIGURATIONS = [
+    ("torch", "torch", False),
+    ("onnx-fp32", "onnx", False),
+    ("onnx-int8", "onnx", True),
+]
+
+
+def collect_texts(limit: int):
+    """Chunk the MCP server sources into embedding inputs"""
+    from chunking import GenericChunker
+
+    chunker = GenericChunker(chunk_size=500, chunk_overlap=50)
+    texts = []
+    for path in sorted(MCP_SERVER_DIR.rglob("*.py")):
+        content = path.read_text(encoding="utf-8", errors="ignore")
+        for chunk_content, metadata in chunker.chunk_code(content, str(path), "python"):
+            texts.append(f"{chunker.generate_summary(chunk_content, metadata)}\n\n{chunk_content}")
+            if len(texts) >= limit:
+                return texts
+    return texts
+
+
+def run_worker(backend: str, quantize: bool, threads: int, batch_size: int, texts_path: str, vectors_path: str):
+    """Measure one backend (runs in a subprocess)"""
+    import numpy as np
+    from embeddings import create_local_embedder
+
+    texts = json.loads(Path(texts_path).read_text())
+
+    start = time.perf_counter()
+    embedder = create_local_embedder("all-MiniLM-L6-v2", backend=backend, threads=threads, quantize=quantize)
+    embedder.encode(texts[:8], batch_size=8)  # warm-up
+    load_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vectors = np.asarray(embedder.encode(texts, batch_size=batch_size), dtype=np.float32)
+    encode_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for text in texts[:100]:
+        embedder.encode(text)
+    single_ms = (time.perf_counter() - start) / min(100, len(texts)) * 1000
+
+    np.save(vectors_path, vectors)
+
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss_mb = max_rss / (1024 * 1024) if sys.platform == "darwin" else max_rss / 1024
+
+    print(json.dumps({
+        "load_seconds": round(load_seconds, 2),
+        "texts_per_second": round(len(texts) / encode_seconds, 1),
+        "single_query_ms": round(single_ms, 2),
+        "peak_rss_mb": round(rss_mb, 1),
+        "dimensions": int(vectors.shape[1])
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--texts", type=int, default=2000, help="Number of code chunks to embed")
+    parser.add_argument("--threads", type=int, default=0, help="Intra-op threads (0 = runtime default)")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--worker", nargs=3, metavar=("BACKEND", "QUANTIZE", "VECTORS"), help=argparse.SUPPRESS)
+    parser.add_argument("--texts-file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        backend, quantize, vectors_path = args.worker
+        run_worker(backend, quantize == "1", args.threads, args.batch_size, args.texts_file, vectors_path)
+        return
+
+    import numpy as np
+
+    texts = collect_texts(args.texts)
+    print(f"Embedding {len(texts)} code chunks (batch size {args.batch_size}, threads {args.threads or 'default'})\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        texts_path = os.path.join(tmp, "texts.json")
+        Path(texts_path).write_text(json.dumps(texts))
+
+        results = {}
+        for name, backend, quantize in CONFIGURATIONS:
+            vectors_path = os.path.join(tmp, f"{name}.npy")
+            proc = subprocess.run(
+                [sys.executable, __file__, "--worker", backend, "1" if quantize else "0", vectors_path,
+                 "--texts-file", texts_path, "--threads", str(args.threads), "--batch-size", str(args.batch_size)],
+                capture_output=True, text=True
+            )
+            if proc.returncode != 0:
+                print(f"{name:<10} unavailable: {proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else 'failed'}")
+                continue
+            results[name] = json.loads(proc.stdout.strip().splitlines()[-1])
+            results[name]["vectors"] = np.load(vectors_path)
+
+    baseline = results.get("torch")
+
+    print(f"\n{'backend':<10} {'load s':>8} {'texts/s':>9} {'query ms':>9} {'RSS MB':>8} {'cos vs torch':>13}")
+    for name, result in results.items():
+        agreement = "-"
+        if baseline is not None:
+            # Vectors are L2-normalized, so the row-wise dot product is cosine similarity
+            cosine = (result["vectors"] * baseline["vectors"]).sum(axis=1)
+            agreement = f"{cosine.mean():.4f} (min {cosine.min():.3f})"
+        print(f"{name:<10} {result['load_seconds']:>8} {result['texts_per_second']:>9} "
+              f"{result['single_query_ms']:>9} {result['peak_rss_mb']:>8} {agreement:>13}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+Benchmark similarity search: memory-mapped EmbeddingStore vs ChromaDB.
+
+For each collection size, the EmbeddingStore (append-only float32 file,
+exact top-k with argpartition) and a ChromaDB collection (the current
+local RAG path, vectors passed as Python lists) are filled with the same
+synthetic unit vectors and queried with the same queries. Each engine and
+size runs in a fresh subprocess so load time and peak RSS are isolated.
+Chroma results are compared with the exact top-k (recall@k).
+
+Usage:
+    cd claudetask/mcp_server
+    python benchmarks/bench_vector_search.py [--sizes 10000,100000,1000000] [--dims 384] [--chroma-max 1000000]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import subprocess
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+MCP_SERVER_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(MCP_SERVER_DIR))
+
+BATCH = 10_000  # vectors per write (Chroma caps a single add at ~41k)
+
+
+def make_vectors(seed: int, count: int, dims: int, topics: int = 1000):
+    """
+    Deterministic unit vectors clustered around shared topic centers
+    (uniformly random high-dimensional vectors are unlike real embeddings)
+    """
+    import numpy as np
+
+    centers = np.random.default_rng(12345).standard_normal((topics, dims), dtype=np.float32)
+    rng = np.random.default_rng(seed)
+    vectors = centers[rng.integers(0, topics, count)] + 0.5 * rng.standard_normal((count, dims), dtype=np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def batches(size: int, dims: int):
+    for start in range(0, size, BATCH):
+        count = min(BATCH, size - start)
+        yield [f"v{i}" for i in range(start, start + count)], make_vectors(start + 1, count, dims)
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss / (1024 * 1024) if sys.platform == "darwin" else max_rss / 1024
+
+
+def run_store(size: int, dims: int, k: int, queries, workdir: str):
+    from embeddings.embedding_store import EmbeddingStore
+
+    start = time.perf_counter()
+    store = EmbeddingStore(os.path.join(workdir, "store"), dims)
+    for ids, vectors in batches(size, dims):
+        store.add(ids, vectors)
+    build_seconds = time.perf_counter() - start
+
+    # Reopen: what a restarted server pays before its first query
+    start = time.perf_counter()
+    store = EmbeddingStore(os.path.join(workdir, "store"), dims)
+    open_seconds = time.perf_counter() - start
+
+    store.search(queries[:1], k=k)  # page in
+    start = time.perf_counter()
+    results = [store.search(query, k=k)[0] for query in queries]
+    single_ms = (time.perf_counter() - start) / len(queries) * 1000
+
+    start = time.perf_counter()
+    store.search(queries, k=k)
+    batch_ms = (time.perf_counter() - start) / len(queries) * 1000
+
+    return {
+        "build_seconds": build_seconds,
+        "open_seconds": open_seconds,
+        "query_ms": single_ms,
+        "batched_query_ms": batch_ms,
+        "disk_mb": store.stats()["file_bytes"] / 2 ** 20,
+        "results": [[id for id, _ in hits] for hits in results]
+    }
+
+
+def run_chroma(size: int, dims: int, k: int, queries, workdir: str):
+    import chromadb
+
+    start = time.perf_counter()
+    client = chromadb.PersistentClient(path=os.path.join(workdir, "chroma"))
+    collection = client.get_or_create_collection("bench", metadata={"hnsw:space": "cosine"})
+    for ids, vectors in batches(size, dims):
+        collection.add(ids=ids, embeddings=vectors.tolist())
+    build_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    client = chromadb.PersistentClient(path=os.path.join(workdir, "chroma"))
+    collection = client.get_collection("bench")
+    open_seconds = time.perf_counter() - start
+
+    collection.query(query_embeddings=[queries[0].tolist()], n_results=k)  # load index
+    start = time.perf_counter()
+    results = [
+        collection.query(query_embeddings=[query.tolist()], n_results=k)["ids"][0]
+        for query in queries
+    ]
+    single_ms = (time.perf_counter() - start) / len(queries) * 1000
+
+    start = time.perf_counter()
+    collection.query(query_embeddings=queries.tolist(), n_results=k)
+    batch_ms = (time.perf_counter() - start) / len(queries) * 1000
+
+    disk_bytes = sum(path.stat().st_size for path in Path(workdir, "chroma").rglob("*") if path.is_file())
+    return {
+        "build_seconds": build_seconds,
+        "open_seconds": open_seconds,
+        "query_ms": single_ms,
+        "batched_query_ms": batch_ms,
+        "disk_mb": disk_bytes / 2 ** 20,
+        "results": results
+    }
+
+
+def run_worker(engine: str, size: int, dims: int, k: int, query_count: int, output: str):
+    """Measure one engine at one size (runs in a subprocess)"""
+    queries = make_vectors(0, query_count, dims)
+    with tempfile.TemporaryDirectory() as workdir:
+        runner = run_store if engine == "store" else run_chroma
+        result = runner(size, dims, k, queries, workdir)
+    result["peak_rss_mb"] = peak_rss_mb()
+    Path(output).write_text(json.dumps(result))
+
+
+def list_bytes_per_vector(dims: int) -> float:
+    """Memory of one vector held as List[float] (the .tolist() representation)"""
+    vectors = make_vectors(0, 1000, dims)
+    tracemalloc.start()
+    as_lists = vectors.tolist()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del as_lists
+    return size / 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="Comma-separated collection sizes")
+    parser.add_argument("--dims", type=int, default=384)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--chroma-max", type=int, default=1_000_000, help="Skip ChromaDB above this size")
+    parser.add_argument("--worker", nargs=3, metavar=("ENGINE", "SIZE", "OUTPUT"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        engine, size, output = args.worker
+        run_worker(engine, int(size), args.dims, args.k, args.queries, output)
+        return
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    list_bytes = list_bytes_per_vector(args.dims)
+    print(f"{args.dims}d vectors, k={args.k}, {args.queries} queries; "
+          f"float32 row {args.dims * 4} B vs List[float] {list_bytes:.0f} B per vector\n")
+    print(f"{'size':>9} {'engine':<7} {'build s':>8} {'open s':>7} {'query ms':>9} {'batch ms':>9} "
+          f"{'RSS MB':>8} {'disk MB':>8} {'recall':>7}")
+
+    for size in sizes:
+        results = {}
+        for engine in ("store", "chroma"):
+            if engine == "chroma" and size > args.chroma_max:
+                continue
+            with tempfile.TemporaryDirectory() as tmp:
+                output = os.path.join(tmp, "result.json")
+                proc = subprocess.run(
+                    [sys.executable, __file__, "--worker", engine, str(size), output,
+                     "--dims", str(args.dims), "--k", str(args.k), "--queries", str(args.queries)],
+                    capture_output=True, text=True
+                )
+                if proc.returncode != 0:
+                    reason = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "failed"
+                    print(f"{size:>9} {engine:<7} unavailable: {reason}")
+                    continue
+                results[engine] = json.loads(Path(output).read_text())
+
+        exact = results.get("store")
+        for engine, result in results.items():
+            recall = "-"
+            if exact is not None:
+                hits = sum(len(set(a) & set(b)) for a, b in zip(result["results"], exact["results"]))
+                recall = f"{hits / (len(exact['results']) * args.k):.3f}"
+            print(f"{size:>9} {engine:<7} {result['build_seconds']:>8.2f} {result['open_seconds']:>7.2f} "
+                  f"{result['query_ms']:>9.2f} {result['batched_query_ms']:>9.2f} "
+                  f"{result['peak_rss_mb']:>8.1f} {result['disk_mb']:>8.1f} {recall:>7}")
+
+
+if __name__ == "__main__":
+    main()
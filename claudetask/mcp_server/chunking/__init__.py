@@ -1,6 +1,18 @@
 """Code chunking module for semantic code splitting"""
 
-from .base_chunker import BaseChunker, ChunkMetadata
+from .base_chunker import BaseChunker, ChunkMetadata, SymbolDefinition
 from .generic_chunker import GenericChunker
+from .python_chunker import PythonChunker
+from .script_chunker import ScriptChunker
+from .registry import CodeChunker, get_chunker, register_chunker
+from .pipeline import ChunkingPipeline, ChunkedFile, chunk_file, discover_files
+from .chunk_ids import content_hash, stable_chunk_ids
+from .change_detection import ChangeDetector, ChangeSet
 
-__all__ = ["BaseChunker", "ChunkMetadata", "GenericChunker"]
+__all__ = [
+    "BaseChunker", "ChunkMetadata", "SymbolDefinition", "GenericChunker",
+    "PythonChunker", "ScriptChunker", "CodeChunker", "get_chunker", "register_chunker",
+    "ChunkingPipeline", "ChunkedFile", "chunk_file", "discover_files",
+    "content_hash", "stable_chunk_ids",
+    "ChangeDetector", "ChangeSet"
+]
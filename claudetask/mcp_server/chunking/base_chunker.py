@@ -7,7 +7,7 @@ into semantically meaningful pieces with summaries.
 
 import logging
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
@@ -24,6 +24,16 @@ class ChunkMetadata:
     symbols: List[str]  # extracted symbols (function names, class names)
 
 
+@dataclass
+class SymbolDefinition:
+    """A symbol defined in a file, with the full line range of its definition"""
+    name: str
+    kind: str  # function, class, ...
+    start_line: int  # 1-indexed, inclusive
+    end_line: int
+    container: Optional[str] = None  # enclosing class, for methods
+
+
 class BaseChunker(ABC):
     """
     Abstract base class for code chunkers.
@@ -62,6 +72,55 @@ class BaseChunker(ABC):
         """
         pass
 
+    def extract_symbols(
+        self,
+        code: str,
+        file_path: str,
+        language: str
+    ) -> List[SymbolDefinition]:
+        """
+        Extract the symbols defined in a file.
+
+        The default implementation reports the symbols of each chunk with
+        the chunk's line range; chunkers that know the full extent of a
+        definition (even when it is split into several chunks) override it.
+
+        Args:
+            code: Source code content
+            file_path: Path to the file
+            language: Programming language
+
+        Returns:
+            Symbol definitions in file order
+        """
+        return [
+            SymbolDefinition(name, metadata.chunk_type, metadata.start_line, metadata.end_line)
+            for _, metadata in self.chunk_code(code, file_path, language)
+            for name in metadata.symbols
+        ]
+
+    def chunk_and_extract(
+        self,
+        code: str,
+        file_path: str,
+        language: str
+    ) -> Tuple[List[tuple[str, ChunkMetadata]], List[SymbolDefinition]]:
+        """
+        Chunk code and extract its symbols.
+
+        Indexers need both; chunkers that parse the file override this to
+        derive both from a single parse.
+
+        Args:
+            code: Source code content
+            file_path: Path to the file
+            language: Programming language
+
+        Returns:
+            (chunks, symbols) as returned by chunk_code() and extract_symbols()
+        """
+        return self.chunk_code(code, file_path, language), self.extract_symbols(code, file_path, language)
+
     def generate_summary(self, chunk: str, metadata: ChunkMetadata) -> str:
         """
         Generate a brief summary for a code chunk.
@@ -77,7 +136,7 @@ class BaseChunker(ABC):
         # TODO: Use LLM for better summaries
         lines = chunk.strip().split('\n')
 
-        if metadata.chunk_type == "function":
+        if metadata.chunk_type in ("function", "method"):
             # Extract function name and first docstring line
             for line in lines[:5]:
                 if 'def ' in line or 'function ' in line:
@@ -0,0 +1,288 @@
+"""
+Change detection for incremental indexing.
+
+Hashing every file in the tree on every run costs more than the reindex
+itself on large repositories. When the repository is a git checkout, the
+change set is computed from git instead:
+
+1. `git diff --name-status` between the last indexed commit and HEAD
+2. `git status --porcelain` for staged, unstaged and untracked files
+3. Files that were dirty at the last run (they may have been reverted)
+
+Only those candidates are stat'ed and hashed; an mtime/size match against the
+previous run skips even the hash. Without git (not a checkout, git missing,
+last commit unknown or garbage-collected) every file is walked, still using
+the mtime/size pre-check before hashing.
+"""
+
+import os
+import hashlib
+import logging
+import subprocess
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ChangeSet:
+    """Files that need reindexing since the last run"""
+    mode: str  # "git" or "hash"
+    head_commit: Optional[str] = None
+    added: Dict[str, str] = field(default_factory=dict)  # relative_path -> sha256
+    modified: Dict[str, str] = field(default_factory=dict)  # relative_path -> sha256
+    deleted: List[str] = field(default_factory=list)
+    unchanged: int = 0
+    checked: int = 0  # files stat'ed or hashed
+    file_stats: Dict[str, List[float]] = field(default_factory=dict)  # relative_path -> [mtime, size]
+    dirty_files: List[str] = field(default_factory=list)  # differ from HEAD (git mode)
+
+    @property
+    def changed(self) -> Dict[str, str]:
+        """Added and modified files with their new hashes"""
+        return {**self.added, **self.modified}
+
+    def is_empty(self) -> bool:
+        return not (self.added or self.modified or self.deleted)
+
+
+class ChangeDetector:
+    """
+    Computes the set of added, modified and deleted files for a repository.
+
+    Callers persist the returned head_commit, file_stats and dirty_files
+    alongside their file hashes and pass them back on the next run.
+
+    Usage:
+        detector = ChangeDetector(repo_path, SUPPORTED_EXTENSIONS, SKIP_DIRS)
+        changes = detector.detect(file_hashes, file_stats, last_commit, dirty_files)
+        for relative_path, file_hash in changes.changed.items():
+            ...  # reindex
+    """
+
+    GIT_TIMEOUT = 30  # seconds per git command
+
+    def __init__(
+        self,
+        repo_path: str,
+        supported_extensions: Set[str],
+        skip_dirs: Set[str],
+        use_git: bool = True
+    ):
+        """
+        Initialize detector.
+
+        Args:
+            repo_path: Repository root (may be a subdirectory of a git checkout)
+            supported_extensions: Lowercase extensions to include (e.g. ".py")
+            skip_dirs: Directory names to ignore
+            use_git: Use git to narrow the candidate set when available
+        """
+        self.repo_path = os.path.abspath(repo_path)
+        self.supported_extensions = supported_extensions
+        self.skip_dirs = skip_dirs
+        self.use_git = use_git
+        self._git_toplevel: Optional[str] = None
+
+    def detect(
+        self,
+        file_hashes: Dict[str, str],
+        file_stats: Optional[Dict[str, List[float]]] = None,
+        last_commit: Optional[str] = None,
+        dirty_files: Optional[Iterable[str]] = None
+    ) -> ChangeSet:
+        """
+        Compute changes since the last indexing run.
+
+        Args:
+            file_hashes: relative_path -> sha256 of indexed content
+            file_stats: relative_path -> [mtime, size] recorded at last run
+            last_commit: HEAD commit at last run
+            dirty_files: Files that differed from HEAD at last run
+
+        Returns:
+            ChangeSet (mode tells which strategy was used)
+        """
+        file_stats = file_stats or {}
+
+        if self.use_git and last_commit:
+            try:
+                return self._detect_with_git(file_hashes, file_stats, last_commit, set(dirty_files or []))
+            except (OSError, subprocess.SubprocessError, ValueError) as e:
+                logger.info(f"Git change detection unavailable, hashing tree: {e}")
+
+        changes = self._detect_by_hashing(file_hashes, file_stats)
+        if self.use_git:
+            # Record the commit so the next run can use git
+            try:
+                changes.head_commit = self.get_head_commit()
+                changes.dirty_files = sorted(self._git_status_paths())
+            except (OSError, subprocess.SubprocessError, ValueError):
+                pass
+        return changes
+
+    def get_head_commit(self) -> str:
+        """
+        Get the current HEAD commit SHA.
+
+        Raises:
+            ValueError: If repo_path is not inside a git checkout
+        """
+        return self._git("rev-parse", "HEAD").strip()
+
+    def _detect_with_git(
+        self,
+        file_hashes: Dict[str, str],
+        file_stats: Dict[str, List[float]],
+        last_commit: str,
+        previously_dirty: Set[str]
+    ) -> ChangeSet:
+        """Hash only files git reports as changed since last_commit"""
+        head = self.get_head_commit()
+
+        # Raises ValueError if the commit no longer exists (rebase + gc)
+        self._git("cat-file", "-e", f"{last_commit}^{{commit}}")
+
+        candidates: Set[str] = set(previously_dirty)
+        if head != last_commit:
+            output = self._git("diff", "--name-status", "--no-renames", "-z", last_commit, head)
+            fields = [f for f in output.split('\0') if f]
+            # -z output alternates status and path
+            candidates.update(self._to_repo_relative(path) for path in fields[1::2])
+            candidates.discard(None)
+
+        dirty = self._git_status_paths()
+        candidates.update(dirty)
+
+        changes = ChangeSet(mode="git", head_commit=head, file_stats=dict(file_stats))
+        changes.dirty_files = sorted(dirty)
+
+        for relative_path in sorted(candidates):
+            if not self._is_indexable(relative_path):
+                continue
+            self._check_file(relative_path, file_hashes, file_stats, changes)
+
+        # Known files git did not report are unchanged by construction
+        changes.unchanged = len(file_hashes) - len(changes.modified) - len(changes.deleted)
+
+        logger.info(
+            f"Git change detection ({last_commit[:8]}..{head[:8]}): {len(candidates)} candidates, "
+            f"{len(changes.added)} added, {len(changes.modified)} modified, {len(changes.deleted)} deleted"
+        )
+        return changes
+
+    def _detect_by_hashing(
+        self,
+        file_hashes: Dict[str, str],
+        file_stats: Dict[str, List[float]]
+    ) -> ChangeSet:
+        """Walk the whole tree, hashing files whose mtime/size changed"""
+        changes = ChangeSet(mode="hash")
+        seen: Set[str] = set()
+
+        for root, dirs, files in os.walk(self.repo_path):
+            dirs[:] = [d for d in dirs if d not in self.skip_dirs]
+
+            for file in files:
+                if os.path.splitext(file)[1].lower() not in self.supported_extensions:
+                    continue
+
+                relative_path = os.path.relpath(os.path.join(root, file), self.repo_path)
+                seen.add(relative_path)
+                self._check_file(relative_path, file_hashes, file_stats, changes)
+
+        changes.deleted = sorted(set(file_hashes) - seen)
+        return changes
+
+    def _check_file(
+        self,
+        relative_path: str,
+        file_hashes: Dict[str, str],
+        file_stats: Dict[str, List[float]],
+        changes: ChangeSet
+    ):
+        """Classify one candidate file, hashing only if its stat changed"""
+        abs_path = os.path.join(self.repo_path, relative_path)
+        stored_hash = file_hashes.get(relative_path)
+
+        try:
+            stat = os.stat(abs_path)
+        except FileNotFoundError:
+            if stored_hash is not None:
+                changes.deleted.append(relative_path)
+            changes.file_stats.pop(relative_path, None)
+            return
+        except OSError as e:
+            logger.warning(f"Failed to stat {relative_path}: {e}")
+            return
+
+        changes.checked += 1
+        current_stat = [stat.st_mtime, stat.st_size]
+
+        if stored_hash is not None and file_stats.get(relative_path) == current_stat:
+            changes.unchanged += 1
+            changes.file_stats[relative_path] = current_stat
+            return
+
+        try:
+            with open(abs_path, 'rb') as f:
+                current_hash = hashlib.sha256(f.read()).hexdigest()
+        except OSError as e:
+            logger.warning(f"Failed to read {relative_path}: {e}")
+            return
+
+        changes.file_stats[relative_path] = current_stat
+
+        if stored_hash is None:
+            changes.added[relative_path] = current_hash
+        elif stored_hash != current_hash:
+            changes.modified[relative_path] = current_hash
+        else:
+            changes.unchanged += 1
+
+    def _is_indexable(self, relative_path: str) -> bool:
+        """Apply the same extension and directory filters as the full walk"""
+        if os.path.splitext(relative_path)[1].lower() not in self.supported_extensions:
+            return False
+        parts = relative_path.split(os.sep)
+        return not any(part in self.skip_dirs for part in parts[:-1])
+
+    def _git_status_paths(self) -> Set[str]:
+        """Staged, unstaged and untracked paths relative to repo_path"""
+        output = self._git("status", "--porcelain", "-z", "--untracked-files=all", "--no-renames")
+        # Entries are "XY path"; paths are relative to the top level
+        paths = {self._to_repo_relative(entry[3:]) for entry in output.split('\0') if len(entry) > 3}
+        paths.discard(None)
+        return paths
+
+    def _to_repo_relative(self, git_path: str) -> Optional[str]:
+        """Convert a top-level relative git path to repo_path relative (None if outside)"""
+        relative_path = os.path.relpath(os.path.join(self._toplevel(), git_path), self.repo_path)
+        if relative_path.startswith(os.pardir + os.sep) or relative_path == os.pardir:
+            return None
+        return relative_path
+
+    def _toplevel(self) -> str:
+        if self._git_toplevel is None:
+            self._git_toplevel = self._git("rev-parse", "--show-toplevel").strip()
+        return self._git_toplevel
+
+    def _git(self, *args: str) -> str:
+        """
+        Run a git command in repo_path.
+
+        Raises:
+            ValueError: If git exits non-zero
+            OSError: If git is not installed
+            subprocess.TimeoutExpired: If git takes longer than GIT_TIMEOUT
+        """
+        result = subprocess.run(
+            ["git", "-C", self.repo_path, *args],
+            capture_output=True,
+            text=True,
+            timeout=self.GIT_TIMEOUT
+        )
+        if result.returncode != 0:
+            raise ValueError(f"git {args[0]} failed: {result.stderr.strip()}")
+        return result.stdout
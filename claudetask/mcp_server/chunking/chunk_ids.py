@@ -0,0 +1,48 @@
+"""
+Stable, content-based chunk identifiers.
+
+Line-number based IDs (file:start:end) shift whenever a line is inserted
+above a chunk. These IDs are built from (file, symbol, content hash), so a
+function keeps its ID as long as its text is unchanged, wherever it moves.
+"""
+
+import hashlib
+from typing import Dict, Iterable, List, Tuple
+
+from .base_chunker import ChunkMetadata
+
+
+def content_hash(content: str) -> str:
+    """Short content digest used in chunk IDs and change detection"""
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()[:16]
+
+
+def stable_chunk_ids(
+    file_path: str,
+    chunks: Iterable[Tuple[str, ChunkMetadata]]
+) -> List[str]:
+    """
+    Assign stable IDs to a file's chunks.
+
+    Format: "{file_path}::{symbol or chunk_type}::{content_hash}". Identical
+    chunks within one file (repeated boilerplate) get a "#n" occurrence suffix.
+
+    Args:
+        file_path: Relative file path
+        chunks: (content, metadata) pairs in file order
+
+    Returns:
+        One ID per chunk, in input order
+    """
+    occurrences: Dict[str, int] = {}
+    ids = []
+
+    for content, metadata in chunks:
+        anchor = metadata.symbols[0] if metadata.symbols else metadata.chunk_type
+        base_id = f"{file_path}::{anchor}::{content_hash(content)}"
+
+        count = occurrences.get(base_id, 0)
+        occurrences[base_id] = count + 1
+        ids.append(base_id if count == 0 else f"{base_id}#{count}")
+
+    return ids
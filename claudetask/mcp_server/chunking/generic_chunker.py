@@ -8,7 +8,7 @@ reasonable chunks when AST parsing is not available.
 import re
 import logging
 from typing import List
-from .base_chunker import BaseChunker, ChunkMetadata
+from .base_chunker import BaseChunker, ChunkMetadata, SymbolDefinition
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +38,23 @@ class GenericChunker(BaseChunker):
         r'^\s*type\s+(\w+)\s*=',  # TypeScript
     ]
 
+    # Definitions for the symbol table. Stricter than the boundary patterns
+    # above: a Java/C# method needs a modifier, so calls like "return foo(" do
+    # not match. (pattern, kind) pairs, first match wins.
+    _MODIFIERS = r'(?:(?:export|default|public|private|protected|internal|static|final|abstract|override|virtual|sealed|open|data|async|suspend|synchronized|pub(?:\([^)]*\))?)\s+)*'
+    DEFINITION_PATTERNS = [
+        (re.compile(r'^\s*(?:async\s+)?def\s+(?:self\.)?(\w+[?!]?)'), "function"),  # Python, Ruby
+        (re.compile(r'^\s*' + _MODIFIERS + r'(?:class|struct|enum|trait|object|record)\s+(\w+)'), "class"),
+        (re.compile(r'^\s*' + _MODIFIERS + r'interface\s+(\w+)'), "interface"),
+        (re.compile(r'^\s*(?:export\s+)?type\s+(\w+)\s*(?:<[^>]*>)?\s*='), "type"),  # TypeScript
+        (re.compile(r'^\s*type\s+(\w+)\s+(?:struct|interface)\b'), "class"),  # Go
+        (re.compile(r'^\s*' + _MODIFIERS + r'(?:function\s*\*?|func|fn|fun)\s+(?:\([^)]*\)\s*)?(?:<[^>]*>\s*)?(?:\w+\.)?(\w+)'), "function"),  # JS, PHP, Go, Swift, Rust, Kotlin
+        (re.compile(r'^\s*(?:export\s+)?(?:const|let|var)\s+(\w+)\s*(?::[^=]+)?=\s*(?:async\s+)?(?:function\b|\([^)]*\)\s*(?::[^=]+)?=>|\w+\s*=>)'), "function"),  # JS/TS function values
+        (re.compile(r'^\s*(?:(?:public|private|protected|internal|static|final|abstract|override|virtual|sealed|async|synchronized)\s+)+[\w<>\[\],.?]+\s+(\w+)\s*\('), "function"),  # Java/C# methods
+        (re.compile(r'^\s*(?:(?:public|private|protected|static|async|get|set)\s+)*(?!(?:if|for|while|switch|catch|return|function|else)\b)(\w+)\s*\([^)]*\)\s*(?::\s*[\w<>\[\]|, ]+)?\s*\{\s*$'), "function"),  # JS/TS class methods
+    ]
+    CONTAINER_KINDS = {"class", "interface"}
+
     def chunk_code(
         self,
         code: str,
@@ -88,6 +105,66 @@ class GenericChunker(BaseChunker):
         logger.info(f"Chunked {file_path} into {len(chunks)} chunks")
         return chunks
 
+    def extract_symbols(
+        self,
+        code: str,
+        file_path: str,
+        language: str
+    ) -> List[SymbolDefinition]:
+        """
+        Extract definitions with DEFINITION_PATTERNS in one pass.
+
+        A definition spans from its first line to the last line before the
+        next non-blank line indented at or below it (lines at its own
+        indentation opening with a bracket, like a closing "}" or a
+        signature's ")", stay in the definition). Functions nested in a class are reported as methods
+        of it.
+        """
+        lines = code.split('\n')
+        indents = []
+        for line in lines:
+            stripped = line.lstrip()
+            if not stripped or stripped.startswith(('#', '//', '*', '/*')):
+                indents.append(None)  # never ends a definition
+            else:
+                indents.append(len(line) - len(stripped))
+
+        symbols = []
+        containers = []  # (indent, name, kind) of enclosing definitions
+
+        for i, line in enumerate(lines):
+            indent = indents[i]
+            if indent is None:
+                continue
+
+            for pattern, kind in self.DEFINITION_PATTERNS:
+                match = pattern.match(line)
+                if match:
+                    break
+            else:
+                continue
+
+            while containers and containers[-1][0] >= indent:
+                containers.pop()
+            container = containers[-1][1] if containers and containers[-1][2] in self.CONTAINER_KINDS else None
+            if kind == "function" and container:
+                kind = "method"
+
+            end = i
+            for j in range(i + 1, len(lines)):
+                if indents[j] is None:
+                    continue
+                if indents[j] < indent or (
+                    indents[j] == indent and not lines[j].lstrip().startswith(('{', '}', ')', ']'))
+                ):
+                    break
+                end = j
+
+            symbols.append(SymbolDefinition(match.group(1), kind, i + 1, end + 1, container))
+            containers.append((indent, match.group(1), kind))
+
+        return symbols
+
     def _find_logical_boundaries(self, lines: List[str]) -> List[tuple]:
         """
         Find logical boundaries in code (functions, classes, etc.)
@@ -0,0 +1,281 @@
+"""
+Parallel read + chunk pipeline for codebase indexing.
+
+Indexing is split into independent stages connected by bounded queues:
+
+1. Discovery: walk the repository tree (in a worker thread)
+2. Read + chunk: read, hash and chunk files in a process pool
+3. Consume: caller-supplied coroutine (embedding + storage)
+
+Chunking of later files proceeds while earlier files are being embedded,
+and the event loop is never blocked by file I/O or regex chunking.
+"""
+
+import os
+import asyncio
+import hashlib
+import logging
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .base_chunker import ChunkMetadata, SymbolDefinition
+from .registry import CodeChunker
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ChunkedFile:
+    """Result of reading and chunking a single file"""
+    file_path: str  # absolute path
+    relative_path: str
+    language: str
+    file_hash: Optional[str] = None
+    chunks: List[Tuple[str, ChunkMetadata, str]] = field(default_factory=list)  # (content, metadata, summary)
+    symbols: List[SymbolDefinition] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+# Per-process chunker cache (worker processes reuse one chunker per configuration)
+_chunkers = {}
+
+
+def _get_chunker(chunk_size: int, chunk_overlap: int) -> CodeChunker:
+    key = (chunk_size, chunk_overlap)
+    chunker = _chunkers.get(key)
+    if chunker is None:
+        chunker = CodeChunker(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+        _chunkers[key] = chunker
+    return chunker
+
+
+def chunk_file(
+    file_path: str,
+    relative_path: str,
+    language: str,
+    chunk_size: int = 500,
+    chunk_overlap: int = 50
+) -> ChunkedFile:
+    """
+    Read, hash and chunk one file and extract its symbols. Runs inside pool workers.
+
+    Errors are returned on the result instead of raised so one bad file
+    does not abort the whole pipeline.
+
+    Args:
+        file_path: Absolute file path
+        relative_path: Path relative to repository root
+        language: Programming language
+        chunk_size: Target chunk size in tokens
+        chunk_overlap: Overlap between chunks in tokens
+
+    Returns:
+        ChunkedFile with chunks, summaries and symbol definitions
+    """
+    result = ChunkedFile(file_path=file_path, relative_path=relative_path, language=language)
+
+    try:
+        with open(file_path, 'rb') as f:
+            raw = f.read()
+
+        result.file_hash = hashlib.sha256(raw).hexdigest()
+        # Match text-mode reads (universal newlines)
+        content = raw.decode('utf-8', errors='ignore').replace('\r\n', '\n').replace('\r', '\n')
+
+        chunker = _get_chunker(chunk_size, chunk_overlap)
+        chunks, result.symbols = chunker.chunk_and_extract(content, relative_path, language)
+        for chunk_content, metadata in chunks:
+            summary = chunker.generate_summary(chunk_content, metadata)
+            result.chunks.append((chunk_content, metadata, summary))
+
+    except Exception as e:
+        result.error = str(e)
+
+    return result
+
+
+def discover_files(
+    repo_path: str,
+    supported_extensions: Set[str],
+    skip_dirs: Set[str]
+) -> Iterator[Tuple[str, str]]:
+    """
+    Walk a repository and yield indexable files.
+
+    Args:
+        repo_path: Repository root
+        supported_extensions: Lowercase extensions to include (e.g. ".py")
+        skip_dirs: Directory names to prune
+
+    Yields:
+        (absolute_path, relative_path) tuples
+    """
+    for root, dirs, files in os.walk(repo_path):
+        dirs[:] = [d for d in dirs if d not in skip_dirs]
+
+        for file in files:
+            ext = os.path.splitext(file)[1].lower()
+            if ext not in supported_extensions:
+                continue
+
+            file_path = os.path.join(root, file)
+            yield file_path, os.path.relpath(file_path, repo_path)
+
+
+class ChunkingPipeline:
+    """
+    Producer/consumer pipeline that chunks files in parallel.
+
+    Usage:
+        pipeline = ChunkingPipeline(chunk_size=500, chunk_overlap=50)
+        files = await pipeline.discover(repo_path, extensions, skip_dirs)
+
+        async def on_file(chunked: ChunkedFile):
+            ...  # embed and store
+
+        await pipeline.run(((abs_path, rel_path, language) for ...), on_file)
+    """
+
+    # Below this many files a process pool costs more than it saves
+    MIN_FILES_FOR_PROCESSES = 32
+
+    def __init__(
+        self,
+        chunk_size: int = 500,
+        chunk_overlap: int = 50,
+        max_workers: Optional[int] = None,
+        queue_size: int = 64
+    ):
+        """
+        Initialize pipeline.
+
+        Args:
+            chunk_size: Target chunk size in tokens
+            chunk_overlap: Overlap between chunks in tokens
+            max_workers: Chunking worker processes (default: CPU count)
+            queue_size: Max chunked files buffered ahead of the consumer
+        """
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.queue_size = max(1, queue_size)
+
+    async def discover(
+        self,
+        repo_path: str,
+        supported_extensions: Set[str],
+        skip_dirs: Set[str]
+    ) -> List[Tuple[str, str]]:
+        """Run file discovery in a worker thread"""
+        return await asyncio.to_thread(
+            lambda: list(discover_files(repo_path, supported_extensions, skip_dirs))
+        )
+
+    async def run(
+        self,
+        files: Iterable[Tuple[str, str, str]],
+        on_file: Callable[[ChunkedFile], Awaitable[None]]
+    ) -> int:
+        """
+        Chunk files in parallel and feed results to a consumer coroutine.
+
+        Results are delivered in completion order. The consumer runs in the
+        event loop; when it falls behind, the bounded queue stops new files
+        from being submitted.
+
+        Args:
+            files: Iterable of (absolute_path, relative_path, language)
+            on_file: Coroutine called once per chunked file
+
+        Returns:
+            Number of files processed
+        """
+        files = list(files)
+        if not files:
+            return 0
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        executor = self._create_executor(len(files))
+
+        producer = asyncio.create_task(self._produce(files, queue, executor))
+        processed = 0
+
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                await on_file(item)
+                processed += 1
+
+            # Surface producer errors (if any)
+            await producer
+
+        finally:
+            if not producer.done():
+                producer.cancel()
+                try:
+                    await producer
+                except (asyncio.CancelledError, Exception):
+                    pass
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return processed
+
+    async def _produce(
+        self,
+        files: List[Tuple[str, str, str]],
+        queue: asyncio.Queue,
+        executor: Executor
+    ):
+        """Submit chunking jobs with a bounded in-flight window"""
+        loop = asyncio.get_running_loop()
+        in_flight = set()
+        max_in_flight = self.max_workers * 2
+
+        try:
+            for file_path, relative_path, language in files:
+                in_flight.add(loop.run_in_executor(
+                    executor,
+                    chunk_file,
+                    file_path,
+                    relative_path,
+                    language,
+                    self.chunk_size,
+                    self.chunk_overlap
+                ))
+
+                if len(in_flight) >= max_in_flight:
+                    done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                    for future in done:
+                        await queue.put(future.result())
+
+            while in_flight:
+                done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    await queue.put(future.result())
+
+        except asyncio.CancelledError:
+            for future in in_flight:
+                future.cancel()
+            raise
+
+        except Exception:
+            for future in in_flight:
+                future.cancel()
+            # Wake the consumer so run() can re-raise the error
+            await queue.put(None)
+            raise
+
+        await queue.put(None)
+
+    def _create_executor(self, file_count: int) -> Executor:
+        """Process pool for large runs, thread pool for small ones or if processes are unavailable"""
+        if self.max_workers > 1 and file_count >= self.MIN_FILES_FOR_PROCESSES:
+            try:
+                return ProcessPoolExecutor(max_workers=self.max_workers)
+            except (OSError, NotImplementedError) as e:
+                logger.warning(f"Process pool unavailable, chunking in threads: {e}")
+
+        return ThreadPoolExecutor(max_workers=self.max_workers)
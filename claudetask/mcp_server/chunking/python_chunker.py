@@ -0,0 +1,105 @@
+"""
+Python chunker built on the standard library ast module.
+
+Top-level statements come with exact line ranges (lineno/end_lineno), so
+chunks follow real definitions: decorators and leading comments stay with
+their function or class, and a class is split along its methods.
+"""
+
+import ast
+import logging
+from typing import List, Optional
+
+from .structured_chunker import StructuredChunker, Unit
+
+logger = logging.getLogger(__name__)
+
+
+class PythonChunker(StructuredChunker):
+    """
+    AST-based chunker for Python files.
+
+    Files that do not parse (syntax errors, Python 2 code) fall back to
+    GenericChunker.
+
+    Usage:
+        chunker = PythonChunker(chunk_size=512)
+        chunks = chunker.chunk_code(code, "app/service.py", "python")
+    """
+
+    def parse(self, code: str, lines: List[str]) -> Optional[List[Unit]]:
+        """Split a module into its top-level statements"""
+        try:
+            tree = ast.parse(code)
+        except (SyntaxError, ValueError) as e:
+            logger.debug(f"Cannot parse Python source, using generic chunking: {e}")
+            return None
+        units = self._units(tree.body, lines, container=None, floor=0)
+
+        # Comments after the last statement
+        last = units[-1].end if units else -1
+        if any(line.strip() for line in lines[last + 1:]):
+            start, end = last + 1, len(lines) - 1
+            while not lines[start].strip():
+                start += 1
+            # Not past the last line (a trailing newline leaves an empty one)
+            while not lines[end].strip():
+                end -= 1
+            units.append(Unit(start, end, "block"))
+        return units
+
+    def _units(
+        self,
+        body: List[ast.stmt],
+        lines: List[str],
+        container: Optional[str],
+        floor: int
+    ) -> List[Unit]:
+        """
+        Units for a statement list.
+
+        Args:
+            body: Statements of a module or class body
+            lines: Source lines
+            container: Enclosing class name
+            floor: First line (0-indexed) the units may extend up to
+        """
+        units = []
+        for node in body:
+            start = min([node.lineno] + [decorator.lineno for decorator in getattr(node, "decorator_list", ())]) - 1
+            end = (node.end_lineno or node.lineno) - 1
+
+            # Comments above a statement (since the previous one) belong to it
+            while start > floor and (not lines[start - 1].strip() or lines[start - 1].lstrip().startswith("#")):
+                start -= 1
+            while not lines[start].strip():
+                start += 1
+            floor = end + 1
+
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                kind = "method" if container else "function"
+                units.append(Unit(start, end, kind, node.name, container, self._members(node, lines, None)))
+            elif isinstance(node, ast.ClassDef):
+                units.append(Unit(start, end, "class", node.name, container, self._members(node, lines, node.name)))
+            elif isinstance(node, (ast.Import, ast.ImportFrom)):
+                units.append(Unit(start, end, "import"))
+            else:
+                units.append(Unit(start, end, "block"))
+        return units
+
+    def _members(self, node: ast.AST, lines: List[str], container: Optional[str]):
+        """Lazy body units of a function or class, without the docstring (kept in the header)"""
+        def members() -> List[Unit]:
+            body, floor = node.body, node.lineno
+            if body and isinstance(body[0], ast.Expr) and isinstance(body[0].value, ast.Constant) \
+                    and isinstance(body[0].value.value, str):
+                body, floor = body[1:], body[0].end_lineno
+            if not body:
+                return []
+            # Nested functions of a function body are plain statements, not symbols
+            units = self._units(body, lines, container, floor)
+            if container is None:
+                for unit in units:
+                    unit.kind, unit.name, unit.members = "block", None, None
+            return units
+        return members
@@ -0,0 +1,83 @@
+"""
+Language -> chunker registry.
+
+Languages with a structured chunker (Python via ast, JavaScript and
+TypeScript via the bracket scanner) get exact definition boundaries;
+everything else uses GenericChunker.
+"""
+
+from typing import Dict, Iterable, List, Tuple, Type
+
+from .base_chunker import BaseChunker, ChunkMetadata, SymbolDefinition
+from .generic_chunker import GenericChunker
+from .python_chunker import PythonChunker
+from .script_chunker import ScriptChunker
+
+_CHUNKERS: Dict[str, Type[BaseChunker]] = {}
+
+
+def register_chunker(languages: Iterable[str], chunker_class: Type[BaseChunker]) -> None:
+    """
+    Use a chunker class for languages (as named by language detection, e.g. "python").
+
+    Args:
+        languages: Language names
+        chunker_class: BaseChunker subclass taking (chunk_size, chunk_overlap)
+    """
+    for language in languages:
+        _CHUNKERS[language] = chunker_class
+
+
+def get_chunker(language: str, chunk_size: int = 500, chunk_overlap: int = 50) -> BaseChunker:
+    """
+    Create the chunker for a language (GenericChunker if none is registered).
+
+    Structured chunkers keep per-file state while chunking, so each caller
+    gets its own instance.
+    """
+    chunker_class = _CHUNKERS.get(language, GenericChunker)
+    return chunker_class(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+
+
+register_chunker(["python"], PythonChunker)
+register_chunker(["javascript", "typescript"], ScriptChunker)
+
+
+class CodeChunker(BaseChunker):
+    """
+    Chunker that dispatches each file to the registered chunker for its language.
+
+    Drop-in replacement for GenericChunker wherever files of mixed languages
+    are chunked.
+
+    Usage:
+        chunker = CodeChunker(chunk_size=500, chunk_overlap=50)
+        chunks = chunker.chunk_code(code, "src/app.ts", "typescript")
+    """
+
+    def chunk_code(
+        self,
+        code: str,
+        file_path: str,
+        language: str
+    ) -> List[tuple[str, ChunkMetadata]]:
+        """Chunk code with the chunker registered for its language"""
+        return get_chunker(language, self.chunk_size, self.chunk_overlap).chunk_code(code, file_path, language)
+
+    def extract_symbols(
+        self,
+        code: str,
+        file_path: str,
+        language: str
+    ) -> List[SymbolDefinition]:
+        """Extract symbols with the chunker registered for its language"""
+        return get_chunker(language, self.chunk_size, self.chunk_overlap).extract_symbols(code, file_path, language)
+
+    def chunk_and_extract(
+        self,
+        code: str,
+        file_path: str,
+        language: str
+    ) -> Tuple[List[tuple[str, ChunkMetadata]], List[SymbolDefinition]]:
+        """Chunk code and extract its symbols with the chunker registered for its language"""
+        return get_chunker(language, self.chunk_size, self.chunk_overlap).chunk_and_extract(code, file_path, language)
@@ -0,0 +1,223 @@
+"""
+JavaScript/TypeScript chunker built on a single-pass bracket scanner.
+
+One compiled regular expression walks the file once, skipping comments,
+strings and template literals, and records the bracket depth at the end
+of every line. Statements are then the line runs that start and end at
+the same depth (continuation lines such as `.then(...)` chains are kept
+together), and declarations are recognised from their first line.
+
+This gives tree-sitter-like statement boundaries for the constructs that
+matter for chunking (functions, classes, interfaces, types, enums, arrow
+function constants, imports) without a parser dependency. Regex literals
+are not tokenized; an unbalanced bracket inside one only shifts
+boundaries within that file.
+"""
+
+import re
+import logging
+from typing import List, Optional, Tuple
+
+from .structured_chunker import StructuredChunker, Unit
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"""
+    (?P<line_comment>//[^\n]*)
+  | (?P<span>/\*.*?(?:\*/|\Z)|`(?:\\.|[^`\\])*(?:`|\Z))
+  | '(?:\\.|[^'\\\n])*'
+  | "(?:\\.|[^"\\\n])*"
+  | (?P<open>[{(\[])
+  | (?P<close>[})\]])
+  | (?P<newline>\n)
+""", re.S | re.X)
+
+# A statement continues on the next line if this line ends with an operator...
+_CONTINUED_END = (",", "=", "(", "[", "{", "+", "-", "*", "/", "%", "&", "|", "^", "?", ":", "=>")
+# ...or the next line starts with one
+_CONTINUATION_RE = re.compile(r"\s*(?:\.(?!\.\.)|\?|:|&&|\|\||=>|(?:else|catch|finally)\b)")
+
+_DECORATOR_RE = re.compile(r"(?:@[\w$.]+(?:\([^)]*\))?\s*)+")
+_DECORATOR_ONLY_RE = re.compile(r"@[\w$.]+\s*(?:\(.*\))?\s*$", re.S)
+
+_PREFIX = r"(?:export\s+(?:default\s+)?)?(?:declare\s+)?(?:abstract\s+)?"
+_TYPE_ANNOTATION = r"(?::[^=]*?)?"
+_ARROW = r"(?:async\s+)?(?:function\b|(?:<[^>]*>\s*)?(?:\([^)]*\)|[\w$]+)\s*" + _TYPE_ANNOTATION + r"=>)"
+
+DECLARATION_PATTERNS = [
+    (re.compile(_PREFIX + r"(?:async\s+)?function\s*\*?\s*([\w$]+)"), "function"),
+    (re.compile(_PREFIX + r"class\s+(?!extends\b|implements\b)([\w$]+)"), "class"),
+    (re.compile(_PREFIX + r"interface\s+([\w$]+)"), "interface"),
+    (re.compile(_PREFIX + r"type\s+([\w$]+)\s*(?:<[^=]*>\s*)?="), "type"),
+    (re.compile(_PREFIX + r"(?:const\s+)?enum\s+([\w$]+)"), "enum"),
+    (re.compile(_PREFIX + r"(?:const|let|var)\s+([\w$]+)\s*" + _TYPE_ANNOTATION + r"=\s*" + _ARROW), "function"),
+]
+_IMPORT_RE = re.compile(r"import\b|export\s+(?:type\s+)?(?:\*|\{[^}]*\}\s*from)")
+
+_MEMBER_RE = re.compile(
+    r"(?:(?:public|private|protected|static|readonly|abstract|override|declare|async|get|set)\s+)*\*?\s*"
+    r"(#?[\w$]+)\s*\??\s*(?:<[^>]*>\s*)?(?:\(|" + _TYPE_ANNOTATION + r"=\s*" + _ARROW + ")"
+)
+_NOT_MEMBER_NAMES = {"if", "for", "while", "switch", "catch", "return", "function", "new", "await", "typeof"}
+
+
+class ScriptChunker(StructuredChunker):
+    """
+    Scanner-based chunker for JavaScript and TypeScript (including JSX/TSX).
+
+    Usage:
+        chunker = ScriptChunker(chunk_size=512)
+        chunks = chunker.chunk_code(code, "src/api.ts", "typescript")
+    """
+
+    def parse(self, code: str, lines: List[str]) -> Optional[List[Unit]]:
+        """Split a module into its top-level statements"""
+        self._scan(code, lines)
+        return self._units(0, len(lines) - 1, 0, None)
+
+    # ==================
+    # Scanning
+    # ==================
+
+    def _scan(self, code: str, lines: List[str]):
+        """Bracket depth at the end of each line, and which lines start inside a comment/template"""
+        count = len(lines)
+        depth_end = [0] * count
+        inside = [None] * (count + 1)  # "c" (block comment) or "t" (template literal)
+        comment_at = {}  # line -> column of a trailing // comment
+
+        depth, line, line_start = 0, 0, 0
+        for match in _TOKEN_RE.finditer(code):
+            kind = match.lastgroup
+            if kind == "newline":
+                depth_end[line] = depth
+                line += 1
+                line_start = match.end()
+            elif kind == "open":
+                depth += 1
+            elif kind == "close":
+                depth = max(depth - 1, 0)
+            elif kind == "span":
+                text = match.group()
+                newlines = text.count("\n")
+                if newlines:
+                    span_kind = "c" if text[0] == "/" else "t"
+                    for offset in range(newlines):
+                        depth_end[line + offset] = depth
+                        inside[line + offset + 1] = span_kind
+                    line += newlines
+                    line_start = match.start() + text.rfind("\n") + 1
+            elif kind == "line_comment":
+                comment_at.setdefault(line, match.start() - line_start)
+        for rest in range(line, count):
+            depth_end[rest] = depth
+
+        self._lines = lines
+        self._depth_end = depth_end
+        self._inside = inside
+        self._comment_at = comment_at
+
+    def _depth_start(self, line: int) -> int:
+        return self._depth_end[line - 1] if line > 0 else 0
+
+    def _code(self, line: int) -> str:
+        """Line without a trailing // comment"""
+        text = self._lines[line]
+        column = self._comment_at.get(line)
+        return (text[:column] if column is not None else text).strip()
+
+    def _continues(self, line: int, last: int) -> bool:
+        """Whether the statement ending at this line (at its base depth) goes on"""
+        if self._inside[line + 1]:
+            return True
+        code = self._code(line)
+        if code.endswith(";") or code.endswith("*/") or code.endswith("++") or code.endswith("--"):
+            return False
+        if code.endswith(_CONTINUED_END):
+            return True
+        following = line + 1
+        while following <= last and not self._lines[following].strip():
+            following += 1
+        return following <= last and bool(_CONTINUATION_RE.match(self._lines[following]))
+
+    def _is_comment(self, line: int) -> bool:
+        text = self._lines[line].strip()
+        if self._inside[line] == "c":
+            return "*/" not in text or text.endswith("*/")
+        return text.startswith("//") or (text.startswith("/*") and (text.endswith("*/") or self._inside[line + 1] == "c"))
+
+    def _statements(self, first: int, last: int, base: int) -> List[Tuple[int, int]]:
+        """Line ranges of the statements at depth base within first..last"""
+        ranges = []
+        line = first
+        while line <= last:
+            if not self._lines[line].strip() and not self._inside[line]:
+                line += 1
+                continue
+            start = line
+            while line < last:
+                depth = self._depth_end[line]
+                if depth < base or (depth == base and not self._continues(line, last)):
+                    break
+                line += 1
+            if not (self._depth_end[line] < base and start == line and self._lines[line].strip().startswith("}")):
+                ranges.append((start, line))  # (the closing brace of the enclosing block is not a statement)
+            line += 1
+        return ranges
+
+    # ==================
+    # Units
+    # ==================
+
+    def _units(self, first: int, last: int, base: int, container: Optional[str]) -> List[Unit]:
+        """Statements as units; comments and decorators attach to the statement after them"""
+        units = []
+        pending = pending_end = None
+        for start, end in self._statements(first, last, base):
+            if all(self._is_comment(line) for line in range(start, end + 1)) or \
+                    _DECORATOR_ONLY_RE.match("\n".join(self._lines[start:end + 1]).strip()):
+                if pending is None:
+                    pending = start
+                pending_end = end
+                continue
+            unit = self._classify(start, end, container)
+            if pending is not None:
+                unit.start, pending = pending, None
+            units.append(unit)
+        if pending is not None:
+            units.append(Unit(pending, pending_end, "block"))
+        return units
+
+    def _classify(self, start: int, end: int, container: Optional[str]) -> Unit:
+        head = "\n".join(self._lines[start:min(end, start + 10) + 1]).lstrip()
+        head = head[_DECORATOR_RE.match(head).end():] if head.startswith("@") else head
+
+        if container is not None:
+            match = _MEMBER_RE.match(head)
+            if match and match.group(1) not in _NOT_MEMBER_NAMES:
+                return Unit(start, end, "method", match.group(1), container, self._members(start, end, None))
+            return Unit(start, end, "block")
+
+        if _IMPORT_RE.match(head):
+            return Unit(start, end, "import")
+        for pattern, kind in DECLARATION_PATTERNS:
+            match = pattern.match(head)
+            if match:
+                name = match.group(1)
+                inner = name if kind in self.CONTAINER_KINDS else None
+                return Unit(start, end, kind, name, None, self._members(start, end, inner))
+        return Unit(start, end, "block")
+
+    def _members(self, start: int, end: int, container: Optional[str]):
+        """Lazy body statements of a declaration (class members, or function statements as blocks)"""
+        def members() -> List[Unit]:
+            base = self._depth_start(start) + 1
+            for line in range(start, end):
+                if self._depth_end[line] == base and self._code(line).endswith("{"):
+                    units = self._units(line + 1, end, base, container)
+                    if container is None:
+                        for unit in units:
+                            unit.kind, unit.name, unit.members = "block", None, None
+                    return units
+            return []
+        return members
@@ -0,0 +1,242 @@
+"""
+Shared packing for chunkers that understand a file's structure.
+
+A language chunker parses a file into units (top-level statements and
+definitions with exact line ranges); StructuredChunker turns them into
+non-overlapping chunks:
+
+- each definition (function, class, ...) is its own chunk
+- runs of other statements (imports, constants, glue code) are grouped
+  until chunk_size
+- a definition larger than chunk_size is split along its members (class
+  methods) or statements (function bodies), never mid-statement unless a
+  single statement is itself too large
+"""
+
+import logging
+from abc import abstractmethod
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+from .base_chunker import BaseChunker, ChunkMetadata, SymbolDefinition
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Unit:
+    """A statement or definition of a file (0-indexed, inclusive line range)"""
+    start: int
+    end: int
+    kind: str  # function, method, class, interface, type, enum, import, block
+    name: Optional[str] = None
+    container: Optional[str] = None  # enclosing class of a method
+    members: Optional[Callable[[], List["Unit"]]] = None  # body units, for splitting
+
+
+class StructuredChunker(BaseChunker):
+    """
+    Base class for AST/scanner-based chunkers.
+
+    Subclasses implement parse(); chunk_code() and extract_symbols() are
+    derived from the units it returns (chunk_and_extract() parses once for both).
+    """
+
+    DEFINITION_KINDS = {"function", "method", "class", "interface", "type", "enum"}
+    CONTAINER_KINDS = {"class", "interface"}
+
+    @abstractmethod
+    def parse(self, code: str, lines: List[str]) -> Optional[List[Unit]]:
+        """
+        Split a file into top-level units.
+
+        Args:
+            code: Source code content
+            lines: code split into lines
+
+        Returns:
+            Units in file order, or None if the file cannot be parsed
+            (chunk_code then falls back to GenericChunker)
+        """
+
+    def chunk_code(
+        self,
+        code: str,
+        file_path: str,
+        language: str
+    ) -> List[tuple[str, ChunkMetadata]]:
+        """
+        Chunk code along its parsed structure.
+
+        Returns:
+            List of (chunk_content, metadata) tuples, non-overlapping and in file order
+        """
+        lines = code.split('\n')
+        units = self.parse(code, lines)
+        if units is None:
+            return self._fallback().chunk_code(code, file_path, language)
+        return self._chunks(units, lines, file_path, language)
+
+    def extract_symbols(
+        self,
+        code: str,
+        file_path: str,
+        language: str
+    ) -> List[SymbolDefinition]:
+        """Definitions from the parsed units, with class members one level down"""
+        lines = code.split('\n')
+        units = self.parse(code, lines)
+        if units is None:
+            return self._fallback().extract_symbols(code, file_path, language)
+        return self._symbols(units)
+
+    def chunk_and_extract(
+        self,
+        code: str,
+        file_path: str,
+        language: str
+    ) -> Tuple[List[tuple[str, ChunkMetadata]], List[SymbolDefinition]]:
+        """Chunks and symbols from a single parse of the file"""
+        lines = code.split('\n')
+        units = self.parse(code, lines)
+        if units is None:
+            return self._fallback().chunk_and_extract(code, file_path, language)
+        return self._chunks(units, lines, file_path, language), self._symbols(units)
+
+    def _chunks(
+        self,
+        units: List[Unit],
+        lines: List[str],
+        file_path: str,
+        language: str
+    ) -> List[tuple[str, ChunkMetadata]]:
+        # Prefix sums of line lengths: token estimate of any line range in O(1)
+        offsets = [0]
+        for line in lines:
+            offsets.append(offsets[-1] + len(line) + 1)
+        self._offsets = offsets
+
+        specs: List[list] = []  # [start, end, chunk_type, symbols]
+        self._pack(units, specs)
+
+        chunks = []
+        for start, end, chunk_type, symbols in specs:
+            metadata = ChunkMetadata(
+                file_path=file_path,
+                language=language,
+                start_line=start + 1,
+                end_line=end + 1,
+                chunk_type=chunk_type,
+                symbols=symbols
+            )
+            chunks.append(('\n'.join(lines[start:end + 1]), metadata))
+
+        logger.debug(f"Chunked {file_path} into {len(chunks)} chunks")
+        return chunks
+
+    def _symbols(self, units: List[Unit]) -> List[SymbolDefinition]:
+        symbols = []
+        for unit in units:
+            if unit.kind not in self.DEFINITION_KINDS or not unit.name:
+                continue
+            symbols.append(SymbolDefinition(unit.name, unit.kind, unit.start + 1, unit.end + 1, unit.container))
+            if unit.kind in self.CONTAINER_KINDS and unit.members:
+                symbols.extend(
+                    SymbolDefinition(member.name, member.kind, member.start + 1, member.end + 1, unit.name)
+                    for member in unit.members()
+                    if member.kind in self.DEFINITION_KINDS and member.name
+                )
+        return symbols
+
+    def _fallback(self) -> BaseChunker:
+        from .generic_chunker import GenericChunker
+        return GenericChunker(chunk_size=self.chunk_size, chunk_overlap=self.chunk_overlap)
+
+    # ==================
+    # Packing
+    # ==================
+
+    def _size(self, start: int, end: int) -> int:
+        """Estimated tokens of lines start..end (same estimate as count_tokens)"""
+        return (self._offsets[end + 1] - self._offsets[start]) // 4
+
+    def _pack(self, units: List[Unit], specs: List[list]):
+        """Definitions as their own chunks, other statements grouped up to chunk_size"""
+        group = None
+        for unit in units:
+            if unit.kind in self.DEFINITION_KINDS:
+                if group:
+                    specs.append(group)
+                    group = None
+                self._pack_definition(unit, specs)
+                continue
+
+            kind = "import" if unit.kind == "import" else "block"
+            if group and self._size(group[0], unit.end) <= self.chunk_size:
+                group[1] = unit.end
+                if group[2] != kind:
+                    group[2] = "block"
+            else:
+                if group:
+                    specs.append(group)
+                if self._size(unit.start, unit.end) > self.chunk_size:
+                    self._split_lines(unit.start, unit.end, kind, [], specs)
+                    group = None
+                    continue
+                group = [unit.start, unit.end, kind, []]
+
+        if group:
+            specs.append(group)
+
+    def _pack_definition(self, unit: Unit, specs: List[list]):
+        symbols = [unit.name] if unit.name else []
+        if self._size(unit.start, unit.end) <= self.chunk_size:
+            specs.append([unit.start, unit.end, unit.kind, symbols])
+            return
+
+        members = unit.members() if unit.members else []
+        if not members:
+            self._split_lines(unit.start, unit.end, unit.kind, symbols, specs)
+            return
+
+        if unit.kind in self.CONTAINER_KINDS:
+            # Header (signature, docstring, fields before the first member), then the members
+            header_end = members[0].start - 1
+            if header_end >= unit.start:
+                specs.append([unit.start, header_end, unit.kind, symbols])
+            before = len(specs)
+            self._pack(members, specs)
+        else:
+            # Function body: consecutive statements, the first part carrying the signature
+            def flush(part):
+                if self._size(part[0], part[1]) > self.chunk_size:
+                    self._split_lines(part[0], part[1], part[2], part[3], specs)
+                else:
+                    specs.append(part)
+
+            before = len(specs)
+            part = [unit.start, members[0].start - 1, unit.kind, symbols]
+            for member in members:
+                if part[1] >= part[0] and self._size(part[0], member.end) > self.chunk_size:
+                    flush(part)
+                    part = [member.start, member.start - 1, f"{unit.kind}_part", []]
+                part[1] = member.end
+            flush(part)
+
+        # Closing lines after the last member ("}") stay with the last chunk
+        if len(specs) > before:
+            specs[-1][1] = max(specs[-1][1], unit.end)
+        else:
+            specs.append([unit.start, unit.end, unit.kind, symbols])
+
+    def _split_lines(self, start: int, end: int, chunk_type: str, symbols: List[str], specs: List[list]):
+        """Split an oversized range into consecutive line runs of about chunk_size tokens"""
+        part_type = chunk_type if chunk_type.endswith("_part") else f"{chunk_type}_part"
+        part_start = start
+        for line in range(start, end + 1):
+            if line > part_start and self._size(part_start, line) > self.chunk_size:
+                first = part_start == start
+                specs.append([part_start, line - 1, chunk_type if first else part_type, symbols if first else []])
+                part_start = line
+        first = part_start == start
+        specs.append([part_start, end, chunk_type if first else part_type, symbols if first else []])
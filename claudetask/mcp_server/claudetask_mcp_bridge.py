@@ -6,11 +6,13 @@ It implements the coordinator-executor pattern where Claude never directly modif
 but delegates tasks to specialized agents working in git worktrees.
 """
 
+import os
 import asyncio
 import json
 import argparse
 import httpx
 import sys
+from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 from mcp.server import Server
@@ -21,6 +23,10 @@ import mcp.types as types
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from config import get_config
 
+from backend_client import BackendClient
+from log_buffer import LogBuffer
+from log_rotation import LogRotationPolicy, RotatingLogHandler
+
 # RAG imports
 from rag import RAGService, RAGConfig
 
@@ -28,12 +34,21 @@ from rag import RAGService, RAGConfig
 class ClaudeTaskMCPServer:
     """MCP Server for ClaudeTask integration"""
 
-    def __init__(self, project_id: str, project_path: str, server_url: str = "http://localhost:3333"):
+    def __init__(
+        self,
+        project_id: str,
+        project_path: str,
+        server_url: str = "http://localhost:3333",
+        backend_uds: Optional[str] = None
+    ):
         self.project_id = project_id
         self.project_path = project_path
         self.server_url = server_url.rstrip("/")
         self.server = Server("claudetask")
 
+        # One pooled client for all backend calls (keep-alive, optional UDS)
+        self.backend = BackendClient(self.server_url, uds=backend_uds)
+
         # Initialize logger
         import logging
         self.logger = logging.getLogger(__name__)
@@ -193,20 +208,110 @@ class ClaudeTaskMCPServer:
 
         # Initialize RAG service with centralized config
         config = get_config(project_path)
+        # With CLAUDETASK_EMBEDDING_BACKEND=remote the model is not loaded here;
+        # texts are embedded by the backend's shared, micro-batched endpoint
         self.rag_service = RAGService(RAGConfig(
             chromadb_path=str(config.chromadb_dir),
             embedding_model="all-MiniLM-L6-v2",
             chunk_size=500,
-            chunk_overlap=50
+            chunk_overlap=50,
+            embedding_service_url=os.getenv("CLAUDETASK_EMBEDDING_URL") or self.server_url
         ))
-        self.rag_initialized = False  # Will be set to True after async init
+        self.rag_initialized = False  # Set to True once the model is loaded (index may still be warming)
+
+        # Background RAG warm-up (model load + index refresh) progress
+        self._rag_warmup_task: Optional[asyncio.Task] = None
+        self.rag_warmup = {
+            "phase": "pending",  # pending, loading_model, indexing, ready, failed
+            "files_done": 0,
+            "files_total": 0,
+            "error": None
+        }
 
         # MongoDB logging state (will be set after checking project settings)
         self._mongodb_logging_enabled = None  # None = not checked yet
+        # MCP call logs are shipped to the backend in background batches
+        self._log_buffer = LogBuffer(self._send_log_batch)
 
         # Setup tool handlers
         self._setup_tools()
 
+    async def _warm_up_rag(self):
+        """Load the embedding model and refresh the codebase index in the background.
+
+        Runs after the MCP handshake so Claude Code never waits for it. RAG tools
+        become usable as soon as the model is loaded and serve results from the
+        existing index while the refresh is running.
+        """
+        state = self.rag_warmup
+
+        def on_progress(files_done: int, files_total: int):
+            state["files_done"] = files_done
+            state["files_total"] = files_total
+
+        try:
+            state["phase"] = "loading_model"
+            self.logger.info("Initializing RAG service...")
+            await self.rag_service.initialize()
+            self.rag_initialized = True
+            self.logger.info("RAG service initialized successfully")
+
+            state["phase"] = "indexing"
+            # Check if index exists, if not - create initial index
+            if not await self.rag_service.index_exists():
+                self.logger.info("No RAG index found. Creating initial index...")
+                await self.rag_service.index_codebase(self.project_path, progress_callback=on_progress)
+            else:
+                self.logger.info("RAG index exists. Running incremental update...")
+                await self.rag_service.update_index_incremental(self.project_path, progress_callback=on_progress)
+
+            state["phase"] = "ready"
+            self.logger.info("RAG index warm-up complete")
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            state["phase"] = "failed"
+            state["error"] = str(e)
+            self.logger.error(f"Failed to initialize RAG service: {e}")
+            if not self.rag_initialized:
+                self.logger.warning("Server will run without RAG features")
+
+    def _rag_warmup_percent(self) -> int:
+        """Overall warm-up progress: model load counts as the first 10%"""
+        state = self.rag_warmup
+        if state["phase"] == "ready":
+            return 100
+        if state["phase"] != "indexing":
+            return 0
+        if not state["files_total"]:
+            return 10
+        return 10 + int(90 * state["files_done"] / state["files_total"])
+
+    def _rag_unavailable_message(self, feature: str) -> str:
+        """Tool response while the RAG model is not loaded"""
+        if self.rag_warmup["phase"] == "failed":
+            return f"⚠️ RAG service failed to initialize ({self.rag_warmup['error']}). {feature} unavailable."
+        return (
+            f"⏳ RAG index warming ({self._rag_warmup_percent()}%): embedding model is loading. "
+            f"{feature} will be available shortly."
+        )
+
+    def _rag_status_line(self) -> str:
+        """One-line RAG warm-up status for diagnostics"""
+        phase = self.rag_warmup["phase"]
+        if phase == "ready":
+            return "ready"
+        if phase == "failed":
+            return f"unavailable ({self.rag_warmup['error']})"
+        if phase == "indexing":
+            return (
+                f"index warming ({self._rag_warmup_percent()}%, "
+                f"{self.rag_warmup['files_done']}/{self.rag_warmup['files_total']} files) - "
+                f"searches use the existing index"
+            )
+        return f"index warming ({self._rag_warmup_percent()}%) - loading embedding model"
+
     async def _get_active_project_id(self) -> str:
         """Fetch the current active project ID from backend
 
@@ -217,7 +322,7 @@ class ClaudeTaskMCPServer:
             str: The active project ID, or the default project_id if fetch fails
         """
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
+            async with self.backend.session(timeout=5.0) as client:
                 url = f"{self.server_url}/api/projects/active"
                 self.logger.debug(f"Fetching active project from: {url}")
                 response = await client.get(url)
@@ -245,7 +350,7 @@ class ClaudeTaskMCPServer:
             return self._mongodb_logging_enabled
 
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
+            async with self.backend.session(timeout=5.0) as client:
                 response = await client.get(f"{self.server_url}/api/projects/active")
                 if response.status_code == 200:
                     project = response.json()
@@ -267,7 +372,10 @@ class ClaudeTaskMCPServer:
         result: str = None,
         error: str = None
     ):
-        """Send MCP log entry to MongoDB via backend API.
+        """Queue MCP log entry for MongoDB (delivered in batches via backend API).
+
+        Never waits on the backend: entries are buffered and flushed in the
+        background by _send_log_batch.
 
         Args:
             tool_name: Name of the MCP tool
@@ -279,26 +387,32 @@ class ClaudeTaskMCPServer:
         if not await self._check_mongodb_logging():
             return
 
-        try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                params = {
-                    "tool_name": tool_name,
-                    "status": status
-                }
-                if arguments:
-                    params["arguments"] = json.dumps(arguments, ensure_ascii=False)[:2000]
-                if result:
-                    params["result"] = result[:2000]
-                if error:
-                    params["error"] = error[:1000]
+        entry = {
+            "tool_name": tool_name,
+            "status": status,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        if arguments:
+            entry["arguments"] = json.dumps(arguments, ensure_ascii=False)[:2000]
+        if result:
+            entry["result"] = result[:2000]
+        if error:
+            entry["error"] = error[:1000]
 
-                await client.post(
-                    f"{self.server_url}/api/mcp-logs/ingest/mcp",
-                    params=params
-                )
-        except Exception as e:
-            # Don't fail MCP calls if logging fails
-            self.logger.debug(f"Failed to log to MongoDB: {e}")
+        self._log_buffer.add(entry)
+
+    async def _send_log_batch(self, entries: List[Dict[str, Any]]):
+        """Deliver buffered MCP log entries to the bulk-ingest endpoint.
+
+        Raises:
+            httpx.HTTPError: If the backend is unreachable or rejects the batch
+        """
+        async with self.backend.session(timeout=10.0) as client:
+            response = await client.post(
+                f"{self.server_url}/api/mcp-logs/ingest/mcp/bulk",
+                json={"entries": entries}
+            )
+            response.raise_for_status()
 
     def _setup_tools(self):
         """Setup MCP tools"""
@@ -605,7 +719,7 @@ class ClaudeTaskMCPServer:
                 ),
                 types.Tool(
                     name="search_codebase",
-                    description="Semantic search across codebase using RAG to find relevant code chunks. Returns multiple results for comprehensive analysis.",
+                    description="Search across codebase using RAG to find relevant code chunks. Hybrid mode (default) combines semantic and keyword/identifier matching; a bare function or class name returns its definition directly. Returns multiple results for comprehensive analysis.",
                     inputSchema={
                         "type": "object",
                         "properties": {
@@ -626,14 +740,55 @@ class ClaudeTaskMCPServer:
                             },
                             "min_similarity": {
                                 "type": "number",
-                                "description": "Optional: minimum similarity threshold (0.0-1.0). Only return results above this threshold.",
+                                "description": "Optional: minimum semantic similarity threshold (0.0-1.0). Only return results above this threshold; in hybrid mode this drops keyword-only matches. Ignored in lexical mode and for exact symbol lookups.",
                                 "minimum": 0.0,
                                 "maximum": 1.0
+                            },
+                            "mode": {
+                                "type": "string",
+                                "enum": ["hybrid", "semantic", "lexical"],
+                                "description": "Optional: hybrid (default), semantic (embeddings only) or lexical (keywords/identifiers only, fastest)",
+                                "default": "hybrid"
                             }
                         },
                         "required": ["query"]
                     }
                 ),
+                types.Tool(
+                    name="find_symbol",
+                    description="Go to definition: look up functions and classes by name in the codebase symbol table. Returns file paths and line ranges in milliseconds, without a semantic search. Supports exact names, prefixes and fuzzy abbreviations (e.g. 'gubi' for get_user_by_id).",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "name": {
+                                "type": "string",
+                                "description": "Symbol name, prefix or abbreviation ('Class.method' looks up 'method')"
+                            },
+                            "match": {
+                                "type": "string",
+                                "enum": ["fuzzy", "prefix", "exact"],
+                                "description": "Optional: fuzzy (default, ranks exact and prefix matches first), prefix or exact",
+                                "default": "fuzzy"
+                            },
+                            "kind": {
+                                "type": "string",
+                                "description": "Optional: filter by kind (function, class)"
+                            },
+                            "language": {
+                                "type": "string",
+                                "description": "Optional: filter by programming language"
+                            },
+                            "limit": {
+                                "type": "integer",
+                                "description": "Maximum number of results (default: 20)",
+                                "default": 20,
+                                "minimum": 1,
+                                "maximum": 200
+                            }
+                        },
+                        "required": ["name"]
+                    }
+                ),
                 types.Tool(
                     name="find_similar_tasks",
                     description="Find similar historical tasks using RAG to learn from past implementations",
@@ -694,6 +849,20 @@ class ClaudeTaskMCPServer:
                         "required": ["file_paths"]
                     }
                 ),
+                types.Tool(
+                    name="get_indexing_jobs",
+                    description="Show progress of background codebase/documentation indexing jobs (files done, chunks embedded, ETA). Indexing tools queue jobs and return immediately.",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "job_id": {
+                                "type": "string",
+                                "description": "Optional: job ID returned by an indexing tool (default: recent jobs of the active project)"
+                            }
+                        },
+                        "required": []
+                    }
+                ),
                 # Documentation RAG tools
                 types.Tool(
                     name="search_documentation",
@@ -918,7 +1087,7 @@ class ClaudeTaskMCPServer:
             if not await self._check_mongodb_logging():
                 self.logger.info(f"{'='*60}")
                 self.logger.info(f"🔵 MCP CALL RECEIVED: {name}")
-                self.logger.info(f"📥 Arguments: {json.dumps(arguments, indent=2, ensure_ascii=False)}")
+                self.logger.info(f"📥 Arguments: {json.dumps(arguments, ensure_ascii=False)}")
                 self.logger.info(f"{'='*60}")
 
             result = None
@@ -999,7 +1168,16 @@ class ClaudeTaskMCPServer:
                         arguments["query"],
                         arguments.get("top_k", 20),
                         arguments.get("language"),
-                        arguments.get("min_similarity")
+                        arguments.get("min_similarity"),
+                        arguments.get("mode", "hybrid")
+                    )
+                elif name == "find_symbol":
+                    result = await self._find_symbol(
+                        arguments["name"],
+                        arguments.get("match", "fuzzy"),
+                        arguments.get("kind"),
+                        arguments.get("language"),
+                        arguments.get("limit", 20)
                     )
                 elif name == "find_similar_tasks":
                     result = await self._find_similar_tasks(
@@ -1016,6 +1194,10 @@ class ClaudeTaskMCPServer:
                     result = await self._index_files(
                         arguments["file_paths"]
                     )
+                elif name == "get_indexing_jobs":
+                    result = await self._get_indexing_jobs(
+                        arguments.get("job_id")
+                    )
                 # Documentation RAG handlers
                 elif name == "search_documentation":
                     result = await self._search_documentation(
@@ -1131,7 +1313,7 @@ class ClaudeTaskMCPServer:
 
     async def _get_next_task(self) -> list[types.TextContent]:
         """Get the highest priority task from backlog"""
-        async with httpx.AsyncClient() as client:
+        async with self.backend.session() as client:
             try:
                 response = await client.get(f"{self.server_url}/api/mcp/next-task")
                 response.raise_for_status()
@@ -1170,7 +1352,7 @@ This command will start the analysis process for this task."""
     
     async def _get_task(self, task_id: int) -> list[types.TextContent]:
         """Get details of a specific task"""
-        async with httpx.AsyncClient() as client:
+        async with self.backend.session() as client:
             try:
                 response = await client.get(f"{self.server_url}/api/tasks/{task_id}")
                 response.raise_for_status()
@@ -1361,7 +1543,7 @@ Recommended Agent: {recommended_agent}
 
     async def _analyze_task(self, task_id: int) -> list[types.TextContent]:
         """Analyze a task and create implementation plan"""
-        async with httpx.AsyncClient() as client:
+        async with self.backend.session() as client:
             try:
                 # Get task details
                 response = await client.get(f"{self.server_url}/api/tasks/{task_id}")
@@ -1451,7 +1633,7 @@ Description:
         
         try:
             # Get task details  
-            async with httpx.AsyncClient() as client:
+            async with self.backend.session() as client:
                 response = await client.get(f"{self.server_url}/api/tasks/{task_id}")
                 response.raise_for_status()
                 task = response.json()
@@ -1563,7 +1745,7 @@ Description:
     
     async def _update_status(self, task_id: int, status: str, comment: Optional[str] = None) -> list[types.TextContent]:
         """Update task status"""
-        async with httpx.AsyncClient() as client:
+        async with self.backend.session() as client:
             try:
                 # Sync worktree with main before transitioning to new work phases
                 sync_message = ""
@@ -1689,7 +1871,7 @@ New Status: {status}
 
         try:
             # Get task details
-            async with httpx.AsyncClient() as client:
+            async with self.backend.session() as client:
                 task_response = await client.get(f"{self.server_url}/api/tasks/{task_id}")
                 task_response.raise_for_status()
                 task = task_response.json()
@@ -1819,7 +2001,7 @@ New Status: {status}
                 )]
             
             # Update task with branch and worktree info
-            async with httpx.AsyncClient() as client:
+            async with self.backend.session() as client:
                 await client.patch(
                     f"{self.server_url}/api/tasks/{task_id}",
                     json={
@@ -1847,7 +2029,7 @@ All changes should be made in the worktree directory."""
 
     async def _verify_connection(self) -> list[types.TextContent]:
         """Verify connection to backend"""
-        async with httpx.AsyncClient() as client:
+        async with self.backend.session() as client:
             try:
                 response = await client.get(f"{self.server_url}/api/mcp/connection")
                 response.raise_for_status()
@@ -1862,6 +2044,7 @@ Project: {status.get('project_name', 'Unknown')}
 Path: {status.get('project_path', 'Unknown')}
 Total Tasks: {status.get('tasks_count', 0)}
 Active Task: {status.get('active_task', {}).get('title', 'None') if status.get('active_task') else 'None'}
+RAG: {self._rag_status_line()}
 
 Connection to ClaudeTask backend is working properly."""
                     )]
@@ -1880,7 +2063,7 @@ Connection to ClaudeTask backend is working properly."""
 
     async def _get_task_queue(self) -> list[types.TextContent]:
         """Get task queue status"""
-        async with httpx.AsyncClient() as client:
+        async with self.backend.session() as client:
             try:
                 response = await client.get(f"{self.server_url}/api/mcp/tasks/queue")
                 response.raise_for_status()
@@ -1920,7 +2103,7 @@ Completed Today: {completed_today}
 
     async def _delegate_to_agent(self, task_id: int, agent_type: str, instructions: str) -> list[types.TextContent]:
         """Delegate work to specialized agent"""
-        async with httpx.AsyncClient() as client:
+        async with self.backend.session() as client:
             try:
                 # Get task details first
                 response = await client.get(f"{self.server_url}/api/tasks/{task_id}")
@@ -2012,7 +2195,7 @@ IMPORTANT: Delegation is NOT complete until you run the Task tool above!
 
     async def _get_tasks_needing_analysis(self) -> list[types.TextContent]:
         """Get all tasks that are waiting for analysis"""
-        async with httpx.AsyncClient() as client:
+        async with self.backend.session() as client:
             try:
                 # Get active project first
                 response = await client.get(f"{self.server_url}/api/projects/active")
@@ -2067,7 +2250,7 @@ Example: Use analyze_task with task_id {tasks[0]['id']} to start analyzing "{tas
 
     async def _update_task_analysis(self, task_id: int, analysis: str) -> list[types.TextContent]:
         """Save analysis results back to the task"""
-        async with httpx.AsyncClient() as client:
+        async with self.backend.session() as client:
             try:
                 # Update task analysis field
                 response = await client.patch(
@@ -2282,7 +2465,7 @@ Here are all the agents available for task delegation:
     
     async def _complete_task(self, task_id: int, create_pr: bool = False) -> list[types.TextContent]:
         """Complete a task by merging to main and cleaning up worktree"""
-        async with httpx.AsyncClient() as client:
+        async with self.backend.session() as client:
             try:
                 # Get task details first
                 response = await client.get(f"{self.server_url}/api/tasks/{task_id}")
@@ -2320,17 +2503,16 @@ Here are all the agents available for task delegation:
                             self.logger.info(f"Task #{task_id} merged to main. Triggering MongoDB Atlas RAG reindexing...")
                             project_id = await self._get_active_project_id()
 
-                            async with httpx.AsyncClient(timeout=300.0) as reindex_client:
+                            async with self.backend.session(timeout=30.0) as reindex_client:
                                 reindex_response = await reindex_client.post(
                                     f"{self.server_url}/api/codebase/{project_id}/reindex",
                                     json={"repo_path": self.project_path}
                                 )
 
-                                if reindex_response.status_code == 200:
-                                    reindex_result = reindex_response.json()
-                                    chunks = reindex_result.get('total_chunks', 0)
-                                    reindex_status = f"- RAG Index Updated: ✅ Yes (MongoDB Atlas, {chunks} chunks)\n"
-                                    self.logger.info(f"RAG reindexing completed: {chunks} chunks indexed")
+                                if reindex_response.status_code in (200, 202):
+                                    job_id = reindex_response.json().get("job_id")
+                                    reindex_status = f"- RAG Index Update: ⏳ Queued (MongoDB Atlas, job {job_id})\n"
+                                    self.logger.info(f"RAG reindexing queued as job {job_id}")
                                 else:
                                     reindex_status = f"- RAG Index Updated: ⚠️ Failed ({reindex_response.status_code})\n"
                                     self.logger.warning(f"RAG reindexing returned {reindex_response.status_code}")
@@ -2407,7 +2589,7 @@ Task has been {'merged to main branch' if result.get('merged') else 'prepared fo
     
     async def _start_claude_session(self, task_id: int, context: str = "") -> list[types.TextContent]:
         """Start a Claude session for a task with automatic context from analysis documents"""
-        async with httpx.AsyncClient() as client:
+        async with self.backend.session() as client:
             try:
                 # Get task details to access worktree path
                 task_response = await client.get(f"{self.server_url}/api/tasks/{task_id}")
@@ -2530,7 +2712,7 @@ Error: {result.get('error', 'Unknown error')}
     
     async def _get_session_status(self, task_id: int) -> list[types.TextContent]:
         """Get Claude session status for a task"""
-        async with httpx.AsyncClient() as client:
+        async with self.backend.session() as client:
             try:
                 # Get session status
                 response = await client.get(
@@ -2595,7 +2777,7 @@ Error: {result.get('error', 'Unknown error')}
 
     async def _append_stage_result(self, task_id: int, status: str, summary: str, details: Optional[str] = None) -> list[types.TextContent]:
         """Append a new stage result to task's cumulative results"""
-        async with httpx.AsyncClient() as client:
+        async with self.backend.session() as client:
             try:
                 # Prepare the stage result data
                 stage_result_data = {
@@ -2673,7 +2855,7 @@ Total stage results recorded: {stage_results_count}
 
     async def _set_testing_urls(self, task_id: int, urls: Dict[str, str]) -> list[types.TextContent]:
         """Set testing environment URLs for a task"""
-        async with httpx.AsyncClient() as client:
+        async with self.backend.session() as client:
             try:
                 # Send to backend API
                 response = await client.patch(
@@ -2721,7 +2903,7 @@ Status: {task['status']}
         import re
         from urllib.parse import urlparse
         
-        async with httpx.AsyncClient() as client:
+        async with self.backend.session() as client:
             try:
                 # Get task details first to check for testing URLs
                 task_response = await client.get(f"{self.server_url}/api/tasks/{task_id}")
@@ -2893,23 +3075,25 @@ Task is now ready for final status updates or closure."""
         query: str,
         top_k: int = 20,
         language: Optional[str] = None,
-        min_similarity: Optional[float] = None
+        min_similarity: Optional[float] = None,
+        mode: str = "hybrid"
     ) -> list[types.TextContent]:
-        """Search codebase using MongoDB Atlas Vector Search API"""
+        """Search codebase through the backend code search API (semantic, lexical or hybrid)"""
         try:
             project_id = await self._get_active_project_id()
 
             # Build request body
             request_body = {
                 "query": query,
-                "limit": top_k
+                "limit": top_k,
+                "mode": mode
             }
             if language:
                 request_body["language"] = language
             if min_similarity:
                 request_body["min_similarity"] = min_similarity
 
-            async with httpx.AsyncClient(timeout=60.0) as client:
+            async with self.backend.session(timeout=60.0) as client:
                 response = await client.post(
                     f"{self.server_url}/api/codebase/{project_id}/search",
                     json=request_body
@@ -2933,7 +3117,7 @@ Task is now ready for final status updates or closure."""
                     )]
 
                 # Format results
-                response_text = f"🔍 **Code Search Results for: '{query}'** (MongoDB Atlas)\n\n"
+                response_text = f"🔍 **Code Search Results for: '{query}'** ({mode})\n\n"
                 response_text += f"Found {len(results)} relevant code chunks:\n"
 
                 if min_similarity:
@@ -2949,9 +3133,19 @@ Task is now ready for final status updates or closure."""
                     lang = chunk.get('language', 'unknown')
                     summary = chunk.get('summary', 'No summary')
                     content = chunk.get('content', '')
-                    similarity = chunk.get('score', chunk.get('similarity_score', 0))
+                    similarity = chunk.get('score', chunk.get('similarity_score'))
+                    match = chunk.get('match')
 
-                    response_text += f"**{i}. {file_path}** (lines {start_line}-{end_line}) [score: {similarity:.3f}]\n"
+                    if match == "symbol":
+                        score_text = "symbol definition"
+                    elif match == "lexical" or similarity is None:
+                        score_text = "keyword match"
+                    else:
+                        score_text = f"score: {similarity:.3f}"
+                        if match == "both":
+                            score_text += ", keyword match"
+
+                    response_text += f"**{i}. {file_path}** (lines {start_line}-{end_line}) [{score_text}]\n"
                     response_text += f"   Type: {chunk_type} | Language: {lang}\n"
                     response_text += f"   Summary: {summary}\n"
                     response_text += f"   Code:\n```{lang}\n{content}\n```\n\n"
@@ -2965,6 +3159,60 @@ Task is now ready for final status updates or closure."""
                 text=f"Error searching codebase: {str(e)}"
             )]
 
+    async def _find_symbol(
+        self,
+        name: str,
+        match: str = "fuzzy",
+        kind: Optional[str] = None,
+        language: Optional[str] = None,
+        limit: int = 20
+    ) -> list[types.TextContent]:
+        """Look up symbol definitions through the backend symbol table API"""
+        try:
+            project_id = await self._get_active_project_id()
+
+            params = {"q": name, "match": match, "limit": limit}
+            if kind:
+                params["kind"] = kind
+            if language:
+                params["language"] = language
+
+            async with self.backend.session(timeout=30.0) as client:
+                response = await client.get(
+                    f"{self.server_url}/api/codebase/{project_id}/symbols",
+                    params=params
+                )
+
+                if response.status_code != 200:
+                    error_detail = response.json().get("detail", response.text)
+                    return [types.TextContent(
+                        type="text",
+                        text=f"❌ Symbol lookup failed: {error_detail}"
+                    )]
+
+                symbols = response.json().get("symbols", [])
+                if not symbols:
+                    return [types.TextContent(
+                        type="text",
+                        text=f"No symbol matching '{name}' ({match}). The codebase may need to be (re)indexed."
+                    )]
+
+                response_text = f"📍 **Definitions for '{name}'** ({match}, {len(symbols)} found)\n\n"
+                for symbol in symbols:
+                    response_text += (
+                        f"- `{symbol['name']}` ({symbol.get('kind') or 'symbol'}, {symbol.get('language') or 'unknown'}) "
+                        f"{symbol['file_path']}:{symbol['start_line']}-{symbol['end_line']}\n"
+                    )
+
+                return [types.TextContent(type="text", text=response_text)]
+
+        except Exception as e:
+            self.logger.error(f"Error looking up symbol: {e}")
+            return [types.TextContent(
+                type="text",
+                text=f"Error looking up symbol: {str(e)}"
+            )]
+
     async def _find_similar_tasks(
         self,
         task_description: str,
@@ -2974,7 +3222,7 @@ Task is now ready for final status updates or closure."""
         if not self.rag_initialized:
             return [types.TextContent(
                 type="text",
-                text="⚠️  RAG service not initialized. Cannot search tasks."
+                text=self._rag_unavailable_message("Similar task search")
             )]
 
         try:
@@ -3006,41 +3254,51 @@ Task is now ready for final status updates or closure."""
                 text=f"Error finding similar tasks: {str(e)}"
             )]
 
+    def _format_indexing_job(self, response, label: str) -> list[types.TextContent]:
+        """Format the response of an endpoint that queued an indexing job"""
+        if response.status_code not in (200, 202):
+            error_detail = response.json().get("detail", response.text)
+            return [types.TextContent(
+                type="text",
+                text=f"❌ {label} failed: {error_detail}"
+            )]
+
+        result = response.json()
+        job_id = result.get("job_id")
+        queued = "merged into an already queued job" if result.get("merged") else "queued"
+        return [types.TextContent(
+            type="text",
+            text=f"⏳ {label} {queued} (MongoDB Atlas)\n\n"
+                 f"Job ID: {job_id}\n"
+                 f"Indexing runs in the background. Check progress with get_indexing_jobs "
+                 f"or {self.server_url}/api/indexing/jobs/{job_id}"
+        )]
+
     async def _reindex_codebase(
         self,
         full_reindex: bool = False
     ) -> list[types.TextContent]:
-        """Reindex codebase via MongoDB Atlas API (incremental or full)"""
+        """Queue codebase reindexing via MongoDB Atlas API (incremental or full)"""
         try:
             project_id = await self._get_active_project_id()
 
-            async with httpx.AsyncClient(timeout=300.0) as client:
+            async with self.backend.session(timeout=30.0) as client:
                 if full_reindex:
-                    self.logger.info("Starting full codebase reindex via MongoDB Atlas...")
+                    self.logger.info("Queueing full codebase reindex via MongoDB Atlas...")
                     response = await client.post(
                         f"{self.server_url}/api/codebase/{project_id}/index",
                         json={"repo_path": self.project_path, "full_reindex": True}
                     )
                 else:
-                    self.logger.info("Starting incremental codebase reindex via MongoDB Atlas...")
+                    self.logger.info("Queueing incremental codebase reindex via MongoDB Atlas...")
                     response = await client.post(
                         f"{self.server_url}/api/codebase/{project_id}/reindex",
                         json={"repo_path": self.project_path}
                     )
 
-                if response.status_code == 200:
-                    result = response.json()
-                    stats = f"Files: {result.get('indexed_files', 'N/A')}, Chunks: {result.get('total_chunks', 'N/A')}"
-                    return [types.TextContent(
-                        type="text",
-                        text=f"✅ {'Full' if full_reindex else 'Incremental'} codebase reindexing completed (MongoDB Atlas)\n\n{stats}"
-                    )]
-                else:
-                    error_detail = response.json().get("detail", response.text)
-                    return [types.TextContent(
-                        type="text",
-                        text=f"❌ Reindex failed: {error_detail}"
-                    )]
+                return self._format_indexing_job(
+                    response, f"{'Full' if full_reindex else 'Incremental'} codebase reindex"
+                )
 
         except Exception as e:
             self.logger.error(f"Error reindexing codebase: {e}")
@@ -3050,32 +3308,17 @@ Task is now ready for final status updates or closure."""
             )]
 
     async def _index_codebase(self) -> list[types.TextContent]:
-        """Index entire codebase from scratch via MongoDB Atlas API"""
+        """Queue indexing of the entire codebase from scratch via MongoDB Atlas API"""
         try:
             project_id = await self._get_active_project_id()
 
-            self.logger.info("Starting full codebase indexing via MongoDB Atlas...")
-            async with httpx.AsyncClient(timeout=600.0) as client:
+            self.logger.info("Queueing full codebase indexing via MongoDB Atlas...")
+            async with self.backend.session(timeout=30.0) as client:
                 response = await client.post(
                     f"{self.server_url}/api/codebase/{project_id}/index",
                     json={"repo_path": self.project_path, "full_reindex": True}
                 )
-
-                if response.status_code == 200:
-                    result = response.json()
-                    return [types.TextContent(
-                        type="text",
-                        text=f"✅ Codebase indexing completed (MongoDB Atlas)\n\n"
-                             f"Files indexed: {result.get('indexed_files', 'N/A')}\n"
-                             f"Total chunks: {result.get('total_chunks', 'N/A')}\n"
-                             f"Skipped: {result.get('skipped_files', 0)}"
-                    )]
-                else:
-                    error_detail = response.json().get("detail", response.text)
-                    return [types.TextContent(
-                        type="text",
-                        text=f"❌ Indexing failed: {error_detail}"
-                    )]
+                return self._format_indexing_job(response, "Codebase indexing")
 
         except Exception as e:
             self.logger.error(f"Error indexing codebase: {e}")
@@ -3085,32 +3328,17 @@ Task is now ready for final status updates or closure."""
             )]
 
     async def _index_files(self, file_paths: list[str]) -> list[types.TextContent]:
-        """Index specific files via MongoDB Atlas API"""
+        """Queue indexing of specific files via MongoDB Atlas API"""
         try:
             project_id = await self._get_active_project_id()
 
-            self.logger.info(f"Starting indexing of {len(file_paths)} files via MongoDB Atlas...")
-            async with httpx.AsyncClient(timeout=300.0) as client:
+            self.logger.info(f"Queueing indexing of {len(file_paths)} files via MongoDB Atlas...")
+            async with self.backend.session(timeout=30.0) as client:
                 response = await client.post(
                     f"{self.server_url}/api/codebase/{project_id}/index-files",
                     json={"file_paths": file_paths, "repo_path": self.project_path}
                 )
-
-                if response.status_code == 200:
-                    result = response.json()
-                    return [types.TextContent(
-                        type="text",
-                        text=f"✅ File indexing completed (MongoDB Atlas)\n\n"
-                             f"Files indexed: {result.get('indexed_files', 'N/A')}\n"
-                             f"Files skipped: {result.get('skipped_files', 0)}\n"
-                             f"Total chunks: {result.get('total_chunks', 'N/A')}"
-                    )]
-                else:
-                    error_detail = response.json().get("detail", response.text)
-                    return [types.TextContent(
-                        type="text",
-                        text=f"❌ File indexing failed: {error_detail}"
-                    )]
+                return self._format_indexing_job(response, f"Indexing of {len(file_paths)} files")
 
         except Exception as e:
             self.logger.error(f"Error indexing files: {e}")
@@ -3119,6 +3347,55 @@ Task is now ready for final status updates or closure."""
                 text=f"❌ Error indexing files: {str(e)}"
             )]
 
+    async def _get_indexing_jobs(self, job_id: Optional[str] = None) -> list[types.TextContent]:
+        """Show progress of background indexing jobs"""
+        try:
+            async with self.backend.session(timeout=10.0) as client:
+                if job_id:
+                    response = await client.get(f"{self.server_url}/api/indexing/jobs/{job_id}")
+                    if response.status_code != 200:
+                        return [types.TextContent(
+                            type="text",
+                            text=f"❌ {response.json().get('detail', response.text)}"
+                        )]
+                    jobs = [response.json()]
+                else:
+                    project_id = await self._get_active_project_id()
+                    response = await client.get(
+                        f"{self.server_url}/api/indexing/jobs",
+                        params={"project_id": project_id, "limit": 10}
+                    )
+                    response.raise_for_status()
+                    jobs = response.json().get("jobs", [])
+
+            if not jobs:
+                return [types.TextContent(type="text", text="No indexing jobs found")]
+
+            response_text = "📊 **Indexing Jobs**\n\n"
+            for job in jobs:
+                response_text += f"**{job['job_id']}** {job['kind']} {job['operation']}: {job['status']}\n"
+                response_text += (
+                    f"   Files: {job['files_done']}/{job['files_total']} ({job['percent']}%), "
+                    f"chunks embedded: {job['chunks_embedded']}"
+                )
+                if job.get("eta_seconds") is not None:
+                    response_text += f", ETA: {job['eta_seconds']:.0f}s"
+                if job.get("coalesced"):
+                    response_text += f", merged triggers: {job['coalesced']}"
+                response_text += "\n"
+                if job.get("error"):
+                    response_text += f"   Error: {job['error']}\n"
+                response_text += "\n"
+
+            return [types.TextContent(type="text", text=response_text)]
+
+        except Exception as e:
+            self.logger.error(f"Error getting indexing jobs: {e}")
+            return [types.TextContent(
+                type="text",
+                text=f"Error getting indexing jobs: {str(e)}"
+            )]
+
     # Documentation RAG methods
 
     async def _search_documentation(
@@ -3142,7 +3419,7 @@ Task is now ready for final status updates or closure."""
             if min_similarity:
                 request_body["min_similarity"] = min_similarity
 
-            async with httpx.AsyncClient(timeout=60.0) as client:
+            async with self.backend.session(timeout=60.0) as client:
                 response = await client.post(
                     f"{self.server_url}/api/documentation-rag/{project_id}/search",
                     json=request_body
@@ -3202,32 +3479,17 @@ Task is now ready for final status updates or closure."""
             )]
 
     async def _index_documentation(self, full_reindex: bool = False) -> list[types.TextContent]:
-        """Index documentation files via MongoDB Atlas API"""
+        """Queue documentation indexing via MongoDB Atlas API"""
         try:
             project_id = await self._get_active_project_id()
 
-            self.logger.info(f"Starting {'full' if full_reindex else 'incremental'} documentation indexing via MongoDB Atlas...")
-            async with httpx.AsyncClient(timeout=600.0) as client:
+            self.logger.info(f"Queueing {'full' if full_reindex else 'incremental'} documentation indexing via MongoDB Atlas...")
+            async with self.backend.session(timeout=30.0) as client:
                 response = await client.post(
                     f"{self.server_url}/api/documentation-rag/{project_id}/index",
                     json={"repo_path": self.project_path, "full_reindex": full_reindex}
                 )
-
-                if response.status_code == 200:
-                    result = response.json()
-                    return [types.TextContent(
-                        type="text",
-                        text=f"✅ Documentation indexing completed (MongoDB Atlas)\n\n"
-                             f"Files indexed: {result.get('indexed_files', 'N/A')}\n"
-                             f"Total chunks: {result.get('total_chunks', 'N/A')}\n"
-                             f"Skipped: {result.get('skipped_files', 0)}"
-                    )]
-                else:
-                    error_detail = response.json().get("detail", response.text)
-                    return [types.TextContent(
-                        type="text",
-                        text=f"❌ Documentation indexing failed: {error_detail}"
-                    )]
+                return self._format_indexing_job(response, "Documentation indexing")
 
         except Exception as e:
             self.logger.error(f"Error indexing documentation: {e}")
@@ -3237,33 +3499,17 @@ Task is now ready for final status updates or closure."""
             )]
 
     async def _reindex_documentation(self) -> list[types.TextContent]:
-        """Incrementally reindex documentation via MongoDB Atlas API"""
+        """Queue incremental documentation reindex via MongoDB Atlas API"""
         try:
             project_id = await self._get_active_project_id()
 
-            self.logger.info("Starting incremental documentation reindex via MongoDB Atlas...")
-            async with httpx.AsyncClient(timeout=300.0) as client:
+            self.logger.info("Queueing incremental documentation reindex via MongoDB Atlas...")
+            async with self.backend.session(timeout=30.0) as client:
                 response = await client.post(
                     f"{self.server_url}/api/documentation-rag/{project_id}/reindex",
                     json={"repo_path": self.project_path}
                 )
-
-                if response.status_code == 200:
-                    result = response.json()
-                    return [types.TextContent(
-                        type="text",
-                        text=f"✅ Documentation reindex completed (MongoDB Atlas)\n\n"
-                             f"New files: {result.get('new_files', 0)}\n"
-                             f"Updated files: {result.get('updated_files', 0)}\n"
-                             f"Deleted files: {result.get('deleted_files', 0)}\n"
-                             f"Total chunks: {result.get('total_chunks', 'N/A')}"
-                    )]
-                else:
-                    error_detail = response.json().get("detail", response.text)
-                    return [types.TextContent(
-                        type="text",
-                        text=f"❌ Documentation reindex failed: {error_detail}"
-                    )]
+                return self._format_indexing_job(response, "Documentation reindex")
 
         except Exception as e:
             self.logger.error(f"Error reindexing documentation: {e}")
@@ -3274,7 +3520,7 @@ Task is now ready for final status updates or closure."""
 
     async def _complete_skill_creation_session(self, session_id: str) -> list[types.TextContent]:
         """Complete skill creation session by sending /exit and stopping Claude process"""
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with self.backend.session(timeout=30.0) as client:
             try:
                 self.logger.info(f"Completing skill creation session: {session_id}")
 
@@ -3320,7 +3566,7 @@ Task is now ready for final status updates or closure."""
         and gracefully terminates it. Called at the end of slash commands
         executed via hooks (like /summarize-project).
         """
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with self.backend.session(timeout=30.0) as client:
             try:
                 self.logger.info("Completing hook session - finding active hook sessions")
 
@@ -3386,7 +3632,7 @@ Task is now ready for final status updates or closure."""
         # Get current active project (not cached - always fresh)
         project_id = await self._get_active_project_id()
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with self.backend.session(timeout=30.0) as client:
             try:
                 self.logger.info(f"Updating skill status: {skill_name} -> {status}")
                 self.logger.info(f"Using active project_id: {project_id}")
@@ -3459,7 +3705,7 @@ Task is now ready for final status updates or closure."""
         # Get current active project (not cached - always fresh)
         project_id = await self._get_active_project_id()
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with self.backend.session(timeout=30.0) as client:
             try:
                 self.logger.info(f"Updating subagent status: {subagent_type} -> {status}")
                 self.logger.info(f"Using active project_id: {project_id}")
@@ -3522,7 +3768,7 @@ Task is now ready for final status updates or closure."""
 
     async def _get_project_settings(self) -> list[types.TextContent]:
         """Get project settings including project_mode, worktree_enabled, and manual modes"""
-        async with httpx.AsyncClient() as client:
+        async with self.backend.session() as client:
             try:
                 # Get project data (contains project_mode)
                 project_response = await client.get(f"{self.server_url}/api/projects/{self.project_id}")
@@ -3626,7 +3872,7 @@ Apply SIMPLE mode instructions as fallback.
         Uses self.project_id from .mcp.json to ensure memory is stored
         in the correct project (the one Claude Code is opened in).
         """
-        async with httpx.AsyncClient() as client:
+        async with self.backend.session() as client:
             try:
                 # Use project_id from .mcp.json, not active project from backend
                 # This ensures memory is tied to the directory Claude Code is opened in
@@ -3663,7 +3909,7 @@ Apply SIMPLE mode instructions as fallback.
         Uses self.project_id from .mcp.json to ensure memory is retrieved
         from the correct project (the one Claude Code is opened in).
         """
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with self.backend.session(timeout=30.0) as client:
             try:
                 # Use project_id from .mcp.json, not active project from backend
                 # This ensures memory is tied to the directory Claude Code is opened in
@@ -3742,7 +3988,7 @@ Apply SIMPLE mode instructions as fallback.
         Uses self.project_id from .mcp.json to ensure summary is updated
         for the correct project (the one Claude Code is opened in).
         """
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with self.backend.session(timeout=30.0) as client:
             try:
                 # Use project_id from .mcp.json, not active project from backend
                 # This ensures memory is tied to the directory Claude Code is opened in
@@ -3793,7 +4039,7 @@ Apply SIMPLE mode instructions as fallback.
             if not self.rag_initialized:
                 return [types.TextContent(
                     type="text",
-                    text="⚠️ RAG service not initialized. Memory search unavailable."
+                    text=self._rag_unavailable_message("Memory search")
                 )]
 
             # Use project_id from .mcp.json, not active project from backend
@@ -3855,13 +4101,10 @@ Apply SIMPLE mode instructions as fallback.
     async def _get_current_session_id(self, project_id: str) -> Optional[str]:
         """Get the most recent session ID for a project"""
         try:
-            import aiohttp
-            async with aiohttp.ClientSession() as session:
-                url = f"{self.backend_url}/api/projects/{project_id}/memory/sessions/current"
-                async with session.get(url, timeout=5) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data.get('session_id')
+            async with self.backend.session(timeout=5.0) as client:
+                response = await client.get(f"{self.server_url}/api/projects/{project_id}/memory/sessions/current")
+                if response.status_code == 200:
+                    return response.json().get('session_id')
         except Exception as e:
             self.logger.warning(f"Failed to get current session: {e}")
         return None
@@ -3869,13 +4112,10 @@ Apply SIMPLE mode instructions as fallback.
     async def _get_last_session_id(self, project_id: str) -> Optional[str]:
         """Get the previous (second most recent) session ID for a project"""
         try:
-            import aiohttp
-            async with aiohttp.ClientSession() as session:
-                url = f"{self.backend_url}/api/projects/{project_id}/memory/sessions/last"
-                async with session.get(url, timeout=5) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data.get('session_id')
+            async with self.backend.session(timeout=5.0) as client:
+                response = await client.get(f"{self.server_url}/api/projects/{project_id}/memory/sessions/last")
+                if response.status_code == 200:
+                    return response.json().get('session_id')
         except Exception as e:
             self.logger.warning(f"Failed to get last session: {e}")
         return None
@@ -3885,49 +4125,46 @@ Apply SIMPLE mode instructions as fallback.
         from mcp.server.stdio import stdio_server
         from mcp.server.models import ServerCapabilities
 
-        # Initialize RAG service in background
-        try:
-            self.logger.info("Initializing RAG service...")
-            await self.rag_service.initialize()
-            self.rag_initialized = True
-            self.logger.info("RAG service initialized successfully")
+        # Initialize RAG service in background so the MCP handshake is answered immediately
+        self._rag_warmup_task = asyncio.create_task(self._warm_up_rag())
 
-            # Check if index exists, if not - create initial index
-            if not await self.rag_service.index_exists():
-                self.logger.info("No RAG index found. Creating initial index...")
-                await self.rag_service.index_codebase(self.project_path)
-            else:
-                self.logger.info("RAG index exists. Running incremental update...")
-                await self.rag_service.update_index_incremental(self.project_path)
-
-        except Exception as e:
-            self.logger.error(f"Failed to initialize RAG service: {e}")
-            self.logger.warning("Server will run without RAG features")
-
-        async with stdio_server() as (read_stream, write_stream):
-            await self.server.run(
-                read_stream,
-                write_stream,
-                InitializationOptions(
-                    server_name="claudetask",
-                    server_version="1.0.0",
-                    capabilities=ServerCapabilities(
-                        tools={}
+        try:
+            async with stdio_server() as (read_stream, write_stream):
+                await self.server.run(
+                    read_stream,
+                    write_stream,
+                    InitializationOptions(
+                        server_name="claudetask",
+                        server_version="1.0.0",
+                        capabilities=ServerCapabilities(
+                            tools={}
+                        )
                     )
                 )
-            )
+        finally:
+            if not self._rag_warmup_task.done():
+                self._rag_warmup_task.cancel()
+                try:
+                    await self._rag_warmup_task
+                except asyncio.CancelledError:
+                    pass
+            await self._log_buffer.close()
+            await self.backend.aclose()
 
 
 async def main():
     """Main entry point"""
     # Configure logging for MCP calls
     import logging
+    import logging.handlers
+    import queue
     from pathlib import Path
 
     parser = argparse.ArgumentParser(description="ClaudeTask MCP Bridge Server")
     parser.add_argument("--project-id", required=True, help="Project ID")
     parser.add_argument("--project-path", required=True, help="Project path")
     parser.add_argument("--server", default="http://localhost:3333", help="Backend server URL")
+    parser.add_argument("--backend-uds", help="Unix socket of the backend (default: $CLAUDETASK_BACKEND_UDS)")
 
     args = parser.parse_args()
 
@@ -3936,22 +4173,32 @@ async def main():
     log_dir = project_path / ".claudetask" / "logs" / "mcp"
     log_dir.mkdir(parents=True, exist_ok=True)
 
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.StreamHandler(),  # Console output
-            logging.FileHandler(log_dir / 'mcp_calls.log')  # File output in project's .claudetask folder
-        ]
-    )
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    handlers = [
+        logging.StreamHandler(),  # Console output
+        # File output in project's .claudetask folder, rotated per the project's policy
+        RotatingLogHandler(log_dir / 'mcp_calls.log', LogRotationPolicy.load(project_path))
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    # Tool calls only enqueue records; console and file writes happen on a listener thread
+    log_queue = queue.SimpleQueue()
+    logging.basicConfig(level=logging.INFO, handlers=[logging.handlers.QueueHandler(log_queue)])
+    log_listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    log_listener.start()
 
     server = ClaudeTaskMCPServer(
         project_id=args.project_id,
         project_path=args.project_path,
-        server_url=args.server
+        server_url=args.server,
+        backend_uds=args.backend_uds
     )
-    
-    await server.run()
+
+    try:
+        await server.run()
+    finally:
+        log_listener.stop()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,26 @@
+"""Embedding infrastructure shared by the MCP bridge and the backend indexers"""
+
+from .cache import EmbeddingCache, get_embedding_cache
+from .embedding_store import EmbeddingStore
+from .local_backends import OnnxEmbedder, TorchEmbedder, create_local_embedder
+from .micro_batcher import MicroBatcher
+from .remote_embedder import RemoteEmbedder
+from .vector_index import VectorIndex
+from .scheduler import (
+    AdaptiveRateLimiter,
+    EmbeddingScheduler,
+    RateLimitError,
+    estimate_tokens,
+    is_rate_limit_error,
+    pack_batches,
+)
+
+__all__ = [
+    "EmbeddingCache", "get_embedding_cache",
+    "EmbeddingStore",
+    "OnnxEmbedder", "TorchEmbedder", "RemoteEmbedder", "create_local_embedder",
+    "MicroBatcher",
+    "VectorIndex",
+    "AdaptiveRateLimiter", "EmbeddingScheduler", "RateLimitError",
+    "estimate_tokens", "is_rate_limit_error", "pack_batches"
+]
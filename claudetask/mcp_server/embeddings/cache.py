@@ -0,0 +1,268 @@
+"""
+Persistent content-addressed embedding cache.
+
+Embeddings are keyed by (model name, sha256 of the embedded text), so any
+byte-identical chunk - unchanged function in an edited file, moved or renamed
+file, repeated boilerplate - is embedded only once per model. The cache is a
+single SQLite file shared by every process that indexes (backend, MCP bridges)
+and is bounded with least-recently-used eviction.
+"""
+
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from array import array
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    """
+    SQLite-backed LRU cache of embedding vectors.
+
+    Vectors are stored as packed float32 blobs. Access is thread-safe
+    (encode calls run in worker threads) and multi-process safe (WAL mode).
+
+    Usage:
+        cache = EmbeddingCache("/path/to/embedding_cache.db")
+        vectors, missing = cache.lookup("all-MiniLM-L6-v2", texts)
+        ...  # embed texts[i] for i in missing
+        cache.store("all-MiniLM-L6-v2", [texts[i] for i in missing], new_vectors)
+    """
+
+    # Evict down to this fraction of max_entries so eviction is not run on every insert
+    EVICTION_TARGET = 0.9
+
+    # Other processes add entries too: recount the table at most this often (seconds)
+    RECOUNT_INTERVAL = 60.0
+
+    def __init__(self, db_path: str, max_entries: int = 200_000):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            db_path: SQLite file path
+            max_entries: Maximum cached vectors across all models
+        """
+        self.db_path = str(db_path)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                dimensions INTEGER NOT NULL,
+                vector BLOB NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (model, text_hash)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings(last_used)")
+        self._conn.commit()
+        self._count_entries()
+
+    @staticmethod
+    def text_key(text: str) -> str:
+        """Content address for a text"""
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def lookup(
+        self,
+        model: str,
+        texts: Sequence[str]
+    ) -> Tuple[List[Optional[List[float]]], List[int]]:
+        """
+        Look up cached vectors for texts.
+
+        Args:
+            model: Model identifier (include input type if it changes vectors)
+            texts: Texts to look up
+
+        Returns:
+            (vectors, missing) - vectors[i] is None for misses;
+            missing lists the indices that need embedding
+        """
+        keys = [self.text_key(text) for text in texts]
+        found: Dict[str, List[float]] = {}
+
+        with self._lock:
+            # SQLite caps bound parameters per statement
+            unique_keys = list(dict.fromkeys(keys))
+            for i in range(0, len(unique_keys), 500):
+                batch = unique_keys[i:i + 500]
+                placeholders = ','.join('?' * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings WHERE model = ? AND text_hash IN ({placeholders})",
+                    [model, *batch]
+                ).fetchall()
+                for text_hash, blob in rows:
+                    vector = array('f')
+                    vector.frombytes(blob)
+                    found[text_hash] = vector.tolist()
+
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE model = ? AND text_hash = ?",
+                    [(now, model, text_hash) for text_hash in found]
+                )
+                self._conn.commit()
+
+            vectors = [found.get(key) for key in keys]
+            missing = [i for i, vector in enumerate(vectors) if vector is None]
+
+            self.hits += len(keys) - len(missing)
+            self.misses += len(missing)
+
+        return vectors, missing
+
+    def store(self, model: str, texts: Sequence[str], vectors: Sequence[Sequence[float]]):
+        """
+        Store vectors for texts, evicting least recently used entries if full.
+
+        Args:
+            model: Model identifier used in lookup()
+            texts: Embedded texts
+            vectors: Corresponding embedding vectors
+        """
+        if not texts:
+            return
+
+        now = time.time()
+        rows = [
+            (model, self.text_key(text), len(vector), array('f', vector).tobytes(), now)
+            for text, vector in zip(texts, vectors)
+        ]
+
+        with self._lock:
+            # Vectors are content-addressed: an entry another process stored meanwhile is kept
+            cursor = self._conn.executemany(
+                "INSERT OR IGNORE INTO embeddings (model, text_hash, dimensions, vector, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            self._entries += max(cursor.rowcount, 0)
+            self._evict_if_needed()
+            self._conn.commit()
+
+    def get_or_compute(
+        self,
+        model: str,
+        texts: Sequence[str],
+        compute: Callable[[List[str]], Sequence[Sequence[float]]]
+    ) -> List[List[float]]:
+        """
+        Return vectors for texts, computing and caching only the misses.
+
+        Args:
+            model: Model identifier
+            texts: Texts to embed
+            compute: Sync function embedding a list of texts
+
+        Returns:
+            One vector per text, in input order
+        """
+        vectors, missing = self.lookup(model, texts)
+
+        if missing:
+            missing_texts = [texts[i] for i in missing]
+            computed = [list(vector) for vector in compute(missing_texts)]
+            self.store(model, missing_texts, computed)
+            for i, vector in zip(missing, computed):
+                vectors[i] = vector
+
+        return vectors
+
+    def _count_entries(self) -> int:
+        """Count cached vectors exactly (caller holds lock, or during __init__)"""
+        self._entries = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        self._counted_at = time.monotonic()
+        return self._entries
+
+    def _entry_count(self) -> int:
+        """Running count of cached vectors, recounted when it may have drifted (caller holds lock)"""
+        if time.monotonic() - self._counted_at > self.RECOUNT_INTERVAL:
+            return self._count_entries()
+        return self._entries
+
+    def _evict_if_needed(self):
+        """Drop least recently used entries above max_entries (caller holds lock)"""
+        if self._entry_count() <= self.max_entries or self._count_entries() <= self.max_entries:
+            return
+
+        to_remove = self._entries - int(self.max_entries * self.EVICTION_TARGET)
+        cursor = self._conn.execute(
+            "DELETE FROM embeddings WHERE rowid IN "
+            "(SELECT rowid FROM embeddings ORDER BY last_used ASC LIMIT ?)",
+            (to_remove,)
+        )
+        self._entries -= cursor.rowcount
+        self.evictions += cursor.rowcount
+        logger.info(f"Embedding cache evicted {cursor.rowcount} least recently used entries")
+
+    def stats(self) -> Dict[str, object]:
+        """Hit-rate and size statistics"""
+        with self._lock:
+            entries = self._entry_count()
+            hits, misses, evictions = self.hits, self.misses, self.evictions
+
+        total = hits + misses
+        return {
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total, 4) if total else 0.0,
+            "evictions": evictions,
+            "path": self.db_path
+        }
+
+    def clear(self):
+        """Remove all cached vectors and reset counters"""
+        with self._lock:
+            self._conn.execute("DELETE FROM embeddings")
+            self._conn.commit()
+            self._count_entries()
+            self.hits = self.misses = self.evictions = 0
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+
+# Process-wide instances, one per database file
+_caches: Dict[str, EmbeddingCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_embedding_cache(db_path: str, max_entries: int = 200_000) -> EmbeddingCache:
+    """
+    Get the shared EmbeddingCache for a database file.
+
+    Args:
+        db_path: SQLite file path
+        max_entries: Maximum cached vectors (used on first call only)
+
+    Returns:
+        EmbeddingCache instance
+    """
+    key = str(Path(db_path).resolve())
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = EmbeddingCache(key, max_entries=max_entries)
+            _caches[key] = cache
+        return cache
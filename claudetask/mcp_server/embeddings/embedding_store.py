@@ -0,0 +1,490 @@
+"""
+Memory-mapped float32 embedding store.
+
+Vectors are kept in an append-only file of L2-normalized float32 rows that is
+memory-mapped for search, instead of as Python float lists (~24 bytes per
+float plus conversion on every write and query). A store is a directory:
+
+    meta.json       {"dimensions": 384}
+    vectors.f32     row-major float32 rows, append-only
+    ids.jsonl       one JSON-encoded ID per row (row i <-> line i)
+    tombstones.i64  int64 numbers of deleted rows, append-only
+    lock            held (flock) by the process writing or reloading the store
+
+Replacing an ID appends a new row; the last row of an ID wins, so earlier
+rows are dead without a tombstone. Deletes append tombstones. Dead rows are
+dropped by compact(), which runs automatically once most rows are dead.
+
+Several processes may open the same store (MCP bridges of one project):
+every write runs under the lock file and first reloads the ID map if
+another process changed the files, and reads reload when the files differ
+from what was last loaded.
+
+Requirements: numpy
+"""
+
+import os
+import json
+import logging
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: the store is only safe within one process
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingStore:
+    """
+    Append-only embedding file with an ID <-> row map, tombstones and
+    batched exact top-k search.
+
+    Usage:
+        store = EmbeddingStore("vectors/task_history", dimensions=384)
+        store.add(["task_1", "task_2"], vectors)
+        results = store.search(query_vectors, k=5)  # one [(id, score), ...] list per query
+        store.remove(["task_1"])
+
+        with store.locked():  # several operations without other processes in between
+            if len(store) != expected:
+                store.rebuild(ids, vectors)
+    """
+
+    VECTORS_FILE = "vectors.f32"
+    IDS_FILE = "ids.jsonl"
+    TOMBSTONES_FILE = "tombstones.i64"
+    META_FILE = "meta.json"
+    LOCK_FILE = "lock"
+
+    def __init__(self, path: str, dimensions: int, block_rows: int = 65536):
+        """
+        Open (or create) a store.
+
+        Args:
+            path: Store directory
+            dimensions: Vector dimensions
+            block_rows: Rows scored per matrix product during search (bounds
+                        temporary memory to queries * block_rows floats)
+
+        Raises:
+            ValueError: If the store exists with different dimensions
+        """
+        self.path = Path(path)
+        self.dimensions = dimensions
+        self.block_rows = block_rows
+        self._lock = threading.RLock()
+        self._lock_depth = 0
+        self._state = None  # _disk_state() as of the last load or own write
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._lock_file = open(self.path / self.LOCK_FILE, "ab")
+
+        with self.locked():
+            meta_path = self.path / self.META_FILE
+            if meta_path.exists():
+                stored = json.loads(meta_path.read_text()).get("dimensions")
+            else:
+                stored = dimensions
+                meta_path.write_text(json.dumps({"dimensions": dimensions}))
+
+            if stored == dimensions:
+                self._load()
+
+        if stored != dimensions:
+            self._lock_file.close()
+            raise ValueError(f"Embedding store {self.path} has {stored} dimensions, not {dimensions}")
+
+    # ==================
+    # Locking
+    # ==================
+
+    @contextmanager
+    def locked(self):
+        """
+        Hold the store exclusively (threads and other processes), reloading
+        it first if another process changed it. Reentrant.
+        """
+        with self._lock:
+            if self._lock_depth == 0 and fcntl is not None:
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
+            self._lock_depth += 1
+            try:
+                if self._lock_depth == 1 and self._state is not None and self._disk_state() != self._state:
+                    self._load()
+                yield
+            finally:
+                self._lock_depth -= 1
+                if self._lock_depth == 0 and fcntl is not None:
+                    fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _disk_state(self) -> Tuple:
+        """Identity and size of the files that define the rows (changed by every write)"""
+        state = []
+        for name in (self.IDS_FILE, self.TOMBSTONES_FILE):
+            try:
+                stat = os.stat(self.path / name)
+                state.append((stat.st_ino, stat.st_size, stat.st_mtime_ns))
+            except FileNotFoundError:
+                state.append(None)
+        return tuple(state)
+
+    def _sync(self):
+        """Reload before a read if another process changed the store (caller holds self._lock)"""
+        if self._state is not None and self._disk_state() != self._state:
+            with self.locked():
+                pass
+
+    # ==================
+    # Loading
+    # ==================
+
+    def _load(self):
+        """Read the ID map and tombstones, repairing a torn append (caller holds the lock file)"""
+        import numpy as np
+
+        row_bytes = self.dimensions * 4
+        vectors_path = self.path / self.VECTORS_FILE
+        ids_path = self.path / self.IDS_FILE
+        vectors_path.touch()
+        ids_path.touch()
+
+        # Vectors are appended before IDs: the ID file decides which rows exist
+        ids: List[str] = []
+        valid_bytes = 0
+        with open(ids_path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                ids.append(json.loads(line))
+                valid_bytes += len(line)
+
+        # ids and vectors must line up row for row: cut both to the shorter one
+        rows = min(len(ids), os.path.getsize(vectors_path) // row_bytes)
+        if rows < len(ids):
+            valid_bytes = sum(len(json.dumps(id)) + 1 for id in ids[:rows])
+            ids = ids[:rows]
+        if os.path.getsize(ids_path) != valid_bytes or os.path.getsize(vectors_path) != rows * row_bytes:
+            logger.warning(
+                f"Embedding store {self.path}: ids and vectors out of line "
+                f"({os.path.getsize(ids_path)} id bytes, {os.path.getsize(vectors_path)} vector bytes), "
+                f"truncating to {rows} rows"
+            )
+            os.truncate(ids_path, valid_bytes)
+            os.truncate(vectors_path, rows * row_bytes)
+
+        self._ids = ids
+        self._rows: Dict[str, int] = {}
+        self._dead = np.zeros(max(rows, 1024), dtype=bool)
+        for row, id in enumerate(ids):
+            previous = self._rows.get(id)
+            if previous is not None:
+                self._dead[previous] = True
+            self._rows[id] = row
+
+        tombstones_path = self.path / self.TOMBSTONES_FILE
+        if tombstones_path.exists():
+            tombstones = np.fromfile(tombstones_path, dtype=np.int64)
+            tombstones = tombstones[tombstones < rows]
+            self._dead[tombstones] = True
+            for row in tombstones:
+                id = ids[row]
+                if self._rows.get(id) == row:
+                    del self._rows[id]
+
+        self._size = rows
+        self._matrix = None
+        self._mapped_rows = 0
+        self._state = self._disk_state()
+
+    def _mapped(self):
+        """Memory map covering all rows (remapped after appends)"""
+        import numpy as np
+
+        if self._matrix is None or self._mapped_rows != self._size:
+            self._matrix = None
+            if self._size:
+                self._matrix = np.memmap(
+                    self.path / self.VECTORS_FILE, dtype=np.float32, mode="r",
+                    shape=(self._size, self.dimensions)
+                )
+            self._mapped_rows = self._size
+        return self._matrix
+
+    # ==================
+    # Writes
+    # ==================
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._sync()
+            return len(self._rows)
+
+    def __contains__(self, id: str) -> bool:
+        with self._lock:
+            self._sync()
+            return id in self._rows
+
+    def ids(self) -> List[str]:
+        """IDs of all live vectors"""
+        with self._lock:
+            self._sync()
+            return list(self._rows)
+
+    def add(self, ids: Sequence[str], vectors) -> None:
+        """
+        Add or replace vectors.
+
+        Args:
+            ids: Vector IDs (existing IDs are replaced)
+            vectors: (n, dimensions) array-like
+        """
+        import numpy as np
+
+        if not len(ids):
+            return
+
+        data = np.asarray(vectors, dtype=np.float32).reshape(len(ids), self.dimensions)
+        norms = np.linalg.norm(data, axis=1, keepdims=True)
+        data = np.ascontiguousarray(data / np.clip(norms, 1e-12, None), dtype=np.float32)
+
+        with self.locked():
+            # Vectors before IDs: the ID file decides which rows exist
+            with open(self.path / self.VECTORS_FILE, "ab") as f:
+                f.write(data.tobytes())
+            with open(self.path / self.IDS_FILE, "ab") as f:
+                f.write("".join(json.dumps(id) + "\n" for id in ids).encode())
+
+            self._grow_dead(self._size + len(ids))
+            for offset, id in enumerate(ids):
+                row = self._size + offset
+                previous = self._rows.get(id)
+                if previous is not None:
+                    self._dead[previous] = True
+                self._rows[id] = row
+                self._ids.append(id)
+            self._size += len(ids)
+            self._state = self._disk_state()
+
+    def remove(self, ids: Sequence[str]) -> int:
+        """
+        Delete vectors (tombstoned until the next compaction).
+
+        Args:
+            ids: Vector IDs (unknown IDs are ignored)
+
+        Returns:
+            Number of removed vectors
+        """
+        import numpy as np
+
+        with self.locked():
+            rows = [self._rows.pop(id) for id in ids if id in self._rows]
+            if not rows:
+                return 0
+
+            with open(self.path / self.TOMBSTONES_FILE, "ab") as f:
+                f.write(np.asarray(rows, dtype=np.int64).tobytes())
+            self._dead[rows] = True
+            self._state = self._disk_state()
+
+            dead = self._size - len(self._rows)
+            if dead >= 1024 and dead > self._size // 2:
+                self.compact()
+
+        return len(rows)
+
+    def clear(self) -> None:
+        """Remove all vectors"""
+        with self.locked():
+            self._matrix = None
+            for name in (self.VECTORS_FILE, self.IDS_FILE, self.TOMBSTONES_FILE):
+                (self.path / name).unlink(missing_ok=True)
+            self._load()
+
+    def rebuild(self, ids: Sequence[str], vectors) -> None:
+        """
+        Replace all vectors at once (readers see the old or the new set, never an empty store).
+
+        Args:
+            ids: Vector IDs
+            vectors: (n, dimensions) array-like
+        """
+        import numpy as np
+
+        data = np.asarray(vectors, dtype=np.float32).reshape(len(ids), self.dimensions)
+        norms = np.linalg.norm(data, axis=1, keepdims=True)
+        data = np.ascontiguousarray(data / np.clip(norms, 1e-12, None), dtype=np.float32)
+
+        with self.locked():
+            self._replace_files(list(ids), data)
+            logger.info(f"Rebuilt embedding store {self.path}: {len(ids)} rows")
+
+    def compact(self) -> None:
+        """Rewrite the files without dead rows"""
+        import numpy as np
+
+        with self.locked():
+            live = sorted(self._rows.values())
+            matrix = self._mapped()
+            vectors = np.ascontiguousarray(matrix[live]) if live else np.zeros((0, self.dimensions), np.float32)
+            ids = [self._ids[row] for row in live]
+            size = self._size
+
+            self._replace_files(ids, vectors)
+            logger.info(f"Compacted embedding store {self.path}: {size} -> {len(ids)} rows")
+
+    def _replace_files(self, ids: List[str], vectors):
+        """Swap in new ID and vector files and reload (caller holds the lock file)"""
+        # Write replacements next to the originals, then swap them in
+        vectors_tmp = self.path / (self.VECTORS_FILE + ".tmp")
+        ids_tmp = self.path / (self.IDS_FILE + ".tmp")
+        vectors.tofile(vectors_tmp)
+        ids_tmp.write_text("".join(json.dumps(id) + "\n" for id in ids))
+
+        self._matrix = None
+        # IDs first: a crash in between leaves extra vector rows, which _load truncates
+        os.replace(ids_tmp, self.path / self.IDS_FILE)
+        os.replace(vectors_tmp, self.path / self.VECTORS_FILE)
+        (self.path / self.TOMBSTONES_FILE).unlink(missing_ok=True)
+        self._load()
+
+    def _grow_dead(self, rows: int):
+        import numpy as np
+
+        if rows > len(self._dead):
+            dead = np.zeros(max(rows, len(self._dead) * 2), dtype=bool)
+            dead[:len(self._dead)] = self._dead
+            self._dead = dead
+
+    # ==================
+    # Reads
+    # ==================
+
+    def get(self, ids: Sequence[str]):
+        """
+        Stored (normalized) vectors of IDs.
+
+        Returns:
+            (n, dimensions) float32 array; unknown IDs are skipped
+        """
+        import numpy as np
+
+        with self._lock:
+            self._sync()
+            rows = [self._rows[id] for id in ids if id in self._rows]
+            if not rows:
+                return np.zeros((0, self.dimensions), dtype=np.float32)
+            return np.asarray(self._mapped()[rows])
+
+    def live(self):
+        """
+        All live vectors.
+
+        Returns:
+            (ids, (n, dimensions) float32 array)
+        """
+        with self._lock:
+            self._sync()
+            ids = list(self._rows)
+            return ids, self.get(ids)
+
+    def search(
+        self,
+        queries,
+        k: int = 10,
+        allow: Optional[Callable[[str], bool]] = None
+    ) -> List[List[Tuple[str, float]]]:
+        """
+        Exact cosine top-k for a batch of queries.
+
+        Scores rows block by block (one matrix product per block), keeps
+        the running top-k per query with argpartition, and sorts only the
+        final k.
+
+        Args:
+            queries: (m, dimensions) or (dimensions,) array-like
+            k: Results per query
+            allow: Optional predicate on IDs (metadata filters)
+
+        Returns:
+            One list of (id, cosine similarity) pairs per query, best first
+        """
+        import numpy as np
+
+        q = np.asarray(queries, dtype=np.float32).reshape(-1, self.dimensions)
+        q = q / np.clip(np.linalg.norm(q, axis=1, keepdims=True), 1e-12, None)
+        m = len(q)
+
+        with self._lock:
+            self._sync()
+            matrix = self._mapped()
+            size = self._size
+            if not len(self._rows) or k <= 0:
+                return [[] for _ in range(m)]
+
+            excluded = self._dead[:size]
+            if allow is not None:
+                excluded = excluded.copy()
+                for id, row in self._rows.items():
+                    if not allow(id):
+                        excluded[row] = True
+
+            k = min(k, size)
+            best_scores = np.full((m, 0), -np.inf, dtype=np.float32)
+            best_rows = np.zeros((m, 0), dtype=np.int64)
+
+            for start in range(0, size, self.block_rows):
+                end = min(start + self.block_rows, size)
+                mask = excluded[start:end]
+                if mask.all():
+                    continue
+
+                scores = q @ matrix[start:end].T
+                if mask.any():
+                    scores[:, mask] = -np.inf
+
+                block_k = min(k, end - start)
+                top = np.argpartition(-scores, block_k - 1, axis=1)[:, :block_k]
+                scores = np.concatenate([best_scores, np.take_along_axis(scores, top, axis=1)], axis=1)
+                rows = np.concatenate([best_rows, top + start], axis=1)
+
+                if scores.shape[1] > k:
+                    keep = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+                    scores = np.take_along_axis(scores, keep, axis=1)
+                    rows = np.take_along_axis(rows, keep, axis=1)
+                best_scores, best_rows = scores, rows
+
+            order = np.argsort(-best_scores, axis=1)
+            best_scores = np.take_along_axis(best_scores, order, axis=1)
+            best_rows = np.take_along_axis(best_rows, order, axis=1)
+
+            return [
+                [
+                    (self._ids[row], float(score))
+                    for row, score in zip(best_rows[i], best_scores[i])
+                    if score != -np.inf
+                ]
+                for i in range(m)
+            ]
+
+    def stats(self) -> Dict[str, object]:
+        """Store size on disk and in use"""
+        with self._lock:
+            self._sync()
+            return {
+                "vectors": len(self._rows),
+                "rows": self._size,
+                "dead_rows": self._size - len(self._rows),
+                "dimensions": self.dimensions,
+                "file_bytes": self._size * self.dimensions * 4
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._matrix = None
+            self._lock_file.close()
@@ -0,0 +1,266 @@
+"""
+Local (CPU) embedding backends for the 384d all-MiniLM-L6-v2 collections.
+
+Interchangeable engines expose the SentenceTransformer.encode() subset
+used by RAGService and the backend:
+
+- "torch": sentence-transformers on PyTorch (default, original behavior)
+- "onnx":  ONNX Runtime with the same weights, optionally int8-quantized.
+           Avoids importing torch, which dominates startup time and RSS of
+           the backend and every MCP bridge process.
+- "remote": the backend's shared, micro-batched embedding endpoint
+           (RemoteEmbedder); no model is loaded in the calling process.
+
+All produce mean-pooled, L2-normalized vectors, so collections built with
+one engine can be queried with another.
+
+Requirements for "onnx": onnxruntime, tokenizers, huggingface_hub, numpy.
+"""
+
+import os
+import logging
+import platform
+from pathlib import Path
+from typing import List, Optional, Sequence, Union
+
+logger = logging.getLogger(__name__)
+
+BACKEND_TORCH = "torch"
+BACKEND_ONNX = "onnx"
+BACKEND_REMOTE = "remote"
+
+
+class TorchEmbedder:
+    """Thin wrapper around SentenceTransformer (lazy torch import)"""
+
+    def __init__(self, model_name: str, threads: int = 0):
+        from sentence_transformers import SentenceTransformer
+
+        if threads:
+            import torch
+            torch.set_num_threads(threads)
+
+        self.model_name = model_name
+        self.backend = BACKEND_TORCH
+        self.quantized = False
+        self.model = SentenceTransformer(model_name)
+
+    @property
+    def cache_key(self) -> str:
+        """Embedding cache namespace (vectors are identical to plain SentenceTransformer)"""
+        return self.model_name
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.model.get_sentence_embedding_dimension()
+
+    def encode(self, sentences: Union[str, Sequence[str]], batch_size: int = 32, show_progress_bar: bool = False):
+        return self.model.encode(sentences, batch_size=batch_size, show_progress_bar=show_progress_bar)
+
+
+class OnnxEmbedder:
+    """
+    ONNX Runtime sentence embedder for sentence-transformers models.
+
+    Uses the ONNX exports published in the model's Hugging Face repository.
+    With quantize=True a pre-quantized int8 variant for the host CPU is used
+    when the repository ships one; otherwise model.onnx is dynamically
+    quantized once and cached next to the download.
+
+    Usage:
+        embedder = OnnxEmbedder("all-MiniLM-L6-v2", threads=4, quantize=True)
+        vectors = embedder.encode(["def foo(): ..."], batch_size=64)
+    """
+
+    MAX_SEQ_LENGTH = 256  # matches all-MiniLM-L6-v2 max_seq_length
+
+    def __init__(self, model_name: str, threads: int = 0, quantize: bool = True):
+        """
+        Load tokenizer and ONNX session.
+
+        Args:
+            model_name: sentence-transformers model (short or full HF name)
+            threads: ONNX Runtime intra-op threads (0 = runtime default)
+            quantize: Use int8 weights
+
+        Raises:
+            ImportError: If onnxruntime/tokenizers/huggingface_hub are missing
+        """
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        self.model_name = model_name
+        self.backend = BACKEND_ONNX
+        self.quantized = quantize
+
+        repo_id = model_name if "/" in model_name else f"sentence-transformers/{model_name}"
+        model_path = self._resolve_model_file(repo_id, quantize)
+
+        self.tokenizer = Tokenizer.from_file(self._download(repo_id, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=self.MAX_SEQ_LENGTH)
+        self.tokenizer.enable_padding()
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.inter_op_num_threads = 1
+        if threads:
+            options.intra_op_num_threads = threads
+
+        self.session = ort.InferenceSession(model_path, sess_options=options, providers=["CPUExecutionProvider"])
+        self._input_names = {model_input.name for model_input in self.session.get_inputs()}
+        self._dimensions: Optional[int] = None
+
+        logger.info(
+            f"Loaded ONNX embedding model {repo_id} ({'int8' if quantize else 'fp32'}, "
+            f"{threads or 'default'} threads) from {model_path}"
+        )
+
+    @property
+    def cache_key(self) -> str:
+        """Embedding cache namespace (int8 vectors differ slightly from fp32)"""
+        return f"{self.model_name}:int8" if self.quantized else self.model_name
+
+    @staticmethod
+    def _download(repo_id: str, filename: str) -> str:
+        from huggingface_hub import hf_hub_download
+        return hf_hub_download(repo_id=repo_id, filename=filename)
+
+    def _resolve_model_file(self, repo_id: str, quantize: bool) -> str:
+        """Pick the ONNX file for this host, quantizing locally if needed"""
+        if not quantize:
+            return self._download(repo_id, "onnx/model.onnx")
+
+        machine = platform.machine().lower()
+        candidates = (
+            ["onnx/model_qint8_arm64.onnx"] if machine in ("arm64", "aarch64")
+            else ["onnx/model_quint8_avx2.onnx", "onnx/model_qint8_avx512_vnni.onnx"]
+        )
+        for filename in candidates:
+            try:
+                return self._download(repo_id, filename)
+            except Exception:
+                continue
+
+        # No published int8 export - quantize the fp32 model once
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        fp32_path = Path(self._download(repo_id, "onnx/model.onnx"))
+        int8_path = fp32_path.with_name("model_int8_dynamic.onnx")
+        if not int8_path.exists():
+            logger.info(f"Quantizing {fp32_path} to int8")
+            quantize_dynamic(str(fp32_path), str(int8_path), weight_type=QuantType.QInt8)
+        return str(int8_path)
+
+    def get_sentence_embedding_dimension(self) -> int:
+        if self._dimensions is None:
+            self._dimensions = int(self.encode("dimension probe").shape[-1])
+        return self._dimensions
+
+    def encode(self, sentences: Union[str, Sequence[str]], batch_size: int = 32, show_progress_bar: bool = False):
+        """
+        Embed texts (SentenceTransformer.encode compatible subset).
+
+        Args:
+            sentences: One text or a list of texts
+            batch_size: Texts per forward pass
+            show_progress_bar: Ignored (kept for signature compatibility)
+
+        Returns:
+            float32 numpy array: (dims,) for a single text, (n, dims) for a list
+        """
+        import numpy as np
+
+        single = isinstance(sentences, str)
+        texts: List[str] = [sentences] if single else list(sentences)
+        if not texts:
+            return np.zeros((0, self._dimensions or 0), dtype=np.float32)
+
+        # Length-sorted batches minimize padding; results are restored to input order
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        output = [None] * len(texts)
+
+        for start in range(0, len(order), batch_size):
+            indices = order[start:start + batch_size]
+            vectors = self._encode_batch([texts[i] for i in indices])
+            for i, vector in zip(indices, vectors):
+                output[i] = vector
+
+        result = np.stack(output).astype(np.float32, copy=False)
+        return result[0] if single else result
+
+    def _encode_batch(self, texts: List[str]):
+        import numpy as np
+
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self._input_names:
+            feeds["token_type_ids"] = np.array([e.type_ids for e in encodings], dtype=np.int64)
+
+        token_embeddings = self.session.run(None, feeds)[0]
+
+        # Mean pooling over real tokens, then L2 normalization (sentence-transformers pipeline)
+        mask = attention_mask[..., None].astype(np.float32)
+        pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        return pooled / np.clip(norms, 1e-12, None)
+
+
+def create_local_embedder(
+    model_name: str = "all-MiniLM-L6-v2",
+    backend: Optional[str] = None,
+    threads: Optional[int] = None,
+    quantize: Optional[bool] = None,
+    service_url: Optional[str] = None
+):
+    """
+    Create a local embedding engine.
+
+    Unset arguments are read from the environment:
+    - CLAUDETASK_EMBEDDING_BACKEND: "torch" (default), "onnx" or "remote"
+    - CLAUDETASK_EMBEDDING_THREADS: intra-op threads (default: 0 = runtime default)
+    - CLAUDETASK_EMBEDDING_QUANTIZE: int8 weights for onnx (default: "true")
+    - CLAUDETASK_EMBEDDING_URL: embedding service for remote (default: http://localhost:3333)
+    - CLAUDETASK_EMBEDDING_FALLBACK: in-process backend if the service is down (default: "torch")
+
+    Args:
+        model_name: sentence-transformers model name
+        backend: "torch", "onnx" or "remote"
+        threads: Intra-op threads
+        quantize: Use int8 weights (onnx only)
+        service_url: Backend URL (remote only)
+
+    Returns:
+        TorchEmbedder, OnnxEmbedder or RemoteEmbedder
+
+    Raises:
+        ValueError: If backend is unknown
+        ImportError: If the backend's dependencies are missing
+    """
+    backend = (backend or os.getenv("CLAUDETASK_EMBEDDING_BACKEND") or BACKEND_TORCH).lower()
+    if threads is None:
+        threads = int(os.getenv("CLAUDETASK_EMBEDDING_THREADS", "0"))
+    if quantize is None:
+        quantize = os.getenv("CLAUDETASK_EMBEDDING_QUANTIZE", "true").lower() in ("1", "true", "yes")
+
+    if backend == BACKEND_REMOTE:
+        from .remote_embedder import RemoteEmbedder
+
+        service_url = service_url or os.getenv("CLAUDETASK_EMBEDDING_URL") or "http://localhost:3333"
+        try:
+            return RemoteEmbedder(service_url, model_name)
+        except ConnectionError as e:
+            # A bridge must keep working when the backend is down or still starting
+            backend = os.getenv("CLAUDETASK_EMBEDDING_FALLBACK", BACKEND_TORCH).lower()
+            logger.warning(f"{e}; loading {backend} embedding model in-process instead")
+
+    if backend == BACKEND_TORCH:
+        return TorchEmbedder(model_name, threads=threads)
+    if backend == BACKEND_ONNX:
+        return OnnxEmbedder(model_name, threads=threads, quantize=quantize)
+
+    raise ValueError(
+        f"Unknown embedding backend: {backend}. "
+        f"Expected '{BACKEND_TORCH}', '{BACKEND_ONNX}' or '{BACKEND_REMOTE}'."
+    )
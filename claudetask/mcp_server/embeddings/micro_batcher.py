@@ -0,0 +1,149 @@
+"""
+Dynamic micro-batching for a shared embedding model.
+
+Many small concurrent encode requests (one query from each MCP bridge, a few
+chunks from each hook) are much cheaper as one forward pass than as many.
+The batcher collects requests until either max_batch_size texts are queued
+or the oldest request has waited max_wait_ms, then runs a single model call
+in a worker thread and hands each caller its slice of the result.
+"""
+
+import time
+import asyncio
+import logging
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent encode requests into shared model calls.
+
+    Usage:
+        batcher = MicroBatcher(lambda texts: model.encode(texts).tolist())
+        vectors = await batcher.submit(["query text"])
+    """
+
+    def __init__(
+        self,
+        encode: Callable[[List[str]], Sequence[Sequence[float]]],
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0
+    ):
+        """
+        Initialize batcher.
+
+        Args:
+            encode: Sync function embedding a list of texts (runs in a worker thread)
+            max_batch_size: Texts per model call (a larger single request is not split)
+            max_wait_ms: Longest time the first queued request waits for company
+        """
+        self.encode = encode
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+        self.requests = 0
+        self.texts = 0
+        self.batches = 0
+        self.total_encode_seconds = 0.0
+        self.max_observed_batch = 0
+
+    async def submit(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts together with whatever other requests arrive in the window.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            One vector per text, in input order
+
+        Raises:
+            Exception: Error raised by the encode function for this batch
+        """
+        if not texts:
+            return []
+
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((list(texts), future))
+        return await future
+
+    def _ensure_worker(self):
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+    async def _run(self):
+        """Collect requests into batches and encode them one batch at a time"""
+        while True:
+            pending: List[Tuple[List[str], asyncio.Future]] = [await self._queue.get()]
+            queued = len(pending[0][0])
+            deadline = time.monotonic() + self.max_wait
+
+            while queued < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                pending.append(item)
+                queued += len(item[0])
+
+            # Skip requests whose callers went away while queued
+            pending = [(texts, future) for texts, future in pending if not future.done()]
+            if not pending:
+                continue
+
+            batch = [text for texts, _ in pending for text in texts]
+            start = time.monotonic()
+            try:
+                vectors = await asyncio.to_thread(self.encode, batch)
+            except Exception as e:
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.total_encode_seconds += time.monotonic() - start
+            self.batches += 1
+            self.requests += len(pending)
+            self.texts += len(batch)
+            self.max_observed_batch = max(self.max_observed_batch, len(batch))
+
+            offset = 0
+            for texts, future in pending:
+                if not future.done():
+                    future.set_result([list(vector) for vector in vectors[offset:offset + len(texts)]])
+                offset += len(texts)
+
+    def stats(self) -> Dict[str, object]:
+        """Batching efficiency statistics"""
+        return {
+            "requests": self.requests,
+            "texts": self.texts,
+            "model_calls": self.batches,
+            "avg_texts_per_call": round(self.texts / self.batches, 2) if self.batches else 0.0,
+            "avg_requests_per_call": round(self.requests / self.batches, 2) if self.batches else 0.0,
+            "max_texts_per_call": self.max_observed_batch,
+            "avg_encode_ms": round(self.total_encode_seconds / self.batches * 1000, 2) if self.batches else None,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000
+        }
+
+    async def close(self):
+        """Stop the worker task"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
@@ -0,0 +1,109 @@
+"""
+Embedding engine backed by the backend's shared embedding endpoint.
+
+MCP bridges in "remote" mode send texts to POST /api/embeddings/encode
+instead of loading their own copy of the model; the backend micro-batches
+concurrent requests from all bridges into single model calls.
+"""
+
+import logging
+from typing import List, Sequence, Union
+
+from .local_backends import BACKEND_REMOTE
+
+logger = logging.getLogger(__name__)
+
+# Texts the service accepts per request (MAX_TEXTS_PER_REQUEST of the backend's embeddings router)
+MAX_TEXTS_PER_REQUEST = 2048
+
+
+class RemoteEmbedder:
+    """
+    SentenceTransformer.encode-compatible client for the backend embedding service.
+
+    Usage:
+        embedder = RemoteEmbedder("http://localhost:3333", "all-MiniLM-L6-v2")
+        vector = embedder.encode("query").tolist()
+    """
+
+    def __init__(self, base_url: str, model_name: str, timeout: float = 30.0):
+        """
+        Connect to the embedding service and verify it serves model_name.
+
+        Args:
+            base_url: Backend URL (e.g. http://localhost:3333)
+            model_name: Expected model; vectors from another model would not
+                match the existing collections
+
+        Raises:
+            ConnectionError: If the service is unreachable, not ready, or serves another model
+        """
+        import httpx
+
+        self.base_url = base_url.rstrip("/")
+        self.model_name = model_name
+        self.backend = BACKEND_REMOTE
+        self.quantized = False
+        self._client = httpx.Client(base_url=self.base_url, timeout=httpx.Timeout(timeout, connect=2.0))
+
+        try:
+            response = self._client.get("/api/embeddings/info")
+            response.raise_for_status()
+            info = response.json()
+        except Exception as e:
+            self._client.close()
+            raise ConnectionError(f"Embedding service at {self.base_url} unavailable: {e}") from e
+
+        if info.get("model") != model_name:
+            self._client.close()
+            raise ConnectionError(
+                f"Embedding service at {self.base_url} serves {info.get('model')}, expected {model_name}"
+            )
+
+        self._dimensions = info.get("dimensions")
+        self._cache_key = info.get("cache_key") or model_name
+        logger.info(f"Using shared embedding service at {self.base_url} ({model_name})")
+
+    @property
+    def cache_key(self) -> str:
+        """Embedding cache namespace of the engine behind the service"""
+        return self._cache_key
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self._dimensions
+
+    def encode(self, sentences: Union[str, Sequence[str]], batch_size: int = 32, show_progress_bar: bool = False):
+        """
+        Embed texts through the shared service.
+
+        Args:
+            sentences: One text or a list of texts
+            batch_size: Texts per request (at most MAX_TEXTS_PER_REQUEST; the
+                service also batches across callers)
+            show_progress_bar: Ignored
+
+        Returns:
+            float32 numpy array: (dims,) for a single text, (n, dims) for a list
+        """
+        import numpy as np
+
+        single = isinstance(sentences, str)
+        texts: List[str] = [sentences] if single else list(sentences)
+
+        step = max(1, min(batch_size, MAX_TEXTS_PER_REQUEST))
+        vectors = []
+        for start in range(0, len(texts), step):
+            response = self._client.post(
+                "/api/embeddings/encode",
+                json={"texts": texts[start:start + step], "model": self.model_name}
+            )
+            response.raise_for_status()
+            vectors.extend(response.json()["embeddings"])
+
+        if not vectors:
+            return np.empty((0, self._dimensions or 0), dtype=np.float32)
+        vectors = np.asarray(vectors, dtype=np.float32)
+        return vectors[0] if single else vectors
+
+    def close(self):
+        self._client.close()
@@ -0,0 +1,408 @@
+"""
+Concurrent embedding scheduler with adaptive rate limiting.
+
+Remote embedding APIs are latency-bound: a single request spends most of its
+time waiting on the network, so sending batches one after another leaves
+throughput on the table. The scheduler:
+
+- Packs texts into batches by estimated token budget (not a fixed count)
+- Keeps up to max_concurrency batches in flight
+- Paces requests with token buckets for requests/sec and tokens/sec
+- Halves the request rate on 429 responses and recovers it additively (AIMD)
+- Records per-batch latency for metrics endpoints
+"""
+
+import time
+import random
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass, asdict
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap token estimate for batch packing.
+
+    Source code tokenizes denser than prose (~3 chars/token), so this errs
+    on the side of smaller batches.
+    """
+    return len(text) // 3 + 1
+
+
+def pack_batches(
+    texts: Sequence[str],
+    max_batch_size: int,
+    max_batch_tokens: int,
+    estimate: Callable[[str], int] = estimate_tokens
+) -> List[List[int]]:
+    """
+    Group consecutive texts into batches under both a count and a token budget.
+
+    A single text larger than the budget gets a batch of its own.
+
+    Args:
+        texts: Texts to pack
+        max_batch_size: Maximum texts per batch
+        max_batch_tokens: Maximum estimated tokens per batch
+        estimate: Token estimator
+
+    Returns:
+        Lists of text indices, in input order
+    """
+    batches: List[List[int]] = []
+    current: List[int] = []
+    current_tokens = 0
+
+    for i, text in enumerate(texts):
+        tokens = estimate(text)
+        if current and (len(current) >= max_batch_size or current_tokens + tokens > max_batch_tokens):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(i)
+        current_tokens += tokens
+
+    if current:
+        batches.append(current)
+
+    return batches
+
+
+class RateLimitError(Exception):
+    """Raised by embed functions on HTTP 429 (optionally with Retry-After)"""
+
+    def __init__(self, message: str = "rate limited", retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """Recognize rate-limit errors from SDKs that do not share an exception type"""
+    if isinstance(error, RateLimitError) or "RateLimit" in type(error).__name__:
+        return True
+    error_str = str(error).lower()
+    return "rate limit" in error_str or "429" in error_str or "too many requests" in error_str
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket whose refill rate adapts to rate-limit responses.
+
+    On a 429 the rate is multiplied by decrease_factor and the bucket is
+    paused for Retry-After (if given); every success adds increase_step
+    back, up to max_rate.
+
+    Usage:
+        limiter = AdaptiveRateLimiter(rate=20.0)
+        await limiter.acquire()
+        ...  # send request
+        limiter.on_success()  # or limiter.on_rate_limited(retry_after)
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[float] = None,
+        min_rate: Optional[float] = None,
+        max_rate: Optional[float] = None,
+        decrease_factor: float = 0.5,
+        increase_step: Optional[float] = None
+    ):
+        """
+        Initialize limiter.
+
+        Args:
+            rate: Initial refill rate (units per second)
+            burst: Bucket capacity (default: one second of rate, at least 1)
+            min_rate: Lower bound after decreases (default: rate / 64)
+            max_rate: Upper bound after increases (default: rate)
+            decrease_factor: Rate multiplier on rate-limit responses
+            increase_step: Rate added per success (default: max_rate / 50)
+        """
+        self.max_rate = max_rate or rate
+        self.min_rate = min_rate or rate / 64
+        self.rate = rate
+        self.burst = burst or max(1.0, rate)
+        self.decrease_factor = decrease_factor
+        self.increase_step = increase_step or self.max_rate / 50
+
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+
+        self.rate_limited = 0
+        self.total_wait_seconds = 0.0
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, cost: float = 1.0):
+        """
+        Wait until cost units are available, then consume them.
+
+        Waiters are served in arrival order.
+
+        Args:
+            cost: Units to consume (clamped to burst so oversized requests still run)
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        cost = min(cost, self.burst)
+
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                else:
+                    self._refill(now)
+                    if self._tokens >= cost:
+                        self._tokens -= cost
+                        return
+                    wait = (cost - self._tokens) / self.rate
+
+                self.total_wait_seconds += wait
+                await asyncio.sleep(wait)
+
+    def on_success(self):
+        """Additive increase after a successful request"""
+        if self.rate < self.max_rate:
+            self._refill(time.monotonic())
+            self.rate = min(self.max_rate, self.rate + self.increase_step)
+
+    def on_rate_limited(self, retry_after: Optional[float] = None):
+        """
+        Multiplicative decrease after a rate-limit response.
+
+        Args:
+            retry_after: Server-requested pause in seconds
+        """
+        now = time.monotonic()
+        self._refill(now)
+        self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+        self._tokens = 0.0
+        self.rate_limited += 1
+        if retry_after:
+            self._paused_until = max(self._paused_until, now + retry_after)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "rate": round(self.rate, 3),
+            "max_rate": self.max_rate,
+            "rate_limited": self.rate_limited,
+            "total_wait_seconds": round(self.total_wait_seconds, 3)
+        }
+
+
+@dataclass
+class BatchMetric:
+    """Timing of one embedding request"""
+    size: int
+    tokens: int
+    latency_ms: float
+    retries: int
+    finished_at: float
+
+
+class EmbeddingScheduler:
+    """
+    Runs embedding requests concurrently under adaptive rate limits.
+
+    Usage:
+        async def embed_batch(texts):
+            return await client.embed(texts)
+
+        scheduler = EmbeddingScheduler(embed_batch, max_concurrency=4,
+                                       requests_per_second=20, tokens_per_second=50_000)
+        vectors = await scheduler.embed(texts)
+        scheduler.get_metrics()
+    """
+
+    def __init__(
+        self,
+        embed_batch: Callable[[List[str]], Awaitable[List[List[float]]]],
+        max_concurrency: int = 4,
+        max_batch_size: int = 1000,
+        max_batch_tokens: int = 100_000,
+        requests_per_second: float = 25.0,
+        tokens_per_second: Optional[float] = None,
+        max_retries: int = 5,
+        retry_base_delay: float = 1.0,
+        metrics_window: int = 1000,
+        request_limiter: Optional[AdaptiveRateLimiter] = None,
+        token_limiter: Optional[AdaptiveRateLimiter] = None
+    ):
+        """
+        Initialize scheduler.
+
+        Args:
+            embed_batch: Coroutine embedding one batch of texts
+            max_concurrency: Batches in flight at once
+            max_batch_size: Maximum texts per request
+            max_batch_tokens: Maximum estimated tokens per request
+            requests_per_second: Initial/maximum request rate
+            tokens_per_second: Token throughput limit (None: unlimited)
+            max_retries: Attempts per batch on rate-limit errors
+            retry_base_delay: Base delay for exponential backoff (seconds)
+            metrics_window: Number of recent batches kept for latency stats
+            request_limiter: Shared request limiter (overrides requests_per_second)
+            token_limiter: Shared token limiter (overrides tokens_per_second)
+        """
+        self.embed_batch = embed_batch
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_batch_size = max_batch_size
+        self.max_batch_tokens = max_batch_tokens
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+
+        self.request_limiter = request_limiter or AdaptiveRateLimiter(
+            rate=requests_per_second,
+            burst=max(1.0, min(requests_per_second, float(self.max_concurrency)))
+        )
+        self.token_limiter = token_limiter or (AdaptiveRateLimiter(
+            rate=tokens_per_second,
+            burst=max(tokens_per_second, float(max_batch_tokens))
+        ) if tokens_per_second else None)
+
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._metrics: Deque[BatchMetric] = deque(maxlen=metrics_window)
+        self.total_batches = 0
+        self.total_texts = 0
+        self.total_tokens = 0
+        self.total_retries = 0
+
+    async def embed(self, texts: Sequence[str], max_batch_size: Optional[int] = None) -> List[List[float]]:
+        """
+        Embed texts, running packed batches concurrently.
+
+        Args:
+            texts: Texts to embed
+            max_batch_size: Per-call cap on texts per request (default: scheduler setting)
+
+        Returns:
+            One vector per text, in input order
+
+        Raises:
+            Exception: First batch failure (remaining batches are cancelled)
+        """
+        if not texts:
+            return []
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        batch_limit = min(max_batch_size or self.max_batch_size, self.max_batch_size)
+        batches = pack_batches(texts, batch_limit, self.max_batch_tokens)
+        results: List[Optional[List[float]]] = [None] * len(texts)
+
+        async def run(indices: List[int]):
+            batch = [texts[i] for i in indices]
+            async with self._semaphore:
+                vectors = await self._embed_with_retry(batch)
+            for i, vector in zip(indices, vectors):
+                results[i] = vector
+
+        tasks = [asyncio.ensure_future(run(indices)) for indices in batches]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        return results
+
+    async def _embed_with_retry(self, batch: List[str]) -> List[List[float]]:
+        """Send one batch, backing off and slowing the limiter on 429s"""
+        tokens = sum(estimate_tokens(text) for text in batch)
+
+        for attempt in range(self.max_retries):
+            await self.request_limiter.acquire()
+            if self.token_limiter is not None:
+                await self.token_limiter.acquire(tokens)
+
+            start = time.monotonic()
+            try:
+                vectors = await self.embed_batch(batch)
+            except Exception as e:
+                if not is_rate_limit_error(e) or attempt == self.max_retries - 1:
+                    raise
+
+                retry_after = getattr(e, "retry_after", None)
+                self.request_limiter.on_rate_limited(retry_after)
+                if self.token_limiter is not None:
+                    self.token_limiter.on_rate_limited(retry_after)
+
+                # Jitter keeps concurrent batches from retrying in lockstep
+                delay = max(retry_after or 0.0, self.retry_base_delay * (2 ** attempt) * random.uniform(0.5, 1.0))
+                self.total_retries += 1
+                logger.warning(
+                    f"Rate limit hit, attempt {attempt + 1}/{self.max_retries}. "
+                    f"Waiting {delay:.1f}s (request rate now {self.request_limiter.rate:.2f}/s)"
+                )
+                await asyncio.sleep(delay)
+                continue
+
+            latency_ms = (time.monotonic() - start) * 1000
+            self.request_limiter.on_success()
+            if self.token_limiter is not None:
+                self.token_limiter.on_success()
+
+            self._metrics.append(BatchMetric(
+                size=len(batch),
+                tokens=tokens,
+                latency_ms=round(latency_ms, 2),
+                retries=attempt,
+                finished_at=time.time()
+            ))
+            self.total_batches += 1
+            self.total_texts += len(batch)
+            self.total_tokens += tokens
+
+            logger.debug(f"Embedded batch of {len(batch)} texts (~{tokens} tokens) in {latency_ms:.0f}ms")
+            return vectors
+
+        raise RuntimeError("unreachable")  # loop always returns or raises
+
+    def get_metrics(self, recent: int = 0) -> Dict[str, object]:
+        """
+        Throughput and latency statistics.
+
+        Args:
+            recent: Also include the last N per-batch records
+
+        Returns:
+            Totals, latency percentiles over the metrics window and limiter state
+        """
+        latencies = sorted(metric.latency_ms for metric in self._metrics)
+
+        def percentile(p: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))]
+
+        metrics: Dict[str, object] = {
+            "batches": self.total_batches,
+            "texts": self.total_texts,
+            "estimated_tokens": self.total_tokens,
+            "retries": self.total_retries,
+            "max_concurrency": self.max_concurrency,
+            "latency_ms": {
+                "p50": percentile(0.5),
+                "p95": percentile(0.95),
+                "max": latencies[-1] if latencies else None,
+                "mean": round(sum(latencies) / len(latencies), 2) if latencies else None
+            },
+            "request_limiter": self.request_limiter.stats(),
+            "token_limiter": self.token_limiter.stats() if self.token_limiter else None
+        }
+        if recent:
+            metrics["recent_batches"] = [asdict(metric) for metric in list(self._metrics)[-recent:]]
+        return metrics
@@ -0,0 +1,286 @@
+"""
+In-process vector index for local (offline) similarity search.
+
+Vectors live in one contiguous, L2-normalized float32 matrix, so a query is
+a single matrix-vector product plus an argpartition top-k. Past
+hnsw_threshold vectors an HNSW graph (hnswlib) answers queries instead of
+the full scan; without hnswlib the brute-force path is used at any size.
+
+Requirements: numpy; hnswlib is optional.
+"""
+
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import hnswlib
+    HNSW_AVAILABLE = True
+except ImportError:
+    HNSW_AVAILABLE = False
+
+
+class VectorIndex:
+    """
+    Cosine-similarity index over string IDs.
+
+    Usage:
+        index = VectorIndex(384)
+        index.add(["chunk-1", "chunk-2"], vectors)
+        results = index.search(query_vector, k=10)  # [(id, score), ...]
+        index.remove(["chunk-1"])
+    """
+
+    def __init__(
+        self,
+        dimensions: int,
+        hnsw_threshold: int = 50_000,
+        hnsw_m: int = 16,
+        hnsw_ef_construction: int = 200,
+        hnsw_ef_search: int = 128
+    ):
+        """
+        Initialize an empty index.
+
+        Args:
+            dimensions: Vector dimensions
+            hnsw_threshold: Vector count from which HNSW is used (if installed)
+            hnsw_m: HNSW graph degree
+            hnsw_ef_construction: HNSW build-time candidate list size
+            hnsw_ef_search: HNSW query-time candidate list size (raised to k when smaller)
+        """
+        self.dimensions = dimensions
+        self.hnsw_threshold = hnsw_threshold
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_construction = hnsw_ef_construction
+        self.hnsw_ef_search = hnsw_ef_search
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        import numpy as np
+
+        self._matrix = np.zeros((0, self.dimensions), dtype=np.float32)
+        self._size = 0
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+
+        # HNSW uses stable integer labels; matrix rows move when vectors are removed
+        self._labels = np.zeros(0, dtype=np.int64)
+        self._label_ids: Dict[int, str] = {}
+        self._next_label = 0
+        self._hnsw = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, id: str) -> bool:
+        return id in self._rows
+
+    @property
+    def uses_hnsw(self) -> bool:
+        return self._hnsw is not None
+
+    def add(self, ids: Sequence[str], vectors) -> None:
+        """
+        Add or replace vectors.
+
+        Args:
+            ids: Vector IDs (existing IDs are overwritten)
+            vectors: (n, dimensions) array-like
+        """
+        import numpy as np
+
+        if not len(ids):
+            return
+
+        data = self._normalize(np.asarray(vectors, dtype=np.float32).reshape(len(ids), self.dimensions))
+
+        with self._lock:
+            new_labels = []
+            for id, vector in zip(ids, data):
+                row = self._rows.get(id)
+                if row is None:
+                    row = self._append_row()
+                    self._ids.append(id)
+                    self._rows[id] = row
+                elif self._hnsw is not None:
+                    self._hnsw.mark_deleted(int(self._labels[row]))
+                    del self._label_ids[int(self._labels[row])]
+
+                self._matrix[row] = vector
+                self._labels[row] = self._next_label
+                self._label_ids[self._next_label] = id
+                new_labels.append((self._next_label, row))
+                self._next_label += 1
+
+            if self._hnsw is not None:
+                self._hnsw_add([label for label, _ in new_labels], [row for _, row in new_labels])
+
+    def remove(self, ids: Sequence[str]) -> int:
+        """
+        Remove vectors.
+
+        Args:
+            ids: Vector IDs (unknown IDs are ignored)
+
+        Returns:
+            Number of removed vectors
+        """
+        removed = 0
+        with self._lock:
+            for id in ids:
+                row = self._rows.pop(id, None)
+                if row is None:
+                    continue
+
+                label = int(self._labels[row])
+                self._label_ids.pop(label, None)
+                if self._hnsw is not None:
+                    self._hnsw.mark_deleted(label)
+
+                # Keep the matrix dense: move the last row into the hole
+                last = self._size - 1
+                if row != last:
+                    moved_id = self._ids[last]
+                    self._matrix[row] = self._matrix[last]
+                    self._labels[row] = self._labels[last]
+                    self._ids[row] = moved_id
+                    self._rows[moved_id] = row
+                self._ids.pop()
+                self._size -= 1
+                removed += 1
+
+        return removed
+
+    def clear(self) -> None:
+        """Remove all vectors"""
+        with self._lock:
+            self._reset()
+
+    def search(
+        self,
+        query,
+        k: int = 10,
+        allow: Optional[Callable[[str], bool]] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Find the most similar vectors.
+
+        Args:
+            query: Query vector (dimensions,)
+            k: Number of results
+            allow: Optional predicate on IDs (metadata filters); filtered
+                   HNSW queries fall back to the exact scan if too few pass
+
+        Returns:
+            (id, cosine similarity) pairs, best first
+        """
+        import numpy as np
+
+        q = self._normalize(np.asarray(query, dtype=np.float32).reshape(1, self.dimensions))[0]
+
+        with self._lock:
+            if self._size == 0 or k <= 0:
+                return []
+
+            if self._hnsw is None and HNSW_AVAILABLE and self._size >= self.hnsw_threshold:
+                self._build_hnsw()
+
+            if self._hnsw is not None:
+                results = self._search_hnsw(q, k, allow)
+                if results is not None:
+                    return results
+
+            return self._search_exact(q, k, allow)
+
+    def _search_exact(self, q, k: int, allow: Optional[Callable[[str], bool]]) -> List[Tuple[str, float]]:
+        import numpy as np
+
+        scores = self._matrix[:self._size] @ q
+
+        if allow is not None:
+            rows = np.fromiter(
+                (i for i, id in enumerate(self._ids) if allow(id)),
+                dtype=np.int64
+            )
+            if not len(rows):
+                return []
+            scores = scores[rows]
+        else:
+            rows = None
+
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        if rows is not None:
+            return [(self._ids[rows[i]], float(scores[i])) for i in top]
+        return [(self._ids[i], float(scores[i])) for i in top]
+
+    def _search_hnsw(self, q, k: int, allow: Optional[Callable[[str], bool]]) -> Optional[List[Tuple[str, float]]]:
+        # Over-fetch when filtering; the caller falls back to an exact scan if that is not enough
+        fetch = min(self._size, k if allow is None else k * 4)
+        self._hnsw.set_ef(max(self.hnsw_ef_search, fetch))
+        labels, distances = self._hnsw.knn_query(q, k=fetch)
+
+        results = []
+        for label, distance in zip(labels[0], distances[0]):
+            id = self._label_ids.get(int(label))
+            if id is None or (allow is not None and not allow(id)):
+                continue
+            results.append((id, float(1.0 - distance)))
+            if len(results) == k:
+                return results
+
+        return results if allow is None else None
+
+    def _build_hnsw(self) -> None:
+        index = hnswlib.Index(space="ip", dim=self.dimensions)
+        index.init_index(
+            max_elements=max(self._size * 2, 1024),
+            ef_construction=self.hnsw_ef_construction,
+            M=self.hnsw_m
+        )
+        index.add_items(self._matrix[:self._size], self._labels[:self._size])
+        self._hnsw = index
+        logger.info(f"Built HNSW index over {self._size} vectors ({self.dimensions}d)")
+
+    def _hnsw_add(self, labels: List[int], rows: List[int]) -> None:
+        capacity = self._hnsw.get_max_elements()
+        needed = self._hnsw.get_current_count() + len(labels)
+        if needed > capacity:
+            self._hnsw.resize_index(max(needed, capacity * 2))
+        self._hnsw.add_items(self._matrix[rows], labels)
+
+    def _append_row(self) -> int:
+        import numpy as np
+
+        if self._size == len(self._matrix):
+            capacity = max(1024, len(self._matrix) * 2)
+            matrix = np.zeros((capacity, self.dimensions), dtype=np.float32)
+            matrix[:self._size] = self._matrix[:self._size]
+            labels = np.zeros(capacity, dtype=np.int64)
+            labels[:self._size] = self._labels[:self._size]
+            self._matrix, self._labels = matrix, labels
+
+        self._size += 1
+        return self._size - 1
+
+    @staticmethod
+    def _normalize(vectors):
+        import numpy as np
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.clip(norms, 1e-12, None)
+
+    def stats(self) -> Dict[str, object]:
+        """Index size and search mode"""
+        return {
+            "vectors": self._size,
+            "dimensions": self.dimensions,
+            "mode": "hnsw" if self._hnsw is not None else "exact",
+            "memory_bytes": int(self._matrix.nbytes)
+        }
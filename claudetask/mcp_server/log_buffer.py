@@ -0,0 +1,170 @@
+"""
+Asynchronous, batched delivery of MCP call logs.
+
+Tool handlers append log entries to an in-memory buffer and return
+immediately; a background task ships them to the backend in batches.
+The buffer is bounded: when the backend is down or slow, the oldest
+entries are dropped instead of delaying tool calls or growing memory.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LogBuffer:
+    """
+    Bounded drop-oldest buffer with a background batch flusher.
+
+    Usage:
+        buffer = LogBuffer(send_batch)  # async def send_batch(entries) -> None
+        buffer.add({"tool_name": "get_task", "status": "success"})
+        ...
+        await buffer.close()
+    """
+
+    def __init__(
+        self,
+        send_batch: Callable[[List[Dict[str, Any]]], Awaitable[None]],
+        max_entries: int = 2000,
+        batch_size: int = 200,
+        flush_interval: float = 1.0,
+        max_backoff: float = 30.0
+    ):
+        """
+        Initialize buffer.
+
+        Args:
+            send_batch: Coroutine delivering a list of entries (raises on failure)
+            max_entries: Buffer capacity; older entries are dropped beyond it
+            batch_size: Entries per delivery
+            flush_interval: Seconds between deliveries while entries are pending
+            max_backoff: Longest pause between retries while delivery fails
+        """
+        self.send_batch = send_batch
+        self.max_entries = max_entries
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_backoff = max_backoff
+
+        self._entries: Deque[Dict[str, Any]] = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._failures = 0
+
+        self.sent = 0
+        self.dropped = 0
+        self.batches = 0
+        self.failed_batches = 0
+
+    def add(self, entry: Dict[str, Any]):
+        """
+        Queue an entry for delivery (never blocks).
+
+        Args:
+            entry: JSON-serializable log entry
+        """
+        self._entries.append(entry)
+        self._trim()
+
+        self._ensure_flusher()
+        # While delivery fails, the backoff timer decides when to retry
+        if len(self._entries) >= self.batch_size and not self._failures:
+            self._wakeup.set()
+
+    def _trim(self):
+        """Apply backpressure by dropping the oldest entries"""
+        overflow = len(self._entries) - self.max_entries
+        for _ in range(overflow):
+            self._entries.popleft()
+        if overflow > 0:
+            # Warn on the first drop and then once per 1000 dropped entries
+            if self.dropped == 0 or self.dropped // 1000 != (self.dropped + overflow) // 1000:
+                logger.warning(f"Log buffer full, dropped {self.dropped + overflow} oldest entries so far")
+            self.dropped += overflow
+
+    def _ensure_flusher(self):
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._run())
+
+    async def _run(self):
+        """Deliver batches until cancelled"""
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self._next_delay())
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            while self._entries:
+                if not await self._flush_batch():
+                    break
+
+    def _next_delay(self) -> float:
+        if not self._failures:
+            return self.flush_interval
+        return min(self.flush_interval * (2 ** self._failures), self.max_backoff)
+
+    async def _flush_batch(self) -> bool:
+        """Send one batch; on failure put it back (subject to drop-oldest)"""
+        batch = [self._entries.popleft() for _ in range(min(self.batch_size, len(self._entries)))]
+        try:
+            await self.send_batch(batch)
+        except asyncio.CancelledError:
+            self._entries.extendleft(reversed(batch))
+            raise
+        except Exception as e:
+            self.failed_batches += 1
+            self._failures += 1
+            # Entries added while sending are newer - keep them after the failed batch
+            self._entries.extendleft(reversed(batch))
+            self._trim()
+            logger.debug(f"Log delivery failed ({len(batch)} entries, retry in {self._next_delay():.1f}s): {e}")
+            return False
+
+        self._failures = 0
+        self.sent += len(batch)
+        self.batches += 1
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        """Delivery statistics"""
+        return {
+            "pending": len(self._entries),
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "failed_batches": self.failed_batches
+        }
+
+    async def close(self, timeout: float = 5.0):
+        """
+        Stop the flusher and make a final delivery attempt.
+
+        Args:
+            timeout: Seconds to spend on the final flush
+        """
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+
+        async def drain():
+            while self._entries and await self._flush_batch():
+                pass
+
+        try:
+            await asyncio.wait_for(drain(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+        if self._entries:
+            logger.warning(f"Discarding {len(self._entries)} undelivered log entries on shutdown")
@@ -0,0 +1,357 @@
+"""
+Size- and time-based rotation of the file-based MCP and hook logs.
+
+A log is rotated when it reaches max_bytes or when its first line is
+older than rotate_interval_hours. The rotated segment is renamed next to
+the active log as <log>.<YYYYmmdd-HHMMSS>[-N] and then gzipped
+(<log>.<...>.gz), so a sorted listing is chronological. Other processes
+may still append to a segment right after the rename, so it is only
+compressed once it has been idle for SEGMENT_IDLE_SECONDS and kept plain
+if it grew while being compressed. Retention keeps at most max_segments
+segments, none older than max_age_days.
+
+The policy is per project, in .claudetask/logs/rotation.json. It is read
+by RotatingLogHandler (MCP servers, at startup), by hook-logger.sh (on
+every hook run) and by the backend, which also edits it.
+"""
+
+import os
+import re
+import gzip
+import json
+import time
+import shutil
+import logging
+import logging.handlers
+import threading
+from dataclasses import dataclass, asdict, fields
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+# A segment is compressed once nobody wrote to it for this long: writers that
+# opened the log before it was moved finish their current line first
+SEGMENT_IDLE_SECONDS = 2.0
+# Compression attempts before a segment that keeps growing is left plain
+SEGMENT_COMPRESS_ATTEMPTS = 3
+
+
+def policy_file(project_path: PathLike) -> Path:
+    """Location of a project's log rotation policy"""
+    return Path(project_path) / ".claudetask" / "logs" / "rotation.json"
+
+
+@dataclass
+class LogRotationPolicy:
+    """
+    Rotation and retention settings of a project's logs.
+
+    Usage:
+        policy = LogRotationPolicy.load(project_path)
+        if rotation_due(log_file, policy):
+            rotate_log(log_file, policy)
+    """
+    max_bytes: int = 10 * 1024 * 1024  # Rotate at this size (0: never by size)
+    rotate_interval_hours: float = 24.0  # Rotate once the first line is this old (0: never by age)
+    max_segments: int = 20  # Rotated segments kept per log (0: no limit)
+    max_age_days: float = 30.0  # Delete segments older than this (0: no limit)
+    compress: bool = True  # Gzip rotated segments
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LogRotationPolicy":
+        """Policy from a (possibly partial) dict; unknown keys are ignored"""
+        names = {f.name for f in fields(cls)}
+        return cls(**{key: value for key, value in data.items() if key in names})
+
+    @classmethod
+    def load(cls, project_path: PathLike) -> "LogRotationPolicy":
+        """Project's policy, or the defaults if it has none (or it is unreadable)"""
+        path = policy_file(project_path)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return cls.from_dict(json.load(f))
+        except FileNotFoundError:
+            return cls()
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Ignoring invalid log rotation policy {path}: {e}")
+            return cls()
+
+    def save(self, project_path: PathLike) -> Path:
+        """Write the policy to the project's rotation.json"""
+        path = policy_file(project_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(asdict(self), f, indent=2)
+        return path
+
+
+# ==================
+# Segments
+# ==================
+
+def _segment_pattern(log_file: Path) -> "re.Pattern":
+    return re.compile(rf"^{re.escape(log_file.name)}\.(\d{{8}}-\d{{6}})(?:-(\d+))?(\.gz)?$")
+
+
+def segment_key(segment: PathLike) -> str:
+    """Name of a segment without its .gz suffix (stable across compression)"""
+    name = Path(segment).name
+    return name[:-3] if name.endswith(".gz") else name
+
+
+def log_segments(log_file: PathLike) -> List[Path]:
+    """
+    Rotated segments of a log, oldest first.
+
+    A segment that exists both plain and gzipped (compression just finished)
+    is listed once, as the .gz file.
+    """
+    log_file = Path(log_file)
+    pattern = _segment_pattern(log_file)
+    found: Dict[str, tuple] = {}
+    try:
+        names = os.listdir(log_file.parent)
+    except FileNotFoundError:
+        return []
+    for name in names:
+        match = pattern.match(name)
+        if match:
+            key = segment_key(name)
+            if key not in found or match.group(3):
+                found[key] = ((match.group(1), int(match.group(2) or 0)), log_file.parent / name)
+    return [path for _, path in sorted(found.values())]
+
+
+def log_started_at(log_file: PathLike) -> Optional[float]:
+    """Time of a log's first line (both log formats start with YYYY-MM-DD HH:MM:SS)"""
+    try:
+        with open(log_file, "rb") as f:
+            head = f.read(19).decode("ascii")
+        return time.mktime(time.strptime(head, "%Y-%m-%d %H:%M:%S"))
+    except (OSError, ValueError, UnicodeDecodeError):
+        return None
+
+
+def rotation_due(log_file: PathLike, policy: LogRotationPolicy, size: Optional[int] = None) -> bool:
+    """Whether a log has reached the policy's size or age"""
+    if size is None:
+        try:
+            size = os.path.getsize(log_file)
+        except OSError:
+            return False
+    if size <= 0:
+        return False
+    if policy.max_bytes > 0 and size >= policy.max_bytes:
+        return True
+    if policy.rotate_interval_hours > 0:
+        started = log_started_at(log_file)
+        return started is not None and time.time() - started >= policy.rotate_interval_hours * 3600
+    return False
+
+
+def _wait_until_idle(segment: Path, idle_seconds: float) -> os.stat_result:
+    """Sleep until a file has not been modified for idle_seconds; returns its stat"""
+    while True:
+        stat = segment.stat()
+        idle = time.time() - stat.st_mtime
+        if idle >= idle_seconds:
+            return stat
+        time.sleep(idle_seconds - idle)
+
+
+def compress_segment(segment: PathLike, idle_seconds: float = SEGMENT_IDLE_SECONDS) -> Path:
+    """
+    Gzip a plain segment (atomically: readers see either the plain or the .gz file).
+
+    Waits until the segment has been idle for idle_seconds, and keeps the
+    plain file if it was written to while being compressed (retrying up to
+    SEGMENT_COMPRESS_ATTEMPTS times), so late appends are never lost.
+
+    Args:
+        segment: Plain rotated segment
+        idle_seconds: Time without writes before compressing
+
+    Returns:
+        The .gz segment, or the plain one if compression failed
+    """
+    segment = Path(segment)
+    target = segment.with_name(segment.name + ".gz")
+    partial = segment.with_name(segment.name + ".gz.tmp")
+    try:
+        for _ in range(SEGMENT_COMPRESS_ATTEMPTS):
+            before = _wait_until_idle(segment, idle_seconds)
+            with open(segment, "rb") as source, gzip.open(partial, "wb") as sink:
+                shutil.copyfileobj(source, sink, 1 << 20)
+            if _changed(segment, before):
+                continue
+            shutil.copystat(segment, partial)
+            os.replace(partial, target)
+            # Re-check before unlink: a write that slipped in keeps the plain file
+            if _changed(segment, before):
+                target.unlink()
+                continue
+            segment.unlink()
+            return target
+
+        logger.warning(f"Log segment {segment} is still being written, left uncompressed")
+    except OSError as e:
+        logger.warning(f"Could not compress log segment {segment}: {e}")
+    try:
+        partial.unlink()
+    except OSError:
+        pass
+    return segment
+
+
+def _changed(segment: Path, before: os.stat_result) -> bool:
+    stat = segment.stat()
+    return (stat.st_size, stat.st_mtime_ns) != (before.st_size, before.st_mtime_ns)
+
+
+def prune_segments(log_file: PathLike, policy: LogRotationPolicy) -> List[Path]:
+    """
+    Delete segments beyond the policy's count and age limits.
+
+    Returns:
+        Deleted segments
+    """
+    segments = log_segments(log_file)
+    expired = []
+    if policy.max_segments > 0 and len(segments) > policy.max_segments:
+        expired = segments[:len(segments) - policy.max_segments]
+        segments = segments[len(expired):]
+    if policy.max_age_days > 0:
+        cutoff = time.time() - policy.max_age_days * 86400
+        for segment in segments:
+            try:
+                if segment.stat().st_mtime < cutoff:
+                    expired.append(segment)
+            except FileNotFoundError:
+                continue
+
+    deleted = []
+    for segment in expired:
+        try:
+            segment.unlink()
+            deleted.append(segment)
+        except FileNotFoundError:
+            continue
+        except OSError as e:
+            logger.warning(f"Could not delete expired log segment {segment}: {e}")
+    return deleted
+
+
+def rotate_log(log_file: PathLike, policy: LogRotationPolicy, background: bool = False) -> Optional[Path]:
+    """
+    Move the active log aside as a new segment, then compress and prune.
+
+    Writers that reopen the log by name (FileHandler after a reopen, `>>` in
+    shell scripts) continue in a fresh file; writes already in flight land in
+    the segment, which compress_segment only gzips once it is idle.
+
+    Args:
+        log_file: Active log
+        policy: Rotation policy
+        background: Compress and prune on a daemon thread
+
+    Returns:
+        The new (plain) segment, or None if the log was already moved
+    """
+    log_file = Path(log_file)
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    segment = log_file.with_name(f"{log_file.name}.{stamp}")
+    suffix = 0
+    while segment.exists() or segment.with_name(segment.name + ".gz").exists():
+        suffix += 1
+        segment = log_file.with_name(f"{log_file.name}.{stamp}-{suffix}")
+    try:
+        os.rename(log_file, segment)
+    except FileNotFoundError:
+        return None
+
+    def finish():
+        if policy.compress:
+            compress_segment(segment)
+        prune_segments(log_file, policy)
+
+    if background:
+        threading.Thread(target=finish, name="log-rotation", daemon=True).start()
+    else:
+        finish()
+    return segment
+
+
+# ==================
+# Handler
+# ==================
+
+class RotatingLogHandler(logging.handlers.WatchedFileHandler):
+    """
+    File handler that rotates its log by size and age.
+
+    Several processes may write the same log (one MCP server per Claude
+    session): the log is reopened when another process rotated it, so no
+    process keeps writing to a moved segment.
+
+    Usage:
+        policy = LogRotationPolicy.load(project_path)
+        handler = RotatingLogHandler(log_dir / "mcp_calls.log", policy)
+    """
+
+    def __init__(self, filename: PathLike, policy: LogRotationPolicy, encoding: str = "utf-8"):
+        """
+        Open the log for appending.
+
+        Args:
+            filename: Log file
+            policy: Rotation policy
+            encoding: File encoding
+        """
+        self.policy = policy
+        super().__init__(filename, encoding=encoding)
+        self._rotate_at = self._next_rotation()
+
+    def _next_rotation(self) -> Optional[float]:
+        if self.policy.rotate_interval_hours <= 0:
+            return None
+        started = log_started_at(self.baseFilename) or time.time()
+        return started + self.policy.rotate_interval_hours * 3600
+
+    def reopenIfNeeded(self):
+        inode = self.ino
+        super().reopenIfNeeded()
+        if self.ino != inode:
+            self._rotate_at = self._next_rotation()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.reopenIfNeeded()
+            if self._rotation_due(record):
+                self._rotate()
+        except Exception:
+            self.handleError(record)
+            return
+        logging.FileHandler.emit(self, record)
+
+    def _rotation_due(self, record: logging.LogRecord) -> bool:
+        if self.stream is None:
+            return False
+        self.stream.seek(0, 2)  # Other processes append too
+        size = self.stream.tell()
+        if size <= 0:
+            return False
+        if self.policy.max_bytes > 0 and size + len(self.format(record)) + 1 >= self.policy.max_bytes:
+            return True
+        return self._rotate_at is not None and time.time() >= self._rotate_at
+
+    def _rotate(self) -> None:
+        self.stream.close()
+        self.stream = None
+        # (No logging here: this handler may be the one that would write it)
+        rotate_log(self.baseFilename, self.policy, background=True)
+        self.stream = self._open()
+        self._statstream()
+        self._rotate_at = self._next_rotation()
@@ -13,6 +13,7 @@ from pathlib import Path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from mcp_server.claudetask_mcp_bridge import ClaudeTaskMCPServer
+from mcp_server.log_rotation import LogRotationPolicy, RotatingLogHandler
 
 # Initial basic logging to stderr (will be reconfigured with file handler later)
 logging.basicConfig(
@@ -27,7 +28,8 @@ def setup_file_logging(project_path: str):
     """Setup file logging to project's .claudetask folder.
 
     Only used when storage_mode is 'local'. For 'mongodb' mode,
-    logs are sent directly to MongoDB via API.
+    logs are sent directly to MongoDB via API. The log is rotated per
+    the project's .claudetask/logs/rotation.json.
     """
     log_dir = Path(project_path) / ".claudetask" / "logs" / "mcp"
     log_dir.mkdir(parents=True, exist_ok=True)
@@ -35,7 +37,7 @@ def setup_file_logging(project_path: str):
     log_file = log_dir / "mcp_calls.log"
 
     # Add file handler to root logger so all loggers write to file
-    file_handler = logging.FileHandler(log_file, encoding='utf-8')
+    file_handler = RotatingLogHandler(log_file, LogRotationPolicy.load(project_path))
     file_handler.setLevel(logging.INFO)
     file_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
 
@@ -191,6 +191,7 @@ class MongoDBRAGService:
             async with httpx.AsyncClient(timeout=300.0) as client:  # 5 min timeout for large repos
                 response = await client.post(
                     f"{self.config.backend_url}/api/codebase/{self.project_id}/index",
+                    params={"wait": "true"},  # Statistics of the finished indexing job
                     json={
                         "repo_path": repo_path,
                         "full_reindex": True
@@ -229,6 +230,7 @@ class MongoDBRAGService:
             async with httpx.AsyncClient(timeout=120.0) as client:
                 response = await client.post(
                     f"{self.config.backend_url}/api/codebase/{self.project_id}/index-files",
+                    params={"wait": "true"},  # Statistics of the finished indexing job
                     json={
                         "file_paths": file_paths,
                         "repo_path": repo_path
@@ -266,6 +268,7 @@ class MongoDBRAGService:
             async with httpx.AsyncClient(timeout=300.0) as client:
                 response = await client.post(
                     f"{self.config.backend_url}/api/codebase/{self.project_id}/reindex",
+                    params={"wait": "true"},  # Statistics of the finished indexing job
                     json={"repo_path": repo_path}
                 )
 
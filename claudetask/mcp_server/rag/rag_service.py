@@ -7,21 +7,25 @@ This service provides semantic search capabilities across:
 
 Architecture:
 - ChromaDB: Vector database for embeddings storage
-- Sentence Transformers: Embedding generation (all-MiniLM-L6-v2)
+- Sentence Transformers or ONNX Runtime: Embedding generation (all-MiniLM-L6-v2)
 - Semantic chunking: Intelligent code splitting with summaries
 """
 
 import os
+import time
+import uuid
+import asyncio
 import logging
-from typing import List, Dict, Optional, Any, Set
-from dataclasses import dataclass
+from typing import Callable, List, Dict, Optional, Any, Set, Tuple
+from dataclasses import dataclass, field
 from pathlib import Path
 
 import chromadb
 from chromadb.config import Settings
-from sentence_transformers import SentenceTransformer
 import git
 
+from retrieval import LexicalIndex, looks_like_identifier, reciprocal_rank_fusion, query_cache
+
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +41,24 @@ class RAGConfig:
     relevance_threshold: float = 0.7
     enable_caching: bool = True
     cache_size: int = 1000
+    embedding_cache_path: Optional[str] = None  # default: embedding_cache.db next to chromadb_path
+    embedding_cache_max_entries: int = 200_000
+    task_vectors_path: Optional[str] = None  # default: task_vectors/ next to chromadb_path
+    embedding_batch_size: int = 64  # texts per model forward pass
+    # Engine: "torch" (sentence-transformers), "onnx" (ONNX Runtime, optionally int8)
+    # or "remote" (backend's shared embedding endpoint at embedding_service_url)
+    embedding_backend: str = field(default_factory=lambda: os.getenv("CLAUDETASK_EMBEDDING_BACKEND", "torch"))
+    embedding_service_url: Optional[str] = field(default_factory=lambda: os.getenv("CLAUDETASK_EMBEDDING_URL"))
+    embedding_threads: int = field(default_factory=lambda: int(os.getenv("CLAUDETASK_EMBEDDING_THREADS", "0")))
+    embedding_quantize: bool = field(
+        default_factory=lambda: os.getenv("CLAUDETASK_EMBEDDING_QUANTIZE", "true").lower() in ("1", "true", "yes")
+    )
+    index_batch_size: int = 512  # chunks accumulated across files before embedding
+    upsert_batch_size: int = 1000  # rows per ChromaDB upsert call
+    index_workers: int = 0  # chunking worker processes (0 = CPU count)
+    index_queue_size: int = 64  # chunked files buffered ahead of embedding
+    chunk_level_reindex: bool = True  # diff chunks by content ID instead of delete-all per file
+    git_change_detection: bool = True  # find changed files via git instead of hashing the tree
 
 
 @dataclass
@@ -54,6 +76,26 @@ class CodeChunk:
     symbols: List[str]  # function names, class names, etc.
 
 
+@dataclass
+class PendingFileChunks:
+    """
+    Reindexed files waiting for their new chunks to be embedded.
+
+    Stale chunks are deleted and moved ones updated only when the new
+    chunks are upserted (see RAGService._flush_pending_files), so a failed
+    run never leaves a file with neither its old nor its new chunks.
+    """
+    added: List[Dict[str, Any]] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    moved: List[Dict[str, Any]] = field(default_factory=list)
+
+    def extend(self, added: List[Dict[str, Any]], removed: List[str], moved: List[Dict[str, Any]]):
+        """Queue one file's result of RAGService._sync_file_chunks"""
+        self.added.extend(added)
+        self.removed.extend(removed)
+        self.moved.extend(moved)
+
+
 @dataclass
 class RAGSearchResult:
     """Search result from RAG system"""
@@ -70,18 +112,41 @@ class RAGService:
 
     Features:
     - Semantic code search with ChromaDB
+    - Lexical (BM25) and hybrid code search with exact symbol lookup
     - Task similarity matching
     - Automatic context assembly for task analysis
     - Incremental indexing on code changes
     """
 
+    # Supported file extensions
+    SUPPORTED_EXTENSIONS = {
+        '.py', '.js', '.ts', '.tsx', '.jsx',
+        '.java', '.cs', '.go', '.rs', '.cpp', '.c',
+        '.rb', '.php', '.swift', '.kt'
+    }
+
+    # Code search modes
+    SEARCH_MODES = ("semantic", "lexical", "hybrid")
+
+    # Directories to skip
+    SKIP_DIRS = {
+        'node_modules', 'venv', '__pycache__', '.git',
+        'dist', 'build', '.next', 'target', 'bin', 'obj',
+        '.claudetask', 'worktrees'
+    }
+
     def __init__(self, config: RAGConfig):
         """Initialize RAG service with configuration"""
         self.config = config
         self.client: Optional[chromadb.Client] = None
-        self.embedding_model: Optional[SentenceTransformer] = None
+        self.embedding_model = None  # TorchEmbedder or OnnxEmbedder
         self.codebase_collection = None
         self.tasks_collection = None
+        self.task_vectors = None  # EmbeddingStore mirroring task_history for similarity search
+        self.lexical_index: Optional[LexicalIndex] = None  # BM25 over codebase_chunks, built on first use
+        self._lexical_version: Optional[str] = None  # codebase version marker the lexical index is current with
+        self._lexical_lock = asyncio.Lock()
+        self.embedding_cache = None
 
         logger.info(f"RAG Service initializing with model: {config.embedding_model}")
 
@@ -103,10 +168,36 @@ class RAGService:
             await self._initialize_collections()
 
             # Load embedding model
-            logger.info(f"Loading embedding model: {self.config.embedding_model}")
-            self.embedding_model = SentenceTransformer(self.config.embedding_model)
+            from embeddings import create_local_embedder
+
+            logger.info(
+                f"Loading embedding model: {self.config.embedding_model} "
+                f"({self.config.embedding_backend} backend)"
+            )
+            self.embedding_model = await asyncio.to_thread(
+                create_local_embedder,
+                self.config.embedding_model,
+                self.config.embedding_backend,
+                self.config.embedding_threads,
+                self.config.embedding_quantize,
+                self.config.embedding_service_url
+            )
             logger.info("Embedding model loaded successfully")
 
+            task_vectors_path = self.config.task_vectors_path or str(chromadb_path.parent / "task_vectors")
+            await asyncio.to_thread(self._open_task_vectors, task_vectors_path)
+
+            # Content-addressed embedding cache shared with other indexers
+            if self.config.enable_caching:
+                from embeddings import get_embedding_cache
+
+                cache_path = self.config.embedding_cache_path or str(chromadb_path.parent / "embedding_cache.db")
+                self.embedding_cache = get_embedding_cache(
+                    cache_path,
+                    max_entries=self.config.embedding_cache_max_entries
+                )
+                logger.info(f"Embedding cache enabled at {cache_path}")
+
             logger.info("RAG Service initialized successfully")
 
         except Exception as e:
@@ -142,6 +233,41 @@ class RAGService:
             logger.error(f"Failed to initialize collections: {e}")
             raise
 
+    def _open_task_vectors(self, path: str):
+        """
+        Open the task embedding store, rebuilding it from the task_history
+        collection if it is missing or out of sync (e.g. tasks indexed by an
+        older version).
+
+        The check and the rebuild hold the store's lock file, so other MCP
+        processes sharing the store never see it half rebuilt.
+        """
+        from embeddings.embedding_store import EmbeddingStore
+
+        dimensions = self.embedding_model.get_sentence_embedding_dimension()
+        try:
+            store = EmbeddingStore(path, dimensions)
+        except ValueError:
+            # Embedding model changed: vectors are rebuilt from the collection
+            import shutil
+            shutil.rmtree(path, ignore_errors=True)
+            store = EmbeddingStore(path, dimensions)
+
+        with store.locked():
+            task_count = self.tasks_collection.count()
+            if len(store) != task_count:
+                vectors = []
+                if task_count:
+                    existing = self.tasks_collection.get(include=["embeddings"])
+                    vectors = [
+                        (id, embedding) for id, embedding in zip(existing["ids"], existing["embeddings"])
+                        if len(embedding) == dimensions
+                    ]
+                store.rebuild([id for id, _ in vectors], [embedding for _, embedding in vectors])
+                logger.info(f"Rebuilt task embedding store: {len(store)} tasks")
+
+        self.task_vectors = store
+
     async def index_exists(self) -> bool:
         """Check if RAG index already exists"""
         try:
@@ -155,81 +281,286 @@ class RAGService:
         self,
         query: str,
         top_k: int = None,
-        filters: Optional[Dict] = None
+        filters: Optional[Dict] = None,
+        mode: str = "hybrid"
     ) -> List[CodeChunk]:
         """
         Search codebase for relevant code chunks.
 
+        In lexical and hybrid mode, a query that is a bare identifier naming
+        a defined symbol returns the defining chunks without embedding the
+        query. Filters other than plain field equality are only supported
+        by semantic search; such queries fall back to semantic mode.
+
         Args:
-            query: Natural language query
+            query: Natural language query or identifiers
             top_k: Number of results to return
             filters: Optional metadata filters (file_type, repository, etc.)
+            mode: "semantic" (embeddings), "lexical" (BM25) or "hybrid" (both,
+                  fused with reciprocal rank fusion)
 
         Returns:
             List of relevant code chunks ranked by relevance
+
+        Raises:
+            ValueError: If mode is unknown
         """
         if not self.embedding_model:
             raise RuntimeError("RAG service not initialized")
+        if mode not in self.SEARCH_MODES:
+            raise ValueError(f"Unknown search mode '{mode}' (expected one of {', '.join(self.SEARCH_MODES)})")
 
         top_k = top_k or self.config.top_k_default
 
         try:
-            # Generate query embedding
-            query_embedding = self.embedding_model.encode(query).tolist()
-
-            # Search ChromaDB
-            results = self.codebase_collection.query(
-                query_embeddings=[query_embedding],
-                n_results=top_k,
-                where=filters if filters else {}
+            # Cached per index version; the collection size and version marker
+            # catch writes by other processes
+            return await query_cache.results(
+                self._cache_scope("codebase"),
+                (
+                    self.codebase_collection.count(), self._read_codebase_version(),
+                    query, top_k, repr(filters), mode
+                ),
+                lambda: self._search_codebase(query, top_k, filters, mode)
             )
+        except Exception as e:
+            logger.error(f"Codebase search failed: {e}")
+            return []
 
-            # Convert to CodeChunk objects with deduplication
-            code_chunks = []
-            seen_chunks = set()  # Track unique chunks by (file_path, start_line, end_line)
+    async def _search_codebase(
+        self,
+        query: str,
+        top_k: int,
+        filters: Optional[Dict],
+        mode: str
+    ) -> List[CodeChunk]:
+        """Run a code search (uncached)"""
+        lexical_filters = self._lexical_filters(filters)
+        if lexical_filters is None:
+            mode = "semantic"
 
-            if results and results['ids'] and len(results['ids']) > 0:
-                ids = results['ids'][0]
-                metadatas = results['metadatas'][0]
-                documents = results['documents'][0]
+        if mode == "semantic":
+            code_chunks = await self._semantic_search(query, top_k, filters)
+            logger.info(f"Code search returned {len(code_chunks)} results")
+            return code_chunks
 
-                for i in range(len(ids)):
-                    metadata = metadatas[i]
+        index = await self._get_lexical_index()
 
-                    # Create unique identifier for deduplication
-                    chunk_key = (
-                        metadata.get('file_path', ''),
-                        metadata.get('start_line', 0),
-                        metadata.get('end_line', 0)
-                    )
+        if looks_like_identifier(query):
+            ids = index.lookup_symbol(query, lexical_filters)[:top_k]
+            if ids:
+                logger.info(f"Symbol lookup answered '{query}' with {len(ids)} chunks")
+                return self._get_code_chunks(ids)
 
-                    # Skip if we've already seen this chunk
-                    if chunk_key in seen_chunks:
-                        logger.debug(f"Skipping duplicate chunk: {chunk_key}")
-                        continue
+        if mode == "lexical":
+            ids = [id for id, _ in index.search(query, top_k, lexical_filters)]
+            code_chunks = self._get_code_chunks(ids)
+        else:
+            # Hybrid: fuse the two rankings, each over twice the requested results
+            semantic = await self._semantic_search(query, top_k * 2, filters)
+            lexical = index.search(query, top_k * 2, lexical_filters)
+            fused = reciprocal_rank_fusion([
+                [chunk.chunk_id for chunk in semantic],
+                [id for id, _ in lexical]
+            ])[:top_k]
+
+            by_id = {chunk.chunk_id: chunk for chunk in semantic}
+            missing = [id for id, _ in fused if id not in by_id]
+            by_id.update((chunk.chunk_id, chunk) for chunk in self._get_code_chunks(missing))
+            code_chunks = [by_id[id] for id, _ in fused if id in by_id]
+
+        logger.info(f"Code search ({mode}) returned {len(code_chunks)} results")
+        return code_chunks
+
+
+    async def _semantic_search(self, query: str, top_k: int, filters: Optional[Dict]) -> List[CodeChunk]:
+        """Embedding search over the codebase collection"""
+        query_embedding = await self._query_embedding(query)
+
+        # Search ChromaDB
+        results = self.codebase_collection.query(
+            query_embeddings=[query_embedding],
+            n_results=top_k,
+            where=filters if filters else {}
+        )
 
-                    seen_chunks.add(chunk_key)
-
-                    chunk = CodeChunk(
-                        chunk_id=ids[i],
-                        repository="main",
-                        file_path=metadata.get('file_path', ''),
-                        start_line=metadata.get('start_line', 0),
-                        end_line=metadata.get('end_line', 0),
-                        content=documents[i],
-                        summary=metadata.get('summary', ''),
-                        language=metadata.get('language', 'unknown'),
-                        chunk_type=metadata.get('chunk_type', 'unknown'),
-                        symbols=metadata.get('symbols', '').split(',') if metadata.get('symbols') else []
-                    )
-                    code_chunks.append(chunk)
+        # Convert to CodeChunk objects with deduplication
+        code_chunks = []
+        seen_chunks = set()  # Track unique chunks by (file_path, start_line, end_line)
 
-            logger.info(f"Code search returned {len(code_chunks)} results")
-            return code_chunks
+        if results and results['ids'] and len(results['ids']) > 0:
+            ids = results['ids'][0]
+            metadatas = results['metadatas'][0]
+            documents = results['documents'][0]
 
-        except Exception as e:
-            logger.error(f"Codebase search failed: {e}")
+            for i in range(len(ids)):
+                metadata = metadatas[i]
+
+                # Create unique identifier for deduplication
+                chunk_key = (
+                    metadata.get('file_path', ''),
+                    metadata.get('start_line', 0),
+                    metadata.get('end_line', 0)
+                )
+
+                # Skip if we've already seen this chunk
+                if chunk_key in seen_chunks:
+                    logger.debug(f"Skipping duplicate chunk: {chunk_key}")
+                    continue
+
+                seen_chunks.add(chunk_key)
+                code_chunks.append(self._to_code_chunk(ids[i], documents[i], metadata))
+
+        return code_chunks
+
+    async def _query_embedding(self, query: str) -> List[float]:
+        """Embedding of a search query (repeated queries come from the query cache)"""
+        async def encode():
+            return self.embedding_model.encode(query).tolist()
+
+        return await query_cache.embedding(self.embedding_model.cache_key, query, encode)
+
+    def _cache_scope(self, index: str, project_id: Optional[str] = None) -> tuple:
+        """Query cache scope of one of this service's collections"""
+        return ("chroma", self.config.chromadb_path, index, project_id)
+
+    def _to_code_chunk(self, chunk_id: str, document: str, metadata: Dict[str, Any]) -> CodeChunk:
+        return CodeChunk(
+            chunk_id=chunk_id,
+            repository="main",
+            file_path=metadata.get('file_path', ''),
+            start_line=metadata.get('start_line', 0),
+            end_line=metadata.get('end_line', 0),
+            content=document,
+            summary=metadata.get('summary', ''),
+            language=metadata.get('language', 'unknown'),
+            chunk_type=metadata.get('chunk_type', 'unknown'),
+            symbols=metadata.get('symbols', '').split(',') if metadata.get('symbols') else []
+        )
+
+    def _get_code_chunks(self, ids: List[str]) -> List[CodeChunk]:
+        """Load chunks by ID, in the given order"""
+        if not ids:
             return []
+        results = self.codebase_collection.get(ids=ids, include=["documents", "metadatas"])
+        found = {
+            id: self._to_code_chunk(id, document, metadata or {})
+            for id, document, metadata in zip(results['ids'], results['documents'], results['metadatas'])
+        }
+        return [found[id] for id in ids if id in found]
+
+    # ========================
+    # Lexical Index
+    # ========================
+
+    @staticmethod
+    def _lexical_filters(filters: Optional[Dict]) -> Optional[Dict[str, Any]]:
+        """Equality filters usable by the lexical index (None if filters use Chroma operators)"""
+        if not filters:
+            return {}
+        if any(field.startswith('$') or isinstance(value, dict) for field, value in filters.items()):
+            return None
+        return dict(filters)
+
+    @staticmethod
+    def _lexical_document(chunk_id: str, document: str, metadata: Dict[str, Any]):
+        symbols = metadata.get('symbols') or ''
+        return (
+            chunk_id,
+            document or '',
+            symbols.split(',') if symbols else [],
+            {field: metadata.get(field) for field in ('file_path', 'language', 'chunk_type')}
+        )
+
+    def _codebase_version_path(self) -> Path:
+        return Path(self.config.chromadb_path).parent / "codebase_version"
+
+    def _read_codebase_version(self) -> str:
+        """Marker rewritten by every process after it changes codebase_chunks"""
+        try:
+            return self._codebase_version_path().read_text()
+        except FileNotFoundError:
+            return ""
+
+    def _mark_codebase_changed(self):
+        """Publish a new codebase version marker after writing to codebase_chunks"""
+        previous = self._read_codebase_version()
+        version = uuid.uuid4().hex
+
+        path = self._codebase_version_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(version)
+        os.replace(tmp_path, path)
+
+        # Our writes are applied to the lexical index in place; if another
+        # process wrote since it was last current, it is rebuilt on next use
+        self._lexical_version = version if previous == self._lexical_version else None
+
+    def _lexical_index_current(self, version: str) -> bool:
+        return (
+            self.lexical_index is not None
+            and version == self._lexical_version
+            and len(self.lexical_index) == self.codebase_collection.count()
+        )
+
+    async def _get_lexical_index(self) -> LexicalIndex:
+        """
+        BM25 index over codebase_chunks, built from the collection on first use.
+
+        The collection is shared with other MCP processes: the index is
+        rebuilt when the codebase version marker or the collection size
+        shows writes it has not seen.
+        """
+        version = self._read_codebase_version()
+        if self._lexical_index_current(version):
+            return self.lexical_index
+
+        async with self._lexical_lock:
+            version = self._read_codebase_version()
+            if not self._lexical_index_current(version):
+                stale = self.lexical_index is not None
+
+                def build() -> LexicalIndex:
+                    existing = self.codebase_collection.get(include=["documents", "metadatas"])
+                    index = LexicalIndex()
+                    index.add_many(
+                        self._lexical_document(id, document, metadata or {})
+                        for id, document, metadata in zip(
+                            existing['ids'], existing['documents'], existing['metadatas']
+                        )
+                    )
+                    return index
+
+                self.lexical_index = await asyncio.to_thread(build)
+                self._lexical_version = version
+                if stale:
+                    # Changed by another process: cached searches are stale too
+                    query_cache.bump(self._cache_scope("codebase"))
+                logger.info(f"{'Rebuilt' if stale else 'Built'} lexical code index: {self.lexical_index.stats()}")
+
+        return self.lexical_index
+
+    def _lexical_remove(self, ids: List[str]):
+        """Apply removed chunks to the lexical index and invalidate cached code searches"""
+        if not ids:
+            return
+        query_cache.bump(self._cache_scope("codebase"))
+        self._mark_codebase_changed()
+        if self.lexical_index is not None:
+            self.lexical_index.remove(ids)
+
+    def _lexical_add(self, records: List[Dict[str, Any]]):
+        """Apply written chunks to the lexical index and invalidate cached code searches"""
+        if not records:
+            return
+        query_cache.bump(self._cache_scope("codebase"))
+        self._mark_codebase_changed()
+        if self.lexical_index is not None:
+            self.lexical_index.add_many(
+                self._lexical_document(record['id'], record['document'], record['metadata'])
+                for record in records
+            )
 
     async def find_similar_tasks(
         self,
@@ -250,49 +581,48 @@ class RAGService:
             raise RuntimeError("RAG service not initialized")
 
         try:
-            # Generate query embedding
-            query_embedding = self.embedding_model.encode(task_description).tolist()
-
-            # Search tasks collection
-            results = self.tasks_collection.query(
-                query_embeddings=[query_embedding],
-                n_results=top_k
-            )
+            # Exact cosine top-k over the memory-mapped task vectors (extra
+            # candidates make up for duplicate entries of one task)
+            query_embedding = self.embedding_model.encode(task_description)
+            hits = self.task_vectors.search(query_embedding, k=top_k * 2)[0]
 
-            # Convert to task dictionaries with deduplication
+            # Documents and metadata stay in ChromaDB
             similar_tasks = []
             seen_tasks = set()  # Track unique tasks by task_id
+            if hits:
+                results = self.tasks_collection.get(
+                    ids=[id for id, _ in hits],
+                    include=["documents", "metadatas"]
+                )
+                records = {
+                    id: (document, metadata)
+                    for id, document, metadata in zip(results['ids'], results['documents'], results['metadatas'])
+                }
 
-            if results and results['ids'] and len(results['ids']) > 0:
-                ids = results['ids'][0]
-                metadatas = results['metadatas'][0]
-                documents = results['documents'][0]
-                distances = results.get('distances', [[]])[0] if 'distances' in results else []
-
-                for i in range(len(ids)):
-                    metadata = metadatas[i]
+                for id, similarity in hits:
+                    if id not in records:
+                        continue
+                    document, metadata = records[id]
                     task_id = metadata.get('task_id')
 
                     # Skip if we've already seen this task
                     if task_id in seen_tasks:
                         logger.debug(f"Skipping duplicate task: {task_id}")
                         continue
-
                     seen_tasks.add(task_id)
 
-                    # Convert distance to similarity (1 - distance for L2, higher is better)
-                    similarity = 1.0 - distances[i] if i < len(distances) else 0.0
-
                     task = {
                         'task_id': task_id,
                         'title': metadata.get('title', ''),
                         'task_type': metadata.get('task_type', ''),
                         'priority': metadata.get('priority', ''),
                         'status': metadata.get('status', ''),
-                        'content': documents[i],
+                        'content': document,
                         'similarity': similarity
                     }
                     similar_tasks.append(task)
+                    if len(similar_tasks) == top_k:
+                        break
 
             logger.info(f"Found {len(similar_tasks)} similar tasks")
             return similar_tasks
@@ -370,108 +700,96 @@ class RAGService:
 
         return (code_score + task_score) / 2.0
 
-    async def index_codebase(self, repo_path: str):
+    async def index_codebase(
+        self,
+        repo_path: str,
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> Dict[str, Any]:
         """
         Index entire codebase.
         Called on first RAG initialization.
 
+        Runs as a staged pipeline: discovery in a worker thread, read + chunk
+        in a process pool, and batched embedding/upsert in the consumer
+        (see RAGConfig.index_batch_size), with bounded queues in between.
+
         Args:
             repo_path: Path to repository root
+            progress_callback: Called with (files_done, files_total) as files complete
+
+        Returns:
+            Statistics including throughput in chunks/sec
         """
         logger.info(f"Starting codebase indexing from {repo_path}")
 
-        from chunking import GenericChunker
-        import os
+        from chunking import ChunkingPipeline
 
-        chunker = GenericChunker(
+        pipeline = ChunkingPipeline(
             chunk_size=self.config.chunk_size,
-            chunk_overlap=self.config.chunk_overlap
+            chunk_overlap=self.config.chunk_overlap,
+            max_workers=self.config.index_workers or None,
+            queue_size=self.config.index_queue_size
         )
 
-        # Supported file extensions
-        supported_extensions = {
-            '.py', '.js', '.ts', '.tsx', '.jsx',
-            '.java', '.cs', '.go', '.rs', '.cpp', '.c',
-            '.rb', '.php', '.swift', '.kt'
-        }
-
-        # Directories to skip
-        skip_dirs = {
-            'node_modules', 'venv', '__pycache__', '.git',
-            'dist', 'build', '.next', 'target', 'bin', 'obj',
-            '.claudetask', 'worktrees'
-        }
-
+        start_time = time.time()
         total_chunks = 0
         indexed_files = 0
+        chunk_stats = self._new_chunk_stats()
+        pending = PendingFileChunks()
+        files_done = 0
+        files_total = 0
+
+        async def on_file(chunked):
+            nonlocal total_chunks, indexed_files, pending, files_done
+
+            files_done += 1
+            if progress_callback:
+                progress_callback(files_done, files_total)
+
+            if chunked.error:
+                logger.warning(f"Failed to index {chunked.file_path}: {chunked.error}")
+                return
+
+            records = self._prepare_file_records(None, chunked.relative_path, chunked.chunks)
+            pending.extend(*self._sync_file_chunks(chunked.relative_path, records, chunk_stats))
+
+            indexed_files += 1
+
+            if indexed_files % 10 == 0:
+                logger.info(f"Indexed {indexed_files} files, {total_chunks + len(pending.added)} chunks")
+
+            if len(pending.added) >= self.config.index_batch_size:
+                batch, pending = pending, PendingFileChunks()
+                total_chunks += await self._flush_pending_files(batch)
 
         try:
-            # Walk through repository
-            for root, dirs, files in os.walk(repo_path):
-                # Remove skip directories from dirs list (modifies in-place)
-                dirs[:] = [d for d in dirs if d not in skip_dirs]
-
-                for file in files:
-                    # Check file extension
-                    ext = os.path.splitext(file)[1].lower()
-                    if ext not in supported_extensions:
-                        continue
+            files = await pipeline.discover(repo_path, self.SUPPORTED_EXTENSIONS, self.SKIP_DIRS)
+            logger.info(f"Found {len(files)} files to index")
+            files_total = len(files)
+            if progress_callback:
+                progress_callback(0, files_total)
+
+            await pipeline.run(
+                (
+                    (file_path, relative_path, self._detect_language(os.path.splitext(file_path)[1]))
+                    for file_path, relative_path in files
+                ),
+                on_file
+            )
 
-                    file_path = os.path.join(root, file)
-                    relative_path = os.path.relpath(file_path, repo_path)
-
-                    try:
-                        # Read file content
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            content = f.read()
-
-                        # Detect language
-                        language = self._detect_language(ext)
-
-                        # Chunk the file
-                        chunks = chunker.chunk_code(content, relative_path, language)
-
-                        # Index each chunk
-                        for chunk_content, metadata in chunks:
-                            # Generate summary
-                            summary = chunker.generate_summary(chunk_content, metadata)
-
-                            # Create embedding
-                            embedding = self.embedding_model.encode(
-                                f"{summary}\n\n{chunk_content}"
-                            ).tolist()
-
-                            # Generate deterministic ID based on file path and line numbers
-                            chunk_id = f"{metadata.file_path}:{metadata.start_line}:{metadata.end_line}"
-
-                            # Upsert to ChromaDB (replaces if ID exists, adds if new)
-                            self.codebase_collection.upsert(
-                                ids=[chunk_id],
-                                embeddings=[embedding],
-                                documents=[chunk_content],
-                                metadatas=[{
-                                    'file_path': metadata.file_path,
-                                    'language': metadata.language,
-                                    'start_line': metadata.start_line,
-                                    'end_line': metadata.end_line,
-                                    'chunk_type': metadata.chunk_type,
-                                    'summary': summary,
-                                    'symbols': ','.join(metadata.symbols) if metadata.symbols else ''
-                                }]
-                            )
-
-                            total_chunks += 1
-
-                        indexed_files += 1
-
-                        if indexed_files % 10 == 0:
-                            logger.info(f"Indexed {indexed_files} files, {total_chunks} chunks")
-
-                    except Exception as e:
-                        logger.warning(f"Failed to index {file_path}: {e}")
-                        continue
+            total_chunks += await self._flush_pending_files(pending)
+
+            stats = self._indexing_stats(total_chunks, start_time)
+            stats['indexed_files'] = indexed_files
+            stats.update(chunk_stats)
+
+            logger.info(
+                f"Codebase indexing complete: {indexed_files} files, {total_chunks} chunks embedded "
+                f"({stats['chunks_per_second']} chunks/sec), {chunk_stats['chunks_kept']} kept, "
+                f"{chunk_stats['chunks_removed']} removed"
+            )
 
-            logger.info(f"Codebase indexing complete: {indexed_files} files, {total_chunks} chunks")
+            return stats
 
         except Exception as e:
             logger.error(f"Codebase indexing failed: {e}")
@@ -488,24 +806,19 @@ class RAGService:
         """
         logger.info(f"Starting indexing of {len(file_paths)} files")
 
-        from chunking import GenericChunker
-        import os
+        from chunking import CodeChunker
 
-        chunker = GenericChunker(
+        chunker = CodeChunker(
             chunk_size=self.config.chunk_size,
             chunk_overlap=self.config.chunk_overlap
         )
 
-        # Supported file extensions
-        supported_extensions = {
-            '.py', '.js', '.ts', '.tsx', '.jsx',
-            '.java', '.cs', '.go', '.rs', '.cpp', '.c',
-            '.rb', '.php', '.swift', '.kt'
-        }
-
+        start_time = time.time()
         total_chunks = 0
         indexed_files = 0
         skipped_files = 0
+        chunk_stats = self._new_chunk_stats()
+        pending = PendingFileChunks()
 
         try:
             for file_path in file_paths:
@@ -523,7 +836,7 @@ class RAGService:
 
                 # Check file extension
                 ext = os.path.splitext(abs_path)[1].lower()
-                if ext not in supported_extensions:
+                if ext not in self.SUPPORTED_EXTENSIONS:
                     logger.warning(f"Unsupported file type: {abs_path} (extension: {ext})")
                     skipped_files += 1
                     continue
@@ -531,14 +844,6 @@ class RAGService:
                 relative_path = os.path.relpath(abs_path, repo_path)
 
                 try:
-                    # Remove existing chunks for this file before re-indexing
-                    existing = self.codebase_collection.get(
-                        where={"file_path": relative_path}
-                    )
-                    if existing and existing['ids']:
-                        logger.info(f"Removing {len(existing['ids'])} existing chunks for {relative_path}")
-                        self.codebase_collection.delete(ids=existing['ids'])
-
                     # Read file content
                     with open(abs_path, 'r', encoding='utf-8') as f:
                         content = f.read()
@@ -549,59 +854,295 @@ class RAGService:
                     # Chunk the file
                     chunks = chunker.chunk_code(content, relative_path, language)
 
-                    # Index each chunk
-                    file_chunks = 0
-                    for chunk_content, metadata in chunks:
-                        # Generate summary
-                        summary = chunker.generate_summary(chunk_content, metadata)
-
-                        # Create embedding
-                        embedding = self.embedding_model.encode(
-                            f"{summary}\n\n{chunk_content}"
-                        ).tolist()
-
-                        # Generate deterministic ID based on file path and line numbers
-                        chunk_id = f"{metadata.file_path}:{metadata.start_line}:{metadata.end_line}"
-
-                        # Upsert to ChromaDB (replaces if ID exists, adds if new)
-                        self.codebase_collection.upsert(
-                            ids=[chunk_id],
-                            embeddings=[embedding],
-                            documents=[chunk_content],
-                            metadatas=[{
-                                'file_path': metadata.file_path,
-                                'language': metadata.language,
-                                'start_line': metadata.start_line,
-                                'end_line': metadata.end_line,
-                                'chunk_type': metadata.chunk_type,
-                                'summary': summary,
-                                'symbols': ','.join(metadata.symbols) if metadata.symbols else ''
-                            }]
-                        )
-
-                        file_chunks += 1
-                        total_chunks += 1
+                    # Keep unchanged chunks, queue new/modified ones, drop stale ones
+                    records = self._prepare_file_records(chunker, relative_path, chunks)
+                    pending.extend(*self._sync_file_chunks(relative_path, records, chunk_stats))
 
                     indexed_files += 1
-                    logger.info(f"Indexed {relative_path}: {file_chunks} chunks")
+                    logger.info(f"Chunked {relative_path}: {len(chunks)} chunks")
 
                 except Exception as e:
                     logger.error(f"Failed to index {abs_path}: {e}")
                     skipped_files += 1
                     continue
 
-            logger.info(f"File indexing complete: {indexed_files} indexed, {skipped_files} skipped, {total_chunks} total chunks")
+                if len(pending.added) >= self.config.index_batch_size:
+                    total_chunks += await self._flush_pending_files(pending)
+                    pending = PendingFileChunks()
+
+            total_chunks += await self._flush_pending_files(pending)
+
+            stats = self._indexing_stats(total_chunks, start_time)
+
+            logger.info(
+                f"File indexing complete: {indexed_files} indexed, {skipped_files} skipped, "
+                f"{total_chunks} total chunks ({stats['chunks_per_second']} chunks/sec)"
+            )
 
             return {
                 'indexed_files': indexed_files,
                 'skipped_files': skipped_files,
-                'total_chunks': total_chunks
+                'total_chunks': total_chunks,
+                'chunks_per_second': stats['chunks_per_second'],
+                **chunk_stats
             }
 
         except Exception as e:
             logger.error(f"File indexing failed: {e}")
             raise
 
+    def _prepare_file_records(self, chunker, relative_path: str, chunks: List[tuple]) -> List[Dict[str, Any]]:
+        """
+        Build records for all chunks of one file with stable content-based IDs.
+
+        Args:
+            chunker: Chunker used to generate summaries (unused if summaries given)
+            relative_path: File path relative to repository root
+            chunks: (content, metadata) or (content, metadata, summary) tuples
+
+        Returns:
+            Records in file order
+        """
+        from chunking import stable_chunk_ids
+
+        chunk_ids = stable_chunk_ids(relative_path, [(chunk[0], chunk[1]) for chunk in chunks])
+
+        return [
+            self._prepare_chunk_record(
+                chunker,
+                chunk[0],
+                chunk[1],
+                summary=chunk[2] if len(chunk) > 2 else None,
+                chunk_id=chunk_id
+            )
+            for chunk, chunk_id in zip(chunks, chunk_ids)
+        ]
+
+    def _prepare_chunk_record(
+        self,
+        chunker,
+        chunk_content: str,
+        metadata,
+        summary: Optional[str] = None,
+        chunk_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Build the ChromaDB record for a chunk (everything except the embedding).
+
+        Args:
+            chunker: Chunker used to generate the summary (unused if summary given)
+            chunk_content: Chunk source text
+            metadata: ChunkMetadata for the chunk
+            summary: Pre-computed summary (e.g. from a pipeline worker)
+            chunk_id: Stable ID from _prepare_file_records (default: file:start:end)
+
+        Returns:
+            Record dict with id, text to embed, document and metadata
+        """
+        if summary is None:
+            summary = chunker.generate_summary(chunk_content, metadata)
+
+        return {
+            'id': chunk_id or f"{metadata.file_path}:{metadata.start_line}:{metadata.end_line}",
+            'text': f"{summary}\n\n{chunk_content}",
+            'document': chunk_content,
+            'metadata': {
+                'file_path': metadata.file_path,
+                'language': metadata.language,
+                'start_line': metadata.start_line,
+                'end_line': metadata.end_line,
+                'chunk_type': metadata.chunk_type,
+                'summary': summary,
+                'symbols': ','.join(metadata.symbols) if metadata.symbols else ''
+            }
+        }
+
+    def _new_chunk_stats(self) -> Dict[str, int]:
+        """Counters for chunk-level reindexing"""
+        return {'chunks_kept': 0, 'chunks_added': 0, 'chunks_removed': 0}
+
+    def _sync_file_chunks(
+        self,
+        relative_path: str,
+        records: List[Dict[str, Any]],
+        chunk_stats: Dict[str, int]
+    ) -> Tuple[List[Dict[str, Any]], List[str], List[Dict[str, Any]]]:
+        """
+        Reconcile a file's stored chunks with freshly chunked records.
+
+        With chunk_level_reindex enabled, chunks whose stable ID already exists
+        are kept (only their line metadata is updated) and only new or modified
+        chunks need embedding. Otherwise all chunks of the file are re-embedded.
+        Nothing is written here; queue the result in PendingFileChunks.
+
+        Args:
+            relative_path: File path relative to repository root
+            records: Records from _prepare_file_records
+            chunk_stats: Counters updated in place (kept/added/removed)
+
+        Returns:
+            Tuple of (records that still need embedding, stale chunk IDs,
+            kept records whose line numbers changed)
+        """
+        existing = self.codebase_collection.get(
+            where={"file_path": relative_path},
+            include=["metadatas"]
+        )
+        existing_ids = existing['ids'] if existing and existing['ids'] else []
+        existing_metadata = dict(zip(existing_ids, existing.get('metadatas') or [])) if existing_ids else {}
+
+        new_ids = {record['id'] for record in records}
+        # IDs that are upserted again must not be deleted after the upsert
+        removed = [chunk_id for chunk_id in existing_ids if chunk_id not in new_ids]
+
+        if self.config.chunk_level_reindex:
+            kept = [record for record in records if record['id'] in existing_metadata]
+            added = [record for record in records if record['id'] not in existing_metadata]
+        else:
+            kept, added = [], records
+
+        # Unchanged content that moved within the file: refresh line numbers only
+        moved = [
+            record for record in kept
+            if (existing_metadata[record['id']] or {}).get('start_line') != record['metadata']['start_line']
+            or (existing_metadata[record['id']] or {}).get('end_line') != record['metadata']['end_line']
+        ]
+
+        chunk_stats['chunks_kept'] += len(kept)
+        chunk_stats['chunks_added'] += len(added)
+        chunk_stats['chunks_removed'] += len(removed)
+
+        if kept or removed:
+            logger.debug(
+                f"{relative_path}: {len(kept)} chunks kept ({len(moved)} moved), "
+                f"{len(added)} added, {len(removed)} removed"
+            )
+
+        return added, removed, moved
+
+    async def _flush_pending_files(self, pending: PendingFileChunks) -> int:
+        """
+        Embed and upsert the new chunks of queued files, then drop their stale ones.
+
+        Stale chunks are deleted and moved chunks updated only after the new
+        chunks are stored, so an embedding or upsert failure leaves the files'
+        previous chunks searchable.
+
+        Args:
+            pending: Files queued by _sync_file_chunks
+
+        Returns:
+            Number of chunks written
+        """
+        written = await self._flush_chunk_batch(pending.added)
+
+        if pending.removed:
+            self.codebase_collection.delete(ids=pending.removed)
+            self._lexical_remove(pending.removed)
+
+        if pending.moved:
+            self.codebase_collection.update(
+                ids=[record['id'] for record in pending.moved],
+                metadatas=[record['metadata'] for record in pending.moved]
+            )
+            query_cache.bump(self._cache_scope("codebase"))
+            self._mark_codebase_changed()
+
+        return written
+
+    async def _flush_chunk_batch(self, records: List[Dict[str, Any]]) -> int:
+        """
+        Embed and upsert a batch of chunk records.
+
+        Texts are encoded in a single batched embedding model call and
+        written to ChromaDB in bulk upserts of RAGConfig.upsert_batch_size rows.
+
+        Args:
+            records: Records from _prepare_chunk_record
+
+        Returns:
+            Number of chunks written
+        """
+        if not records:
+            return 0
+
+        # ChromaDB rejects duplicate IDs within one upsert - keep the last one
+        records = list({record['id']: record for record in records}.values())
+
+        # Encode in a worker thread so the event loop stays responsive
+        embeddings = await asyncio.to_thread(
+            self._encode_documents,
+            [record['text'] for record in records]
+        )
+
+        for i in range(0, len(records), self.config.upsert_batch_size):
+            batch = records[i:i + self.config.upsert_batch_size]
+
+            # Upsert to ChromaDB (replaces if ID exists, adds if new)
+            self.codebase_collection.upsert(
+                ids=[record['id'] for record in batch],
+                embeddings=embeddings[i:i + len(batch)],
+                documents=[record['document'] for record in batch],
+                metadatas=[record['metadata'] for record in batch]
+            )
+            self._lexical_add(batch)
+
+        logger.debug(f"Embedded and upserted batch of {len(records)} chunks")
+        return len(records)
+
+    def _encode_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed document texts, reusing cached vectors for previously seen content.
+
+        Only cache misses reach the model; they are encoded in one batched call.
+        """
+        def encode(batch: List[str]) -> List[List[float]]:
+            return self.embedding_model.encode(
+                batch,
+                batch_size=self.config.embedding_batch_size,
+                show_progress_bar=False
+            ).tolist()
+
+        if self.embedding_cache is None:
+            return encode(texts)
+
+        return self.embedding_cache.get_or_compute(self.embedding_model.cache_key, texts, encode)
+
+    def encode_texts(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed arbitrary texts with the service's model (and embedding cache).
+
+        Used by the backend's shared embedding endpoint.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            One vector per text
+        """
+        if not self.embedding_model:
+            raise RuntimeError("Embedding model not initialized")
+        return self._encode_documents(texts)
+
+    def get_embedding_cache_stats(self) -> Dict[str, Any]:
+        """Get embedding cache hit-rate statistics"""
+        if self.embedding_cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.embedding_cache.stats()}
+
+    def get_query_cache_stats(self) -> Dict[str, Any]:
+        """Get query cache (query embeddings and code search results) hit/miss statistics"""
+        return query_cache.stats(self._cache_scope("codebase"))
+
+    def _indexing_stats(self, total_chunks: int, start_time: float) -> Dict[str, Any]:
+        """Build throughput statistics for an indexing run"""
+        elapsed = max(time.time() - start_time, 1e-6)
+        return {
+            'total_chunks': total_chunks,
+            'elapsed_seconds': round(elapsed, 2),
+            'chunks_per_second': round(total_chunks / elapsed, 1)
+        }
+
     def _detect_language(self, ext: str) -> str:
         """Detect programming language from file extension"""
         language_map = {
@@ -650,7 +1191,7 @@ Stage Results:
 """
 
             # Create embedding
-            embedding = self.embedding_model.encode(task_text).tolist()
+            embedding = self.embedding_model.encode(task_text)
 
             # Use deterministic ID for idempotent indexing
             chunk_id = f"task_{task_id}"
@@ -668,7 +1209,7 @@ Stage Results:
             # Upsert to ChromaDB (replaces if task already indexed)
             self.tasks_collection.upsert(
                 ids=[chunk_id],
-                embeddings=[embedding],
+                embeddings=[embedding.tolist()],
                 documents=[task_text],
                 metadatas=[{
                     'task_id': task_id,
@@ -679,32 +1220,44 @@ Stage Results:
                 }]
             )
 
+            self.task_vectors.add([chunk_id], [embedding])
+
             logger.info(f"Task #{task_id} indexed successfully")
 
         except Exception as e:
             logger.error(f"Failed to index task #{task_id}: {e}")
             raise
 
-    async def update_index_incremental(self, repo_path: str):
+    async def update_index_incremental(
+        self,
+        repo_path: str,
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> Dict[str, Any]:
         """
         Incrementally update index for changed files.
         Called on MCP startup if index exists or after merge to main.
 
+        Changed files are found from git (diff since the last indexed commit
+        plus working-tree status) when available, otherwise by hashing the
+        tree with an mtime/size pre-check.
+
         Args:
             repo_path: Path to repository root
+            progress_callback: Called with (files_done, files_total) for changed files
+
+        Returns:
+            Statistics including throughput in chunks/sec
         """
         logger.info(f"Checking for index updates in {repo_path}")
 
-        import os
-        import hashlib
-        from pathlib import Path
+        import json
+        from datetime import datetime
 
         # Load index metadata (tracks file hashes)
         metadata_path = Path(self.config.chromadb_path).parent / "index_metadata.json"
 
         # Load existing metadata
         if metadata_path.exists():
-            import json
             with open(metadata_path, 'r') as f:
                 metadata = json.load(f)
         else:
@@ -713,122 +1266,105 @@ Stage Results:
                 'file_hashes': {}
             }
 
-        updated_files = []
-        new_files = []
-        deleted_chunks = 0
-
-        from chunking import GenericChunker
+        from chunking import CodeChunker, ChangeDetector
 
-        chunker = GenericChunker(
+        chunker = CodeChunker(
             chunk_size=self.config.chunk_size,
             chunk_overlap=self.config.chunk_overlap
         )
 
-        supported_extensions = {
-            '.py', '.js', '.ts', '.tsx', '.jsx',
-            '.java', '.cs', '.go', '.rs', '.cpp', '.c',
-            '.rb', '.php', '.swift', '.kt'
-        }
-
-        skip_dirs = {
-            'node_modules', 'venv', '__pycache__', '.git',
-            'dist', 'build', '.next', 'target', 'bin', 'obj',
-            '.claudetask', 'worktrees'
-        }
+        start_time = time.time()
+        total_chunks = 0
+        chunk_stats = self._new_chunk_stats()
+        pending = PendingFileChunks()
 
         try:
-            # Walk through repository
-            for root, dirs, files in os.walk(repo_path):
-                dirs[:] = [d for d in dirs if d not in skip_dirs]
+            detector = ChangeDetector(
+                repo_path,
+                self.SUPPORTED_EXTENSIONS,
+                self.SKIP_DIRS,
+                use_git=self.config.git_change_detection
+            )
+            changes = await asyncio.to_thread(
+                detector.detect,
+                metadata['file_hashes'],
+                metadata.get('file_stats'),
+                metadata.get('last_commit'),
+                metadata.get('dirty_files')
+            )
 
-                for file in files:
-                    ext = os.path.splitext(file)[1].lower()
-                    if ext not in supported_extensions:
-                        continue
+            for relative_path in changes.deleted:
+                await self._remove_file_chunks(relative_path)
+                metadata['file_hashes'].pop(relative_path, None)
 
-                    file_path = os.path.join(root, file)
-                    relative_path = os.path.relpath(file_path, repo_path)
+            changed_files = changes.changed
+            if progress_callback:
+                progress_callback(0, len(changed_files))
 
-                    # Calculate current file hash
-                    try:
-                        with open(file_path, 'rb') as f:
-                            current_hash = hashlib.sha256(f.read()).hexdigest()
-                    except:
-                        continue
+            for files_done, (relative_path, current_hash) in enumerate(changed_files.items(), 1):
+                file_path = os.path.join(repo_path, relative_path)
 
-                    # Check if file changed
-                    stored_hash = metadata['file_hashes'].get(relative_path)
+                # Re-index file (unchanged chunks are kept, stale ones deleted)
+                try:
+                    with open(file_path, 'r', encoding='utf-8') as f:
+                        content = f.read()
 
-                    if stored_hash == current_hash:
-                        # File unchanged, skip
-                        continue
+                    language = self._detect_language(os.path.splitext(relative_path)[1].lower())
+                    chunks = chunker.chunk_code(content, relative_path, language)
 
-                    # File is new or modified
-                    if stored_hash is None:
-                        new_files.append(relative_path)
-                    else:
-                        updated_files.append(relative_path)
+                    records = self._prepare_file_records(chunker, relative_path, chunks)
+                    pending.extend(*self._sync_file_chunks(relative_path, records, chunk_stats))
 
-                    # Delete old chunks for this file
-                    try:
-                        results = self.codebase_collection.get(
-                            where={"file_path": relative_path}
-                        )
-                        if results and results['ids']:
-                            self.codebase_collection.delete(ids=results['ids'])
-                            deleted_chunks += len(results['ids'])
-                    except Exception as e:
-                        logger.warning(f"Failed to delete old chunks for {relative_path}: {e}")
-
-                    # Re-index file
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            content = f.read()
-
-                        language = self._detect_language(ext)
-                        chunks = chunker.chunk_code(content, relative_path, language)
-
-                        for chunk_content, chunk_metadata in chunks:
-                            summary = chunker.generate_summary(chunk_content, chunk_metadata)
-                            embedding = self.embedding_model.encode(
-                                f"{summary}\n\n{chunk_content}"
-                            ).tolist()
-
-                            # Generate deterministic ID based on file path and line numbers
-                            chunk_id = f"{chunk_metadata.file_path}:{chunk_metadata.start_line}:{chunk_metadata.end_line}"
-
-                            self.codebase_collection.upsert(
-                                ids=[chunk_id],
-                                embeddings=[embedding],
-                                documents=[chunk_content],
-                                metadatas=[{
-                                    'file_path': chunk_metadata.file_path,
-                                    'language': chunk_metadata.language,
-                                    'start_line': chunk_metadata.start_line,
-                                    'end_line': chunk_metadata.end_line,
-                                    'chunk_type': chunk_metadata.chunk_type,
-                                    'summary': summary,
-                                    'symbols': ','.join(chunk_metadata.symbols) if chunk_metadata.symbols else ''
-                                }]
-                            )
-
-                        # Update metadata
-                        metadata['file_hashes'][relative_path] = current_hash
-
-                    except Exception as e:
-                        logger.warning(f"Failed to re-index {relative_path}: {e}")
+                    # Update metadata
+                    metadata['file_hashes'][relative_path] = current_hash
+
+                except Exception as e:
+                    logger.warning(f"Failed to re-index {relative_path}: {e}")
+                    # Force a re-check next run
+                    changes.file_stats.pop(relative_path, None)
+                    changes.dirty_files.append(relative_path)
+
+                if len(pending.added) >= self.config.index_batch_size:
+                    total_chunks += await self._flush_pending_files(pending)
+                    pending = PendingFileChunks()
+
+                if progress_callback:
+                    progress_callback(files_done, len(changed_files))
+
+                # Let other tasks (e.g. MCP requests during warm-up) run between files
+                await asyncio.sleep(0)
+
+            total_chunks += await self._flush_pending_files(pending)
 
             # Save updated metadata
-            import json
-            from datetime import datetime
             metadata['last_indexed'] = datetime.now().isoformat()
+            metadata['last_commit'] = changes.head_commit
+            metadata['dirty_files'] = changes.dirty_files
+            metadata['file_stats'] = changes.file_stats
 
             metadata_path.parent.mkdir(parents=True, exist_ok=True)
             with open(metadata_path, 'w') as f:
                 json.dump(metadata, f, indent=2)
 
-            logger.info(f"Incremental update complete: {len(new_files)} new files, "
-                       f"{len(updated_files)} updated files, {deleted_chunks} chunks deleted")
+            stats = self._indexing_stats(total_chunks, start_time)
+            stats.update({
+                'change_detection': changes.mode,
+                'files_checked': changes.checked,
+                'new_files': len(changes.added),
+                'updated_files': len(changes.modified),
+                'deleted_files': len(changes.deleted),
+                'deleted_chunks': chunk_stats['chunks_removed'],
+                **chunk_stats
+            })
+
+            logger.info(f"Incremental update complete ({changes.mode} change detection, "
+                       f"{changes.checked} files checked): {len(changes.added)} new files, "
+                       f"{len(changes.modified)} updated files, {len(changes.deleted)} deleted files, "
+                       f"{chunk_stats['chunks_kept']} chunks kept, "
+                       f"{chunk_stats['chunks_added']} added, {chunk_stats['chunks_removed']} removed "
+                       f"({stats['chunks_per_second']} chunks/sec)")
+
+            return stats
 
         except Exception as e:
             logger.error(f"Incremental indexing failed: {e}")
@@ -880,14 +1416,10 @@ Stage Results:
 
             logger.info(f"Found {len(changed_files)} changed files in merge commit {commit.hexsha[:8]}")
 
-            # Filter to only supported file types
-            supported_extensions = {'.py', '.js', '.ts', '.tsx', '.jsx', '.java',
-                                   '.cs', '.go', '.rs', '.cpp', '.c', '.rb', '.php', '.swift', '.kt'}
-
             files_to_reindex = []
             for file_path in changed_files:
                 ext = os.path.splitext(file_path)[1].lower()
-                if ext in supported_extensions:
+                if ext in self.SUPPORTED_EXTENSIONS:
                     full_path = os.path.join(repo_path, file_path)
                     if os.path.exists(full_path):
                         files_to_reindex.append(file_path)
@@ -903,54 +1435,47 @@ Stage Results:
             logger.info(f"Reindexing {len(files_to_reindex)} files: {', '.join(files_to_reindex[:5])}{'...' if len(files_to_reindex) > 5 else ''}")
 
             # Reindex each changed file
-            from chunking import GenericChunker
-            chunker = GenericChunker(chunk_size=self.config.chunk_size, chunk_overlap=self.config.chunk_overlap)
+            from chunking import CodeChunker
+            chunker = CodeChunker(chunk_size=self.config.chunk_size, chunk_overlap=self.config.chunk_overlap)
+
+            start_time = time.time()
+            total_chunks = 0
+            chunk_stats = self._new_chunk_stats()
+            pending = PendingFileChunks()
 
             for relative_path in files_to_reindex:
                 file_path = os.path.join(repo_path, relative_path)
 
                 try:
-                    # Remove old chunks for this file
-                    await self._remove_file_chunks(relative_path)
-
                     # Read and re-index file
                     with open(file_path, 'r', encoding='utf-8') as f:
                         content = f.read()
 
-                    language = self._detect_language(relative_path)
+                    language = self._detect_language(os.path.splitext(relative_path)[1])
                     chunks = chunker.chunk_code(content, relative_path, language)
 
-                    # Add new chunks
-                    for chunk_content, chunk_metadata in chunks:
-                        summary = chunker.generate_summary(chunk_content, chunk_metadata)
-
-                        # Generate embedding
-                        embedding = self.embedding_model.encode(f"{summary}\n\n{chunk_content}").tolist()
-
-                        # Store in ChromaDB with deterministic ID
-                        chunk_id = f"{chunk_metadata.file_path}:{chunk_metadata.start_line}:{chunk_metadata.end_line}"
-
-                        self.codebase_collection.upsert(
-                            ids=[chunk_id],
-                            embeddings=[embedding],
-                            documents=[chunk_content],
-                            metadatas=[{
-                                'file_path': chunk_metadata.file_path,
-                                'language': chunk_metadata.language,
-                                'start_line': chunk_metadata.start_line,
-                                'end_line': chunk_metadata.end_line,
-                                'chunk_type': chunk_metadata.chunk_type,
-                                'summary': summary,
-                                'symbols': ','.join(chunk_metadata.symbols) if chunk_metadata.symbols else ''
-                            }]
-                        )
+                    # Keep unchanged chunks, queue new/modified ones, drop stale ones
+                    records = self._prepare_file_records(chunker, relative_path, chunks)
+                    pending.extend(*self._sync_file_chunks(relative_path, records, chunk_stats))
 
-                    logger.info(f"Reindexed {relative_path}: {len(chunks)} chunks")
+                    logger.info(f"Chunked {relative_path}: {len(chunks)} chunks")
 
                 except Exception as e:
                     logger.warning(f"Failed to reindex {relative_path}: {e}")
 
-            logger.info(f"Merge commit reindex complete: {len(files_to_reindex)} files updated")
+                if len(pending.added) >= self.config.index_batch_size:
+                    total_chunks += await self._flush_pending_files(pending)
+                    pending = PendingFileChunks()
+
+            total_chunks += await self._flush_pending_files(pending)
+
+            stats = self._indexing_stats(total_chunks, start_time)
+
+            logger.info(
+                f"Merge commit reindex complete: {len(files_to_reindex)} files updated, "
+                f"{chunk_stats['chunks_kept']} chunks kept, {chunk_stats['chunks_added']} added, "
+                f"{chunk_stats['chunks_removed']} removed ({stats['chunks_per_second']} chunks/sec)"
+            )
 
         except Exception as e:
             logger.error(f"Merge commit reindexing failed: {e}")
@@ -967,6 +1492,7 @@ Stage Results:
             if existing and existing['ids']:
                 # Delete all chunks for this file
                 self.codebase_collection.delete(ids=existing['ids'])
+                self._lexical_remove(existing['ids'])
                 logger.debug(f"Removed {len(existing['ids'])} chunks for {file_path}")
         except Exception as e:
             logger.warning(f"Failed to remove chunks for {file_path}: {e}")
@@ -1027,6 +1553,7 @@ Stage Results:
                 metadatas=[full_metadata]
             )
 
+            query_cache.bump(self._cache_scope("memory", project_id))
             logger.info(f"Indexed message {message_id} for project {project_id[:8]} in collection {self.memory_collection.name}")
 
         except Exception as e:
@@ -1060,34 +1587,40 @@ Stage Results:
                 logger.info(f"No memories indexed yet for project {project_id[:8]}")
                 return []
 
-            # Generate query embedding
-            query_embedding = self.embedding_model.encode(query).tolist()
+            async def search():
+                query_embedding = await self._query_embedding(query)
 
-            # Build where clause - always filter by project_id
-            where_clause = {"project_id": project_id}
-            if filters:
-                where_clause = {**filters, "project_id": project_id}
+                # Build where clause - always filter by project_id
+                where_clause = {"project_id": project_id}
+                if filters:
+                    where_clause = {**filters, "project_id": project_id}
 
-            logger.info(f"Searching with where_clause: {where_clause}")
+                logger.info(f"Searching with where_clause: {where_clause}")
 
-            # Perform search
-            results = memory_collection.query(
-                query_embeddings=[query_embedding],
-                n_results=limit,
-                where=where_clause
-            )
-
-            # Format results
-            formatted_results = []
-            if results and results['documents']:
-                for i in range(len(results['documents'][0])):
-                    formatted_results.append({
-                        'content': results['documents'][0][i],
-                        'metadata': results['metadatas'][0][i] if results['metadatas'] else {},
-                        'score': 1 - results['distances'][0][i] if results['distances'] else 0  # Convert distance to similarity
-                    })
+                # Perform search
+                results = memory_collection.query(
+                    query_embeddings=[query_embedding],
+                    n_results=limit,
+                    where=where_clause
+                )
 
-            return formatted_results
+                # Format results
+                formatted_results = []
+                if results and results['documents']:
+                    for i in range(len(results['documents'][0])):
+                        formatted_results.append({
+                            'content': results['documents'][0][i],
+                            'metadata': results['metadatas'][0][i] if results['metadatas'] else {},
+                            'score': 1 - results['distances'][0][i] if results['distances'] else 0  # Convert distance to similarity
+                        })
+                return formatted_results
+
+            # Messages are written by the backend process: the collection size is part of the key
+            return await query_cache.results(
+                self._cache_scope("memory", project_id),
+                (collection_count, query, limit, repr(filters)),
+                search
+            )
 
         except Exception as e:
             logger.error(f"Memory search failed: {e}")
@@ -1105,7 +1638,8 @@ Stage Results:
                 return {
                     "total_messages": count,
                     "collection_name": collection_name,
-                    "status": "active"
+                    "status": "active",
+                    "query_cache": query_cache.stats(self._cache_scope("memory", project_id))
                 }
             except:
                 return {
@@ -0,0 +1,17 @@
+"""Lexical, hybrid and symbol retrieval and query caching shared by the MCP bridge and the backend code search"""
+
+from .fusion import reciprocal_rank_fusion
+from .lexical_index import LexicalIndex, LexicalIndexCache, looks_like_identifier, tokenize
+from .query_cache import QueryCache, query_cache
+from .symbols import (
+    SYMBOL_MATCH_MODES, split_symbol_query, prefix_upper_bound,
+    fuzzy_like_pattern, fuzzy_regex, symbol_match_score, rank_symbols
+)
+
+__all__ = [
+    "LexicalIndex", "LexicalIndexCache", "looks_like_identifier", "tokenize",
+    "reciprocal_rank_fusion",
+    "QueryCache", "query_cache",
+    "SYMBOL_MATCH_MODES", "split_symbol_query", "prefix_upper_bound",
+    "fuzzy_like_pattern", "fuzzy_regex", "symbol_match_score", "rank_symbols"
+]
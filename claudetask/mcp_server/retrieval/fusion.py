@@ -0,0 +1,32 @@
+"""Rank fusion for hybrid (lexical + semantic) retrieval"""
+
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[Hashable]],
+    k: int = 60,
+    weights: Optional[Sequence[float]] = None
+) -> List[Tuple[Hashable, float]]:
+    """
+    Fuse ranked lists with reciprocal rank fusion (RRF).
+
+    Each list contributes weight / (k + rank) for every ID it contains
+    (rank starting at 1), so IDs ranked well by several retrievers win
+    without comparing their incompatible scores (BM25 vs cosine).
+
+    Args:
+        rankings: Ranked ID lists, best first
+        k: Rank smoothing constant (60 in the original paper)
+        weights: Optional weight per list (default 1.0)
+
+    Returns:
+        (id, fused score) pairs, best first
+    """
+    scores: Dict[Hashable, float] = {}
+    for position, ranking in enumerate(rankings):
+        weight = weights[position] if weights else 1.0
+        for rank, id in enumerate(ranking, 1):
+            scores[id] = scores.get(id, 0.0) + weight / (k + rank)
+
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
@@ -0,0 +1,326 @@
+"""
+In-process BM25 index over code chunks.
+
+Embeddings are good at "code that does X" but rank exact identifiers
+poorly. This index scores chunk content and the chunk's symbols (function
+and class names, weighted higher) with BM25, and answers exact symbol
+lookups from a symbol -> chunks map without any scoring.
+
+Identifiers are indexed whole and split into their parts, so
+"getUserById", "get_user_by_id" and "user" all match the same chunk.
+"""
+
+import re
+import math
+import heapq
+import asyncio
+import logging
+import threading
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[A-Za-z_$][A-Za-z0-9_$]*|\d+")
+_CAMEL_RE = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+")
+_IDENTIFIER_RE = re.compile(r"^[A-Za-z_$][A-Za-z0-9_$]*(?:\.[A-Za-z_$][A-Za-z0-9_$]*)*$")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercased search terms of a text.
+
+    Each identifier yields itself plus its snake_case/camelCase parts.
+    """
+    terms = []
+    for token in _TOKEN_RE.findall(text):
+        lower = token.lower()
+        terms.append(lower)
+        parts = [part.lower() for piece in token.split("_") for part in _CAMEL_RE.findall(piece)]
+        if len(parts) > 1:
+            terms.extend(part for part in parts if len(part) > 1)
+    return terms
+
+
+def looks_like_identifier(query: str) -> bool:
+    """Whether a query is a bare (optionally dotted) identifier such as "CodeChunk" or "Foo.bar" """
+    return bool(_IDENTIFIER_RE.match(query.strip()))
+
+
+class LexicalIndex:
+    """
+    BM25 inverted index with an exact symbol map.
+
+    Documents carry optional metadata (e.g. language, chunk_type) for
+    equality filters.
+
+    Usage:
+        index = LexicalIndex()
+        index.add("chunk-1", "def get_user(id): ...", symbols=["get_user"], metadata={"language": "python"})
+        index.search("get user", k=10)             # [(id, bm25 score), ...]
+        index.lookup_symbol("get_user")            # ["chunk-1"]
+        index.remove(["chunk-1"])
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, symbol_weight: int = 3):
+        """
+        Initialize an empty index.
+
+        Args:
+            k1: BM25 term frequency saturation
+            b: BM25 length normalization
+            symbol_weight: Term frequency multiplier for symbol names
+        """
+        self.k1 = k1
+        self.b = b
+        self.symbol_weight = symbol_weight
+        self._lock = threading.RLock()
+
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._lengths: Dict[str, int] = {}
+        self._total_length = 0
+        self._terms: Dict[str, Tuple[str, ...]] = {}
+        self._symbols: Dict[str, Set[str]] = {}  # lowercased symbol -> doc IDs
+        self._doc_symbols: Dict[str, Tuple[str, ...]] = {}
+        self._metadata: Dict[str, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def __contains__(self, id: str) -> bool:
+        return id in self._lengths
+
+    def add(
+        self,
+        id: str,
+        content: str,
+        symbols: Optional[Sequence[str]] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Add or replace a document.
+
+        Args:
+            id: Document ID
+            content: Text to index
+            symbols: Symbol names defined in the document
+            metadata: Filterable fields
+        """
+        symbols = tuple(symbol for symbol in (symbols or ()) if symbol)
+        counts = Counter(tokenize(content))
+        for symbol in symbols:
+            for term in tokenize(symbol):
+                counts[term] += self.symbol_weight
+
+        with self._lock:
+            if id in self._lengths:
+                self._remove(id)
+
+            length = sum(counts.values())
+            for term, count in counts.items():
+                self._postings.setdefault(term, {})[id] = count
+            self._terms[id] = tuple(counts)
+            self._lengths[id] = length
+            self._total_length += length
+
+            for symbol in symbols:
+                self._symbols.setdefault(symbol.lower(), set()).add(id)
+            self._doc_symbols[id] = symbols
+            self._metadata[id] = dict(metadata or {})
+
+    def add_many(self, documents: Iterable[Tuple[str, str, Optional[Sequence[str]], Optional[Dict[str, Any]]]]) -> None:
+        """Add (id, content, symbols, metadata) tuples"""
+        for id, content, symbols, metadata in documents:
+            self.add(id, content, symbols, metadata)
+
+    def remove(self, ids: Iterable[str]) -> int:
+        """
+        Remove documents.
+
+        Returns:
+            Number of removed documents
+        """
+        removed = 0
+        with self._lock:
+            for id in ids:
+                if id in self._lengths:
+                    self._remove(id)
+                    removed += 1
+        return removed
+
+    def _remove(self, id: str) -> None:
+        for term in self._terms.pop(id):
+            postings = self._postings[term]
+            del postings[id]
+            if not postings:
+                del self._postings[term]
+        self._total_length -= self._lengths.pop(id)
+
+        for symbol in self._doc_symbols.pop(id):
+            ids = self._symbols.get(symbol.lower())
+            if ids is not None:
+                ids.discard(id)
+                if not ids:
+                    del self._symbols[symbol.lower()]
+        del self._metadata[id]
+
+    def _matches(self, id: str, filters: Optional[Dict[str, Any]]) -> bool:
+        if not filters:
+            return True
+        metadata = self._metadata.get(id, {})
+        return all(metadata.get(field) == value for field, value in filters.items())
+
+    def search(self, query: str, k: int = 10, filters: Optional[Dict[str, Any]] = None) -> List[Tuple[str, float]]:
+        """
+        BM25 ranking of documents for a query.
+
+        Args:
+            query: Free text or identifiers
+            k: Number of results
+            filters: Metadata equality filters
+
+        Returns:
+            (id, BM25 score) pairs, best first
+        """
+        terms = set(tokenize(query))
+
+        with self._lock:
+            count = len(self._lengths)
+            if not count or not terms or k <= 0:
+                return []
+            average_length = self._total_length / count
+
+            scores: Dict[str, float] = {}
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for id, frequency in postings.items():
+                    norm = self.k1 * (1 - self.b + self.b * self._lengths[id] / average_length)
+                    scores[id] = scores.get(id, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+
+            if filters:
+                scores = {id: score for id, score in scores.items() if self._matches(id, filters)}
+
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+
+    def lookup_symbol(self, symbol: str, filters: Optional[Dict[str, Any]] = None) -> List[str]:
+        """
+        Documents defining a symbol.
+
+        Exact-case matches come first; a dotted name ("Class.method") also
+        matches its last part.
+
+        Args:
+            symbol: Symbol name
+            filters: Metadata equality filters
+
+        Returns:
+            Document IDs
+        """
+        symbol = symbol.strip()
+        candidates = [symbol]
+        if "." in symbol:
+            candidates.append(symbol.rsplit(".", 1)[1])
+
+        with self._lock:
+            exact, other = [], []
+            for name in candidates:
+                for id in sorted(self._symbols.get(name.lower(), ())):
+                    if id in exact or id in other or not self._matches(id, filters):
+                        continue
+                    (exact if name in self._doc_symbols[id] else other).append(id)
+            return exact + other
+
+    def stats(self) -> Dict[str, int]:
+        """Index size"""
+        with self._lock:
+            return {
+                "documents": len(self._lengths),
+                "terms": len(self._postings),
+                "symbols": len(self._symbols)
+            }
+
+
+class LexicalIndexCache:
+    """
+    Process-wide lexical indexes, loaded on first use and kept in sync by
+    the writers.
+
+    Usage:
+        index = await cache.get(("local", project_id), load_documents)
+        cache.apply(("local", project_id), added=[...], removed=[...])
+    """
+
+    def __init__(self):
+        self._indexes: Dict[Hashable, LexicalIndex] = {}
+        self._loading: Dict[Hashable, asyncio.Future] = {}
+        self._stale: Set[Hashable] = set()  # written to while loading
+
+    async def get(
+        self,
+        key: Hashable,
+        load: Callable[[], Awaitable[Iterable[Tuple[str, str, Optional[Sequence[str]], Optional[Dict[str, Any]]]]]]
+    ) -> LexicalIndex:
+        """
+        Get the index for a key, building it from load() the first time.
+
+        Concurrent callers share one load.
+        """
+        index = self._indexes.get(key)
+        if index is not None:
+            return index
+
+        future = self._loading.get(key)
+        if future is not None:
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._loading[key] = future
+        try:
+            documents = await load()
+            index = LexicalIndex()
+            await asyncio.to_thread(index.add_many, documents)
+            if key in self._stale:
+                # The load may have read the store before a write: serve it once, rebuild next time
+                self._stale.discard(key)
+            else:
+                self._indexes[key] = index
+            logger.info(f"Built lexical index {key}: {index.stats()}")
+            future.set_result(index)
+            return index
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # retrieved - waiters get it from await
+            raise
+        finally:
+            del self._loading[key]
+
+    def is_loaded(self, key: Hashable) -> bool:
+        """Whether writes to this key need to be applied (index loaded or loading)"""
+        return key in self._indexes or key in self._loading
+
+    def apply(
+        self,
+        key: Hashable,
+        added: Sequence[Tuple[str, str, Optional[Sequence[str]], Optional[Dict[str, Any]]]] = (),
+        removed: Sequence[str] = ()
+    ) -> None:
+        """Apply writes to a loaded index (no-op if not loaded; a load in progress is discarded)"""
+        if key in self._loading:
+            self._stale.add(key)
+            return
+        index = self._indexes.get(key)
+        if index is None:
+            return
+        if removed:
+            index.remove(removed)
+        if added:
+            index.add_many(added)
+
+    def drop(self, key: Hashable) -> None:
+        """Forget an index (rebuilt on next use)"""
+        self._indexes.pop(key, None)
+        if key in self._loading:
+            self._stale.add(key)
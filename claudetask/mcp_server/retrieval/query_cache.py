@@ -0,0 +1,249 @@
+"""
+In-process query cache for RAG searches.
+
+Agents repeat the same searches many times in a session. Two LRU levels
+avoid redoing the work:
+
+1. Query embeddings: (model, query text) -> vector. Skips the embedding
+   model (or, for Voyage, a paid API round trip) for repeated queries,
+   across projects and search types.
+2. Search results: (scope, index version, query, filters, k, ...) ->
+   results. A scope is one searchable index, e.g. ("codebase", project_id).
+   Writers call bump() after changing an index; entries of older versions
+   are never returned again. A TTL bounds staleness for writes made by
+   other processes, which cannot bump this process's versions.
+
+Concurrent misses for the same key share one computation.
+"""
+
+import time
+import copy
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class _LRU:
+    """Bounded mapping with hit/miss/eviction counters"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        value = self.entries.get(key, default)
+        if value is not default:
+            self.entries.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "evictions": self.evictions
+        }
+
+
+class QueryCache:
+    """
+    Two-level LRU cache of query embeddings and search results.
+
+    Meant for one event loop (the backend's or an MCP bridge's).
+
+    Usage:
+        vector = await query_cache.embedding("voyage-3-large:query", query, lambda: embed(query))
+        results = await query_cache.results(("codebase", project_id), (query, mode, limit), lambda: search(...))
+        query_cache.bump(("codebase", project_id))   # after indexing
+    """
+
+    def __init__(self, max_embeddings: int = 2048, max_results: int = 1024, ttl: Optional[float] = 300.0):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_embeddings: Maximum cached query embeddings
+            max_results: Maximum cached result lists
+            ttl: Seconds a result list stays valid (None: until its scope is bumped)
+        """
+        self.ttl = ttl
+        self._embeddings = _LRU(max_embeddings)
+        self._results = _LRU(max_results)
+        self._versions: Dict[Hashable, int] = {}
+        self._scope_counters: Dict[Hashable, List[int]] = {}  # scope -> [hits, misses]
+        self._pending: Dict[Hashable, asyncio.Future] = {}
+
+    # ==================
+    # Index versions
+    # ==================
+
+    def version(self, scope: Hashable) -> int:
+        """Current index version of a scope"""
+        return self._versions.get(scope, 0)
+
+    def bump(self, scope: Hashable) -> int:
+        """
+        Mark a scope's index as changed, invalidating its cached results.
+
+        Returns:
+            New index version
+        """
+        version = self._versions.get(scope, 0) + 1
+        self._versions[scope] = version
+        stale = [key for key in self._results.entries if key[0] == scope]
+        for key in stale:
+            del self._results.entries[key]
+        logger.debug(f"Query cache: {scope} at index version {version}, dropped {len(stale)} result lists")
+        return version
+
+    # ==================
+    # Lookups
+    # ==================
+
+    async def embedding(
+        self,
+        model: str,
+        text: str,
+        compute: Callable[[], Awaitable[List[float]]]
+    ) -> List[float]:
+        """
+        Query embedding of a text, computed on a miss.
+
+        Args:
+            model: Embedding model (plus input type if the model distinguishes them)
+            text: Query text
+            compute: Coroutine function producing the embedding
+        """
+        key = (model, text)
+        vector = self._embeddings.get(key)
+        if vector is not None:
+            self._embeddings.hits += 1
+            return vector
+
+        vector, computed = await self._shared(("embedding",) + key, compute)
+        if computed:
+            self._embeddings.misses += 1
+            if vector:
+                self._embeddings.put(key, vector)
+        else:
+            self._embeddings.hits += 1
+        return vector
+
+    async def results(
+        self,
+        scope: Hashable,
+        key: Hashable,
+        compute: Callable[[], Awaitable[T]]
+    ) -> T:
+        """
+        Search results for a query against a scope's current index version.
+
+        Args:
+            scope: Searched index, e.g. ("codebase", project_id)
+            key: Everything else the results depend on (query, filters, limit, mode...)
+            compute: Coroutine function running the search on a miss
+
+        Returns:
+            A copy of the cached (or freshly computed) results
+        """
+        version = self.version(scope)
+        cache_key = (scope, version, key)
+        counters = self._scope_counters.setdefault(scope, [0, 0])
+
+        entry = self._results.get(cache_key)
+        if entry is not None and (self.ttl is None or time.monotonic() - entry[0] < self.ttl):
+            self._results.hits += 1
+            counters[0] += 1
+            return copy.deepcopy(entry[1])
+
+        results, computed = await self._shared(cache_key, compute)
+        if not computed:
+            self._results.hits += 1
+            counters[0] += 1
+            return results
+
+        self._results.misses += 1
+        counters[1] += 1
+        if self.version(scope) == version:  # not bumped while searching
+            self._results.put(cache_key, (time.monotonic(), copy.deepcopy(results)))
+        return results
+
+    async def _shared(self, key: Hashable, compute: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """
+        Run compute once for concurrent callers with the same key.
+
+        Returns:
+            (value, whether this caller computed it); waiters get a copy
+        """
+        future = self._pending.get(key)
+        if future is not None:
+            return copy.deepcopy(await asyncio.shield(future)), False
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            value = await compute()
+            future.set_result(value)
+            return value, True
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # retrieved - waiters get it from await
+            raise
+        finally:
+            del self._pending[key]
+
+    # ==================
+    # Metrics
+    # ==================
+
+    def stats(self, scope: Optional[Hashable] = None) -> Dict[str, Any]:
+        """
+        Hit/miss metrics of both levels.
+
+        Args:
+            scope: Also report this scope's index version and result hits/misses
+
+        Returns:
+            {"embeddings": {...}, "results": {...}} (+ "scope" when given)
+        """
+        stats = {
+            "embeddings": self._embeddings.stats(),
+            "results": {**self._results.stats(), "ttl_seconds": self.ttl}
+        }
+        if scope is not None:
+            hits, misses = self._scope_counters.get(scope, (0, 0))
+            stats["scope"] = {
+                "index_version": self.version(scope),
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0
+            }
+        return stats
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters (index versions are kept)"""
+        self._embeddings = _LRU(self._embeddings.max_entries)
+        self._results = _LRU(self._results.max_entries)
+        self._scope_counters.clear()
+
+
+# Process-wide cache shared by all search services of this process
+query_cache = QueryCache()
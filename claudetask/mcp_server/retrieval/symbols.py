@@ -0,0 +1,123 @@
+"""
+Matching and ranking for symbol ("go to definition") lookups.
+
+Symbol tables store each definition with its lowercased name so that
+stores can pre-filter candidates with an index range (prefix) or a
+pattern (fuzzy: the query's characters in order, like editor "go to
+symbol"). rank_symbols() then orders the candidates the same way for
+every store.
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+SYMBOL_MATCH_MODES = ("exact", "prefix", "fuzzy")
+
+
+def split_symbol_query(query: str) -> Tuple[str, Optional[str]]:
+    """
+    Split a symbol query into the name to look up and an optional
+    container ("Class.method" -> ("method", "Class")).
+    """
+    container, _, name = query.strip().rpartition(".")
+    return name, container.rsplit(".", 1)[-1] or None
+
+
+def prefix_upper_bound(prefix: str) -> str:
+    """Smallest string greater than every string starting with prefix (for range scans)"""
+    return prefix + "\U0010ffff"
+
+
+def fuzzy_like_pattern(query: str) -> str:
+    """SQL LIKE pattern (ESCAPE '\\') matching names containing the query's characters in order"""
+    escaped = [char if char not in "%_\\" else "\\" + char for char in query.lower()]
+    return "%" + "%".join(escaped) + "%"
+
+
+def fuzzy_regex(query: str) -> str:
+    """Regular expression matching names containing the query's characters in order"""
+    return ".*".join(re.escape(char) for char in query.lower())
+
+
+def symbol_match_score(query: str, name: str, match: str = "fuzzy") -> Optional[float]:
+    """
+    Score a symbol name against a query.
+
+    Exact (case-sensitive, then case-insensitive) matches rank above prefix
+    matches, which rank above substring and then subsequence matches;
+    within a tier, shorter names and (for subsequences) tighter matches
+    rank higher.
+
+    Args:
+        query: Normalized query
+        name: Symbol name
+        match: "exact", "prefix" or "fuzzy"
+
+    Returns:
+        Score (higher is better), or None if the name does not match
+    """
+    lower_query, lower_name = query.lower(), name.lower()
+    length_penalty = len(name) / 1000
+
+    if lower_name == lower_query:
+        return (4.0 if name == query else 3.5) - length_penalty
+    if match == "exact":
+        return None
+
+    if lower_name.startswith(lower_query):
+        return (3.0 if name.startswith(query) else 2.75) - length_penalty
+    if match == "prefix":
+        return None
+
+    position = lower_name.find(lower_query)
+    if position >= 0:
+        # Matches at a word boundary (get_USER, getUser) beat matches inside a word
+        boundary = name[position - 1] == "_" or name[position].isupper()
+        return (2.0 if boundary else 1.75) - length_penalty
+
+    # Subsequence: greedy left-to-right, scored by how spread out the match is
+    position, first, gaps = 0, None, 0
+    for char in lower_query:
+        found = lower_name.find(char, position)
+        if found < 0:
+            return None
+        if first is None:
+            first = found
+        elif found > position:
+            gaps += 1
+        position = found + 1
+    return 1.0 - gaps / (len(lower_query) + 1) / 2 - first / 100 - length_penalty
+
+
+def rank_symbols(
+    query: str,
+    symbols: Iterable[Dict[str, Any]],
+    match: str = "fuzzy",
+    limit: int = 20,
+    container: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Filter and order symbol records by how well their "name" matches.
+
+    Args:
+        query: Name part of the query (see split_symbol_query)
+        symbols: Candidate records (dicts with at least "name")
+        match: "exact", "prefix" or "fuzzy"
+        limit: Maximum number of results
+        container: Qualifier of the query; definitions inside it rank first
+
+    Returns:
+        Matching records with a "score" field, best first (ties by file path and line)
+    """
+    container = container.lower() if container else None
+    scored = []
+    for symbol in symbols:
+        score = symbol_match_score(query, symbol["name"], match)
+        if score is None:
+            continue
+        if container and (symbol.get("container") or "").lower() == container:
+            score += 1.0
+        scored.append({**symbol, "score": round(score, 4)})
+
+    scored.sort(key=lambda symbol: (-symbol["score"], symbol.get("file_path", ""), symbol.get("start_line", 0)))
+    return scored[:limit]
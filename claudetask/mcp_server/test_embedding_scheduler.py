@@ -0,0 +1,174 @@
+"""
+Test Embedding Scheduler Against a Local Fake Embedding Server
+
+Verifies that the embedding scheduler:
+- Packs batches by token budget and returns vectors in input order
+- Keeps several batches in flight (faster than sequential batches)
+- Backs off and lowers its request rate on 429 responses (Retry-After honored)
+- Records per-batch latency metrics
+
+The fake server speaks the Voyage /embeddings wire format, so the backend
+VoyageEmbeddingService can be pointed at it too with
+VOYAGE_API_BASE_URL=http://127.0.0.1:<port>.
+"""
+
+import json
+import time
+import asyncio
+import threading
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from embeddings import EmbeddingScheduler, RateLimitError
+
+
+class FakeEmbeddingServer:
+    """Voyage-compatible /embeddings endpoint with fixed latency and scripted 429s"""
+
+    def __init__(self, latency: float = 0.05, rate_limit_first: int = 0, dimensions: int = 8):
+        self.latency = latency
+        self.rate_limit_remaining = rate_limit_first
+        self.dimensions = dimensions
+        self.requests = 0
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+
+                with server._lock:
+                    server.requests += 1
+                    if server.rate_limit_remaining > 0:
+                        server.rate_limit_remaining -= 1
+                        self.send_response(429)
+                        self.send_header("Retry-After", "0.1")
+                        self.end_headers()
+                        return
+                    server._in_flight += 1
+                    server.max_in_flight = max(server.max_in_flight, server._in_flight)
+
+                time.sleep(server.latency)
+
+                # Deterministic "embedding": text length repeated
+                data = [
+                    {"index": i, "embedding": [float(len(text))] * server.dimensions}
+                    for i, text in enumerate(body["input"])
+                ]
+                payload = json.dumps({"data": data}).encode()
+
+                with server._lock:
+                    server._in_flight -= 1
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+
+
+def make_embed_batch(url: str):
+    """Embed function posting to the fake server (stdlib client in a worker thread)"""
+    def post(texts):
+        request = urllib.request.Request(
+            f"{url}/embeddings",
+            data=json.dumps({"input": texts, "model": "fake", "input_type": "document"}).encode(),
+            headers={"Content-Type": "application/json"}
+        )
+        try:
+            with urllib.request.urlopen(request) as response:
+                return [item["embedding"] for item in json.loads(response.read())["data"]]
+        except urllib.error.HTTPError as e:
+            if e.code == 429:
+                raise RateLimitError("429 Too Many Requests", retry_after=float(e.headers["Retry-After"]))
+            raise
+
+    async def embed_batch(texts):
+        return await asyncio.to_thread(post, texts)
+
+    return embed_batch
+
+
+async def test_embedding_scheduler():
+    """Test concurrency, token packing and 429 handling against the fake server"""
+    print("\n" + "="*80)
+    print("TEST: Embedding Scheduler")
+    print("="*80)
+
+    texts = [f"def function_{i}():\n    return {'x' * (i % 50)}" for i in range(400)]
+
+    # TEST 1: sequential vs concurrent
+    print("\nTEST 1: Concurrent batches vs sequential")
+    print("-" * 80)
+
+    server = FakeEmbeddingServer(latency=0.05)
+    try:
+        timings = {}
+        for concurrency in (1, 4):
+            scheduler = EmbeddingScheduler(
+                make_embed_batch(server.url),
+                max_concurrency=concurrency,
+                max_batch_tokens=1000,
+                requests_per_second=1000
+            )
+            start = time.monotonic()
+            vectors = await scheduler.embed(texts)
+            timings[concurrency] = time.monotonic() - start
+
+            assert len(vectors) == len(texts)
+            assert all(vector[0] == float(len(text)) for vector, text in zip(vectors, texts)), "order mismatch"
+            metrics = scheduler.get_metrics()
+            print(f"✅ concurrency={concurrency}: {metrics['batches']} batches in {timings[concurrency]:.2f}s, "
+                  f"p50={metrics['latency_ms']['p50']}ms p95={metrics['latency_ms']['p95']}ms")
+
+        assert server.max_in_flight > 1, "batches were not sent concurrently"
+        assert timings[4] < timings[1] * 0.6, f"concurrency did not help: {timings}"
+        print(f"✅ Speedup: {timings[1] / timings[4]:.1f}x (max {server.max_in_flight} requests in flight)")
+    finally:
+        server.close()
+
+    # TEST 2: 429 handling
+    print("\nTEST 2: Adaptive backoff on 429")
+    print("-" * 80)
+
+    server = FakeEmbeddingServer(latency=0.01, rate_limit_first=3)
+    try:
+        scheduler = EmbeddingScheduler(
+            make_embed_batch(server.url),
+            max_concurrency=4,
+            max_batch_tokens=2000,
+            requests_per_second=100,
+            retry_base_delay=0.05
+        )
+        vectors = await scheduler.embed(texts)
+        metrics = scheduler.get_metrics()
+
+        assert len(vectors) == len(texts)
+        assert metrics["retries"] == 3
+        assert metrics["request_limiter"]["rate_limited"] == 3
+        assert metrics["request_limiter"]["rate"] < 100
+        print(f"✅ Recovered from 3 rate limits, rate now {metrics['request_limiter']['rate']}/s")
+    finally:
+        server.close()
+
+    print("\n" + "="*80)
+    print("✅ ALL EMBEDDING SCHEDULER TESTS PASSED")
+    print("="*80)
+
+
+if __name__ == "__main__":
+    asyncio.run(test_embedding_scheduler())
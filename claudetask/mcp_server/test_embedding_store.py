@@ -0,0 +1,139 @@
+"""
+Test Memory-Mapped Embedding Store
+
+Verifies that the embedding store:
+- Returns stored vectors and exact top-k results after reopening (round trip)
+- Replaces, removes and compacts rows without losing live vectors
+- Rebuilds its files in one step
+- Stays consistent when several processes append to it concurrently,
+  and repairs ids/vectors that are out of line on open
+"""
+
+import os
+import tempfile
+import multiprocessing
+
+import numpy as np
+
+from embeddings.embedding_store import EmbeddingStore
+
+
+DIMENSIONS = 16
+
+
+def unit(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def append_from_process(path: str, worker: int, count: int):
+    """Add vectors from a separate process (one add per vector)"""
+    store = EmbeddingStore(path, DIMENSIONS)
+    rng = np.random.default_rng(worker)
+    for i in range(count):
+        store.add([f"w{worker}_{i}"], rng.normal(size=(1, DIMENSIONS)))
+    store.close()
+
+
+def test_embedding_store():
+    """Test round trip, rebuild and multi-process appends"""
+    print("\n" + "="*80)
+    print("TEST: Embedding Store")
+    print("="*80)
+
+    rng = np.random.default_rng(0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "store")
+
+        # TEST 1: round trip
+        print("\nTEST 1: Round trip")
+        print("-" * 80)
+
+        ids = [f"id_{i}" for i in range(200)]
+        vectors = rng.normal(size=(200, DIMENSIONS))
+        store = EmbeddingStore(path, DIMENSIONS, block_rows=64)
+        store.add(ids, vectors)
+        store.close()
+
+        store = EmbeddingStore(path, DIMENSIONS, block_rows=64)
+        assert len(store) == 200 and "id_7" in store
+        assert np.allclose(store.get(["id_7", "id_42"]), unit(vectors[[7, 42]]), atol=1e-6)
+
+        hits = store.search(vectors[:3], k=5)
+        assert [result[0][0] for result in hits] == ["id_0", "id_1", "id_2"]
+        assert all(abs(result[0][1] - 1.0) < 1e-5 for result in hits)
+        expected = np.argsort(-(unit(vectors) @ unit(vectors[:1]).T)[:, 0])[:5]
+        assert [id for id, _ in hits[0]] == [ids[row] for row in expected]
+        print("✅ Vectors and exact top-k survive reopening")
+
+        # TEST 2: replace, remove, compact
+        print("\nTEST 2: Replace, remove and compact")
+        print("-" * 80)
+
+        store.add(["id_0"], vectors[1:2])
+        assert len(store) == 200
+        assert store.search(vectors[1], k=2)[0][0][1] > 0.999
+        assert store.remove([f"id_{i}" for i in range(1, 150)]) == 149
+        store.compact()
+        assert store.stats()["rows"] == len(store) == 51
+        assert np.allclose(store.get(["id_199"]), unit(vectors[199:200]), atol=1e-6)
+        assert store.search(vectors[1], k=51, allow=lambda id: id != "id_0")[0][0][0] != "id_0"
+        print(f"✅ {store.stats()}")
+
+        # TEST 3: rebuild
+        print("\nTEST 3: Rebuild")
+        print("-" * 80)
+
+        other = EmbeddingStore(path, DIMENSIONS)
+        assert len(other) == 51
+        store.rebuild(["a", "b"], vectors[:2])
+        assert len(store) == 2 and store.ids() == ["a", "b"]
+        assert len(other) == 2 and "a" in other, "second handle did not see the rebuild"
+        store.rebuild([], np.zeros((0, DIMENSIONS)))
+        assert len(other) == 0
+        other.close()
+        store.close()
+        print("✅ Rebuild replaces all vectors, other handles reload")
+
+        # TEST 4: concurrent appends from several processes
+        print("\nTEST 4: Multi-process appends")
+        print("-" * 80)
+
+        workers = [
+            multiprocessing.Process(target=append_from_process, args=(path, worker, 100))
+            for worker in range(4)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+            assert worker.exitcode == 0
+
+        store = EmbeddingStore(path, DIMENSIONS)
+        assert len(store) == 400 and store.stats()["rows"] == 400
+        assert os.path.getsize(os.path.join(path, EmbeddingStore.VECTORS_FILE)) == 400 * DIMENSIONS * 4
+        probe = store.get(["w3_99"])
+        assert store.search(probe, k=1)[0][0][0] == "w3_99"
+        store.close()
+        print("✅ 4 processes x 100 appends: ids and vectors line up")
+
+        # TEST 5: out-of-line files are repaired on open
+        print("\nTEST 5: Torn append repaired on open")
+        print("-" * 80)
+
+        with open(os.path.join(path, EmbeddingStore.VECTORS_FILE), "ab") as f:
+            f.write(b"\0" * (DIMENSIONS * 4 + 5))
+        store = EmbeddingStore(path, DIMENSIONS)
+        assert len(store) == 400
+        assert os.path.getsize(os.path.join(path, EmbeddingStore.VECTORS_FILE)) == 400 * DIMENSIONS * 4
+        store.close()
+        print("✅ Extra vector bytes truncated")
+
+    print("\n" + "="*80)
+    print("✅ ALL EMBEDDING STORE TESTS PASSED")
+    print("="*80)
+
+
+if __name__ == "__main__":
+    test_embedding_store()
@@ -14,7 +14,8 @@
 #   log_hook_error "Failed: reason"
 #
 # Storage modes:
-#   - local: writes to .claudetask/logs/hooks/hooks.log
+#   - local: writes to .claudetask/logs/hooks/hooks.log, rotated (and gzipped)
+#     by size and age per .claudetask/logs/rotation.json
 #   - mongodb: sends logs to backend API
 
 # Find project root (where .claudetask folder should be)
@@ -34,6 +35,7 @@ find_project_root() {
 PROJECT_ROOT=$(find_project_root)
 HOOK_LOG_DIR="$PROJECT_ROOT/.claudetask/logs/hooks"
 HOOK_LOG_FILE="$HOOK_LOG_DIR/hooks.log"
+LOG_ROTATION_FILE="$PROJECT_ROOT/.claudetask/logs/rotation.json"
 HOOK_NAME=""
 HOOK_START_TIME=""
 STORAGE_MODE=""
@@ -76,6 +78,79 @@ send_to_mongodb() {
     curl -s --max-time 2 -X POST "$BACKEND_URL/api/mcp-logs/ingest/hook?$params" >/dev/null 2>&1 &
 }
 
+# Read a setting of the log rotation policy (same file and defaults as the MCP log)
+read_rotation_setting() {
+    local key="$1"
+    local default="$2"
+    local value=""
+
+    if [[ -f "$LOG_ROTATION_FILE" ]]; then
+        value=$(grep -o "\"$key\"[[:space:]]*:[[:space:]]*[^,}]*" "$LOG_ROTATION_FILE" 2>/dev/null | head -1 | sed 's/.*:[[:space:]]*//; s/[[:space:]"]//g')
+    fi
+    echo "${value:-$default}"
+}
+
+# Delete rotated hook log segments beyond the retention limits
+prune_hook_log_segments() {
+    local max_segments=$(read_rotation_setting max_segments 20)
+    local max_age_days=$(read_rotation_setting max_age_days 30)
+
+    # Segment names sort chronologically (hooks.log.YYYYmmdd-HHMMSS[-N][.gz])
+    if [[ "$max_segments" -gt 0 ]] 2>/dev/null; then
+        ls -1 "$HOOK_LOG_FILE".[0-9]* 2>/dev/null | grep -v '\.tmp$' | sort -r | tail -n +$((max_segments + 1)) | while read -r segment; do
+            rm -f "$segment"
+        done
+    fi
+
+    local max_age_minutes=$(awk -v d="$max_age_days" 'BEGIN { printf "%d", d * 1440 }')
+    if [[ "$max_age_minutes" -gt 0 ]]; then
+        find "$HOOK_LOG_DIR" -maxdepth 1 -name 'hooks.log.[0-9]*' -mmin +"$max_age_minutes" -exec rm -f {} + 2>/dev/null
+    fi
+}
+
+# Rotate hooks.log when it reached the policy's size or age
+rotate_hook_log_if_needed() {
+    [[ -s "$HOOK_LOG_FILE" ]] || return 0
+
+    local max_bytes=$(read_rotation_setting max_bytes 10485760)
+    local interval_hours=$(read_rotation_setting rotate_interval_hours 24)
+    local size=$(wc -c < "$HOOK_LOG_FILE" 2>/dev/null | tr -d ' ')
+    local due=""
+
+    if [[ "$max_bytes" -gt 0 && "${size:-0}" -ge "$max_bytes" ]] 2>/dev/null; then
+        due=1
+    elif awk -v h="$interval_hours" 'BEGIN { exit !(h > 0) }'; then
+        # Age of the first entry (GNU date, then BSD/macOS date)
+        local first=$(head -c 19 "$HOOK_LOG_FILE")
+        local started=$(date -d "$first" +%s 2>/dev/null || date -j -f '%Y-%m-%d %H:%M:%S' "$first" +%s 2>/dev/null)
+        if [[ -n "$started" ]] && awk -v now="$(date +%s)" -v s="$started" -v h="$interval_hours" 'BEGIN { exit !(now - s >= h * 3600) }'; then
+            due=1
+        fi
+    fi
+    [[ -n "$due" ]] || return 0
+
+    # Another hook may rotate at the same moment: only one mv succeeds
+    local segment="$HOOK_LOG_FILE.$(date '+%Y%m%d-%H%M%S')-$$"
+    mv "$HOOK_LOG_FILE" "$segment" 2>/dev/null || return 0
+
+    (
+        # Compress to a temporary name so readers never see a partial .gz.
+        # Hooks that opened the log before the mv may still append: wait until
+        # the segment is idle and keep it plain if it grew while compressing.
+        if [[ "$(read_rotation_setting compress true)" == "true" ]] && command -v gzip >/dev/null 2>&1; then
+            sleep 2
+            local size=$(wc -c < "$segment")
+            gzip -c "$segment" > "$segment.gz.tmp" && touch -r "$segment" "$segment.gz.tmp" \
+                && [[ "$(wc -c < "$segment")" == "$size" ]] \
+                && mv "$segment.gz.tmp" "$segment.gz" && {
+                    if [[ "$(wc -c < "$segment")" == "$size" ]]; then rm -f "$segment"; else rm -f "$segment.gz"; fi
+                }
+            rm -f "$segment.gz.tmp"
+        fi
+        prune_hook_log_segments
+    ) >/dev/null 2>&1 &
+}
+
 # Get current time in milliseconds
 get_time_ms() {
     if [[ "$(uname)" == "Darwin" ]]; then
@@ -100,6 +175,7 @@ init_hook_log() {
     else
         # Create log directory if it doesn't exist
         mkdir -p "$HOOK_LOG_DIR"
+        rotate_hook_log_if_needed
         # Log start to file
         local timestamp=$(date '+%Y-%m-%d %H:%M:%S')
         echo "$timestamp | $HOOK_NAME | START | HOOK START: $HOOK_NAME" >> "$HOOK_LOG_FILE"
@@ -175,6 +251,9 @@ export -f find_project_root
 export -f get_storage_mode
 export -f get_time_ms
 export -f send_to_mongodb
+export -f read_rotation_setting
+export -f prune_hook_log_segments
+export -f rotate_hook_log_if_needed
 export -f init_hook_log
 export -f log_hook
 export -f log_hook_success
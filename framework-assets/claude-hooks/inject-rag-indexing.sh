@@ -44,7 +44,7 @@ if [ -f "$MARKER_FILE" ]; then
     log_hook "Retrying API call with project: $PROJECT_ROOT"
 
     # Make API call
-    API_RESPONSE=$(curl -s -X POST "$API_URL?project_dir=${PROJECT_DIR_ENCODED}" \
+    API_RESPONSE=$(curl -s --max-time 30 -X POST "$API_URL?project_dir=${PROJECT_DIR_ENCODED}" \
         -H "Content-Type: application/json" \
         -d "{\"file_paths\": $FILES_JSON}" \
         2>&1)
@@ -102,7 +102,7 @@ PROJECT_DIR_ENCODED=$(printf %s "$PROJECT_ROOT" | jq -sRr @uri)
 log_hook "Calling API to index files"
 
 # Make API call with file list in body
-API_RESPONSE=$(curl -s -X POST "$API_URL?project_dir=${PROJECT_DIR_ENCODED}" \
+API_RESPONSE=$(curl -s --max-time 30 -X POST "$API_URL?project_dir=${PROJECT_DIR_ENCODED}" \
     -H "Content-Type: application/json" \
     -d "{\"file_paths\": $FILES_JSON}" \
     2>&1)
@@ -113,7 +113,7 @@ API_URL="http://localhost:3333/api/documentation-rag/${PROJECT_NAME}/index-files
 log_hook "Calling API: $API_URL"
 
 # Make API call with file list
-API_RESPONSE=$(curl -s -X POST "$API_URL" \
+API_RESPONSE=$(curl -s --max-time 30 -X POST "$API_URL" \
     -H "Content-Type: application/json" \
     -d "{\"file_paths\": $FILES_JSON, \"repo_path\": \"$PROJECT_ROOT\"}" \
     2>&1)